@@ -1,61 +1,517 @@
+import itertools
+import json
+import os
+import threading
 import time
+import tracemalloc
 from concurrent import futures
+from contextlib import contextmanager
 
 import grpc
+from google.protobuf import json_format
+from grpc_health.v1 import health, health_pb2, health_pb2_grpc
 
 import apply_service_pb2
 import apply_service_pb2_grpc
 from chains.cover_letter_chain import run_cover_letter_chain
+from chains.degradation import applied as degradation_applied, level_name
 from chains.question_answering_chain import run_question_answering_chain
 from chains.resume_chain import run_resume_chain
 from chains.orchestrator_chain import run_orchestrator_chain
 from chains.agentic_orchestrator import run_agentic_orchestrator
+from chains import metrics
+from chains.circuit_breaker import OPEN, add_state_listener
+from chains.common import profile_to_dict, to_dict
+from chains.job_dedup import find_prior_application, remember_application
+from chains.job_ranking import rank_jobs
+from chains.profile_store import derived, get_profile, put_profile, split_ref
+from chains.resume_ingest import ResumeFormatError, ingest_resume, resume_text_for
+from chains.skill_extraction import taxonomy_version
+from chains.stage_checkpoints import StageCheckpoints, checkpoints_enabled
+from chains.usage import (add_usage_listener, collect_usage, record_cache_hit, record_queue_wait,
+                          stage as usage_stage, usage_enabled)
+from estimator import estimate_application, get_estimator
+from job_queue import JobQueue
+from load_governor import get_governor, governor_enabled
+from prefork import serve_prefork
+from prewarm import Prewarmer, prewarm_enabled
+from profiling import FORMATS, HEAP_GROUP_BY, HeapTracker, RequestProfileStore, SamplingProfiler, render
+from scheduler import SchedulerFull, get_scheduler
+
+TENANT_METADATA_KEY = "x-tenant-id"
+PROFILE_METADATA_KEY = "x-profile"
+PROFILE_ID_METADATA_KEY = "x-profile-id"
+
+
+def tenant_of(request, context=None):
+    """Tenant from the request field (if the message has one), falling back to gRPC metadata."""
+    tenant = getattr(request, "tenant_id", "")
+    if tenant:
+        return tenant
+    if context is not None:
+        for key, value in context.invocation_metadata():
+            if key == TENANT_METADATA_KEY:
+                return value
+    return ""
+
+
+def questions_to_dicts(pb_questions):
+    return [{
+        "question": q.question,
+        "type": q.type,
+        "options": list(q.options) if q.options else []
+    } for q in pb_questions]
+
+
+def profile_fields(profile):
+    """Profile message as PutProfile stores it: proto field names, unset fields left out."""
+    return json_format.MessageToDict(profile, preserving_proto_field_name=True)
+
+
+def resolve_profile(tenant, profile_ref):
+    """Profile message for a PutProfile ref, or None if the tenant has no such ref.
+
+    Resume text and skills come already resolved (cached per profile version),
+    so the chains' profile_to_dict calls skip the resume lookup and skill extraction.
+    """
+    found = get_profile(tenant, profile_ref)
+    if found is None:
+        return None
+    pinned, fields = found
+
+    def resolve():
+        # ParseDict validates every string, the whole resume included: once per version only
+        profile = json_format.ParseDict(fields, apply_service_pb2.Profile(), ignore_unknown_fields=True)
+        resolved = profile_to_dict(profile)
+        profile.resume_text = resolved["resume_text"]
+        profile.resume_id = ""
+        del profile.skills[:]
+        profile.skills.extend(resolved["skills"])
+        return profile_fields(profile)
+
+    # An ingested resume that arrives after the first lookup must not stay hidden behind the cache
+    resume_id = fields.get("resume_id", "")
+    resume_known = bool(resume_id) and resume_text_for(resume_id) is not None
+    return apply_service_pb2.Profile(**derived(pinned, "profile_fields", resolve, taxonomy_version(), resume_known))
+
+
+def run_auto_apply_ticket(ticket_id, payload, stages, checkpoint):
+    """Process a queued AutoApply ticket stage by stage, skipping checkpointed stages."""
+    request = apply_service_pb2.AutoApplyRequest.FromString(payload)
+    questions = questions_to_dicts(request.questions)
+    scheduler = get_scheduler()
+    profile = request.profile
+    if request.profile_ref:
+        profile = resolve_profile(request.tenant_id, request.profile_ref)
+        if profile is None:
+            raise LookupError(f"Unknown profile_ref {request.profile_ref}")
+
+    if "resume" not in stages:
+        print(f"[JOB_QUEUE] {ticket_id}: refining resume", flush=True)
+        with scheduler.slot(request.tenant_id):
+            stages["resume"] = run_resume_chain(request.job, profile)
+        checkpoint("resume", stages["resume"])
+
+    if "cover_letter" not in stages:
+        print(f"[JOB_QUEUE] {ticket_id}: generating cover letter", flush=True)
+        with scheduler.slot(request.tenant_id):
+            stages["cover_letter"] = run_cover_letter_chain(request.job, profile)
+        checkpoint("cover_letter", stages["cover_letter"])
+
+    if "answers" not in stages:
+        print(f"[JOB_QUEUE] {ticket_id}: answering {len(questions)} questions", flush=True)
+        if questions:
+            with scheduler.slot(request.tenant_id):
+                stages["answers"] = run_question_answering_chain(request.job, profile, questions)
+        else:
+            stages["answers"] = []
+        checkpoint("answers", stages["answers"])
+
+    return {
+        "success": True,
+        "message": "Application completed successfully",
+        "refined_resume": stages["resume"],
+        "cover_letter": stages["cover_letter"],
+        "answers": stages["answers"],
+        "application_id": f"app-{ticket_id}",
+    }
+
+
+def usage_to_proto(recorder):
+    """Usage block for a response, or None when AGENT_RESPONSE_USAGE=false."""
+    if not usage_enabled():
+        return None
+    summary = recorder.summary()
+    stages = [apply_service_pb2.StageUsage(**entry) for entry in summary.pop("stages")]
+    return apply_service_pb2.Usage(stages=stages, **summary)
+
+
+def ticket_to_status(ticket):
+    status = apply_service_pb2.ApplicationStatus(
+        ticket_id=ticket["ticket_id"],
+        state=ticket["state"],
+        stage=ticket["stage"],
+        completed_stages=ticket["completed_stages"],
+        attempts=ticket["attempts"],
+        message=ticket["message"],
+        updated_at_ms=int(ticket["updated_at"] * 1000),
+    )
+    result = ticket["result"]
+    if result:
+        status.result.CopyFrom(apply_service_pb2.AutoApplyResponse(
+            success=result["success"],
+            message=result["message"],
+            refined_resume=result["refined_resume"],
+            cover_letter=result["cover_letter"],
+            answers=[apply_service_pb2.Answer(question=a["question"], answer=a["answer"]) for a in result["answers"]],
+            application_id=result["application_id"],
+        ))
+    return status
+
+
+class MetricsInterceptor(grpc.ServerInterceptor):
+    """Records per-RPC latency, status codes and in-flight requests."""
+
+    def __init__(self):
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def _track(self, delta):
+        with self._lock:
+            self._in_flight += delta
+            metrics.set_gauge("grpc_in_flight", self._in_flight)
+
+    def _record(self, method, started, context, failed):
+        code = context.code() or (grpc.StatusCode.UNKNOWN if failed else grpc.StatusCode.OK)
+        metrics.inc("grpc_requests_total", method=method, code=code.name)
+        metrics.observe("grpc_latency_seconds", time.perf_counter() - started, method=method)
+        self._track(-1)
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None:
+            return None
+        method = handler_call_details.method.rsplit("/", 1)[-1]
+
+        if handler.unary_unary:
+            behavior = handler.unary_unary
+
+            def unary_unary(request, context):
+                started = time.perf_counter()
+                self._track(1)
+                failed = True
+                try:
+                    response = behavior(request, context)
+                    failed = False
+                    return response
+                finally:
+                    self._record(method, started, context, failed)
+
+            return grpc.unary_unary_rpc_method_handler(
+                unary_unary,
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer,
+            )
+
+        if handler.unary_stream:
+            behavior = handler.unary_stream
+
+            def unary_stream(request, context):
+                started = time.perf_counter()
+                self._track(1)
+                failed = True
+                try:
+                    yield from behavior(request, context)
+                    failed = False
+                finally:
+                    self._record(method, started, context, failed)
+
+            return grpc.unary_stream_rpc_method_handler(
+                unary_stream,
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer,
+            )
+
+        if handler.stream_unary:
+            behavior = handler.stream_unary
+
+            def stream_unary(request_iterator, context):
+                started = time.perf_counter()
+                self._track(1)
+                failed = True
+                try:
+                    response = behavior(request_iterator, context)
+                    failed = False
+                    return response
+                finally:
+                    self._record(method, started, context, failed)
+
+            return grpc.stream_unary_rpc_method_handler(
+                stream_unary,
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer,
+            )
+
+        return handler
+
+
+class ProfilingInterceptor(grpc.ServerInterceptor):
+    """Samples stacks while a request runs when it carries the "x-profile" header.
+
+    The profile is stored under an id returned in the "x-profile-id" trailing
+    metadata and fetched with AdminService.GetRequestProfile. Only installed
+    when the admin service is enabled.
+    """
+
+    def __init__(self, store, max_concurrent=2, interval=0.005):
+        self.store = store
+        self.interval = interval
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+
+    @contextmanager
+    def _profiled(self, method, context):
+        if not self._slots.acquire(blocking=False):
+            yield  # enough profiles running already; serve the request unprofiled
+            return
+        profiler = SamplingProfiler(interval=self.interval, focus=threading.get_ident()).start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            self._slots.release()
+            profile_id = self.store.save(method, profiler)
+            context.set_trailing_metadata(((PROFILE_ID_METADATA_KEY, profile_id),))
+            print(f"[PROFILE] {method} -> {profile_id} ({profiler.sample_count} samples)", flush=True)
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        metadata = dict(handler_call_details.invocation_metadata or ())
+        if handler is None or PROFILE_METADATA_KEY not in metadata:
+            return handler
+        method = handler_call_details.method.rsplit("/", 1)[-1]
+
+        if handler.unary_unary:
+            behavior = handler.unary_unary
+
+            def unary_unary(request, context):
+                with self._profiled(method, context):
+                    return behavior(request, context)
+
+            return grpc.unary_unary_rpc_method_handler(
+                unary_unary,
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer,
+            )
+
+        if handler.unary_stream:
+            behavior = handler.unary_stream
+
+            def unary_stream(request, context):
+                with self._profiled(method, context):
+                    yield from behavior(request, context)
+
+            return grpc.unary_stream_rpc_method_handler(
+                unary_stream,
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer,
+            )
+
+        return handler
+
+
+class AdminService(apply_service_pb2_grpc.AdminServiceServicer):
+    """CPU and heap profiling of this worker process (local port only)."""
+
+    def __init__(self, profile_store):
+        self.profile_store = profile_store
+        self.heap = HeapTracker(keep=int(os.getenv("AGENT_HEAP_SNAPSHOTS", "5")))
+        self.max_seconds = float(os.getenv("AGENT_PROFILE_MAX_SECONDS", "60"))
+        self._cpu_lock = threading.Lock()
+
+    def ProfileCpu(self, request, context):
+        fmt = request.format or "collapsed"
+        if fmt not in FORMATS:
+            return apply_service_pb2.ProfileResult(success=False, message=f"Unknown format: {fmt}")
+        if not self._cpu_lock.acquire(blocking=False):
+            return apply_service_pb2.ProfileResult(success=False, message="A CPU profile is already running")
+        try:
+            duration = min(request.duration_seconds or 5.0, self.max_seconds)
+            profiler = SamplingProfiler(interval=(request.interval_ms or 5.0) / 1000.0).start()
+            time.sleep(duration)
+            profiler.stop()
+        finally:
+            self._cpu_lock.release()
+        return apply_service_pb2.ProfileResult(
+            success=True,
+            format=fmt,
+            data=render(profiler.samples, profiler.interval, fmt),
+            samples=profiler.sample_count,
+            duration_seconds=profiler.duration,
+            pid=os.getpid(),
+        )
+
+    def GetRequestProfile(self, request, context):
+        fmt = request.format or "collapsed"
+        if fmt not in FORMATS:
+            return apply_service_pb2.ProfileResult(success=False, message=f"Unknown format: {fmt}")
+        record = self.profile_store.load(request.profile_id)
+        if record is None:
+            return apply_service_pb2.ProfileResult(success=False, message=f"Profile {request.profile_id} not found")
+        return apply_service_pb2.ProfileResult(
+            success=True,
+            message=record["method"],
+            format=fmt,
+            data=render(record["samples"], record["interval"], fmt),
+            samples=record["sample_count"],
+            duration_seconds=record["duration"],
+            pid=record["pid"],
+        )
+
+    def TakeHeapSnapshot(self, request, context):
+        group_by = request.group_by or "lineno"
+        if group_by not in HEAP_GROUP_BY:
+            return apply_service_pb2.HeapSnapshotResponse(success=False, message=f"Unknown group_by: {group_by}")
+        snapshot_id, snapshot = self.heap.snapshot(frames=request.frames or 1)
+        traced, peak = tracemalloc.get_traced_memory()
+        stats = snapshot.statistics(group_by)
+        return apply_service_pb2.HeapSnapshotResponse(
+            success=True,
+            snapshot_id=snapshot_id,
+            traced_bytes=traced,
+            peak_bytes=peak,
+            top=[str(stat) for stat in stats[:request.top_n or 20]],
+        )
+
+    def DiffHeapSnapshots(self, request, context):
+        group_by = request.group_by or "lineno"
+        if group_by not in HEAP_GROUP_BY:
+            return apply_service_pb2.HeapDiffResponse(success=False, message=f"Unknown group_by: {group_by}")
+        base = self.heap.get(request.base_snapshot_id)
+        if base is None:
+            return apply_service_pb2.HeapDiffResponse(
+                success=False, message=f"Snapshot {request.base_snapshot_id} not found")
+        if request.snapshot_id:
+            snapshot_id, snapshot = request.snapshot_id, self.heap.get(request.snapshot_id)
+            if snapshot is None:
+                return apply_service_pb2.HeapDiffResponse(
+                    success=False, message=f"Snapshot {request.snapshot_id} not found")
+        else:
+            snapshot_id, snapshot = self.heap.snapshot()
+        diff = snapshot.compare_to(base, group_by)
+        return apply_service_pb2.HeapDiffResponse(
+            success=True,
+            snapshot_id=snapshot_id,
+            size_diff_bytes=sum(stat.size_diff for stat in diff),
+            top=[str(stat) for stat in diff[:request.top_n or 20]],
+        )
+
+    def StopHeapTracing(self, request, context):
+        return apply_service_pb2.StopHeapTracingResponse(success=True, dropped_snapshots=self.heap.stop())
+
+
+def start_admin_server(profile_store):
+    """AdminService on loopback; each pre-fork worker gets its own port."""
+    port = int(os.getenv("AGENT_ADMIN_PORT", "50151")) + int(os.getenv("AGENT_WORKER_ID", "0"))
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+    apply_service_pb2_grpc.add_AdminServiceServicer_to_server(AdminService(profile_store), server)
+    server.add_insecure_port(f"127.0.0.1:{port}")
+    server.start()
+    print(f"AdminService listening on 127.0.0.1:{port} (pid {os.getpid()})", flush=True)
+    return server
 
 
 class ApplyService(apply_service_pb2_grpc.ApplyServiceServicer):
+    def __init__(self, job_queue=None, prewarmer=None):
+        self.job_queue = job_queue
+        self.prewarmer = prewarmer
+
+    @contextmanager
+    def _llm_slot(self, request, context, cost=1.0):
+        """Hold a fair-share LLM slot for the request's tenant."""
+        requested = time.perf_counter()
+        try:
+            with get_scheduler().slot(tenant_of(request, context), cost=cost):
+                record_queue_wait(time.perf_counter() - requested)
+                yield
+        except SchedulerFull as exc:
+            context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(exc))
+
+    @contextmanager
+    def _load_level(self):
+        """Run the request at the load governor's current degradation level."""
+        governor = get_governor() if governor_enabled() else None
+        level = governor.evaluate() if governor else 0
+        started = time.perf_counter()
+        with degradation_applied(level):
+            yield level
+        if governor:
+            governor.observe_latency(time.perf_counter() - started)
+        metrics.inc("load_level_requests_total", level=level_name(level))
+
+    @staticmethod
+    def _profile(request, context):
+        """The request's profile: the stored one when it sends profile_ref."""
+        if not request.profile_ref:
+            return request.profile
+        profile = resolve_profile(tenant_of(request, context), request.profile_ref)
+        if profile is None:
+            context.abort(grpc.StatusCode.NOT_FOUND, f"Unknown profile_ref {request.profile_ref}; call PutProfile again")
+        return profile
+
     def Apply(self, request, context):
         application_id = f"app-{int(time.time() * 1000)}"
+        profile = self._profile(request, context)
         job_title = request.job.title or "Unknown role"
-        applicant = request.profile.name or "Applicant"
+        applicant = profile.name or "Applicant"
 
-        refined_resume = run_resume_chain(
-            job_obj=request.job,
-            profile_obj=request.profile,
-        )
+        with self._load_level() as level, collect_usage() as usage:
+            with self._llm_slot(request, context), usage_stage("resume"):
+                refined_resume = run_resume_chain(
+                    job_obj=request.job,
+                    profile_obj=profile,
+                )
         message = f"{applicant} applied to {job_title}. Refined resume:\n{refined_resume}"
 
         return apply_service_pb2.ApplyResponse(
             success=True,
             message=message,
             application_id=application_id,
+            usage=usage_to_proto(usage),
+            degradation_level=level,
+            degradation=level_name(level),
         )
 
     def GenerateCoverLetter(self, request, context):
-        cover_letter = run_cover_letter_chain(
-            job_obj=request.job,
-            profile_obj=request.profile,
-        )
+        profile = self._profile(request, context)
+        with self._load_level() as level, collect_usage() as usage:
+            with self._llm_slot(request, context), usage_stage("cover_letter"):
+                cover_letter = run_cover_letter_chain(
+                    job_obj=request.job,
+                    profile_obj=profile,
+                )
         return apply_service_pb2.CoverLetterResponse(
             success=True,
             cover_letter=cover_letter,
             message="Cover letter generated",
+            usage=usage_to_proto(usage),
+            degradation_level=level,
+            degradation=level_name(level),
         )
 
     def AnswerQuestions(self, request, context):
         """Generate answers to application questions."""
         # Convert protobuf questions to dict format
-        questions = [{
-            "question": q.question,
-            "type": q.type,
-            "options": list(q.options) if q.options else []
-        } for q in request.questions]
+        questions = questions_to_dicts(request.questions)
+        profile = self._profile(request, context)
 
         # Run the question answering chain
-        answers = run_question_answering_chain(
-            job_obj=request.job,
-            profile_obj=request.profile,
-            questions=questions
-        )
+        with self._load_level() as level, collect_usage() as usage:
+            with self._llm_slot(request, context), usage_stage("answers"):
+                answers = run_question_answering_chain(
+                    job_obj=request.job,
+                    profile_obj=profile,
+                    questions=questions
+                )
 
         # Convert to protobuf response
         response_answers = [
@@ -68,31 +524,53 @@ class ApplyService(apply_service_pb2_grpc.ApplyServiceServicer):
         return apply_service_pb2.AnswerResponse(
             success=True,
             answers=response_answers,
-            message="Questions answered successfully"
+            message="Questions answered successfully",
+            usage=usage_to_proto(usage),
+            degradation_level=level,
+            degradation=level_name(level),
         )
 
     def AutoApply(self, request, context):
         """Full auto-apply orchestration."""
-        import sys
         print(f"[AUTO_APPLY] Received request for job: {request.job.title}", flush=True)
 
         # Convert questions to dict format
-        questions = [{
-            "question": q.question,
-            "type": q.type,
-            "options": list(q.options) if q.options else []
-        } for q in request.questions] if request.questions else None
+        questions = questions_to_dicts(request.questions) if request.questions else None
 
         print(f"[AUTO_APPLY] Converted {len(questions) if questions else 0} questions", flush=True)
+        profile = self._profile(request, context)
 
-        # Run agentic orchestrator
-        print("[AUTO_APPLY] Starting agentic orchestrator...", flush=True)
-        result = run_agentic_orchestrator(
-            job_obj=request.job,
-            profile_obj=request.profile,
-            questions=questions
-        )
-        print(f"[AUTO_APPLY] Agentic orchestrator completed with success={result['success']}", flush=True)
+        with self._load_level() as level, collect_usage() as usage:
+            job_dict = to_dict(request.job)
+            profile_dict = profile_to_dict(profile)
+            prior = find_prior_application(job_dict, profile_dict)
+
+            if self.prewarmer:
+                # A right-swipe on a job still queued for prewarming: generate it now instead
+                self.prewarmer.cancel(tenant_of(request, context), [request.job.id])
+
+            if prior:
+                result = self._reuse_prior_application(prior, request, profile, context, questions)
+            elif self._prewarmed(job_dict, profile_dict, questions):
+                print("[AUTO_APPLY] All stages prewarmed, skipping the scheduler", flush=True)
+                result = run_agentic_orchestrator(
+                    job_obj=request.job,
+                    profile_obj=profile,
+                    questions=questions
+                )
+            else:
+                # Run agentic orchestrator
+                print("[AUTO_APPLY] Starting agentic orchestrator...", flush=True)
+                with self._llm_slot(request, context, cost=3 if questions else 2):
+                    result = run_agentic_orchestrator(
+                        job_obj=request.job,
+                        profile_obj=profile,
+                        questions=questions
+                    )
+                print(f"[AUTO_APPLY] Agentic orchestrator completed with success={result['success']}", flush=True)
+                # Degraded (template-only or load-reduced) output must not be reused for later near-duplicates
+                if result["success"] and not result.get("degraded") and not level:
+                    remember_application(job_dict, profile_dict, result)
 
         # Generate application ID
         application_id = f"app-{int(time.time() * 1000)}"
@@ -111,18 +589,268 @@ class ApplyService(apply_service_pb2_grpc.ApplyServiceServicer):
             refined_resume=result["refined_resume"],
             cover_letter=result["cover_letter"],
             answers=response_answers,
-            application_id=application_id
+            application_id=application_id,
+            reused_from_job_id=result.get("source_job_id", ""),
+            reused_stages=result.get("reused_stages", []),
+            usage=usage_to_proto(usage),
+            degradation_level=level,
+            degradation=level_name(level),
+        )
+
+    @staticmethod
+    def _prewarmed(job_dict, profile_dict, questions):
+        """Whether every stage of the request is checkpointed (e.g. by PrewarmApplications)."""
+        if not checkpoints_enabled():
+            return False
+        checkpoints = StageCheckpoints(job_dict, profile_dict, questions)
+        return all(checkpoints.has(stage) for stage in ["resume", "cover_letter"] + (["answers"] if questions else []))
+
+    def _reuse_prior_application(self, prior, request, profile, context, questions):
+        """Build an AutoApply result from a near-duplicate job's artifacts."""
+        prior_answers = {a["question"]: a["answer"] for a in prior["answers"]}
+        answers = []
+        missing = []
+        for q in questions or []:
+            if q["question"] in prior_answers:
+                answers.append({"question": q["question"], "answer": prior_answers[q["question"]]})
+            else:
+                missing.append(q)
+
+        for stage in ["resume", "cover_letter"] + (["answers"] if answers else []):
+            record_cache_hit("job_dedup", stage=stage)
+        if missing:
+            print(f"[AUTO_APPLY] Answering {len(missing)} questions not covered by the prior application", flush=True)
+            with self._llm_slot(request, context), usage_stage("answers"):
+                answers.extend(run_question_answering_chain(request.job, profile, missing))
+
+        return {
+            "success": True,
+            "message": f"Reused application for near-duplicate job {prior['source_job_id']} "
+                       f"(similarity {prior['similarity']:.2f})",
+            "refined_resume": prior["refined_resume"],
+            "cover_letter": prior["cover_letter"],
+            "answers": answers,
+            "source_job_id": prior["source_job_id"],
+        }
+
+    def RankJobs(self, request, context):
+        """Score jobs against a profile locally, without any LLM call."""
+        started = time.perf_counter()
+        scores = rank_jobs(
+            profile=profile_to_dict(self._profile(request, context)),
+            jobs=list(request.jobs),
+            preferred_locations=list(request.preferred_locations),
+            preferred_types=list(request.preferred_types),
+            top_k=request.top_k,
+            min_score=request.min_score,
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"[RANK_JOBS] Ranked {len(request.jobs)} jobs in {elapsed_ms:.1f}ms", flush=True)
+
+        return apply_service_pb2.RankJobsResponse(
+            success=True,
+            scores=[apply_service_pb2.JobScore(**score) for score in scores],
+            message=f"Ranked {len(request.jobs)} jobs in {elapsed_ms:.1f}ms",
+        )
+
+    def SubmitAutoApply(self, request, context):
+        """Queue an AutoApply request and return a ticket immediately."""
+        # Persist the tenant in the payload so queued work stays attributed after restarts
+        tenant = tenant_of(request, context)
+        request.tenant_id = tenant
+        if request.profile_ref:
+            # Pin the version, so a profile edited while the ticket waits does not change it halfway
+            found = get_profile(tenant, request.profile_ref)
+            if found is None:
+                context.abort(grpc.StatusCode.NOT_FOUND, f"Unknown profile_ref {request.profile_ref}; call PutProfile again")
+            request.profile_ref = found[0]
+        ticket_id = self.job_queue.submit(request.SerializeToString(), tenant=tenant)
+        print(f"[SUBMIT_AUTO_APPLY] Queued {ticket_id} for job: {request.job.title}", flush=True)
+        return apply_service_pb2.SubmitAutoApplyResponse(
+            success=True,
+            ticket_id=ticket_id,
+            message="Application queued",
+        )
+
+    def GetApplicationStatus(self, request, context):
+        ticket = self.job_queue.get(request.ticket_id)
+        if ticket is None:
+            context.abort(grpc.StatusCode.NOT_FOUND, f"Unknown ticket {request.ticket_id}")
+        return ticket_to_status(ticket)
+
+    def WatchApplication(self, request, context):
+        """Stream status updates until the ticket completes or fails."""
+        if self.job_queue.get(request.ticket_id) is None:
+            context.abort(grpc.StatusCode.NOT_FOUND, f"Unknown ticket {request.ticket_id}")
+        for ticket in self.job_queue.watch(request.ticket_id, is_active=context.is_active):
+            yield ticket_to_status(ticket)
+
+    def GetMetrics(self, request, context):
+        """Metrics aggregated across every live worker process."""
+        merged = metrics.aggregate()
+        return apply_service_pb2.MetricsResponse(
+            metrics_json=json.dumps(merged),
+            workers=len(merged["workers"]),
+        )
+
+    def PrewarmApplications(self, request, context):
+        """Queue the next jobs of a user's deck for speculative generation."""
+        if self.prewarmer is None:
+            return apply_service_pb2.PrewarmApplicationsResponse(success=False, message="Prewarming is disabled")
+        jobs = [(item.job, questions_to_dicts(item.questions)) for item in request.jobs if item.job.id]
+        queued = self.prewarmer.submit(tenant_of(request, context), self._profile(request, context), jobs)
+        return apply_service_pb2.PrewarmApplicationsResponse(
+            success=True,
+            message=f"{len(queued['accepted'])} queued, {len(queued['cached'])} cached, "
+                    f"{len(queued['skipped'])} over budget",
+            accepted_job_ids=queued["accepted"],
+            cached_job_ids=queued["cached"],
+            skipped_job_ids=queued["skipped"],
+            budget_remaining=queued["budget_remaining"],
+        )
+
+    def CancelPrewarm(self, request, context):
+        if self.prewarmer is None:
+            return apply_service_pb2.CancelPrewarmResponse(cancelled=0)
+        cancelled = self.prewarmer.cancel(tenant_of(request, context), list(request.job_ids))
+        return apply_service_pb2.CancelPrewarmResponse(cancelled=cancelled)
+
+    def PutProfile(self, request, context):
+        """Store a profile version for the caller's tenant; its requests can then send the returned profile_ref."""
+        try:
+            stored = put_profile(tenant_of(request, context), request.profile_id, profile_fields(request.profile))
+        except ValueError as exc:
+            return apply_service_pb2.PutProfileResponse(success=False, message=str(exc))
+        return apply_service_pb2.PutProfileResponse(
+            success=True,
+            message="Profile stored" if stored["changed"] else "Profile unchanged",
+            profile_ref=stored["profile_ref"],
+            version=stored["version"],
+            changed=stored["changed"],
+        )
+
+    def GetProfile(self, request, context):
+        """One of the caller's stored profiles: the latest version for a bare id, or the pinned version."""
+        found = get_profile(tenant_of(request, context), request.profile_ref)
+        if found is None:
+            context.abort(grpc.StatusCode.NOT_FOUND, f"Unknown profile_ref {request.profile_ref}")
+        pinned, fields = found
+        return apply_service_pb2.GetProfileResponse(
+            profile=json_format.ParseDict(fields, apply_service_pb2.Profile(), ignore_unknown_fields=True),
+            profile_ref=pinned,
+            version=split_ref(pinned)[1],
+        )
+
+    def EstimateApplication(self, request, context):
+        """Predict a request's tokens, LLM calls and latency at the current load, without the LLM."""
+        try:
+            estimate = estimate_application(
+                job=to_dict(request.job),
+                profile=profile_to_dict(self._profile(request, context)),
+                questions=questions_to_dicts(request.questions),
+                mode=request.mode or "agent",
+                job_queue=self.job_queue,
+            )
+        except ValueError as exc:
+            return apply_service_pb2.EstimateApplicationResponse(success=False, message=str(exc))
+        stages = [apply_service_pb2.StageEstimate(**stage) for stage in estimate.pop("stages")]
+        return apply_service_pb2.EstimateApplicationResponse(
+            success=True,
+            message=f"{estimate['llm_calls']} LLM calls, about {estimate['latency_seconds']:.1f}s",
+            stages=stages,
+            **estimate,
+        )
+
+    def IngestResume(self, request_iterator, context):
+        """Parse a chunked resume upload, or return the cached parse of the same bytes."""
+        header = {}
+
+        def chunks():
+            for chunk in request_iterator:
+                if not header:
+                    header.update(filename=chunk.filename, content_type=chunk.content_type)
+                yield chunk.data
+
+        stream = chunks()
+        try:
+            first = next(stream, b"")  # reads the header fields before parsing starts
+            document = ingest_resume(
+                itertools.chain([first], stream),
+                filename=header.get("filename", ""),
+                content_type=header.get("content_type", ""),
+            )
+        except ResumeFormatError as exc:
+            return apply_service_pb2.IngestResumeResponse(success=False, message=str(exc))
+        return apply_service_pb2.IngestResumeResponse(
+            success=True,
+            message="Resume parse reused" if document["cached"] else "Resume parsed",
+            resume_id=document["resume_id"],
+            text=document["text"],
+            sections=[apply_service_pb2.ResumeSection(title=s["title"], text=s["text"]) for s in document["sections"]],
+            pages=document["pages"],
+            size_bytes=document["size_bytes"],
+            cached=document["cached"],
         )
 
 
 def serve(port: int = 50051):
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    apply_service_pb2_grpc.add_ApplyServiceServicer_to_server(ApplyService(), server)
+    metrics.start_exporter(interval=float(os.getenv("AGENT_METRICS_INTERVAL", "2")))
+    job_queue = JobQueue(
+        handler=run_auto_apply_ticket,
+        workers=int(os.getenv("JOB_QUEUE_WORKERS", "2")),
+        lease_seconds=float(os.getenv("JOB_QUEUE_LEASE_SECONDS", "300")),
+        max_attempts=int(os.getenv("JOB_QUEUE_MAX_ATTEMPTS", "3")),
+    )
+    job_queue.start()
+    prewarmer = None
+    if prewarm_enabled():
+        prewarmer = Prewarmer.from_env()
+        prewarmer.start()
+
+    interceptors = [MetricsInterceptor()]
+    admin_server = None
+    if os.getenv("AGENT_ADMIN_ENABLED", "false").lower() == "true":
+        profile_store = RequestProfileStore(keep=int(os.getenv("AGENT_PROFILE_KEEP", "50")))
+        admin_server = start_admin_server(profile_store)  # must stay referenced while serving
+        interceptors.append(ProfilingInterceptor(
+            profile_store, max_concurrent=int(os.getenv("AGENT_PROFILE_MAX_CONCURRENT", "2"))))
+
+    max_concurrent = int(os.getenv("AGENT_MAX_CONCURRENT_RPCS", "0"))
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=int(os.getenv("AGENT_THREADS", "10"))),
+        interceptors=interceptors,
+        options=[
+            ("grpc.so_reuseport", 1),
+            # Accept the keepalive pings apply_client sends on idle pooled channels
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.http2.min_ping_interval_without_data_ms", 30000),
+        ],
+        maximum_concurrent_rpcs=max_concurrent or None,
+    )
+    apply_service_pb2_grpc.add_ApplyServiceServicer_to_server(ApplyService(job_queue=job_queue, prewarmer=prewarmer), server)
+
+    # Overall status stays SERVING (degraded responses are still answers);
+    # each LLM backend is reported as "llm/<base_url>|<model>" from its breaker
+    health_servicer = health.HealthServicer()
+    health_servicer.set("", health_pb2.HealthCheckResponse.SERVING)
+    add_state_listener(lambda breaker: health_servicer.set(
+        f"llm/{breaker.name}",
+        health_pb2.HealthCheckResponse.NOT_SERVING if breaker.state == OPEN
+        else health_pb2.HealthCheckResponse.SERVING,
+    ))
+    health_pb2_grpc.add_HealthServicer_to_server(health_servicer, server)
+    # EstimateApplication learns stage timings from every request this worker serves
+    add_usage_listener(get_estimator().observe)
     server.add_insecure_port(f"[::]:{port}")
     server.start()
-    print(f"ApplyService gRPC server listening on port {port}")
+    print(f"ApplyService gRPC server listening on port {port} (pid {os.getpid()})")
     server.wait_for_termination()
 
 
 if __name__ == "__main__":
-    serve()
+    port = int(os.getenv("AGENT_PORT", "50051"))
+    workers = int(os.getenv("AGENT_WORKERS", "1"))
+    if workers > 1:
+        serve_prefork(lambda: serve(port), workers)
+    else:
+        serve(port)
@@ -0,0 +1,20 @@
+"""
+Python client for the agent service
+
+ApplyClient (blocking) and AsyncApplyClient (asyncio) share ClientConfig:
+a pool of channels with keepalive, per-RPC deadlines, jittered retries on
+idempotent RPCs and *_many helpers that fan many requests out over the pool.
+Requires agent-service on sys.path for apply_service_pb2.
+"""
+from apply_client._common import DEFAULT_DEADLINES, IDEMPOTENT_RPCS, ClientConfig, RetryPolicy
+from apply_client.aio import AsyncApplyClient
+from apply_client.client import ApplyClient
+
+__all__ = [
+    "ApplyClient",
+    "AsyncApplyClient",
+    "ClientConfig",
+    "RetryPolicy",
+    "DEFAULT_DEADLINES",
+    "IDEMPOTENT_RPCS",
+]
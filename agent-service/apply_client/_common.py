@@ -0,0 +1,121 @@
+"""
+Configuration shared by the sync and asyncio clients: channel options,
+deadlines and the retry policy
+"""
+import os
+import random
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+import grpc
+
+TENANT_METADATA_KEY = "x-tenant-id"
+
+# RPCs that only read state or generate text; repeating them has no side effect
+# beyond cost. AutoApply records the application and SubmitAutoApply creates a
+# ticket, so they are only retried when the caller asks for it.
+IDEMPOTENT_RPCS: FrozenSet[str] = frozenset({
+    "Apply",
+    "GenerateCoverLetter",
+    "AnswerQuestions",
+    "RankJobs",
+    "GetApplicationStatus",
+    "GetMetrics",
+    "PutProfile",  # content-addressed: storing the same profile twice is a no-op
+    "GetProfile",
+    "EstimateApplication",
+})
+
+# Per-RPC deadlines in seconds; LLM-bound calls get the Ollama timeout plus queueing time
+DEFAULT_DEADLINES: Dict[str, float] = {
+    "Apply": 180.0,
+    "GenerateCoverLetter": 180.0,
+    "AnswerQuestions": 180.0,
+    "AutoApply": 600.0,
+    "RankJobs": 10.0,
+    "SubmitAutoApply": 10.0,
+    "GetApplicationStatus": 5.0,
+    "GetMetrics": 5.0,
+    "PutProfile": 5.0,
+    "GetProfile": 5.0,
+    "EstimateApplication": 5.0,
+}
+
+
+@dataclass
+class RetryPolicy:
+    """Retries with full-jitter exponential backoff.
+
+    Args:
+        max_attempts: Attempts including the first one
+        initial_backoff: Upper bound of the first sleep, in seconds
+        max_backoff: Upper bound of any sleep, in seconds
+        multiplier: Growth of the bound per attempt
+        retryable_codes: Status codes worth another attempt
+    """
+
+    max_attempts: int = 4
+    initial_backoff: float = 0.2
+    max_backoff: float = 5.0
+    multiplier: float = 2.0
+    retryable_codes: FrozenSet[grpc.StatusCode] = frozenset({
+        grpc.StatusCode.UNAVAILABLE,
+        grpc.StatusCode.RESOURCE_EXHAUSTED,  # scheduler queue full / concurrency cap
+        grpc.StatusCode.ABORTED,
+    })
+
+    def backoff(self, attempt: int) -> float:
+        """Sleep before retry number `attempt` (1-based)."""
+        bound = min(self.max_backoff, self.initial_backoff * self.multiplier ** (attempt - 1))
+        return random.uniform(0, bound)
+
+    def should_retry(self, code: Optional[grpc.StatusCode], attempt: int) -> bool:
+        return attempt < self.max_attempts and code in self.retryable_codes
+
+
+@dataclass
+class ClientConfig:
+    """Connection settings for ApplyClient and AsyncApplyClient.
+
+    Args:
+        target: host:port of the agent service
+        pool_size: Channels in the pool, each on its own TCP connection, so
+            pre-fork workers behind SO_REUSEPORT all receive traffic
+        keepalive_time: Seconds between keepalive pings
+        keepalive_timeout: Seconds to wait for a ping ack before closing
+        deadlines: Per-RPC deadline overrides in seconds
+        retry: Retry policy for idempotent RPCs
+        tenant_id: Sent as x-tenant-id metadata on every call when set
+    """
+
+    target: str = field(default_factory=lambda: os.getenv("AGENT_GRPC_URL", "localhost:50051"))
+    pool_size: int = 4
+    keepalive_time: float = 60.0
+    keepalive_timeout: float = 10.0
+    max_message_bytes: int = 16 * 1024 * 1024
+    deadlines: Dict[str, float] = field(default_factory=dict)
+    retry: RetryPolicy = field(default_factory=RetryPolicy)
+    tenant_id: str = ""
+
+    def channel_options(self) -> List[Tuple[str, int]]:
+        return [
+            ("grpc.use_local_subchannel_pool", 1),
+            ("grpc.keepalive_time_ms", int(self.keepalive_time * 1000)),
+            ("grpc.keepalive_timeout_ms", int(self.keepalive_timeout * 1000)),
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.http2.max_pings_without_data", 0),
+            ("grpc.max_receive_message_length", self.max_message_bytes),
+            ("grpc.max_send_message_length", self.max_message_bytes),
+            ("grpc.enable_retries", 0),  # retries are done here, with our own policy
+        ]
+
+    def deadline(self, rpc: str, override: Optional[float] = None) -> Optional[float]:
+        if override is not None:
+            return override
+        return self.deadlines.get(rpc, DEFAULT_DEADLINES.get(rpc))
+
+    def metadata(self, extra: Optional[Sequence[Tuple[str, str]]] = None) -> Optional[List[Tuple[str, str]]]:
+        metadata = list(extra or [])
+        if self.tenant_id and not any(key == TENANT_METADATA_KEY for key, _ in metadata):
+            metadata.append((TENANT_METADATA_KEY, self.tenant_id))
+        return metadata or None
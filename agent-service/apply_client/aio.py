@@ -0,0 +1,163 @@
+"""
+asyncio client for ApplyService (grpc.aio)
+"""
+import asyncio
+import itertools
+from typing import Any, AsyncIterator, Iterable, List, Optional, Sequence, Tuple
+
+import grpc
+
+import apply_service_pb2
+import apply_service_pb2_grpc
+from apply_client._common import IDEMPOTENT_RPCS, ClientConfig
+
+
+class AsyncApplyClient:
+    """
+    asyncio counterpart of ApplyClient
+
+    Usage:
+        async with AsyncApplyClient(ClientConfig(tenant_id="t1")) as client:
+            response = await client.auto_apply(request)
+            responses = await client.apply_many(requests, max_in_flight=16)
+
+    Args:
+        config: Connection settings; defaults to ClientConfig()
+    """
+
+    def __init__(self, config: Optional[ClientConfig] = None):
+        self.config = config or ClientConfig()
+        self._channels = [
+            grpc.aio.insecure_channel(self.config.target, options=self.config.channel_options())
+            for _ in range(max(1, self.config.pool_size))
+        ]
+        self._stubs = [apply_service_pb2_grpc.ApplyServiceStub(channel) for channel in self._channels]
+        self._next = itertools.cycle(range(len(self._stubs)))
+
+    async def __aenter__(self) -> "AsyncApplyClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        await asyncio.gather(*(channel.close() for channel in self._channels))
+
+    def _stub(self) -> apply_service_pb2_grpc.ApplyServiceStub:
+        return self._stubs[next(self._next)]
+
+    async def call(
+        self,
+        rpc: str,
+        request: Any,
+        timeout: Optional[float] = None,
+        metadata: Optional[Sequence[Tuple[str, str]]] = None,
+        idempotent: Optional[bool] = None,
+    ) -> Any:
+        """Invoke a unary RPC; same deadline and retry semantics as ApplyClient.call."""
+        loop = asyncio.get_running_loop()
+        timeout = self.config.deadline(rpc, timeout)
+        deadline = loop.time() + timeout if timeout else None
+        retry = self.config.retry
+        may_retry = rpc in IDEMPOTENT_RPCS if idempotent is None else idempotent
+        metadata = self.config.metadata(metadata)
+        attempt = 0
+        while True:
+            attempt += 1
+            remaining = deadline - loop.time() if deadline else None
+            try:
+                return await getattr(self._stub(), rpc)(request, timeout=remaining, metadata=metadata)
+            except grpc.aio.AioRpcError as exc:
+                if not may_retry or not retry.should_retry(exc.code(), attempt):
+                    raise
+                sleep = retry.backoff(attempt)
+                if deadline and loop.time() + sleep >= deadline:
+                    raise
+                await asyncio.sleep(sleep)
+
+    async def map(
+        self,
+        rpc: str,
+        requests: Iterable[Any],
+        max_in_flight: int = 16,
+        timeout: Optional[float] = None,
+        return_exceptions: bool = True,
+    ) -> List[Any]:
+        """Send many single requests concurrently (see ApplyClient.map)."""
+        semaphore = asyncio.Semaphore(max(1, max_in_flight))
+
+        async def one(request: Any) -> Any:
+            async with semaphore:
+                try:
+                    return await self.call(rpc, request, timeout=timeout)
+                except grpc.aio.AioRpcError as exc:
+                    if not return_exceptions:
+                        raise
+                    return exc
+
+        return list(await asyncio.gather(*(one(request) for request in requests)))
+
+    async def apply(self, request: apply_service_pb2.ApplyRequest, **kwargs: Any) -> apply_service_pb2.ApplyResponse:
+        return await self.call("Apply", request, **kwargs)
+
+    async def generate_cover_letter(self, request: apply_service_pb2.ApplyRequest,
+                                    **kwargs: Any) -> apply_service_pb2.CoverLetterResponse:
+        return await self.call("GenerateCoverLetter", request, **kwargs)
+
+    async def answer_questions(self, request: apply_service_pb2.AnswerRequest,
+                               **kwargs: Any) -> apply_service_pb2.AnswerResponse:
+        return await self.call("AnswerQuestions", request, **kwargs)
+
+    async def auto_apply(self, request: apply_service_pb2.AutoApplyRequest,
+                         **kwargs: Any) -> apply_service_pb2.AutoApplyResponse:
+        return await self.call("AutoApply", request, **kwargs)
+
+    async def rank_jobs(self, request: apply_service_pb2.RankJobsRequest,
+                        **kwargs: Any) -> apply_service_pb2.RankJobsResponse:
+        return await self.call("RankJobs", request, **kwargs)
+
+    async def submit_auto_apply(self, request: apply_service_pb2.AutoApplyRequest,
+                                **kwargs: Any) -> apply_service_pb2.SubmitAutoApplyResponse:
+        return await self.call("SubmitAutoApply", request, **kwargs)
+
+    async def get_application_status(self, ticket_id: str, **kwargs: Any) -> apply_service_pb2.ApplicationStatus:
+        return await self.call("GetApplicationStatus",
+                               apply_service_pb2.ApplicationStatusRequest(ticket_id=ticket_id), **kwargs)
+
+    async def watch_application(self, ticket_id: str,
+                                timeout: Optional[float] = None) -> AsyncIterator[apply_service_pb2.ApplicationStatus]:
+        """Stream status updates until the ticket completes (not retried)."""
+        call = self._stub().WatchApplication(
+            apply_service_pb2.ApplicationStatusRequest(ticket_id=ticket_id),
+            timeout=timeout,
+            metadata=self.config.metadata(),
+        )
+        async for status in call:
+            yield status
+
+    async def get_metrics(self, **kwargs: Any) -> apply_service_pb2.MetricsResponse:
+        return await self.call("GetMetrics", apply_service_pb2.MetricsRequest(), **kwargs)
+
+    async def put_profile(self, profile_id: str, profile: apply_service_pb2.Profile,
+                          **kwargs: Any) -> apply_service_pb2.PutProfileResponse:
+        """Store a profile; send the returned profile_ref in place of the profile."""
+        return await self.call("PutProfile",
+                               apply_service_pb2.PutProfileRequest(profile_id=profile_id, profile=profile), **kwargs)
+
+    async def get_profile(self, profile_ref: str, **kwargs: Any) -> apply_service_pb2.GetProfileResponse:
+        return await self.call("GetProfile", apply_service_pb2.GetProfileRequest(profile_ref=profile_ref), **kwargs)
+
+    async def estimate_application(self, request: apply_service_pb2.EstimateApplicationRequest,
+                                   **kwargs: Any) -> apply_service_pb2.EstimateApplicationResponse:
+        """Predicted tokens, LLM calls and latency of a request, without running it."""
+        return await self.call("EstimateApplication", request, **kwargs)
+
+    async def apply_many(self, requests: Iterable[apply_service_pb2.ApplyRequest], **kwargs: Any) -> List[Any]:
+        return await self.map("Apply", requests, **kwargs)
+
+    async def auto_apply_many(self, requests: Iterable[apply_service_pb2.AutoApplyRequest],
+                              **kwargs: Any) -> List[Any]:
+        return await self.map("AutoApply", requests, **kwargs)
+
+    async def submit_many(self, requests: Iterable[apply_service_pb2.AutoApplyRequest], **kwargs: Any) -> List[Any]:
+        return await self.map("SubmitAutoApply", requests, **kwargs)
@@ -0,0 +1,191 @@
+"""
+Blocking client for ApplyService
+"""
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import grpc
+
+import apply_service_pb2
+import apply_service_pb2_grpc
+from apply_client._common import IDEMPOTENT_RPCS, ClientConfig
+
+
+class ApplyClient:
+    """
+    ApplyService client with a channel pool, deadlines and retries
+
+    Usage:
+        with ApplyClient(ClientConfig(target="localhost:50051")) as client:
+            response = client.auto_apply(request)
+            responses = client.apply_many(requests, max_in_flight=8)
+
+    Args:
+        config: Connection settings; defaults to ClientConfig()
+    """
+
+    def __init__(self, config: Optional[ClientConfig] = None):
+        self.config = config or ClientConfig()
+        self._channels = [
+            grpc.insecure_channel(self.config.target, options=self.config.channel_options())
+            for _ in range(max(1, self.config.pool_size))
+        ]
+        self._stubs = [apply_service_pb2_grpc.ApplyServiceStub(channel) for channel in self._channels]
+        self._next = itertools.cycle(range(len(self._stubs)))
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "ApplyClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for channel in self._channels:
+            channel.close()
+
+    def _stub(self) -> apply_service_pb2_grpc.ApplyServiceStub:
+        with self._lock:
+            return self._stubs[next(self._next)]
+
+    def call(
+        self,
+        rpc: str,
+        request: Any,
+        timeout: Optional[float] = None,
+        metadata: Optional[Sequence[Tuple[str, str]]] = None,
+        idempotent: Optional[bool] = None,
+    ) -> Any:
+        """
+        Invoke a unary RPC, retrying transient failures within one overall deadline
+
+        Args:
+            rpc: RPC name, e.g. "AutoApply"
+            request: Request message
+            timeout: Overall deadline in seconds across all attempts (default per RPC)
+            metadata: Extra call metadata
+            idempotent: Override whether the RPC may be retried
+
+        Returns:
+            Response message
+
+        Raises:
+            grpc.RpcError: The last attempt's error
+        """
+        timeout = self.config.deadline(rpc, timeout)
+        deadline = time.monotonic() + timeout if timeout else None
+        retry = self.config.retry
+        may_retry = rpc in IDEMPOTENT_RPCS if idempotent is None else idempotent
+        metadata = self.config.metadata(metadata)
+        attempt = 0
+        while True:
+            attempt += 1
+            remaining = deadline - time.monotonic() if deadline else None
+            try:
+                return getattr(self._stub(), rpc)(request, timeout=remaining, metadata=metadata)
+            except grpc.RpcError as exc:
+                if not may_retry or not retry.should_retry(exc.code(), attempt):
+                    raise
+                sleep = retry.backoff(attempt)
+                if deadline and time.monotonic() + sleep >= deadline:
+                    raise
+                time.sleep(sleep)
+
+    def map(
+        self,
+        rpc: str,
+        requests: Iterable[Any],
+        max_in_flight: int = 8,
+        timeout: Optional[float] = None,
+        return_exceptions: bool = True,
+    ) -> List[Any]:
+        """
+        Send many single requests concurrently over the pool
+
+        The service has no batch RPC, so a batch is a bounded fan-out of unary
+        calls multiplexed over the pooled connections.
+
+        Args:
+            rpc: RPC name
+            requests: Request messages
+            max_in_flight: Calls outstanding at once
+            timeout: Deadline per call
+            return_exceptions: Put each failure (grpc.RpcError) in its slot instead of raising
+
+        Returns:
+            Responses in request order
+        """
+        def one(request: Any) -> Any:
+            try:
+                return self.call(rpc, request, timeout=timeout)
+            except grpc.RpcError as exc:
+                if not return_exceptions:
+                    raise
+                return exc
+
+        with ThreadPoolExecutor(max_workers=max(1, max_in_flight)) as executor:
+            return list(executor.map(one, requests))
+
+    def apply(self, request: apply_service_pb2.ApplyRequest, **kwargs: Any) -> apply_service_pb2.ApplyResponse:
+        return self.call("Apply", request, **kwargs)
+
+    def generate_cover_letter(self, request: apply_service_pb2.ApplyRequest,
+                              **kwargs: Any) -> apply_service_pb2.CoverLetterResponse:
+        return self.call("GenerateCoverLetter", request, **kwargs)
+
+    def answer_questions(self, request: apply_service_pb2.AnswerRequest,
+                         **kwargs: Any) -> apply_service_pb2.AnswerResponse:
+        return self.call("AnswerQuestions", request, **kwargs)
+
+    def auto_apply(self, request: apply_service_pb2.AutoApplyRequest,
+                   **kwargs: Any) -> apply_service_pb2.AutoApplyResponse:
+        return self.call("AutoApply", request, **kwargs)
+
+    def rank_jobs(self, request: apply_service_pb2.RankJobsRequest,
+                  **kwargs: Any) -> apply_service_pb2.RankJobsResponse:
+        return self.call("RankJobs", request, **kwargs)
+
+    def submit_auto_apply(self, request: apply_service_pb2.AutoApplyRequest,
+                          **kwargs: Any) -> apply_service_pb2.SubmitAutoApplyResponse:
+        return self.call("SubmitAutoApply", request, **kwargs)
+
+    def get_application_status(self, ticket_id: str, **kwargs: Any) -> apply_service_pb2.ApplicationStatus:
+        return self.call("GetApplicationStatus", apply_service_pb2.ApplicationStatusRequest(ticket_id=ticket_id),
+                         **kwargs)
+
+    def watch_application(self, ticket_id: str, timeout: Optional[float] = None) -> Iterator[apply_service_pb2.ApplicationStatus]:
+        """Stream status updates until the ticket completes (not retried)."""
+        return self._stub().WatchApplication(
+            apply_service_pb2.ApplicationStatusRequest(ticket_id=ticket_id),
+            timeout=timeout,
+            metadata=self.config.metadata(),
+        )
+
+    def get_metrics(self, **kwargs: Any) -> apply_service_pb2.MetricsResponse:
+        return self.call("GetMetrics", apply_service_pb2.MetricsRequest(), **kwargs)
+
+    def put_profile(self, profile_id: str, profile: apply_service_pb2.Profile,
+                    **kwargs: Any) -> apply_service_pb2.PutProfileResponse:
+        """Store a profile; send the returned profile_ref in place of the profile."""
+        return self.call("PutProfile", apply_service_pb2.PutProfileRequest(profile_id=profile_id, profile=profile),
+                         **kwargs)
+
+    def get_profile(self, profile_ref: str, **kwargs: Any) -> apply_service_pb2.GetProfileResponse:
+        return self.call("GetProfile", apply_service_pb2.GetProfileRequest(profile_ref=profile_ref), **kwargs)
+
+    def estimate_application(self, request: apply_service_pb2.EstimateApplicationRequest,
+                             **kwargs: Any) -> apply_service_pb2.EstimateApplicationResponse:
+        """Predicted tokens, LLM calls and latency of a request, without running it."""
+        return self.call("EstimateApplication", request, **kwargs)
+
+    def apply_many(self, requests: Iterable[apply_service_pb2.ApplyRequest], **kwargs: Any) -> List[Any]:
+        return self.map("Apply", requests, **kwargs)
+
+    def auto_apply_many(self, requests: Iterable[apply_service_pb2.AutoApplyRequest], **kwargs: Any) -> List[Any]:
+        return self.map("AutoApply", requests, **kwargs)
+
+    def submit_many(self, requests: Iterable[apply_service_pb2.AutoApplyRequest], **kwargs: Any) -> List[Any]:
+        return self.map("SubmitAutoApply", requests, **kwargs)
@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x13\x61pply_service.proto\x12\x05\x61pply\"\x9e\x01\n\x03Job\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05title\x18\x02 \x01(\t\x12\x0f\n\x07\x63ompany\x18\x03 \x01(\t\x12\x10\n\x08location\x18\x04 \x01(\t\x12\x0e\n\x06salary\x18\x05 \x01(\t\x12\x0c\n\x04type\x18\x06 \x01(\t\x12\x12\n\nexperience\x18\x07 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x08 \x01(\t\x12\x12\n\neasy_apply\x18\t \x01(\x08\"n\n\x07Profile\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05\x65mail\x18\x02 \x01(\t\x12\x10\n\x08headline\x18\x03 \x01(\t\x12\x0f\n\x07summary\x18\x04 \x01(\t\x12\x0e\n\x06skills\x18\x05 \x03(\t\x12\x13\n\x0bresume_text\x18\x06 \x01(\t\"H\n\x0c\x41pplyRequest\x12\x17\n\x03job\x18\x01 \x01(\x0b\x32\n.apply.Job\x12\x1f\n\x07profile\x18\x02 \x01(\x0b\x32\x0e.apply.Profile\"I\n\rApplyResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x16\n\x0e\x61pplication_id\x18\x03 \x01(\t\"M\n\x13\x43overLetterResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x14\n\x0c\x63over_letter\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\";\n\x08Question\x12\x10\n\x08question\x18\x01 \x01(\t\x12\x0c\n\x04type\x18\x02 \x01(\t\x12\x0f\n\x07options\x18\x03 \x03(\t\"m\n\rAnswerRequest\x12\x17\n\x03job\x18\x01 \x01(\x0b\x32\n.apply.Job\x12\x1f\n\x07profile\x18\x02 \x01(\x0b\x32\x0e.apply.Profile\x12\"\n\tquestions\x18\x03 \x03(\x0b\x32\x0f.apply.Question\"*\n\x06\x41nswer\x12\x10\n\x08question\x18\x01 \x01(\t\x12\x0e\n\x06\x61nswer\x18\x02 \x01(\t\"R\n\x0e\x41nswerResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x1e\n\x07\x61nswers\x18\x02 \x03(\x0b\x32\r.apply.Answer\x12\x0f\n\x07message\x18\x03 \x01(\t\"p\n\x10\x41utoApplyRequest\x12\x17\n\x03job\x18\x01 \x01(\x0b\x32\n.apply.Job\x12\x1f\n\x07profile\x18\x02 \x01(\x0b\x32\x0e.apply.Profile\x12\"\n\tquestions\x18\x03 \x03(\x0b\x32\x0f.apply.Question\"\x9b\x01\n\x11\x41utoApplyResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x16\n\x0erefined_resume\x18\x03 \x01(\t\x12\x14\n\x0c\x63over_letter\x18\x04 \x01(\t\x12\x1e\n\x07\x61nswers\x18\x05 \x03(\x0b\x32\r.apply.Answer\x12\x16\n\x0e\x61pplication_id\x18\x06 \x01(\t2\x8a\x02\n\x0c\x41pplyService\x12\x32\n\x05\x41pply\x12\x13.apply.ApplyRequest\x1a\x14.apply.ApplyResponse\x12\x46\n\x13GenerateCoverLetter\x12\x13.apply.ApplyRequest\x1a\x1a.apply.CoverLetterResponse\x12>\n\x0f\x41nswerQuestions\x12\x14.apply.AnswerRequest\x1a\x15.apply.AnswerResponse\x12>\n\tAutoApply\x12\x17.apply.AutoApplyRequest\x1a\x18.apply.AutoApplyResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x13\x61pply_service.proto\x12\x05\x61pply\"\x9e\x01\n\x03Job\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05title\x18\x02 \x01(\t\x12\x0f\n\x07\x63ompany\x18\x03 \x01(\t\x12\x10\n\x08location\x18\x04 \x01(\t\x12\x0e\n\x06salary\x18\x05 \x01(\t\x12\x0c\n\x04type\x18\x06 \x01(\t\x12\x12\n\nexperience\x18\x07 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x08 \x01(\t\x12\x12\n\neasy_apply\x18\t \x01(\x08\"\xb1\x01\n\x07Profile\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05\x65mail\x18\x02 \x01(\t\x12\x10\n\x08headline\x18\x03 \x01(\t\x12\x0f\n\x07summary\x18\x04 \x01(\t\x12\x0e\n\x06skills\x18\x05 \x03(\t\x12\x13\n\x0bresume_text\x18\x06 \x01(\t\x12.\n\nattributes\x18\x07 \x01(\x0b\x32\x1a.apply.ApplicantAttributes\x12\x11\n\tresume_id\x18\x08 \x01(\t\"\x8d\x02\n\x13\x41pplicantAttributes\x12*\n\x1dwork_authorization_in_country\x18\x01 \x01(\x08H\x00\x88\x01\x01\x12\x17\n\nneeds_visa\x18\x02 \x01(\x08H\x01\x88\x01\x01\x12 \n\x13willing_to_relocate\x18\x03 \x01(\x08H\x02\x88\x01\x01\x12\x11\n\tethnicity\x18\x04 \x01(\t\x12\x0f\n\x07veteran\x18\x05 \x01(\t\x12\x12\n\ndisability\x18\x06 \x01(\t\x12\x0e\n\x06gender\x18\x07 \x01(\tB \n\x1e_work_authorization_in_countryB\r\n\x0b_needs_visaB\x16\n\x14_willing_to_relocate\"p\n\x0c\x41pplyRequest\x12\x17\n\x03job\x18\x01 \x01(\x0b\x32\n.apply.Job\x12\x1f\n\x07profile\x18\x02 \x01(\x0b\x32\x0e.apply.Profile\x12\x11\n\ttenant_id\x18\x03 \x01(\t\x12\x13\n\x0bprofile_ref\x18\x04 \x01(\t\"\x96\x01\n\rApplyResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x16\n\x0e\x61pplication_id\x18\x03 \x01(\t\x12\x1b\n\x05usage\x18\x04 \x01(\x0b\x32\x0c.apply.Usage\x12\x19\n\x11\x64\x65gradation_level\x18\x05 \x01(\x05\x12\x13\n\x0b\x64\x65gradation\x18\x06 \x01(\t\"\xcd\x01\n\nStageUsage\x12\r\n\x05stage\x18\x01 \x01(\t\x12\x14\n\x0cwall_seconds\x18\x02 \x01(\x01\x12\x11\n\tllm_calls\x18\x03 \x01(\x05\x12\x15\n\rprompt_tokens\x18\x04 \x01(\x03\x12\x13\n\x0b\x65val_tokens\x18\x05 \x01(\x03\x12\x1b\n\x13prompt_eval_seconds\x18\x06 \x01(\x01\x12\x14\n\x0c\x65val_seconds\x18\x07 \x01(\x01\x12\x12\n\ncache_hits\x18\x08 \x03(\t\x12\x14\n\x0cprompt_chars\x18\t \x01(\x03\"\xab\x01\n\x05Usage\x12\x15\n\rtotal_seconds\x18\x01 \x01(\x01\x12\x1a\n\x12queue_wait_seconds\x18\x02 \x01(\x01\x12\r\n\x05model\x18\x03 \x01(\t\x12\x11\n\tllm_calls\x18\x04 \x01(\x05\x12\x15\n\rprompt_tokens\x18\x05 \x01(\x03\x12\x13\n\x0b\x65val_tokens\x18\x06 \x01(\x03\x12!\n\x06stages\x18\x07 \x03(\x0b\x32\x11.apply.StageUsage\"\x9a\x01\n\x13\x43overLetterResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x14\n\x0c\x63over_letter\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\x12\x1b\n\x05usage\x18\x04 \x01(\x0b\x32\x0c.apply.Usage\x12\x19\n\x11\x64\x65gradation_level\x18\x05 \x01(\x05\x12\x13\n\x0b\x64\x65gradation\x18\x06 \x01(\t\";\n\x08Question\x12\x10\n\x08question\x18\x01 \x01(\t\x12\x0c\n\x04type\x18\x02 \x01(\t\x12\x0f\n\x07options\x18\x03 \x03(\t\"\x95\x01\n\rAnswerRequest\x12\x17\n\x03job\x18\x01 \x01(\x0b\x32\n.apply.Job\x12\x1f\n\x07profile\x18\x02 \x01(\x0b\x32\x0e.apply.Profile\x12\"\n\tquestions\x18\x03 \x03(\x0b\x32\x0f.apply.Question\x12\x11\n\ttenant_id\x18\x04 \x01(\t\x12\x13\n\x0bprofile_ref\x18\x05 \x01(\t\"*\n\x06\x41nswer\x12\x10\n\x08question\x18\x01 \x01(\t\x12\x0e\n\x06\x61nswer\x18\x02 \x01(\t\"\x9f\x01\n\x0e\x41nswerResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x1e\n\x07\x61nswers\x18\x02 \x03(\x0b\x32\r.apply.Answer\x12\x0f\n\x07message\x18\x03 \x01(\t\x12\x1b\n\x05usage\x18\x04 \x01(\x0b\x32\x0c.apply.Usage\x12\x19\n\x11\x64\x65gradation_level\x18\x05 \x01(\x05\x12\x13\n\x0b\x64\x65gradation\x18\x06 \x01(\t\"\x98\x01\n\x10\x41utoApplyRequest\x12\x17\n\x03job\x18\x01 \x01(\x0b\x32\n.apply.Job\x12\x1f\n\x07profile\x18\x02 \x01(\x0b\x32\x0e.apply.Profile\x12\"\n\tquestions\x18\x03 \x03(\x0b\x32\x0f.apply.Question\x12\x11\n\ttenant_id\x18\x04 \x01(\t\x12\x13\n\x0bprofile_ref\x18\x05 \x01(\t\"\x9b\x02\n\x11\x41utoApplyResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x16\n\x0erefined_resume\x18\x03 \x01(\t\x12\x14\n\x0c\x63over_letter\x18\x04 \x01(\t\x12\x1e\n\x07\x61nswers\x18\x05 \x03(\x0b\x32\r.apply.Answer\x12\x16\n\x0e\x61pplication_id\x18\x06 \x01(\t\x12\x1a\n\x12reused_from_job_id\x18\x07 \x01(\t\x12\x15\n\rreused_stages\x18\x08 \x03(\t\x12\x1b\n\x05usage\x18\t \x01(\x0b\x32\x0c.apply.Usage\x12\x19\n\x11\x64\x65gradation_level\x18\n \x01(\x05\x12\x13\n\x0b\x64\x65gradation\x18\x0b \x01(\t\"\xcc\x01\n\x0fRankJobsRequest\x12\x1f\n\x07profile\x18\x01 \x01(\x0b\x32\x0e.apply.Profile\x12\x18\n\x04jobs\x18\x02 \x03(\x0b\x32\n.apply.Job\x12\x1b\n\x13preferred_locations\x18\x03 \x03(\t\x12\x17\n\x0fpreferred_types\x18\x04 \x03(\t\x12\r\n\x05top_k\x18\x05 \x01(\x05\x12\x11\n\tmin_score\x18\x06 \x01(\x02\x12\x13\n\x0bprofile_ref\x18\x07 \x01(\t\x12\x11\n\ttenant_id\x18\x08 \x01(\t\"\x96\x01\n\x08JobScore\x12\x0e\n\x06job_id\x18\x01 \x01(\t\x12\r\n\x05score\x18\x02 \x01(\x02\x12\x12\n\ntext_score\x18\x03 \x01(\x02\x12\x13\n\x0bskill_score\x18\x04 \x01(\x02\x12\x16\n\x0elocation_score\x18\x05 \x01(\x02\x12\x12\n\ntype_score\x18\x06 \x01(\x02\x12\x16\n\x0ematched_skills\x18\x07 \x03(\t\"U\n\x10RankJobsResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x1f\n\x06scores\x18\x02 \x03(\x0b\x32\x0f.apply.JobScore\x12\x0f\n\x07message\x18\x03 \x01(\t\"N\n\x17SubmitAutoApplyResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x11\n\tticket_id\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\"-\n\x18\x41pplicationStatusRequest\x12\x11\n\tticket_id\x18\x01 \x01(\t\"\xc2\x01\n\x11\x41pplicationStatus\x12\x11\n\tticket_id\x18\x01 \x01(\t\x12\r\n\x05state\x18\x02 \x01(\t\x12\r\n\x05stage\x18\x03 \x01(\t\x12\x18\n\x10\x63ompleted_stages\x18\x04 \x03(\t\x12\x10\n\x08\x61ttempts\x18\x05 \x01(\x05\x12\x0f\n\x07message\x18\x06 \x01(\t\x12(\n\x06result\x18\x07 \x01(\x0b\x32\x18.apply.AutoApplyResponse\x12\x15\n\rupdated_at_ms\x18\x08 \x01(\x03\"C\n\x0bResumeChunk\x12\x10\n\x08\x66ilename\x18\x01 \x01(\t\x12\x14\n\x0c\x63ontent_type\x18\x02 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x03 \x01(\x0c\",\n\rResumeSection\x12\r\n\x05title\x18\x01 \x01(\t\x12\x0c\n\x04text\x18\x02 \x01(\t\"\xb4\x01\n\x14IngestResumeResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x11\n\tresume_id\x18\x03 \x01(\t\x12\x0c\n\x04text\x18\x04 \x01(\t\x12&\n\x08sections\x18\x05 \x03(\x0b\x32\x14.apply.ResumeSection\x12\r\n\x05pages\x18\x06 \x01(\x05\x12\x12\n\nsize_bytes\x18\x07 \x01(\x03\x12\x0e\n\x06\x63\x61\x63hed\x18\x08 \x01(\x08\"I\n\nPrewarmJob\x12\x17\n\x03job\x18\x01 \x01(\x0b\x32\n.apply.Job\x12\"\n\tquestions\x18\x02 \x03(\x0b\x32\x0f.apply.Question\"\x86\x01\n\x1aPrewarmApplicationsRequest\x12\x1f\n\x07profile\x18\x01 \x01(\x0b\x32\x0e.apply.Profile\x12\x1f\n\x04jobs\x18\x02 \x03(\x0b\x32\x11.apply.PrewarmJob\x12\x11\n\ttenant_id\x18\x03 \x01(\t\x12\x13\n\x0bprofile_ref\x18\x04 \x01(\t\"\xa4\x01\n\x1bPrewarmApplicationsResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x18\n\x10\x61\x63\x63\x65pted_job_ids\x18\x03 \x03(\t\x12\x16\n\x0e\x63\x61\x63hed_job_ids\x18\x04 \x03(\t\x12\x17\n\x0fskipped_job_ids\x18\x05 \x03(\t\x12\x18\n\x10\x62udget_remaining\x18\x06 \x01(\x05\":\n\x14\x43\x61ncelPrewarmRequest\x12\x11\n\ttenant_id\x18\x01 \x01(\t\x12\x0f\n\x07job_ids\x18\x02 \x03(\t\"*\n\x15\x43\x61ncelPrewarmResponse\x12\x11\n\tcancelled\x18\x01 \x01(\x05\"[\n\x11PutProfileRequest\x12\x12\n\nprofile_id\x18\x01 \x01(\t\x12\x1f\n\x07profile\x18\x02 \x01(\x0b\x32\x0e.apply.Profile\x12\x11\n\ttenant_id\x18\x03 \x01(\t\"m\n\x12PutProfileResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x13\n\x0bprofile_ref\x18\x03 \x01(\t\x12\x0f\n\x07version\x18\x04 \x01(\t\x12\x0f\n\x07\x63hanged\x18\x05 \x01(\x08\";\n\x11GetProfileRequest\x12\x13\n\x0bprofile_ref\x18\x01 \x01(\t\x12\x11\n\ttenant_id\x18\x02 \x01(\t\"[\n\x12GetProfileResponse\x12\x1f\n\x07profile\x18\x01 \x01(\x0b\x32\x0e.apply.Profile\x12\x13\n\x0bprofile_ref\x18\x02 \x01(\t\x12\x0f\n\x07version\x18\x03 \x01(\t\"\xb0\x01\n\x1a\x45stimateApplicationRequest\x12\x17\n\x03job\x18\x01 \x01(\x0b\x32\n.apply.Job\x12\x1f\n\x07profile\x18\x02 \x01(\x0b\x32\x0e.apply.Profile\x12\x13\n\x0bprofile_ref\x18\x03 \x01(\t\x12\"\n\tquestions\x18\x04 \x03(\x0b\x32\x0f.apply.Question\x12\x0c\n\x04mode\x18\x05 \x01(\t\x12\x11\n\ttenant_id\x18\x06 \x01(\t\"\xa0\x01\n\rStageEstimate\x12\r\n\x05stage\x18\x01 \x01(\t\x12\x11\n\tllm_calls\x18\x02 \x01(\x05\x12\x15\n\rprompt_tokens\x18\x03 \x01(\x03\x12\x15\n\routput_tokens\x18\x04 \x01(\x03\x12\x19\n\x11max_output_tokens\x18\x05 \x01(\x03\x12\x0f\n\x07seconds\x18\x06 \x01(\x01\x12\x13\n\x0bserved_from\x18\x07 \x01(\t\"\xfd\x02\n\x1b\x45stimateApplicationResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0c\n\x04mode\x18\x03 \x01(\t\x12$\n\x06stages\x18\x04 \x03(\x0b\x32\x14.apply.StageEstimate\x12\x11\n\tllm_calls\x18\x05 \x01(\x05\x12\x15\n\rprompt_tokens\x18\x06 \x01(\x03\x12\x15\n\routput_tokens\x18\x07 \x01(\x03\x12\x19\n\x11max_output_tokens\x18\x08 \x01(\x03\x12\x1a\n\x12generation_seconds\x18\t \x01(\x01\x12\x1a\n\x12queue_wait_seconds\x18\n \x01(\x01\x12\x17\n\x0flatency_seconds\x18\x0b \x01(\x01\x12\x13\n\x0bqueue_depth\x18\x0c \x01(\x05\x12\x19\n\x11\x64\x65gradation_level\x18\r \x01(\x05\x12\x13\n\x0b\x64\x65gradation\x18\x0e \x01(\t\x12\x16\n\x0e\x66itted_samples\x18\x0f \x01(\x05\"\x10\n\x0eMetricsRequest\"8\n\x0fMetricsResponse\x12\x14\n\x0cmetrics_json\x18\x01 \x01(\t\x12\x0f\n\x07workers\x18\x02 \x01(\x05\"R\n\x11\x43puProfileRequest\x12\x18\n\x10\x64uration_seconds\x18\x01 \x01(\x02\x12\x0e\n\x06\x66ormat\x18\x02 \x01(\t\x12\x13\n\x0binterval_ms\x18\x03 \x01(\x02\"\x87\x01\n\rProfileResult\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0e\n\x06\x66ormat\x18\x03 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x04 \x01(\x0c\x12\x0f\n\x07samples\x18\x05 \x01(\x05\x12\x18\n\x10\x64uration_seconds\x18\x06 \x01(\x02\x12\x0b\n\x03pid\x18\x07 \x01(\x05\";\n\x15RequestProfileRequest\x12\x12\n\nprofile_id\x18\x01 \x01(\t\x12\x0e\n\x06\x66ormat\x18\x02 \x01(\t\"F\n\x13HeapSnapshotRequest\x12\r\n\x05top_n\x18\x01 \x01(\x05\x12\x10\n\x08group_by\x18\x02 \x01(\t\x12\x0e\n\x06\x66rames\x18\x03 \x01(\x05\"\x84\x01\n\x14HeapSnapshotResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x13\n\x0bsnapshot_id\x18\x03 \x01(\x05\x12\x14\n\x0ctraced_bytes\x18\x04 \x01(\x03\x12\x12\n\npeak_bytes\x18\x05 \x01(\x03\x12\x0b\n\x03top\x18\x06 \x03(\t\"a\n\x0fHeapDiffRequest\x12\x18\n\x10\x62\x61se_snapshot_id\x18\x01 \x01(\x05\x12\x13\n\x0bsnapshot_id\x18\x02 \x01(\x05\x12\r\n\x05top_n\x18\x03 \x01(\x05\x12\x10\n\x08group_by\x18\x04 \x01(\t\"o\n\x10HeapDiffResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x13\n\x0bsnapshot_id\x18\x03 \x01(\x05\x12\x17\n\x0fsize_diff_bytes\x18\x04 \x01(\x03\x12\x0b\n\x03top\x18\x05 \x03(\t\"\x18\n\x16StopHeapTracingRequest\"E\n\x17StopHeapTracingResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x19\n\x11\x64ropped_snapshots\x18\x02 \x01(\x05\x32\xc5\x08\n\x0c\x41pplyService\x12\x32\n\x05\x41pply\x12\x13.apply.ApplyRequest\x1a\x14.apply.ApplyResponse\x12\x46\n\x13GenerateCoverLetter\x12\x13.apply.ApplyRequest\x1a\x1a.apply.CoverLetterResponse\x12>\n\x0f\x41nswerQuestions\x12\x14.apply.AnswerRequest\x1a\x15.apply.AnswerResponse\x12>\n\tAutoApply\x12\x17.apply.AutoApplyRequest\x1a\x18.apply.AutoApplyResponse\x12;\n\x08RankJobs\x12\x16.apply.RankJobsRequest\x1a\x17.apply.RankJobsResponse\x12J\n\x0fSubmitAutoApply\x12\x17.apply.AutoApplyRequest\x1a\x1e.apply.SubmitAutoApplyResponse\x12Q\n\x14GetApplicationStatus\x12\x1f.apply.ApplicationStatusRequest\x1a\x18.apply.ApplicationStatus\x12O\n\x10WatchApplication\x12\x1f.apply.ApplicationStatusRequest\x1a\x18.apply.ApplicationStatus0\x01\x12;\n\nGetMetrics\x12\x15.apply.MetricsRequest\x1a\x16.apply.MetricsResponse\x12\x41\n\x0cIngestResume\x12\x12.apply.ResumeChunk\x1a\x1b.apply.IngestResumeResponse(\x01\x12\\\n\x13PrewarmApplications\x12!.apply.PrewarmApplicationsRequest\x1a\".apply.PrewarmApplicationsResponse\x12J\n\rCancelPrewarm\x12\x1b.apply.CancelPrewarmRequest\x1a\x1c.apply.CancelPrewarmResponse\x12\x41\n\nPutProfile\x12\x18.apply.PutProfileRequest\x1a\x19.apply.PutProfileResponse\x12\x41\n\nGetProfile\x12\x18.apply.GetProfileRequest\x1a\x19.apply.GetProfileResponse\x12\\\n\x13\x45stimateApplication\x12!.apply.EstimateApplicationRequest\x1a\".apply.EstimateApplicationResponse2\xfa\x02\n\x0c\x41\x64minService\x12<\n\nProfileCpu\x12\x18.apply.CpuProfileRequest\x1a\x14.apply.ProfileResult\x12G\n\x11GetRequestProfile\x12\x1c.apply.RequestProfileRequest\x1a\x14.apply.ProfileResult\x12K\n\x10TakeHeapSnapshot\x12\x1a.apply.HeapSnapshotRequest\x1a\x1b.apply.HeapSnapshotResponse\x12\x44\n\x11\x44iffHeapSnapshots\x12\x16.apply.HeapDiffRequest\x1a\x17.apply.HeapDiffResponse\x12P\n\x0fStopHeapTracing\x12\x1d.apply.StopHeapTracingRequest\x1a\x1e.apply.StopHeapTracingResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -33,26 +33,98 @@ if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
   _globals['_JOB']._serialized_start=31
   _globals['_JOB']._serialized_end=189
-  _globals['_PROFILE']._serialized_start=191
-  _globals['_PROFILE']._serialized_end=301
-  _globals['_APPLYREQUEST']._serialized_start=303
-  _globals['_APPLYREQUEST']._serialized_end=375
-  _globals['_APPLYRESPONSE']._serialized_start=377
-  _globals['_APPLYRESPONSE']._serialized_end=450
-  _globals['_COVERLETTERRESPONSE']._serialized_start=452
-  _globals['_COVERLETTERRESPONSE']._serialized_end=529
-  _globals['_QUESTION']._serialized_start=531
-  _globals['_QUESTION']._serialized_end=590
-  _globals['_ANSWERREQUEST']._serialized_start=592
-  _globals['_ANSWERREQUEST']._serialized_end=701
-  _globals['_ANSWER']._serialized_start=703
-  _globals['_ANSWER']._serialized_end=745
-  _globals['_ANSWERRESPONSE']._serialized_start=747
-  _globals['_ANSWERRESPONSE']._serialized_end=829
-  _globals['_AUTOAPPLYREQUEST']._serialized_start=831
-  _globals['_AUTOAPPLYREQUEST']._serialized_end=943
-  _globals['_AUTOAPPLYRESPONSE']._serialized_start=946
-  _globals['_AUTOAPPLYRESPONSE']._serialized_end=1101
-  _globals['_APPLYSERVICE']._serialized_start=1104
-  _globals['_APPLYSERVICE']._serialized_end=1370
+  _globals['_PROFILE']._serialized_start=192
+  _globals['_PROFILE']._serialized_end=369
+  _globals['_APPLICANTATTRIBUTES']._serialized_start=372
+  _globals['_APPLICANTATTRIBUTES']._serialized_end=641
+  _globals['_APPLYREQUEST']._serialized_start=643
+  _globals['_APPLYREQUEST']._serialized_end=755
+  _globals['_APPLYRESPONSE']._serialized_start=758
+  _globals['_APPLYRESPONSE']._serialized_end=908
+  _globals['_STAGEUSAGE']._serialized_start=911
+  _globals['_STAGEUSAGE']._serialized_end=1116
+  _globals['_USAGE']._serialized_start=1119
+  _globals['_USAGE']._serialized_end=1290
+  _globals['_COVERLETTERRESPONSE']._serialized_start=1293
+  _globals['_COVERLETTERRESPONSE']._serialized_end=1447
+  _globals['_QUESTION']._serialized_start=1449
+  _globals['_QUESTION']._serialized_end=1508
+  _globals['_ANSWERREQUEST']._serialized_start=1511
+  _globals['_ANSWERREQUEST']._serialized_end=1660
+  _globals['_ANSWER']._serialized_start=1662
+  _globals['_ANSWER']._serialized_end=1704
+  _globals['_ANSWERRESPONSE']._serialized_start=1707
+  _globals['_ANSWERRESPONSE']._serialized_end=1866
+  _globals['_AUTOAPPLYREQUEST']._serialized_start=1869
+  _globals['_AUTOAPPLYREQUEST']._serialized_end=2021
+  _globals['_AUTOAPPLYRESPONSE']._serialized_start=2024
+  _globals['_AUTOAPPLYRESPONSE']._serialized_end=2307
+  _globals['_RANKJOBSREQUEST']._serialized_start=2310
+  _globals['_RANKJOBSREQUEST']._serialized_end=2514
+  _globals['_JOBSCORE']._serialized_start=2517
+  _globals['_JOBSCORE']._serialized_end=2667
+  _globals['_RANKJOBSRESPONSE']._serialized_start=2669
+  _globals['_RANKJOBSRESPONSE']._serialized_end=2754
+  _globals['_SUBMITAUTOAPPLYRESPONSE']._serialized_start=2756
+  _globals['_SUBMITAUTOAPPLYRESPONSE']._serialized_end=2834
+  _globals['_APPLICATIONSTATUSREQUEST']._serialized_start=2836
+  _globals['_APPLICATIONSTATUSREQUEST']._serialized_end=2881
+  _globals['_APPLICATIONSTATUS']._serialized_start=2884
+  _globals['_APPLICATIONSTATUS']._serialized_end=3078
+  _globals['_RESUMECHUNK']._serialized_start=3080
+  _globals['_RESUMECHUNK']._serialized_end=3147
+  _globals['_RESUMESECTION']._serialized_start=3149
+  _globals['_RESUMESECTION']._serialized_end=3193
+  _globals['_INGESTRESUMERESPONSE']._serialized_start=3196
+  _globals['_INGESTRESUMERESPONSE']._serialized_end=3376
+  _globals['_PREWARMJOB']._serialized_start=3378
+  _globals['_PREWARMJOB']._serialized_end=3451
+  _globals['_PREWARMAPPLICATIONSREQUEST']._serialized_start=3454
+  _globals['_PREWARMAPPLICATIONSREQUEST']._serialized_end=3588
+  _globals['_PREWARMAPPLICATIONSRESPONSE']._serialized_start=3591
+  _globals['_PREWARMAPPLICATIONSRESPONSE']._serialized_end=3755
+  _globals['_CANCELPREWARMREQUEST']._serialized_start=3757
+  _globals['_CANCELPREWARMREQUEST']._serialized_end=3815
+  _globals['_CANCELPREWARMRESPONSE']._serialized_start=3817
+  _globals['_CANCELPREWARMRESPONSE']._serialized_end=3859
+  _globals['_PUTPROFILEREQUEST']._serialized_start=3861
+  _globals['_PUTPROFILEREQUEST']._serialized_end=3952
+  _globals['_PUTPROFILERESPONSE']._serialized_start=3954
+  _globals['_PUTPROFILERESPONSE']._serialized_end=4063
+  _globals['_GETPROFILEREQUEST']._serialized_start=4065
+  _globals['_GETPROFILEREQUEST']._serialized_end=4124
+  _globals['_GETPROFILERESPONSE']._serialized_start=4126
+  _globals['_GETPROFILERESPONSE']._serialized_end=4217
+  _globals['_ESTIMATEAPPLICATIONREQUEST']._serialized_start=4220
+  _globals['_ESTIMATEAPPLICATIONREQUEST']._serialized_end=4396
+  _globals['_STAGEESTIMATE']._serialized_start=4399
+  _globals['_STAGEESTIMATE']._serialized_end=4559
+  _globals['_ESTIMATEAPPLICATIONRESPONSE']._serialized_start=4562
+  _globals['_ESTIMATEAPPLICATIONRESPONSE']._serialized_end=4943
+  _globals['_METRICSREQUEST']._serialized_start=4945
+  _globals['_METRICSREQUEST']._serialized_end=4961
+  _globals['_METRICSRESPONSE']._serialized_start=4963
+  _globals['_METRICSRESPONSE']._serialized_end=5019
+  _globals['_CPUPROFILEREQUEST']._serialized_start=5021
+  _globals['_CPUPROFILEREQUEST']._serialized_end=5103
+  _globals['_PROFILERESULT']._serialized_start=5106
+  _globals['_PROFILERESULT']._serialized_end=5241
+  _globals['_REQUESTPROFILEREQUEST']._serialized_start=5243
+  _globals['_REQUESTPROFILEREQUEST']._serialized_end=5302
+  _globals['_HEAPSNAPSHOTREQUEST']._serialized_start=5304
+  _globals['_HEAPSNAPSHOTREQUEST']._serialized_end=5374
+  _globals['_HEAPSNAPSHOTRESPONSE']._serialized_start=5377
+  _globals['_HEAPSNAPSHOTRESPONSE']._serialized_end=5509
+  _globals['_HEAPDIFFREQUEST']._serialized_start=5511
+  _globals['_HEAPDIFFREQUEST']._serialized_end=5608
+  _globals['_HEAPDIFFRESPONSE']._serialized_start=5610
+  _globals['_HEAPDIFFRESPONSE']._serialized_end=5721
+  _globals['_STOPHEAPTRACINGREQUEST']._serialized_start=5723
+  _globals['_STOPHEAPTRACINGREQUEST']._serialized_end=5747
+  _globals['_STOPHEAPTRACINGRESPONSE']._serialized_start=5749
+  _globals['_STOPHEAPTRACINGRESPONSE']._serialized_end=5818
+  _globals['_APPLYSERVICE']._serialized_start=5821
+  _globals['_APPLYSERVICE']._serialized_end=6914
+  _globals['_ADMINSERVICE']._serialized_start=6917
+  _globals['_ADMINSERVICE']._serialized_end=7295
 # @@protoc_insertion_point(module_scope)
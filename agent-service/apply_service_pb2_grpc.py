@@ -54,6 +54,61 @@ class ApplyServiceStub(object):
                 request_serializer=apply__service__pb2.AutoApplyRequest.SerializeToString,
                 response_deserializer=apply__service__pb2.AutoApplyResponse.FromString,
                 _registered_method=True)
+        self.RankJobs = channel.unary_unary(
+                '/apply.ApplyService/RankJobs',
+                request_serializer=apply__service__pb2.RankJobsRequest.SerializeToString,
+                response_deserializer=apply__service__pb2.RankJobsResponse.FromString,
+                _registered_method=True)
+        self.SubmitAutoApply = channel.unary_unary(
+                '/apply.ApplyService/SubmitAutoApply',
+                request_serializer=apply__service__pb2.AutoApplyRequest.SerializeToString,
+                response_deserializer=apply__service__pb2.SubmitAutoApplyResponse.FromString,
+                _registered_method=True)
+        self.GetApplicationStatus = channel.unary_unary(
+                '/apply.ApplyService/GetApplicationStatus',
+                request_serializer=apply__service__pb2.ApplicationStatusRequest.SerializeToString,
+                response_deserializer=apply__service__pb2.ApplicationStatus.FromString,
+                _registered_method=True)
+        self.WatchApplication = channel.unary_stream(
+                '/apply.ApplyService/WatchApplication',
+                request_serializer=apply__service__pb2.ApplicationStatusRequest.SerializeToString,
+                response_deserializer=apply__service__pb2.ApplicationStatus.FromString,
+                _registered_method=True)
+        self.GetMetrics = channel.unary_unary(
+                '/apply.ApplyService/GetMetrics',
+                request_serializer=apply__service__pb2.MetricsRequest.SerializeToString,
+                response_deserializer=apply__service__pb2.MetricsResponse.FromString,
+                _registered_method=True)
+        self.IngestResume = channel.stream_unary(
+                '/apply.ApplyService/IngestResume',
+                request_serializer=apply__service__pb2.ResumeChunk.SerializeToString,
+                response_deserializer=apply__service__pb2.IngestResumeResponse.FromString,
+                _registered_method=True)
+        self.PrewarmApplications = channel.unary_unary(
+                '/apply.ApplyService/PrewarmApplications',
+                request_serializer=apply__service__pb2.PrewarmApplicationsRequest.SerializeToString,
+                response_deserializer=apply__service__pb2.PrewarmApplicationsResponse.FromString,
+                _registered_method=True)
+        self.CancelPrewarm = channel.unary_unary(
+                '/apply.ApplyService/CancelPrewarm',
+                request_serializer=apply__service__pb2.CancelPrewarmRequest.SerializeToString,
+                response_deserializer=apply__service__pb2.CancelPrewarmResponse.FromString,
+                _registered_method=True)
+        self.PutProfile = channel.unary_unary(
+                '/apply.ApplyService/PutProfile',
+                request_serializer=apply__service__pb2.PutProfileRequest.SerializeToString,
+                response_deserializer=apply__service__pb2.PutProfileResponse.FromString,
+                _registered_method=True)
+        self.GetProfile = channel.unary_unary(
+                '/apply.ApplyService/GetProfile',
+                request_serializer=apply__service__pb2.GetProfileRequest.SerializeToString,
+                response_deserializer=apply__service__pb2.GetProfileResponse.FromString,
+                _registered_method=True)
+        self.EstimateApplication = channel.unary_unary(
+                '/apply.ApplyService/EstimateApplication',
+                request_serializer=apply__service__pb2.EstimateApplicationRequest.SerializeToString,
+                response_deserializer=apply__service__pb2.EstimateApplicationResponse.FromString,
+                _registered_method=True)
 
 
 class ApplyServiceServicer(object):
@@ -83,6 +138,81 @@ class ApplyServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def RankJobs(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SubmitAutoApply(self, request, context):
+        """Asynchronous auto-apply backed by a durable local queue.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetApplicationStatus(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def WatchApplication(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetMetrics(self, request, context):
+        """Service metrics aggregated across all worker processes.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def IngestResume(self, request_iterator, context):
+        """Upload a resume document (PDF, DOCX or text) in chunks; parses are cached by content hash.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PrewarmApplications(self, request, context):
+        """Speculatively generate the next jobs of a user's swipe deck in idle capacity,
+        so a later AutoApply for them is served from stage checkpoints.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def CancelPrewarm(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PutProfile(self, request, context):
+        """Store a profile server-side so requests can send profile_ref instead of the
+        whole Profile. Versions are content hashes; an unknown ref fails with NOT_FOUND.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetProfile(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def EstimateApplication(self, request, context):
+        """Predicted tokens, LLM calls and latency of a request at the current load,
+        from the token budgeter and per-stage timings; never calls the LLM.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_ApplyServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -106,6 +236,61 @@ def add_ApplyServiceServicer_to_server(servicer, server):
                     request_deserializer=apply__service__pb2.AutoApplyRequest.FromString,
                     response_serializer=apply__service__pb2.AutoApplyResponse.SerializeToString,
             ),
+            'RankJobs': grpc.unary_unary_rpc_method_handler(
+                    servicer.RankJobs,
+                    request_deserializer=apply__service__pb2.RankJobsRequest.FromString,
+                    response_serializer=apply__service__pb2.RankJobsResponse.SerializeToString,
+            ),
+            'SubmitAutoApply': grpc.unary_unary_rpc_method_handler(
+                    servicer.SubmitAutoApply,
+                    request_deserializer=apply__service__pb2.AutoApplyRequest.FromString,
+                    response_serializer=apply__service__pb2.SubmitAutoApplyResponse.SerializeToString,
+            ),
+            'GetApplicationStatus': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetApplicationStatus,
+                    request_deserializer=apply__service__pb2.ApplicationStatusRequest.FromString,
+                    response_serializer=apply__service__pb2.ApplicationStatus.SerializeToString,
+            ),
+            'WatchApplication': grpc.unary_stream_rpc_method_handler(
+                    servicer.WatchApplication,
+                    request_deserializer=apply__service__pb2.ApplicationStatusRequest.FromString,
+                    response_serializer=apply__service__pb2.ApplicationStatus.SerializeToString,
+            ),
+            'GetMetrics': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetMetrics,
+                    request_deserializer=apply__service__pb2.MetricsRequest.FromString,
+                    response_serializer=apply__service__pb2.MetricsResponse.SerializeToString,
+            ),
+            'IngestResume': grpc.stream_unary_rpc_method_handler(
+                    servicer.IngestResume,
+                    request_deserializer=apply__service__pb2.ResumeChunk.FromString,
+                    response_serializer=apply__service__pb2.IngestResumeResponse.SerializeToString,
+            ),
+            'PrewarmApplications': grpc.unary_unary_rpc_method_handler(
+                    servicer.PrewarmApplications,
+                    request_deserializer=apply__service__pb2.PrewarmApplicationsRequest.FromString,
+                    response_serializer=apply__service__pb2.PrewarmApplicationsResponse.SerializeToString,
+            ),
+            'CancelPrewarm': grpc.unary_unary_rpc_method_handler(
+                    servicer.CancelPrewarm,
+                    request_deserializer=apply__service__pb2.CancelPrewarmRequest.FromString,
+                    response_serializer=apply__service__pb2.CancelPrewarmResponse.SerializeToString,
+            ),
+            'PutProfile': grpc.unary_unary_rpc_method_handler(
+                    servicer.PutProfile,
+                    request_deserializer=apply__service__pb2.PutProfileRequest.FromString,
+                    response_serializer=apply__service__pb2.PutProfileResponse.SerializeToString,
+            ),
+            'GetProfile': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetProfile,
+                    request_deserializer=apply__service__pb2.GetProfileRequest.FromString,
+                    response_serializer=apply__service__pb2.GetProfileResponse.SerializeToString,
+            ),
+            'EstimateApplication': grpc.unary_unary_rpc_method_handler(
+                    servicer.EstimateApplication,
+                    request_deserializer=apply__service__pb2.EstimateApplicationRequest.FromString,
+                    response_serializer=apply__service__pb2.EstimateApplicationResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'apply.ApplyService', rpc_method_handlers)
@@ -224,3 +409,553 @@ class ApplyService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def RankJobs(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/apply.ApplyService/RankJobs',
+            apply__service__pb2.RankJobsRequest.SerializeToString,
+            apply__service__pb2.RankJobsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SubmitAutoApply(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/apply.ApplyService/SubmitAutoApply',
+            apply__service__pb2.AutoApplyRequest.SerializeToString,
+            apply__service__pb2.SubmitAutoApplyResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetApplicationStatus(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/apply.ApplyService/GetApplicationStatus',
+            apply__service__pb2.ApplicationStatusRequest.SerializeToString,
+            apply__service__pb2.ApplicationStatus.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def WatchApplication(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/apply.ApplyService/WatchApplication',
+            apply__service__pb2.ApplicationStatusRequest.SerializeToString,
+            apply__service__pb2.ApplicationStatus.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetMetrics(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/apply.ApplyService/GetMetrics',
+            apply__service__pb2.MetricsRequest.SerializeToString,
+            apply__service__pb2.MetricsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def IngestResume(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/apply.ApplyService/IngestResume',
+            apply__service__pb2.ResumeChunk.SerializeToString,
+            apply__service__pb2.IngestResumeResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def PrewarmApplications(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/apply.ApplyService/PrewarmApplications',
+            apply__service__pb2.PrewarmApplicationsRequest.SerializeToString,
+            apply__service__pb2.PrewarmApplicationsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def CancelPrewarm(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/apply.ApplyService/CancelPrewarm',
+            apply__service__pb2.CancelPrewarmRequest.SerializeToString,
+            apply__service__pb2.CancelPrewarmResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def PutProfile(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/apply.ApplyService/PutProfile',
+            apply__service__pb2.PutProfileRequest.SerializeToString,
+            apply__service__pb2.PutProfileResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetProfile(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/apply.ApplyService/GetProfile',
+            apply__service__pb2.GetProfileRequest.SerializeToString,
+            apply__service__pb2.GetProfileResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def EstimateApplication(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/apply.ApplyService/EstimateApplication',
+            apply__service__pb2.EstimateApplicationRequest.SerializeToString,
+            apply__service__pb2.EstimateApplicationResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+
+class AdminServiceStub(object):
+    """Local-only diagnostics. Served on 127.0.0.1:(AGENT_ADMIN_PORT + worker id)
+    when AGENT_ADMIN_ENABLED=true; never on the public port.
+    """
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.ProfileCpu = channel.unary_unary(
+                '/apply.AdminService/ProfileCpu',
+                request_serializer=apply__service__pb2.CpuProfileRequest.SerializeToString,
+                response_deserializer=apply__service__pb2.ProfileResult.FromString,
+                _registered_method=True)
+        self.GetRequestProfile = channel.unary_unary(
+                '/apply.AdminService/GetRequestProfile',
+                request_serializer=apply__service__pb2.RequestProfileRequest.SerializeToString,
+                response_deserializer=apply__service__pb2.ProfileResult.FromString,
+                _registered_method=True)
+        self.TakeHeapSnapshot = channel.unary_unary(
+                '/apply.AdminService/TakeHeapSnapshot',
+                request_serializer=apply__service__pb2.HeapSnapshotRequest.SerializeToString,
+                response_deserializer=apply__service__pb2.HeapSnapshotResponse.FromString,
+                _registered_method=True)
+        self.DiffHeapSnapshots = channel.unary_unary(
+                '/apply.AdminService/DiffHeapSnapshots',
+                request_serializer=apply__service__pb2.HeapDiffRequest.SerializeToString,
+                response_deserializer=apply__service__pb2.HeapDiffResponse.FromString,
+                _registered_method=True)
+        self.StopHeapTracing = channel.unary_unary(
+                '/apply.AdminService/StopHeapTracing',
+                request_serializer=apply__service__pb2.StopHeapTracingRequest.SerializeToString,
+                response_deserializer=apply__service__pb2.StopHeapTracingResponse.FromString,
+                _registered_method=True)
+
+
+class AdminServiceServicer(object):
+    """Local-only diagnostics. Served on 127.0.0.1:(AGENT_ADMIN_PORT + worker id)
+    when AGENT_ADMIN_ENABLED=true; never on the public port.
+    """
+
+    def ProfileCpu(self, request, context):
+        """Sample all threads of this worker for duration_seconds.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetRequestProfile(self, request, context):
+        """Profile captured for a request sent with the "x-profile" metadata header.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def TakeHeapSnapshot(self, request, context):
+        """tracemalloc snapshots; the first snapshot starts tracing.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def DiffHeapSnapshots(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StopHeapTracing(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_AdminServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'ProfileCpu': grpc.unary_unary_rpc_method_handler(
+                    servicer.ProfileCpu,
+                    request_deserializer=apply__service__pb2.CpuProfileRequest.FromString,
+                    response_serializer=apply__service__pb2.ProfileResult.SerializeToString,
+            ),
+            'GetRequestProfile': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetRequestProfile,
+                    request_deserializer=apply__service__pb2.RequestProfileRequest.FromString,
+                    response_serializer=apply__service__pb2.ProfileResult.SerializeToString,
+            ),
+            'TakeHeapSnapshot': grpc.unary_unary_rpc_method_handler(
+                    servicer.TakeHeapSnapshot,
+                    request_deserializer=apply__service__pb2.HeapSnapshotRequest.FromString,
+                    response_serializer=apply__service__pb2.HeapSnapshotResponse.SerializeToString,
+            ),
+            'DiffHeapSnapshots': grpc.unary_unary_rpc_method_handler(
+                    servicer.DiffHeapSnapshots,
+                    request_deserializer=apply__service__pb2.HeapDiffRequest.FromString,
+                    response_serializer=apply__service__pb2.HeapDiffResponse.SerializeToString,
+            ),
+            'StopHeapTracing': grpc.unary_unary_rpc_method_handler(
+                    servicer.StopHeapTracing,
+                    request_deserializer=apply__service__pb2.StopHeapTracingRequest.FromString,
+                    response_serializer=apply__service__pb2.StopHeapTracingResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'apply.AdminService', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('apply.AdminService', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class AdminService(object):
+    """Local-only diagnostics. Served on 127.0.0.1:(AGENT_ADMIN_PORT + worker id)
+    when AGENT_ADMIN_ENABLED=true; never on the public port.
+    """
+
+    @staticmethod
+    def ProfileCpu(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/apply.AdminService/ProfileCpu',
+            apply__service__pb2.CpuProfileRequest.SerializeToString,
+            apply__service__pb2.ProfileResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetRequestProfile(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/apply.AdminService/GetRequestProfile',
+            apply__service__pb2.RequestProfileRequest.SerializeToString,
+            apply__service__pb2.ProfileResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def TakeHeapSnapshot(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/apply.AdminService/TakeHeapSnapshot',
+            apply__service__pb2.HeapSnapshotRequest.SerializeToString,
+            apply__service__pb2.HeapSnapshotResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def DiffHeapSnapshots(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/apply.AdminService/DiffHeapSnapshots',
+            apply__service__pb2.HeapDiffRequest.SerializeToString,
+            apply__service__pb2.HeapDiffResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StopHeapTracing(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/apply.AdminService/StopHeapTracing',
+            apply__service__pb2.StopHeapTracingRequest.SerializeToString,
+            apply__service__pb2.StopHeapTracingResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
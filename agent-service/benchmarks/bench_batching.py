@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the LLM micro-batcher against a local stand-in server
+
+The stand-in serves /v1/completions like a single-GPU batching server: one
+batch runs at a time, and a batch costs `--step-ms` plus `--seq-overhead` of
+that per extra prompt. That is the shape that makes batching pay off:
+prompts sent one by one queue behind each other, batched prompts share a step.
+
+For each concurrency level, N callers submit prompts through a MicroBatcher
+with batching disabled (max batch 1) and enabled, and the throughput and
+latency are compared.
+
+Usage:
+    python benchmarks/bench_batching.py [--concurrency 1,4,16,32] [--step-ms 200]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("AGENT_CACHE_PERSIST", "false")
+
+from chains.llm_backends import MicroBatcher, OpenAICompletionsBackend  # noqa: E402
+
+
+def make_handler(step: float, seq_overhead: float, device: threading.Lock, batch_sizes: list):
+    class CompletionsHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):  # noqa: N802 - http.server naming
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            prompts = body["prompt"] if isinstance(body["prompt"], list) else [body["prompt"]]
+            with device:  # one batch on the accelerator at a time
+                batch_sizes.append(len(prompts))
+                time.sleep(step * (1 + seq_overhead * (len(prompts) - 1)))
+            payload = json.dumps({
+                "choices": [
+                    {"index": i, "text": f"completion {i}", "finish_reason": "stop"}
+                    for i in range(len(prompts))
+                ],
+            }).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    return CompletionsHandler
+
+
+def run_level(batcher: MicroBatcher, concurrency: int, requests: int) -> dict:
+    key = ("stand-in", 0.3, 256, ())
+    latencies = []
+
+    def one(i: int) -> None:
+        started = time.perf_counter()
+        batcher.submit(key, f"prompt {i}").result()
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, range(requests)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "throughput": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", default="1,4,16,32")
+    parser.add_argument("--requests-per-caller", type=int, default=4)
+    parser.add_argument("--step-ms", type=float, default=200.0, help="Stand-in time for a batch of one")
+    parser.add_argument("--seq-overhead", type=float, default=0.05, help="Extra step fraction per batched prompt")
+    parser.add_argument("--window-ms", type=float, default=10.0)
+    parser.add_argument("--max-batch", type=int, default=16)
+    args = parser.parse_args()
+
+    batch_sizes: list = []
+    handler = make_handler(args.step_ms / 1000.0, args.seq_overhead, threading.Lock(), batch_sizes)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    unbatched = MicroBatcher(OpenAICompletionsBackend(base_url), window=0.0, max_batch=1,
+                             max_concurrent=64, use_breaker=False)
+    batched = MicroBatcher(OpenAICompletionsBackend(base_url), window=args.window_ms / 1000.0,
+                           max_batch=args.max_batch, max_concurrent=2, use_breaker=False)
+
+    print(f"{'callers':>8} {'unbatched req/s':>16} {'p50 ms':>8} {'batched req/s':>14} {'p50 ms':>8} "
+          f"{'p95 ms':>8} {'mean batch':>11} {'speedup':>8}")
+    for concurrency in [int(c) for c in args.concurrency.split(",")]:
+        requests = concurrency * args.requests_per_caller
+        single = run_level(unbatched, concurrency, requests)
+        batch_sizes.clear()
+        multi = run_level(batched, concurrency, requests)
+        mean_batch = statistics.mean(batch_sizes) if batch_sizes else 0.0
+        print(f"{concurrency:>8} {single['throughput']:>16.1f} {single['p50_ms']:>8.0f} "
+              f"{multi['throughput']:>14.1f} {multi['p50_ms']:>8.0f} {multi['p95_ms']:>8.0f} "
+              f"{mean_batch:>11.1f} {multi['throughput'] / single['throughput']:>7.1f}x")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
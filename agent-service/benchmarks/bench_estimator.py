@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark for EstimateApplication: estimate cost and prediction error
+
+Speed: estimate_application() for synthetic jobs and profiles in every mode,
+with the persistent cache tier on (in a temporary directory), as the server
+runs it. Reports p50/p99 microseconds per estimate.
+
+Accuracy: a simulated backend with known rates (seconds per call, per 1k
+prompt tokens, per 1k output tokens, plus noise) "runs" each estimated
+request. The estimate is taken first. The simulated usage is then fed to the
+estimator, exactly as the usage listener would after a real request. Reports
+the mean absolute percentage error of the predicted generation seconds over
+windows of requests: with the prior only, while learning, once fitted, and
+after the backend halves its speed halfway through.
+
+Usage:
+    python benchmarks/bench_estimator.py [--estimates 3000] [--requests 400]
+"""
+import argparse
+import contextlib
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("AGENT_CACHE_DIR", tempfile.mkdtemp(prefix="bench-estimator-"))
+os.environ["LLM_BREAKER_ENABLED"] = "false"
+
+import apply_service_pb2  # noqa: E402
+from chains.common import profile_to_dict, to_dict  # noqa: E402
+from estimator import Estimator, estimate_application  # noqa: E402
+import estimator as estimator_module  # noqa: E402
+
+WORDS = ("python services latency customers reliability kubernetes design review ownership "
+         "postgres migration roadmap mentoring incidents platform cost api aws").split()
+TRUE_CHARS_PER_TOKEN = 3.6
+
+
+def text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def make_request(rng: random.Random, index: int) -> Tuple[Dict[str, Any], Dict[str, Any], List[Dict[str, Any]]]:
+    job = apply_service_pb2.Job(id=f"job-{index}", title="Backend Engineer", company=f"Company {index % 50}",
+                                description=text(rng, rng.randint(150, 700)))
+    profile = apply_service_pb2.Profile(name=f"Candidate {index}", email="candidate@example.com",
+                                        resume_text=text(rng, rng.randint(300, 1200)))
+    questions = [{"question": text(rng, 8), "type": "text", "options": []} for _ in range(rng.randint(0, 4))]
+    return to_dict(job), profile_to_dict(profile), questions
+
+
+def time_estimates(requests: List[Tuple[Any, Any, Any]], mode: str, count: int) -> Dict[str, float]:
+    samples = []
+    for i in range(count):
+        job, profile, questions = requests[i % len(requests)]
+        started = time.perf_counter()
+        estimate_application(job, profile, questions, mode)
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return {"p50_us": statistics.median(samples) * 1e6,
+            "p99_us": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1e6}
+
+
+def simulate(estimate: Dict[str, Any], rates: Tuple[float, float, float], rng: random.Random) -> Dict[str, Any]:
+    """Usage summary of the request as the simulated backend runs it."""
+    per_call, per_prompt, per_output = rates
+    stages = []
+    for planned in estimate["stages"]:
+        if not planned["llm_calls"]:
+            continue
+        calls = planned["llm_calls"]
+        # The estimator assumes 4 characters per token until it has learned otherwise
+        prompt_chars = int(planned["prompt_tokens"] * estimate_chars_per_token(planned["stage"]))
+        prompt_tokens = int(prompt_chars / TRUE_CHARS_PER_TOKEN)
+        output_tokens = max(1, int(rng.gauss(planned["output_tokens"], planned["output_tokens"] * 0.25)))
+        seconds = (per_call * calls + per_prompt * prompt_tokens / 1000 + per_output * output_tokens / 1000
+                   + abs(rng.gauss(0, 0.5)))
+        stages.append({"stage": planned["stage"], "wall_seconds": seconds, "llm_calls": calls,
+                       "prompt_tokens": prompt_tokens, "eval_tokens": output_tokens,
+                       "prompt_chars": prompt_chars, "cache_hits": []})
+    total = sum(s["wall_seconds"] for s in stages)
+    return {"total_seconds": total, "queue_wait_seconds": 0.0, "stages": stages}
+
+
+def estimate_chars_per_token(stage: str) -> float:
+    return estimator_module.get_estimator().models[stage].chars_per_token()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--estimates", type=int, default=3000, help="Timed estimates per mode")
+    parser.add_argument("--requests", type=int, default=400, help="Simulated requests for the accuracy run")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        requests = [make_request(rng, i) for i in range(200)]
+        for job, profile, questions in requests:  # warm digests, templates and the cache connection
+            estimate_application(job, profile, questions, "agent")
+
+    print(f"{'mode':<14} {'p50 us':>8} {'p99 us':>8}")
+    for mode in estimator_module.MODES:
+        row = time_estimates(requests, mode, args.estimates)
+        print(f"{mode:<14} {row['p50_us']:>8.0f} {row['p99_us']:>8.0f}")
+
+    estimator_module._estimator = Estimator.from_env()  # start the accuracy run from the prior
+    fast, slow = (0.4, 1.5, 35.0), (0.8, 3.0, 70.0)
+    errors: List[float] = []
+    for i in range(args.requests):
+        job, profile, questions = requests[i % len(requests)]
+        estimate = estimate_application(job, profile, questions, "agent")
+        usage = simulate(estimate, fast if i < args.requests // 2 else slow, rng)
+        errors.append(abs(estimate["generation_seconds"] - usage["total_seconds"]) / usage["total_seconds"])
+        estimator_module.get_estimator().observe(usage)
+
+    half = args.requests // 2
+    windows = [("prior only (first request)", 0, 1), ("learning (requests 2-20)", 1, 20),
+               (f"fitted (21-{half})", 20, half), (f"after 2x slowdown ({half + 1}-{half + 20})", half, half + 20),
+               (f"refitted ({half + 21}-{args.requests})", half + 20, args.requests)]
+    print(f"\n{'accuracy window':<34} {'MAPE':>7}")
+    for name, start, end in windows:
+        print(f"{name:<34} {statistics.mean(errors[start:end]) * 100:>6.1f}%")
+
+
+if __name__ == "__main__":
+    main()
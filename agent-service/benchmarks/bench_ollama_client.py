@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Per-call overhead and import cost: native Ollama client vs the LangChain path
+
+A local stand-in serves /api/chat the way Ollama does (NDJSON stream, final
+chunk with token counts) and answers immediately, so the measured time is
+almost all client-side. Sequential calls go through each path:
+- raw: one httpx POST on a pooled client (the floor)
+- client invoke / stream: ChatOllama vs OllamaChat, a new model object per
+  call as the chains build them
+- run_llm: the full chain entry point with LLM_BACKEND=ollama vs native,
+  without a generation profile (invoke) and with the cover letter profile
+  (streamed, with completion detection)
+
+Overhead is the mean per-call time above the raw floor. Import cost is
+measured in fresh interpreters: wall time and resident memory after importing the
+LangChain Ollama stack vs the native client, and the chain modules (which
+import langchain_ollama only on the first LLM_BACKEND=ollama call).
+
+Usage:
+    python benchmarks/bench_ollama_client.py [--calls 300] [--tokens 64] [--import-runs 5]
+"""
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("AGENT_CACHE_PERSIST", "false")
+os.environ["LLM_BREAKER_ENABLED"] = "false"  # stand-in latency must not trip anything
+
+import httpx  # noqa: E402
+
+from chains.common import chat_ollama_class, run_llm  # noqa: E402
+from chains.generation_profiles import stream_text  # noqa: E402
+from chains.ollama_client import OllamaChat  # noqa: E402
+
+PROMPT = "Write a short cover letter for Jane Doe applying as a backend engineer."
+IMPORTS = {
+    "baseline (python -c pass)": "",
+    "langchain_ollama": "import langchain_ollama",
+    "chains.ollama_client": "import chains.ollama_client",
+    "chain modules": "import chains.resume_chain, chains.cover_letter_chain, chains.question_answering_chain",
+}
+
+
+def make_handler(tokens: int):
+    words = ["Dear Team,\n"] + ["word "] * max(0, tokens - 2) + ["\nSincerely,\nJane Doe"]
+
+    class ChatHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):  # noqa: N802 - http.server naming
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            final = {"model": body["model"], "done": True, "done_reason": "stop",
+                     "prompt_eval_count": len(PROMPT) // 4, "eval_count": len(words),
+                     "prompt_eval_duration": 0, "eval_duration": 0}
+            if body.get("stream", True):
+                lines = [{"model": body["model"], "message": {"role": "assistant", "content": word}, "done": False}
+                         for word in words]
+                lines.append(dict(final, message={"role": "assistant", "content": ""}))
+                payload = b"".join(json.dumps(line).encode("utf-8") + b"\n" for line in lines)
+            else:
+                payload = json.dumps(dict(final, message={"role": "assistant", "content": "".join(words)})).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    return ChatHandler
+
+
+def time_calls(call: Callable[[], Any], calls: int) -> Dict[str, float]:
+    samples: List[float] = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(min(20, calls)):  # warm connections and lazy imports
+            call()
+        for _ in range(calls):
+            started = time.perf_counter()
+            call()
+            samples.append(time.perf_counter() - started)
+    samples.sort()
+    return {
+        "mean_us": statistics.mean(samples) * 1e6,
+        "p50_us": statistics.median(samples) * 1e6,
+        "p99_us": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1e6,
+    }
+
+
+@contextlib.contextmanager
+def backend(name: str):
+    previous = os.environ.get("LLM_BACKEND")
+    os.environ["LLM_BACKEND"] = name
+    try:
+        yield
+    finally:
+        if previous is None:
+            os.environ.pop("LLM_BACKEND", None)
+        else:
+            os.environ["LLM_BACKEND"] = previous
+
+
+def measure_import(statement: str, runs: int) -> Dict[str, float]:
+    # Current RSS: ru_maxrss would include the parent's peak, which survives fork and exec
+    code = ("import time\n"
+            "started = time.perf_counter()\n"
+            f"{statement}\n"
+            "elapsed = time.perf_counter() - started\n"
+            "rss = [line.split()[1] for line in open('/proc/self/status') if line.startswith('VmRSS')][0]\n"
+            "print(elapsed, rss)")
+    cwd = os.path.join(os.path.dirname(__file__), "..")
+    seconds, rss = [], []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", code], cwd=cwd, capture_output=True, text=True, check=True)
+        elapsed, rss_kib = out.stdout.split()[-2:]
+        seconds.append(float(elapsed))
+        rss.append(int(rss_kib) / 1024.0)
+    return {"ms": statistics.median(seconds) * 1000, "rss_mb": statistics.median(rss)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=300, help="Timed calls per path")
+    parser.add_argument("--tokens", type=int, default=64, help="Streamed chunks per reply")
+    parser.add_argument("--import-runs", type=int, default=5)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.tokens))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    os.environ["OLLAMA_BASE_URL"] = base_url
+    os.environ["OLLAMA_MODEL"] = "stand-in"
+
+    chat_ollama = chat_ollama_class()
+    raw = httpx.Client(base_url=base_url)
+    body = {"model": "stand-in", "messages": [{"role": "user", "content": PROMPT}], "stream": False}
+
+    reused = chat_ollama(model="stand-in", base_url=base_url, temperature=0.3)
+
+    def langchain_invoke() -> str:
+        from langchain_core.output_parsers import StrOutputParser
+        return (chat_ollama(model="stand-in", base_url=base_url, temperature=0.3) | StrOutputParser()).invoke(PROMPT)
+
+    def run_llm_with(name: str, task: Any) -> Callable[[], Any]:
+        def call() -> Any:
+            with backend(name):
+                return run_llm(PROMPT, 0.3, None, task=task, context={"name": "Jane Doe"})
+        return call
+
+    paths = [
+        ("raw httpx POST", lambda: raw.post("/api/chat", json=body).json()),
+        ("invoke: ChatOllama | StrOutputParser", langchain_invoke),
+        ("invoke: ChatOllama reused", lambda: reused.invoke(PROMPT).content),
+        ("invoke: OllamaChat", lambda: OllamaChat(model="stand-in", base_url=base_url).invoke(PROMPT).content),
+        ("stream: ChatOllama", lambda: stream_text(
+            chat_ollama(model="stand-in", base_url=base_url, temperature=0.3).stream(PROMPT))),
+        ("stream: OllamaChat", lambda: stream_text(OllamaChat(model="stand-in", base_url=base_url).stream(PROMPT))),
+        ("run_llm, no profile: ollama", run_llm_with("ollama", None)),
+        ("run_llm, no profile: native", run_llm_with("native", None)),
+        ("run_llm, cover letter: ollama", run_llm_with("ollama", "cover_letter")),
+        ("run_llm, cover letter: native", run_llm_with("native", "cover_letter")),
+    ]
+    results = {name: time_calls(call, args.calls) for name, call in paths}
+    floor = results["raw httpx POST"]["mean_us"]
+
+    print(f"{'path':<38} {'mean us':>9} {'p50 us':>9} {'p99 us':>9} {'overhead us':>12}")
+    for name, row in results.items():
+        print(f"{name:<38} {row['mean_us']:>9.0f} {row['p50_us']:>9.0f} {row['p99_us']:>9.0f} "
+              f"{row['mean_us'] - floor:>12.0f}")
+    server.shutdown()
+
+    print(f"\n{'import (fresh interpreter)':<38} {'median ms':>10} {'RSS MB':>8}")
+    for name, statement in IMPORTS.items():
+        row = measure_import(statement, args.import_runs)
+        print(f"{name:<38} {row['ms']:>10.0f} {row['rss_mb']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark for RankJobs local scoring
+
+Generates synthetic jobs and times rank_jobs() for increasing deck sizes,
+both cold (jobs featurized on this call) and warm (features cached, which is
+the steady state when the same jobs are ranked for many users).
+
+Usage:
+    python benchmarks/bench_rank_jobs.py [--sizes 100,1000,10000] [--repeats 5]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("AGENT_CACHE_PERSIST", "false")
+
+from chains.job_ranking import rank_jobs  # noqa: E402
+
+SKILLS = [
+    "python", "go", "java", "typescript", "react", "node.js", "kubernetes", "aws",
+    "gcp", "terraform", "postgresql", "mongodb", "redis", "kafka", "spark",
+    "machine learning", "data pipelines", "graphql", "grpc", "docker", "swift",
+    "kotlin", "figma", "sql", "airflow", "pytorch", "tensorflow", "c++", "rust",
+]
+TITLES = [
+    "Backend Engineer", "Frontend Engineer", "Data Engineer", "ML Engineer",
+    "Site Reliability Engineer", "Product Designer", "Mobile Engineer",
+    "Full Stack Developer", "Platform Engineer", "Data Scientist",
+]
+LOCATIONS = ["Remote", "San Francisco, CA", "New York, NY", "Austin, TX", "Seattle, WA"]
+TYPES = ["Full-time", "Part-time", "Contract", "Internship"]
+FILLER = (
+    "You will collaborate with product and design to ship features used by millions. "
+    "We value ownership, clear communication and a bias for action. "
+    "The team owns services end to end, from design docs to on-call. "
+)
+
+
+def make_job(i: int, rng: random.Random) -> dict:
+    skills = rng.sample(SKILLS, 6)
+    return {
+        "id": f"job-{i}",
+        "title": rng.choice(TITLES),
+        "location": rng.choice(LOCATIONS),
+        "type": rng.choice(TYPES),
+        "description": (
+            f"<p>{FILLER * rng.randint(1, 3)}</p>"
+            f"<h3>Requirements:</h3><ul>{''.join(f'<li>Experience with {s}</li>' for s in skills)}</ul>"
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100,1000,10000")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    profile = {
+        "headline": "Backend engineer",
+        "summary": "Builds distributed systems and data pipelines.",
+        "skills": ["python", "kubernetes", "aws", "postgresql", "machine learning"],
+        "resume_text": "Senior backend engineer with 6 years of Python, Go and Kubernetes on AWS. "
+                       "Built Kafka data pipelines and PostgreSQL services.",
+    }
+
+    print(f"{'jobs':>8} {'cold ms':>10} {'warm p50 ms':>12} {'warm max ms':>12} {'jobs/s (warm)':>14}")
+    for size in [int(s) for s in args.sizes.split(",")]:
+        jobs = [make_job(i, rng) for i in range(size)]
+
+        started = time.perf_counter()
+        rank_jobs(profile, jobs, preferred_locations=["Remote"], preferred_types=["Full-time"])
+        cold_ms = (time.perf_counter() - started) * 1000
+
+        warm = []
+        for _ in range(args.repeats):
+            started = time.perf_counter()
+            rank_jobs(profile, jobs, preferred_locations=["Remote"], preferred_types=["Full-time"])
+            warm.append((time.perf_counter() - started) * 1000)
+
+        p50 = statistics.median(warm)
+        print(f"{size:>8} {cold_ms:>10.1f} {p50:>12.1f} {max(warm):>12.1f} {size / (p50 / 1000):>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+Concurrent gRPC load generator for ApplyService
+
+Drives one or more ApplyService RPCs against a running agent service using a
+pool of channels, with request payloads drawn from a fixture file of jobs,
+profiles and question sets. Two modes:
+
+- closed: N workers each send a request, wait for the reply, repeat
+  (measures capacity at a fixed concurrency)
+- open: requests are issued at a target rate regardless of how fast replies
+  come back (measures latency at a given traffic level); latency is measured
+  from the scheduled send time, so server backlog is not hidden
+
+Every ApplyService RPC can be driven. GetApplicationStatus and
+WatchApplication poll tickets returned by SubmitAutoApply; one ticket is
+submitted up front so they always have one.
+GetProfile reads profiles that PutProfile stored first. IngestResume
+streams a profile's resume text as a text file. WatchApplication is timed
+until the ticket's last update.
+
+Reports throughput, latency percentiles and status-code breakdowns per RPC
+as JSON.
+
+Usage:
+    # Single AutoApply (the old smoke test)
+    python benchmarks/loadgen.py --rpc AutoApply --requests 1
+
+    # 20 concurrent clients mixing Apply and AutoApply for 60s
+    python benchmarks/loadgen.py --mode closed --concurrency 20 --duration 60 --rpc Apply=3,AutoApply=1
+
+    # 5 requests/second, Poisson arrivals, 8 channels
+    python benchmarks/loadgen.py --mode open --rps 5 --arrival poisson --channels 8 --duration 120
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent import futures
+from typing import Any, Callable, Dict, List, Tuple
+
+import grpc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import apply_service_pb2  # noqa: E402
+import apply_service_pb2_grpc  # noqa: E402
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "loadgen.json")
+PERCENTILES = (50, 90, 95, 99)
+RPCS = (
+    "Apply", "GenerateCoverLetter", "AnswerQuestions", "AutoApply", "RankJobs", "SubmitAutoApply",
+    "GetApplicationStatus", "WatchApplication", "GetMetrics", "IngestResume", "PrewarmApplications",
+    "CancelPrewarm", "PutProfile", "GetProfile", "EstimateApplication",
+)
+STREAM_REQUEST_RPCS = ("IngestResume",)
+STREAM_RESPONSE_RPCS = ("WatchApplication",)
+RESUME_CHUNK_BYTES = 16 * 1024
+PREWARM_JOBS = 3
+
+
+def load_fixtures(path: str) -> Dict[str, List[Any]]:
+    with open(path, encoding="utf-8") as handle:
+        fixtures = json.load(handle)
+    for key in ("jobs", "profiles"):
+        if not fixtures.get(key):
+            raise SystemExit(f"Fixture file {path} has no {key}")
+    fixtures.setdefault("question_sets", [[]])
+    return fixtures
+
+
+class RequestFactory:
+    """Builds randomized requests for each RPC from the fixtures."""
+
+    def __init__(self, fixtures: Dict[str, List[Any]], tenants: List[str], rank_deck_size: int, seed: int):
+        self.jobs = [apply_service_pb2.Job(**job) for job in fixtures["jobs"]]
+        self.profiles = [apply_service_pb2.Profile(**profile) for profile in fixtures["profiles"]]
+        self.question_sets = [
+            [apply_service_pb2.Question(**q) for q in question_set]
+            for question_set in fixtures["question_sets"]
+        ]
+        self.tenants = tenants or [""]
+        self.rank_deck_size = rank_deck_size
+        self.random = random.Random(seed)
+        self.ticket_ids: List[str] = []  # from SubmitAutoApply replies
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def profile_id(index: int) -> str:
+        return f"loadgen-{index}"
+
+    def add_ticket(self, ticket_id: str) -> None:
+        with self._lock:
+            self.ticket_ids.append(ticket_id)
+
+    def build(self, rpc: str) -> Any:
+        """Request message for the RPC (for IngestResume, the list of chunks to stream)."""
+        if rpc not in RPCS:
+            raise SystemExit(f"Unsupported RPC: {rpc} (supported: {', '.join(RPCS)})")
+        with self._lock:
+            job = self.random.choice(self.jobs)
+            profile_index = self.random.randrange(len(self.profiles))
+            questions = self.random.choice(self.question_sets)
+            tenant = self.random.choice(self.tenants)
+            deck = [self.random.choice(self.jobs) for _ in range(self.rank_deck_size)]
+            ticket_id = self.random.choice(self.ticket_ids) if self.ticket_ids else ""
+        profile = self.profiles[profile_index]
+
+        if rpc in ("Apply", "GenerateCoverLetter"):
+            return apply_service_pb2.ApplyRequest(job=job, profile=profile, tenant_id=tenant)
+        if rpc == "AnswerQuestions":
+            return apply_service_pb2.AnswerRequest(
+                job=job, profile=profile, questions=questions or self.question_sets[-1], tenant_id=tenant)
+        if rpc in ("AutoApply", "SubmitAutoApply"):
+            return apply_service_pb2.AutoApplyRequest(
+                job=job, profile=profile, questions=questions, tenant_id=tenant)
+        if rpc == "RankJobs":
+            return apply_service_pb2.RankJobsRequest(profile=profile, jobs=deck, top_k=10)
+        if rpc == "GetMetrics":
+            return apply_service_pb2.MetricsRequest()
+        if rpc in ("GetApplicationStatus", "WatchApplication"):
+            return apply_service_pb2.ApplicationStatusRequest(ticket_id=ticket_id)
+        if rpc == "IngestResume":
+            data = (profile.resume_text or profile.summary or profile.name).encode("utf-8")
+            chunks = [apply_service_pb2.ResumeChunk(data=data[i:i + RESUME_CHUNK_BYTES])
+                      for i in range(0, len(data), RESUME_CHUNK_BYTES)] or [apply_service_pb2.ResumeChunk()]
+            chunks[0].filename = f"{self.profile_id(profile_index)}.txt"
+            chunks[0].content_type = "text/plain"
+            return chunks
+        if rpc == "PrewarmApplications":
+            jobs = [apply_service_pb2.PrewarmJob(job=deck_job, questions=questions)
+                    for deck_job in deck[:PREWARM_JOBS]]
+            return apply_service_pb2.PrewarmApplicationsRequest(profile=profile, jobs=jobs, tenant_id=tenant)
+        if rpc == "CancelPrewarm":
+            return apply_service_pb2.CancelPrewarmRequest(
+                tenant_id=tenant, job_ids=[deck_job.id for deck_job in deck[:PREWARM_JOBS]])
+        if rpc == "PutProfile":
+            return apply_service_pb2.PutProfileRequest(profile_id=self.profile_id(profile_index), profile=profile)
+        if rpc == "GetProfile":
+            return apply_service_pb2.GetProfileRequest(profile_ref=self.profile_id(profile_index))
+        return apply_service_pb2.EstimateApplicationRequest(job=job, profile=profile, questions=questions)
+
+
+def parse_mix(spec: str) -> List[Tuple[str, float]]:
+    """'Apply=3,AutoApply=1' -> [('Apply', 3.0), ('AutoApply', 1.0)]"""
+    mix = []
+    for item in spec.split(","):
+        name, _, weight = item.strip().partition("=")
+        if name:
+            mix.append((name, float(weight) if weight else 1.0))
+    return mix
+
+
+class Recorder:
+    """Thread-safe per-RPC latency and status-code accounting."""
+
+    def __init__(self):
+        self.results: Dict[str, List[Tuple[float, str]]] = defaultdict(list)  # (latency, code)
+        self.sent: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, rpc: str, latency: float, code: str) -> None:
+        with self._lock:
+            self.results[rpc].append((latency, code))
+
+    def mark_sent(self, rpc: str) -> None:
+        with self._lock:
+            self.sent[rpc] += 1
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank percentile
+    index = max(0, math.ceil(pct / 100.0 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def summarize(results: List[Tuple[float, str]], sent: int, elapsed: float) -> Dict[str, Any]:
+    """Latency percentiles over successful calls plus status-code counts over all calls."""
+    ok_latencies = sorted(latency for latency, code in results if code == "OK")
+    codes = Counter(code for _, code in results)
+    completed = len(results)
+    ok = len(ok_latencies)
+    return {
+        "sent": sent,
+        "completed": completed,
+        "ok": ok,
+        "error_rate": round(1 - ok / completed, 4) if completed else 0.0,
+        "codes": dict(codes),
+        "throughput_rps": round(completed / elapsed, 3) if elapsed else 0.0,
+        "goodput_rps": round(ok / elapsed, 3) if elapsed else 0.0,
+        "latency_ms": {
+            **{f"p{p}": round(percentile(ok_latencies, p) * 1000, 2) for p in PERCENTILES},
+            "mean": round(sum(ok_latencies) / len(ok_latencies) * 1000, 2) if ok_latencies else 0.0,
+            "max": round(ok_latencies[-1] * 1000, 2) if ok_latencies else 0.0,
+        },
+    }
+
+
+class LoadGenerator:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.factory = RequestFactory(
+            load_fixtures(args.fixtures),
+            [t for t in args.tenants.split(",") if t],
+            args.rank_deck_size,
+            args.seed,
+        )
+        self.mix = parse_mix(args.rpc)
+        self.mix_names = [name for name, _ in self.mix]
+        self.mix_weights = [weight for _, weight in self.mix]
+        for name in self.mix_names:
+            self.factory.build(name)  # fail fast on unsupported RPC names
+        self.random = random.Random(args.seed + 1)
+        self.recorder = Recorder()
+        # A local subchannel pool per channel forces separate TCP connections, so
+        # SO_REUSEPORT spreads them across pre-forked workers like real clients
+        self.channels = [
+            grpc.insecure_channel(args.target, options=[("grpc.use_local_subchannel_pool", 1)])
+            for _ in range(args.channels)
+        ]
+        self.stubs = itertools.cycle([apply_service_pb2_grpc.ApplyServiceStub(c) for c in self.channels])
+        self._stub_lock = threading.Lock()
+        self._issued = 0
+        self._issued_lock = threading.Lock()
+
+    def _next_rpc(self) -> str:
+        with self._stub_lock:
+            return self.random.choices(self.mix_names, self.mix_weights)[0]
+
+    def _next_stub(self) -> apply_service_pb2_grpc.ApplyServiceStub:
+        with self._stub_lock:
+            return next(self.stubs)
+
+    def _take_ticket(self) -> bool:
+        """Claim one request from the --requests budget (unlimited when 0)."""
+        with self._issued_lock:
+            if self.args.requests and self._issued >= self.args.requests:
+                return False
+            self._issued += 1
+            return True
+
+    def _metadata(self, request: Any) -> List[Tuple[str, str]]:
+        tenant = getattr(request, "tenant_id", "")
+        return [("x-tenant-id", tenant)] if tenant else []
+
+    def _call(self, rpc: str) -> Tuple[Callable, Any]:
+        request = self.factory.build(rpc)
+        return getattr(self._next_stub(), rpc), request
+
+    def _invoke(self, rpc: str, method: Callable, request: Any) -> Any:
+        """Blocking call; a streamed reply is drained and its last message returned."""
+        if rpc in STREAM_REQUEST_RPCS:
+            return method(iter(request), timeout=self.args.timeout)
+        if rpc in STREAM_RESPONSE_RPCS:
+            last = None
+            for last in method(request, timeout=self.args.timeout, metadata=self._metadata(request)):
+                pass
+            return last
+        return method(request, timeout=self.args.timeout, metadata=self._metadata(request))
+
+    def _on_reply(self, rpc: str, reply: Any) -> None:
+        if rpc == "SubmitAutoApply" and reply.ticket_id:
+            self.factory.add_ticket(reply.ticket_id)
+
+    def _prepare(self) -> None:
+        """Create the state that read-only RPCs in the mix need: stored profiles and a ticket."""
+        stub = self._next_stub()
+        if "GetProfile" in self.mix_names:
+            for index, profile in enumerate(self.factory.profiles):
+                stub.PutProfile(apply_service_pb2.PutProfileRequest(
+                    profile_id=self.factory.profile_id(index), profile=profile), timeout=self.args.timeout)
+        if {"GetApplicationStatus", "WatchApplication"} & set(self.mix_names):
+            request = self.factory.build("SubmitAutoApply")
+            reply = stub.SubmitAutoApply(request, timeout=self.args.timeout, metadata=self._metadata(request))
+            self.factory.add_ticket(reply.ticket_id)
+
+    def run_closed(self, deadline: float) -> None:
+        def worker():
+            while time.monotonic() < deadline and self._take_ticket():
+                rpc = self._next_rpc()
+                method, request = self._call(rpc)
+                self.recorder.mark_sent(rpc)
+                started = time.monotonic()
+                try:
+                    self._on_reply(rpc, self._invoke(rpc, method, request))
+                    code = "OK"
+                except grpc.RpcError as exc:
+                    code = exc.code().name
+                self.recorder.record(rpc, time.monotonic() - started, code)
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(self.args.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def run_open(self, deadline: float) -> None:
+        in_flight = threading.Semaphore(self.args.max_in_flight)
+        pending = []
+        interval = 1.0 / self.args.rps
+        next_send = time.monotonic()
+
+        while next_send < deadline and self._take_ticket():
+            now = time.monotonic()
+            if next_send > now:
+                time.sleep(next_send - now)
+            rpc = self._next_rpc()
+            scheduled = next_send
+            next_send += self.random.expovariate(self.args.rps) if self.args.arrival == "poisson" else interval
+
+            self.recorder.mark_sent(rpc)
+            if not in_flight.acquire(blocking=False):
+                # The client itself is saturated; count it instead of silently slowing the arrival rate
+                self.recorder.record(rpc, time.monotonic() - scheduled, "CLIENT_BACKLOG")
+                continue
+
+            method, request = self._call(rpc)
+
+            def done(fut, rpc=rpc, scheduled=scheduled):
+                try:
+                    self._on_reply(rpc, fut.result())
+                    code = "OK"
+                except grpc.RpcError as exc:
+                    code = exc.code().name
+                except grpc.FutureCancelledError:
+                    code = "CANCELLED"
+                self.recorder.record(rpc, time.monotonic() - scheduled, code)
+                in_flight.release()
+
+            if rpc in STREAM_RESPONSE_RPCS:
+                # Streamed replies have no future; drain them on a thread of their own
+                future = futures.Future()
+                threading.Thread(target=self._drain, args=(rpc, method, request, future), daemon=True).start()
+            elif rpc in STREAM_REQUEST_RPCS:
+                future = method.future(iter(request), timeout=self.args.timeout)
+            else:
+                future = method.future(request, timeout=self.args.timeout, metadata=self._metadata(request))
+            future.add_done_callback(done)
+            pending.append(future)
+
+        for future in pending:
+            try:
+                future.result()
+            except Exception:  # noqa: BLE001 - already recorded by the callback
+                pass
+
+    def _drain(self, rpc: str, method: Callable, request: Any, future: "futures.Future") -> None:
+        try:
+            future.set_result(self._invoke(rpc, method, request))
+        except grpc.RpcError as exc:
+            future.set_exception(exc)
+
+    def run(self) -> Dict[str, Any]:
+        for channel in self.channels:
+            grpc.channel_ready_future(channel).result(timeout=self.args.connect_timeout)
+        self._prepare()
+
+        started = time.monotonic()
+        deadline = started + self.args.duration if self.args.duration else float("inf")
+        if self.args.mode == "closed":
+            self.run_closed(deadline)
+        else:
+            self.run_open(deadline)
+        elapsed = time.monotonic() - started
+
+        for channel in self.channels:
+            channel.close()
+
+        rec = self.recorder
+        all_results = [result for results in rec.results.values() for result in results]
+
+        return {
+            "config": {
+                "target": self.args.target,
+                "mode": self.args.mode,
+                "rpc_mix": dict(self.mix),
+                "concurrency": self.args.concurrency if self.args.mode == "closed" else None,
+                "rps": self.args.rps if self.args.mode == "open" else None,
+                "arrival": self.args.arrival if self.args.mode == "open" else None,
+                "channels": self.args.channels,
+                "fixtures": self.args.fixtures,
+            },
+            "elapsed_s": round(elapsed, 3),
+            "rpcs": {
+                rpc: summarize(rec.results[rpc], rec.sent[rpc], elapsed)
+                for rpc in sorted(rec.sent)
+            },
+            "total": summarize(all_results, sum(rec.sent.values()), elapsed),
+        }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", default=os.getenv("AGENT_TARGET", "localhost:50051"))
+    parser.add_argument("--rpc", default="AutoApply",
+                        help=f"RPC or weighted mix, e.g. Apply=3,AutoApply=1; one of {', '.join(RPCS)}")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES, help="JSON file with jobs, profiles, question_sets")
+    parser.add_argument("--mode", choices=("closed", "open"), default="closed")
+    parser.add_argument("--concurrency", type=int, default=1, help="closed mode: concurrent clients")
+    parser.add_argument("--rps", type=float, default=1.0, help="open mode: target requests per second")
+    parser.add_argument("--arrival", choices=("uniform", "poisson"), default="uniform", help="open mode arrivals")
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="open mode: client-side in-flight cap")
+    parser.add_argument("--duration", type=float, default=0, help="seconds to run (0 = until --requests)")
+    parser.add_argument("--requests", type=int, default=0, help="total requests to send (0 = until --duration)")
+    parser.add_argument("--channels", type=int, default=4, help="gRPC channels (TCP connections) in the pool")
+    parser.add_argument("--timeout", type=float, default=300.0, help="per-RPC deadline in seconds")
+    parser.add_argument("--connect-timeout", type=float, default=10.0)
+    parser.add_argument("--tenants", default="", help="comma-separated tenant ids to spread requests over")
+    parser.add_argument("--rank-deck-size", type=int, default=50, help="jobs per RankJobs request")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    if not args.duration and not args.requests:
+        parser.error("set --duration and/or --requests")
+
+    report = LoadGenerator(args).run()
+    rendered = json.dumps(report, indent=2)
+    print(rendered)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(rendered + "\n")
+
+    total = report["total"]
+    print(f"{total['completed']} requests in {report['elapsed_s']}s, {total['throughput_rps']} rps, "
+          f"p50 {total['latency_ms']['p50']} ms, p99 {total['latency_ms']['p99']} ms, "
+          f"errors {total['error_rate']:.1%}", file=sys.stderr)
+    return 0 if total["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
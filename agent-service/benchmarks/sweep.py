@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Latency/quality sweep across models, temperatures, templates and pipeline modes
+
+Runs fixture cases (job, profile, questions) through the orchestrator entry
+points in-process, against the configured Ollama, for every cell of a grid:
+
+- model: OLLAMA_MODEL for every stage
+- temperature: LLM_TEMPERATURE for every stage ("default" keeps each stage's own)
+- template: "default", or a directory holding any of the chain templates
+  (resume_prompt.jinja2, cover_letter_prompt.jinja2,
+  question_answering_prompt.jinja2), which the pipeline uses, and the agent
+  tool templates (resume_tool_prompt.jinja2, cover_letter_tool_prompt.jinja2,
+  question_answering_tool_prompt.jinja2), which the agent uses. A cell whose
+  mode uses none of a directory's files repeats another cell and is skipped
+- mode: "pipeline" (sequential chains) or "agent" (ReAct agent)
+- limits: "adaptive" (generation profiles), "off" (no budgets or early
+  stopping), or a number that scales the adaptive budgets (e.g. 0.5)
+
+For each case it records wall time, LLM calls and tokens (from the response
+usage collector) and cheap automatic quality checks:
+- keyword coverage: share of the job description's top keywords that the
+  resume and cover letter mention
+- answers valid: the answers stage returned parseable JSON with one
+  non-empty answer per question
+- length ok: cover letter and resume within sensible word counts
+- degraded: a stage fell back to template or mock output (scores 0)
+
+The report lists every configuration with its latency and quality and marks
+the Pareto frontier (no other configuration is both faster at p50 and better
+on mean quality).
+
+Usage:
+    python benchmarks/sweep.py --models llama3.2:3b,llama3.2:1b --temperatures default,0.7 \\
+        --modes pipeline,agent --limits adaptive,0.5 --cases 4 --output sweep.json
+"""
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("AGENT_CACHE_PERSIST", "false")
+os.environ["STAGE_CHECKPOINTS_ENABLED"] = "false"  # every cell must generate
+
+import apply_service_pb2  # noqa: E402
+from chains.agentic_orchestrator import run_agentic_orchestrator  # noqa: E402
+from chains.degradation import applied  # noqa: E402
+from chains.fallbacks import collect_degraded  # noqa: E402
+from chains.generation_profiles import PROFILES  # noqa: E402
+from chains.job_digest import extract_keywords  # noqa: E402
+from chains.orchestrator_chain import run_orchestrator_chain  # noqa: E402
+from chains.usage import collect_usage  # noqa: E402
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "loadgen.json")
+TEMPLATE_FILES = {
+    "PROMPT_TEMPLATE_PATH": "resume_prompt.jinja2",
+    "COVER_LETTER_TEMPLATE_PATH": "cover_letter_prompt.jinja2",
+    "QUESTION_ANSWERING_TEMPLATE_PATH": "question_answering_prompt.jinja2",
+    "RESUME_TOOL_TEMPLATE_PATH": "resume_tool_prompt.jinja2",
+    "COVER_LETTER_TOOL_TEMPLATE_PATH": "cover_letter_tool_prompt.jinja2",
+    "QUESTION_ANSWERING_TOOL_TEMPLATE_PATH": "question_answering_tool_prompt.jinja2",
+}
+# Template variables each mode renders (the agent's tools have their own prompts)
+MODE_TEMPLATES = {
+    "pipeline": ("PROMPT_TEMPLATE_PATH", "COVER_LETTER_TEMPLATE_PATH", "QUESTION_ANSWERING_TEMPLATE_PATH"),
+    "agent": ("RESUME_TOOL_TEMPLATE_PATH", "COVER_LETTER_TOOL_TEMPLATE_PATH", "QUESTION_ANSWERING_TOOL_TEMPLATE_PATH"),
+}
+COVER_LETTER_WORDS = (120, 450)
+RESUME_WORDS = (40, 300)
+WORD_RE = re.compile(r"[A-Za-z0-9+#.]+")
+
+
+def load_cases(path: str, count: int) -> List[Tuple[Any, Any, List[Dict[str, Any]]]]:
+    """Deterministic (Job, Profile, questions) cases cycling through the fixture lists."""
+    with open(path, encoding="utf-8") as handle:
+        fixtures = json.load(handle)
+    jobs, profiles = fixtures["jobs"], fixtures["profiles"]
+    question_sets = fixtures.get("question_sets") or [[]]
+    cases = []
+    for i in range(count):
+        questions = [dict(q, options=q.get("options", [])) for q in question_sets[i % len(question_sets)]]
+        cases.append((apply_service_pb2.Job(**jobs[i % len(jobs)]),
+                      apply_service_pb2.Profile(**profiles[i % len(profiles)]),
+                      questions))
+    return cases
+
+
+def grid(args: argparse.Namespace) -> Iterator[Dict[str, str]]:
+    axes = {
+        "model": args.models.split(","),
+        "temperature": args.temperatures.split(","),
+        "template": args.templates.split(","),
+        "mode": args.modes.split(","),
+        "limits": args.limits.split(","),
+    }
+    for values in itertools.product(*axes.values()):
+        yield dict(zip(axes, values))
+
+
+def cell_env(config: Dict[str, str]) -> Dict[str, Optional[str]]:
+    """Environment for a grid cell; None removes the variable."""
+    env: Dict[str, Optional[str]] = {
+        "OLLAMA_MODEL": config["model"],
+        "LLM_TEMPERATURE": None if config["temperature"] == "default" else config["temperature"],
+        "GENERATION_PROFILES_ENABLED": "false" if config["limits"] == "off" else "true",
+    }
+    for name, filename in TEMPLATE_FILES.items():
+        path = os.path.join(config["template"], filename)
+        env[name] = path if config["template"] != "default" and os.path.exists(path) else None
+    if config["limits"] not in ("adaptive", "off"):
+        # Scaled budgets reuse the load governor's short_budget step
+        env["LOAD_DEGRADATION_STEPS"] = "short_budget"
+        env["LOAD_BUDGET_SCALE"] = config["limits"]
+    return env
+
+
+def effective_config(config: Dict[str, str], env: Dict[str, Optional[str]]) -> Tuple[Any, ...]:
+    """What a cell actually runs: its axes, with the template reduced to the files its mode renders."""
+    templates = tuple(env[name] for name in MODE_TEMPLATES[config["mode"]])
+    return config["model"], config["temperature"], config["mode"], config["limits"], templates
+
+
+def set_env(env: Dict[str, Optional[str]]) -> Dict[str, Optional[str]]:
+    """Apply env and return the previous values."""
+    previous = {name: os.environ.get(name) for name in env}
+    for name, value in env.items():
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
+    return previous
+
+
+def word_count(text: str) -> int:
+    return len(WORD_RE.findall(text))
+
+
+def quality(job: Any, questions: List[Dict[str, Any]], result: Dict[str, Any], degraded: set) -> Dict[str, Any]:
+    keywords = extract_keywords(f"{job.title}\n{job.description}", limit=12)
+    generated = f"{result.get('refined_resume', '')}\n{result.get('cover_letter', '')}".lower()
+    coverage = sum(1 for word in keywords if word in generated) / len(keywords) if keywords else 1.0
+
+    answers = result.get("answers") or []
+    answers_valid = None
+    if questions:
+        answers_valid = ("answers" not in degraded and len(answers) == len(questions)
+                         and all(str(a.get("answer", "")).strip() for a in answers))
+
+    cover_words = word_count(result.get("cover_letter", ""))
+    resume_words = word_count(result.get("refined_resume", ""))
+    length_ok = (COVER_LETTER_WORDS[0] <= cover_words <= COVER_LETTER_WORDS[1]
+                 and RESUME_WORDS[0] <= resume_words <= RESUME_WORDS[1])
+
+    checks = [coverage, float(length_ok)] + ([float(answers_valid)] if answers_valid is not None else [])
+    score = 0.0 if degraded or not result.get("success") else sum(checks) / len(checks)
+    return {
+        "keyword_coverage": round(coverage, 3),
+        "answers_valid": answers_valid,
+        "length_ok": length_ok,
+        "cover_letter_words": cover_words,
+        "resume_words": resume_words,
+        "degraded": sorted(degraded),
+        "score": round(score, 3),
+    }
+
+
+def run_case(config: Dict[str, str], job: Any, profile: Any, questions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    level = 1 if config["limits"] not in ("adaptive", "off") else 0
+    started = time.perf_counter()
+    with applied(level), collect_usage() as usage, collect_degraded() as degraded:
+        if config["mode"] == "agent":
+            result = run_agentic_orchestrator(job, profile, questions or None)
+        else:
+            result = run_orchestrator_chain(job, profile, questions or None)
+    elapsed = time.perf_counter() - started
+    totals = usage.summary()
+    return {
+        "job_id": job.id,
+        "seconds": round(elapsed, 3),
+        "llm_calls": totals["llm_calls"],
+        "prompt_tokens": totals["prompt_tokens"],
+        "eval_tokens": totals["eval_tokens"],
+        **quality(job, questions, result, degraded),
+    }
+
+
+def summarize(config: Dict[str, str], cases: List[Dict[str, Any]]) -> Dict[str, Any]:
+    latencies = sorted(case["seconds"] for case in cases)
+    answered = [case["answers_valid"] for case in cases if case["answers_valid"] is not None]
+    return {
+        **config,
+        "cases": len(cases),
+        "p50_seconds": round(statistics.median(latencies), 3),
+        "p95_seconds": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3),
+        "mean_llm_calls": round(statistics.mean(c["llm_calls"] for c in cases), 2),
+        "mean_prompt_tokens": round(statistics.mean(c["prompt_tokens"] for c in cases), 1),
+        "mean_eval_tokens": round(statistics.mean(c["eval_tokens"] for c in cases), 1),
+        "keyword_coverage": round(statistics.mean(c["keyword_coverage"] for c in cases), 3),
+        "answers_valid_rate": round(sum(answered) / len(answered), 3) if answered else None,
+        "length_ok_rate": round(sum(c["length_ok"] for c in cases) / len(cases), 3),
+        "degraded_cases": sum(1 for c in cases if c["degraded"]),
+        "quality": round(statistics.mean(c["score"] for c in cases), 3),
+    }
+
+
+def mark_pareto(rows: List[Dict[str, Any]]) -> None:
+    """Flag rows no other row beats on both p50 latency (lower) and quality (higher)."""
+    for row in rows:
+        row["pareto"] = not any(
+            other is not row
+            and other["p50_seconds"] <= row["p50_seconds"] and other["quality"] >= row["quality"]
+            and (other["p50_seconds"] < row["p50_seconds"] or other["quality"] > row["quality"])
+            for other in rows
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--models", default=os.getenv("OLLAMA_MODEL", "llama3.2:3b"))
+    parser.add_argument("--temperatures", default="default")
+    parser.add_argument("--templates", default="default")
+    parser.add_argument("--modes", default="pipeline,agent")
+    parser.add_argument("--limits", default="adaptive")
+    parser.add_argument("--cases", type=int, default=4, help="Fixture cases per configuration")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES)
+    parser.add_argument("--output", help="Write configurations and per-case results as JSON")
+    args = parser.parse_args()
+
+    cases = load_cases(args.fixtures, args.cases)
+    rows, details = [], []
+    seen: Dict[Tuple[Any, ...], Dict[str, str]] = {}
+    for config in grid(args):
+        env = cell_env(config)
+        key = effective_config(config, env)
+        if key in seen:
+            print(f"[SWEEP] Skipping {config}: {config['mode']} mode uses none of its template files, "
+                  f"same as {seen[key]}", file=sys.stderr, flush=True)
+            continue
+        seen[key] = config
+        previous = set_env(env)
+        for profile in PROFILES.values():
+            profile.reset()  # budgets learned in one cell must not leak into the next
+        try:
+            # Chain logging goes to stderr so stdout carries only the report
+            with contextlib.redirect_stdout(sys.stderr):
+                results = [run_case(config, job, profile, questions) for job, profile, questions in cases]
+        finally:
+            set_env(previous)
+        row = summarize(config, results)
+        rows.append(row)
+        details.append({"config": config, "cases": results})
+        print(f"[SWEEP] {config}: p50 {row['p50_seconds']}s, quality {row['quality']}", file=sys.stderr, flush=True)
+
+    mark_pareto(rows)
+    rows.sort(key=lambda row: row["p50_seconds"])
+    print(f"{'model':<16} {'temp':>7} {'template':<12} {'mode':<9} {'limits':<9} {'p50 s':>7} {'p95 s':>7} "
+          f"{'calls':>6} {'eval tok':>9} {'coverage':>9} {'qa ok':>6} {'len ok':>7} {'quality':>8} pareto")
+    for row in rows:
+        qa = "-" if row["answers_valid_rate"] is None else f"{row['answers_valid_rate']:.2f}"
+        print(f"{row['model']:<16} {row['temperature']:>7} {os.path.basename(row['template'].rstrip('/')):<12} "
+              f"{row['mode']:<9} {row['limits']:<9} {row['p50_seconds']:>7.2f} {row['p95_seconds']:>7.2f} "
+              f"{row['mean_llm_calls']:>6.1f} {row['mean_eval_tokens']:>9.0f} {row['keyword_coverage']:>9.2f} "
+              f"{qa:>6} {row['length_ok_rate']:>7.2f} {row['quality']:>8.2f} {'*' if row['pareto'] else ''}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump({"configurations": rows, "runs": details}, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
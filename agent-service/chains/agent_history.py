@@ -0,0 +1,143 @@
+"""
+Bounded message history for the agentic orchestrator
+
+In a ReAct loop every tool result stays in the message list and is sent to
+the model again on each planner turn. With full resumes, cover letters and
+answer JSON as tool results, the prompt grows with every turn and with the
+length of every output.
+
+Instead, tools run through an ObservationStore:
+- The full output stays server-side (for result extraction and checkpoints)
+- The model sees a compact observation: status, length, a short excerpt and
+  a reference ("@resume") it can pass to later tools in place of the text
+- Tool arguments that are references ("@job", "@profile", "@resume", ...)
+  are replaced with the stored text before the tool runs
+
+bounded_history() is the agent's pre-model hook: it keeps the task message
+and as many of the most recent messages as fit in AGENT_HISTORY_MAX_TOKENS.
+"""
+import json
+import os
+from typing import Any, Dict, List
+
+from langchain_core.messages import BaseMessage, ToolMessage
+from langchain_core.tools import BaseTool, StructuredTool
+
+from chains.usage import stage as usage_stage
+
+TOOL_STAGES = {
+    "tailor_resume": "resume",
+    "generate_cover_letter": "cover_letter",
+    "answer_application_questions": "answers",
+}
+
+CHARS_PER_TOKEN = 4  # rough average for English text and JSON
+
+
+def compaction_enabled() -> bool:
+    return os.getenv("AGENT_COMPACT_OBSERVATIONS", "true").lower() != "false"
+
+
+def approx_tokens(message: BaseMessage) -> int:
+    """Approximate token count of a message, including its tool call arguments."""
+    chars = len(str(message.content))
+    for call in getattr(message, "tool_calls", None) or []:
+        chars += len(call.get("name", "")) + len(json.dumps(call.get("args", {})))
+    return chars // CHARS_PER_TOKEN + 4
+
+
+class ObservationStore:
+    """Full tool outputs for one agent run, keyed by reference name.
+
+    Args:
+        refs: Initial references, e.g. {"job": job_json, "profile": profile_json}
+        excerpt_chars: Characters of each output shown to the model
+    """
+
+    def __init__(self, refs: Dict[str, str] = None, excerpt_chars: int = None):
+        self.refs: Dict[str, str] = dict(refs or {})
+        self.outputs: Dict[str, Any] = {}  # stage -> parsed output of successful calls
+        self.excerpt_chars = excerpt_chars if excerpt_chars is not None else int(
+            os.getenv("AGENT_OBSERVATION_EXCERPT_CHARS", "200"))
+        self.compact = compaction_enabled()
+
+    def resolve(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace "@name" argument values with the stored text."""
+        resolved = {}
+        for key, value in args.items():
+            if isinstance(value, str) and value.strip().startswith("@"):
+                value = self.refs.get(value.strip()[1:], value)
+            resolved[key] = value
+        return resolved
+
+    def record(self, tool_name: str, output: Any) -> str:
+        """Store a tool's full output; returns what the model sees."""
+        text = str(getattr(output, "content", output))
+        stage = TOOL_STAGES.get(tool_name, tool_name)
+        ok = not text.startswith("Error:")
+        if stage == "answers":
+            try:
+                answers = json.loads(text)
+            except json.JSONDecodeError:
+                answers = None
+            ok = isinstance(answers, list) and bool(answers)
+            if ok:
+                self.outputs[stage] = answers
+        elif ok and stage in TOOL_STAGES.values():
+            self.outputs[stage] = text
+        if ok:
+            self.refs[stage] = text
+        if not self.compact:
+            return text
+        if not ok:
+            return f"status: error | {text[:self.excerpt_chars]}"
+        excerpt = " ".join(text.split())[:self.excerpt_chars]
+        return (f"status: ok | chars: {len(text)} | ref: @{stage}\n"
+                f"excerpt: {excerpt}{'...' if len(text) > len(excerpt) else ''}")
+
+    def wrap(self, inner: BaseTool) -> BaseTool:
+        """Same tool for the model; arguments resolved and output recorded here."""
+
+        def run(**kwargs: Any) -> str:
+            with usage_stage(TOOL_STAGES.get(inner.name, inner.name)):
+                output = inner.invoke(self.resolve(kwargs))
+            return self.record(inner.name, output)
+
+        return StructuredTool.from_function(
+            func=run,
+            name=inner.name,
+            description=inner.description,
+            args_schema=inner.args_schema,
+        )
+
+
+def bounded_history(messages: List[BaseMessage], max_tokens: int) -> List[BaseMessage]:
+    """
+    Task message plus the most recent messages that fit in max_tokens
+
+    The most recent message is always kept. A ToolMessage is never kept
+    without the AI message that called the tool, even if that exceeds the budget.
+    """
+    if len(messages) <= 2:
+        return list(messages)
+    head, rest = messages[0], messages[1:]
+    kept: List[BaseMessage] = []
+    used = 0
+    for message in reversed(rest):
+        cost = approx_tokens(message)
+        if kept and used + cost > max_tokens and not isinstance(kept[-1], ToolMessage):
+            break
+        kept.append(message)
+        used += cost
+    kept.reverse()
+    return [head] + kept
+
+
+def history_hook(max_tokens: int = None):
+    """pre_model_hook for create_react_agent; state["messages"] is left untouched."""
+    budget = max_tokens if max_tokens is not None else int(os.getenv("AGENT_HISTORY_MAX_TOKENS", "2000"))
+
+    def hook(state: Dict[str, Any]) -> Dict[str, Any]:
+        return {"llm_input_messages": bounded_history(state["messages"], budget)}
+
+    return hook
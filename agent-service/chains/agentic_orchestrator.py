@@ -12,12 +12,18 @@ from typing import Any, Dict, List, Optional
 from langgraph.prebuilt import create_react_agent
 from langchain_core.messages import HumanMessage
 
-from chains.llm_config import get_llm
+from chains.agent_history import ObservationStore, history_hook
+from chains.circuit_breaker import CircuitOpenError
+from chains.llm_config import get_llm, llm_available
+from chains.orchestrator_chain import run_orchestrator_chain
 from chains.resume_tool import tailor_resume
 from chains.cover_letter_tool import generate_cover_letter
 from chains.question_answering_tool import answer_application_questions
 from chains.common import to_dict, profile_to_dict
-
+from chains.degradation import active as degradation_active, current_level
+from chains.fallbacks import collect_degraded
+from chains.stage_checkpoints import StageCheckpoints, checkpoints_enabled
+from chains.usage import UsageCallback
 
 # Agent system prompt
 AGENT_SYSTEM_PROMPT = """You are an expert job application assistant that helps candidates apply to jobs.
@@ -57,6 +63,27 @@ Question: {input}
 Thought:{agent_scratchpad}"""
 
 
+def run_degraded(
+    job_obj: Any,
+    profile_obj: Any,
+    questions: Optional[List[Dict[str, Any]]],
+    model: str = None,
+    checkpoints: Optional[StageCheckpoints] = None,
+) -> Dict[str, Any]:
+    """Run the fixed pipeline instead of the agent while the LLM circuit is open.
+
+    The sequential chains fail fast against an open breaker and return cached
+    or template-only output, so this completes in milliseconds.
+    """
+    print("[AGENTIC_ORCHESTRATOR] LLM backend unavailable, using degraded sequential pipeline")
+    results = run_orchestrator_chain(job_obj, profile_obj, questions, model=model, checkpoints=checkpoints)
+    results["agent_reasoning"] = ""
+    results["degraded"] = True
+    if results["success"]:
+        results["message"] = "Application completed in degraded mode (LLM backend unavailable)"
+    return results
+
+
 def run_agentic_orchestrator(
     job_obj: Any,
     profile_obj: Any,
@@ -69,6 +96,10 @@ def run_agentic_orchestrator(
     The agent will intelligently decide which tools to use and in what order,
     potentially using outputs from one tool as context for another.
 
+    Stage outputs are checkpointed as each tool finishes. If some stages of
+    the same request were already checkpointed (a retry), only the missing
+    stages are generated, by the sequential chains instead of the agent.
+
     Args:
         job_obj: Job object with title, company, description, etc.
         profile_obj: Profile object with name, email, resume_text, etc.
@@ -82,25 +113,44 @@ def run_agentic_orchestrator(
             "answers": [{"question": "...", "answer": "..."}],
             "success": bool,
             "message": str,
-            "agent_reasoning": str  # Agent's thought process
+            "agent_reasoning": str,  # Agent's thought process
+            "reused_stages": [str]
         }
     """
+    job_dict = to_dict(job_obj)
+    profile_dict = profile_to_dict(profile_obj)
+    checkpoints = StageCheckpoints(job_dict, profile_dict, questions, model) if checkpoints_enabled() else None
+
+    if not llm_available(model):
+        return run_degraded(job_obj, profile_obj, questions, model, checkpoints)
+
+    if degradation_active("pipeline"):
+        print(f"[AGENTIC_ORCHESTRATOR] Load level {current_level()}, using the sequential pipeline")
+        results = run_orchestrator_chain(job_obj, profile_obj, questions, model=model, checkpoints=checkpoints)
+        results["agent_reasoning"] = ""
+        return results
+
+    required = ["resume", "cover_letter"] + (["answers"] if questions else [])
+    if checkpoints and any(checkpoints.has(stage) for stage in required):
+        print("[AGENTIC_ORCHESTRATOR] Found checkpointed stages, running only the missing ones")
+        results = run_orchestrator_chain(job_obj, profile_obj, questions, model=model, checkpoints=checkpoints)
+        results["agent_reasoning"] = ""
+        return results
+
     results = {
         "success": False,
         "refined_resume": "",
         "cover_letter": "",
         "answers": [],
         "message": "",
-        "agent_reasoning": ""
+        "agent_reasoning": "",
+        "reused_stages": []
     }
 
     try:
         print("[AGENTIC_ORCHESTRATOR] Starting agentic application processing...")
 
         # Convert objects to JSON for tools
-        job_dict = to_dict(job_obj)
-        profile_dict = profile_to_dict(profile_obj)
-
         job_json = json.dumps(job_dict)
         profile_json = json.dumps(profile_dict)
 
@@ -108,6 +158,9 @@ def run_agentic_orchestrator(
         has_questions = questions and len(questions) > 0
         questions_json = json.dumps(questions) if has_questions else "[]"
 
+        # Full tool outputs stay here; the agent sees compact observations
+        store = ObservationStore(refs={"job": job_json, "profile": profile_json, "questions": questions_json})
+
         # Build the task description for the agent
         task_description = f"""
 Process a job application for the following:
@@ -130,26 +183,38 @@ For each tool:
 - generate_cover_letter expects: job_info (JSON string), profile_info (JSON string), tailored_resume (optional string)
 - answer_application_questions expects: job_info (JSON string), profile_info (JSON string), questions (JSON string)
 
+Pass "@job", "@profile" and "@questions" instead of copying the JSON above, and
+"@resume" as tailored_resume once the resume is done. Tool results are summarized;
+the full text is kept for the candidate.
+
 Return a final summary of what was generated.
 """
 
         # Create the agent using LangGraph
         llm = get_llm(temperature=0.1, model=model)  # Low temp for logical reasoning
+        # Planner turns are charged to their own stage; tool generations record themselves
+        llm.callbacks = list(llm.callbacks or []) + [UsageCallback(llm.model, stage="planner")]
 
         tools = [tailor_resume, generate_cover_letter]
         if has_questions:
             tools.append(answer_application_questions)
+        tools = [store.wrap(t) for t in tools]
 
-        # Create react agent graph
-        agent_executor = create_react_agent(llm, tools)
+        # Create react agent graph; the hook bounds the history sent on each planner turn
+        agent_executor = create_react_agent(llm, tools, pre_model_hook=history_hook())
 
         print(f"[AGENTIC_ORCHESTRATOR] Running agent with {len(tools)} tools...")
         print(f"[AGENTIC_ORCHESTRATOR] Task: {job_dict.get('title')} at {job_dict.get('company')}")
 
         # Execute the agent with LangGraph API
-        result = agent_executor.invoke({
-            "messages": [HumanMessage(content=task_description)]
-        })
+        with collect_degraded() as degraded:
+            try:
+                result = agent_executor.invoke({"messages": [HumanMessage(content=task_description)]})
+            finally:
+                if checkpoints:
+                    for stage, output in store.outputs.items():
+                        if stage not in degraded:
+                            checkpoints.put(stage, output)
 
         # Extract results from agent's messages
         messages = result.get("messages", [])
@@ -175,46 +240,14 @@ Return a final summary of what was generated.
 
         print(f"[AGENT TRACE] ===== End Trace =====\n")
 
-        # Extract intermediate steps from messages
-        intermediate_steps = []
-        for msg in messages:
-            if hasattr(msg, 'tool_calls') and msg.tool_calls:
-                for tool_call in msg.tool_calls:
-                    # Find the corresponding tool response
-                    for response_msg in messages:
-                        if hasattr(response_msg, 'tool_call_id') and response_msg.tool_call_id == tool_call['id']:
-                            intermediate_steps.append((tool_call, response_msg.content))
-                            break
-
         print(f"[AGENTIC_ORCHESTRATOR] Agent completed with {len(messages)} messages")
 
-        # Parse tool outputs from messages
-        for msg in messages:
-            # Check if this is a tool response message
-            if hasattr(msg, 'tool_call_id') and hasattr(msg, 'content'):
-                # Find the corresponding tool call to get the tool name
-                for call_msg in messages:
-                    if hasattr(call_msg, 'tool_calls'):
-                        for tool_call in call_msg.tool_calls:
-                            if tool_call.get('id') == msg.tool_call_id:
-                                tool_name = tool_call.get('name')
-                                observation = msg.content
-
-                                if tool_name == "tailor_resume":
-                                    results["refined_resume"] = observation
-                                    print(f"[AGENTIC_ORCHESTRATOR] Captured resume: {len(observation)} chars")
-
-                                elif tool_name == "generate_cover_letter":
-                                    results["cover_letter"] = observation
-                                    print(f"[AGENTIC_ORCHESTRATOR] Captured cover letter: {len(observation)} chars")
-
-                                elif tool_name == "answer_application_questions":
-                                    try:
-                                        results["answers"] = json.loads(observation)
-                                        print(f"[AGENTIC_ORCHESTRATOR] Captured {len(results['answers'])} answers")
-                                    except json.JSONDecodeError:
-                                        print(f"[AGENTIC_ORCHESTRATOR] Warning: Could not parse answers JSON")
-                                        results["answers"] = []
+        # Full tool outputs come from the store, not from the (compacted) messages
+        results["refined_resume"] = store.outputs.get("resume", "")
+        results["cover_letter"] = store.outputs.get("cover_letter", "")
+        results["answers"] = store.outputs.get("answers", [])
+        print(f"[AGENTIC_ORCHESTRATOR] Captured resume: {len(results['refined_resume'])} chars, "
+              f"cover letter: {len(results['cover_letter'])} chars, {len(results['answers'])} answers")
 
         # Store agent reasoning
         results["agent_reasoning"] = agent_output
@@ -223,6 +256,10 @@ Return a final summary of what was generated.
 
         print("[AGENTIC_ORCHESTRATOR] Agent processing completed successfully")
 
+    except CircuitOpenError as exc:
+        print(f"[AGENTIC_ORCHESTRATOR] {exc}")
+        return run_degraded(job_obj, profile_obj, questions, model, checkpoints)
+
     except Exception as exc:
         print(f"[AGENTIC_ORCHESTRATOR] Error: {exc}")
         results["message"] = f"Agentic orchestration failed: {str(exc)}"
@@ -0,0 +1,192 @@
+"""
+Two-tier cache shared by the agent service
+
+Entries live in a bounded in-process LRU and, optionally, in a SQLite file so
+they survive restarts and can be shared by every process on the host.
+Values must be JSON-serializable. Each thread keeps one SQLite connection per
+file: opening one costs far more than the lookup itself.
+
+The SQLite table of each namespace is bounded too: rows older than the
+namespace's TTL are ignored and pruned, and beyond max_rows the oldest
+writes are dropped. Pruning runs every PRUNE_INTERVAL writes.
+"""
+import hashlib
+import json
+import os
+import pathlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+DEFAULT_CACHE_DIR = pathlib.Path(__file__).parent.parent / ".cache"
+PRUNE_INTERVAL = 256  # writes between two prunes of a namespace's table
+
+_connections = threading.local()  # .by_path: {db path: connection}, .pid: process that opened them
+
+
+def content_hash(*parts: Any) -> str:
+    """Stable SHA-256 hex digest over strings or JSON-serializable values."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if not isinstance(part, str):
+            part = json.dumps(part, sort_keys=True, default=str)
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def cache_dir() -> pathlib.Path:
+    env_dir = os.getenv("AGENT_CACHE_DIR")
+    return pathlib.Path(env_dir) if env_dir else DEFAULT_CACHE_DIR
+
+
+class TieredCache:
+    """In-memory LRU in front of an optional SQLite table.
+
+    Args:
+        namespace: Table name, also used for log prefixes
+        max_entries: Capacity of the in-memory tier
+        persistent: Whether to back the memory tier with SQLite
+        max_rows: Capacity of the SQLite table (0 = unbounded); defaults to AGENT_CACHE_MAX_ROWS
+        ttl_seconds: Age after which persisted rows expire (0 = never); defaults to
+            AGENT_CACHE_TTL_SECONDS
+    """
+
+    def __init__(self, namespace: str, max_entries: int = 512, persistent: bool = True,
+                 max_rows: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.max_rows = max_rows if max_rows is not None else int(os.getenv("AGENT_CACHE_MAX_ROWS", "20000"))
+        self.ttl_seconds = (ttl_seconds if ttl_seconds is not None
+                            else float(os.getenv("AGENT_CACHE_TTL_SECONDS", "2592000")))
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_path: Optional[pathlib.Path] = None
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+
+        if persistent and os.getenv("AGENT_CACHE_PERSIST", "true").lower() != "false":
+            try:
+                directory = cache_dir()
+                directory.mkdir(parents=True, exist_ok=True)
+                self._db_path = directory / "agent_cache.sqlite3"
+                with self._connect() as conn:
+                    conn.execute(
+                        f"CREATE TABLE IF NOT EXISTS {namespace} "
+                        "(key TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at REAL NOT NULL DEFAULT 0)"
+                    )
+                    columns = [row[1] for row in conn.execute(f"PRAGMA table_info({namespace})")]
+                    if "updated_at" not in columns:  # table created before rows were timestamped
+                        conn.execute(f"ALTER TABLE {namespace} ADD COLUMN updated_at REAL NOT NULL DEFAULT 0")
+                        conn.execute(f"UPDATE {namespace} SET updated_at = ?", (time.time(),))
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS {namespace}_updated_at ON {namespace} (updated_at)")
+                self.prune()
+            except (OSError, sqlite3.Error) as exc:
+                print(f"[CACHE] {namespace}: persistent tier disabled ({exc})")
+                self._db_path = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """This thread's connection to the cache file (a forked worker opens its own)."""
+        if getattr(_connections, "pid", None) != os.getpid():
+            _connections.by_path, _connections.pid = {}, os.getpid()
+        conn = _connections.by_path.get(self._db_path)
+        if conn is None:
+            conn = sqlite3.connect(str(self._db_path), timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            _connections.by_path[self._db_path] = conn
+        return conn
+
+    def get(self, key: str, fresh: bool = False) -> Optional[Any]:
+        """Cached value or None; fresh=True skips the memory tier, for keys other processes overwrite."""
+        with self._lock:
+            if key in self._memory and not (fresh and self._db_path):
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+
+        value = None
+        if self._db_path:
+            try:
+                with self._connect() as conn:
+                    row = conn.execute(
+                        f"SELECT value FROM {self.namespace} WHERE key = ? AND updated_at >= ?",
+                        (key, self._oldest()),
+                    ).fetchone()
+                if row:
+                    value = json.loads(row[0])
+            except sqlite3.Error as exc:
+                print(f"[CACHE] {self.namespace}: read failed ({exc})")
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, value)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._remember(key, value)
+
+        if self._db_path:
+            try:
+                with self._connect() as conn:
+                    conn.execute(
+                        f"INSERT OR REPLACE INTO {self.namespace} (key, value, updated_at) VALUES (?, ?, ?)",
+                        (key, json.dumps(value), time.time()),
+                    )
+            except sqlite3.Error as exc:
+                print(f"[CACHE] {self.namespace}: write failed ({exc})")
+                return
+            with self._lock:
+                self._writes += 1
+                due = self._writes % PRUNE_INTERVAL == 0
+            if due:
+                self.prune()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._memory.pop(key, None)
+
+        if self._db_path:
+            try:
+                with self._connect() as conn:
+                    conn.execute(f"DELETE FROM {self.namespace} WHERE key = ?", (key,))
+            except sqlite3.Error as exc:
+                print(f"[CACHE] {self.namespace}: delete failed ({exc})")
+
+    def prune(self) -> int:
+        """Drop expired rows and the oldest rows beyond max_rows; returns the number removed."""
+        if not self._db_path:
+            return 0
+        removed = 0
+        try:
+            with self._connect() as conn:
+                if self.ttl_seconds > 0:
+                    removed += conn.execute(
+                        f"DELETE FROM {self.namespace} WHERE updated_at < ?", (self._oldest(),)
+                    ).rowcount
+                if self.max_rows > 0:
+                    removed += conn.execute(
+                        f"DELETE FROM {self.namespace} WHERE key IN (SELECT key FROM {self.namespace} "
+                        "ORDER BY updated_at DESC LIMIT -1 OFFSET ?)", (self.max_rows,)
+                    ).rowcount
+        except sqlite3.Error as exc:
+            print(f"[CACHE] {self.namespace}: prune failed ({exc})")
+        if removed:
+            print(f"[CACHE] {self.namespace}: pruned {removed} rows", flush=True)
+        return removed
+
+    def _oldest(self) -> float:
+        """Write time before which a persisted row has expired."""
+        return time.time() - self.ttl_seconds if self.ttl_seconds > 0 else float("-inf")
+
+    def _remember(self, key: str, value: Any) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
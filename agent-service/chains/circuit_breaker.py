@@ -0,0 +1,239 @@
+"""
+Circuit breaker around LLM backends
+
+One breaker per (base_url, model). Outcomes of recent calls are kept in a
+sliding window; the breaker opens when the error rate or the slow-call rate
+over that window crosses its threshold. While open, calls fail immediately
+with CircuitOpenError so callers can serve a cached or template-only
+response instead of hanging on a dead backend. After a cooldown the breaker
+goes half-open and lets a few probe calls through: successes close it,
+a failure re-opens it.
+
+The breaker hooks into LangChain through BreakerCallback, so every
+ChatOllama built by this service (plain chains, tools and the ReAct planner)
+is guarded without wrapping each call site. The native client
+(chains/ollama_client.py) calls its breaker directly.
+"""
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from uuid import UUID
+
+try:
+    from langchain_core.callbacks import BaseCallbackHandler
+except ImportError:
+    BaseCallbackHandler = object  # type: ignore
+
+from chains import metrics
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a backend whose breaker is open."""
+
+
+class StreamAborted(Exception):
+    """Raised in a call whose connection another thread cut (a hedge that lost); not a backend failure."""
+
+
+class CircuitBreaker:
+    """Error-rate and latency based breaker for one backend/model.
+
+    Args:
+        name: Label used in logs and metrics ("<base_url>|<model>")
+        window: Number of recent calls considered
+        min_calls: Calls required in the window before the breaker may trip
+        failure_rate: Fraction of failed calls that trips the breaker
+        slow_call_seconds: Calls slower than this count as slow
+        slow_rate: Fraction of slow calls that trips the breaker
+        cooldown_seconds: Time spent open before probing
+        half_open_probes: Concurrent probe calls allowed while half-open
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 20,
+        min_calls: int = 5,
+        failure_rate: float = 0.5,
+        slow_call_seconds: float = 60.0,
+        slow_rate: float = 0.8,
+        cooldown_seconds: float = 30.0,
+        half_open_probes: int = 1,
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_rate = slow_rate
+        self.cooldown_seconds = cooldown_seconds
+        self.half_open_probes = half_open_probes
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window)  # (failed, slow)
+        self._probes = 0
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[["CircuitBreaker"], None]] = []
+        self._publish()
+
+    @classmethod
+    def from_env(cls, name: str) -> "CircuitBreaker":
+        return cls(
+            name,
+            window=int(os.getenv("LLM_BREAKER_WINDOW", "20")),
+            min_calls=int(os.getenv("LLM_BREAKER_MIN_CALLS", "5")),
+            failure_rate=float(os.getenv("LLM_BREAKER_FAILURE_RATE", "0.5")),
+            slow_call_seconds=float(os.getenv("LLM_BREAKER_SLOW_CALL_SECONDS", "60")),
+            slow_rate=float(os.getenv("LLM_BREAKER_SLOW_RATE", "0.8")),
+            cooldown_seconds=float(os.getenv("LLM_BREAKER_COOLDOWN_SECONDS", "30")),
+            half_open_probes=int(os.getenv("LLM_BREAKER_HALF_OPEN_PROBES", "1")),
+        )
+
+    def add_listener(self, listener: Callable[["CircuitBreaker"], None]) -> None:
+        self._listeners.append(listener)
+
+    def _transition(self, state: str) -> None:
+        """Change state. Caller holds the lock; listeners run after release."""
+        if state == self.state:
+            return
+        print(f"[BREAKER] {self.name}: {self.state} -> {state}", flush=True)
+        self.state = state
+        if state == OPEN:
+            self.opened_at = time.monotonic()
+            metrics.inc("llm_breaker_trips_total", breaker=self.name)
+        if state != HALF_OPEN:
+            self._probes = 0
+        if state == CLOSED:
+            self._outcomes.clear()
+
+    def _publish(self) -> None:
+        metrics.set_gauge("llm_breaker_state", STATE_VALUES[self.state], breaker=self.name)
+        for listener in self._listeners:
+            listener(self)
+
+    def available(self) -> bool:
+        """Whether a call would currently be allowed (without reserving a probe)."""
+        with self._lock:
+            if self.state == OPEN:
+                return time.monotonic() - self.opened_at >= self.cooldown_seconds
+            return self.state == CLOSED or self._probes < self.half_open_probes
+
+    def acquire(self) -> None:
+        """Reserve permission for one call or raise CircuitOpenError."""
+        with self._lock:
+            before = self.state
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.cooldown_seconds:
+                self._transition(HALF_OPEN)
+            if self.state == HALF_OPEN and self._probes < self.half_open_probes:
+                self._probes += 1
+                allowed = True
+            else:
+                allowed = self.state == CLOSED
+            changed = before != self.state
+        if changed:
+            self._publish()
+        if not allowed:
+            metrics.inc("llm_breaker_rejected_total", breaker=self.name)
+            raise CircuitOpenError(f"LLM backend {self.name} is unavailable (circuit open)")
+
+    def record(self, failed: bool, duration: float) -> None:
+        slow = duration >= self.slow_call_seconds
+        with self._lock:
+            before = self.state
+            if self.state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+                self._transition(OPEN if failed or slow else CLOSED)
+            elif self.state == CLOSED:
+                self._outcomes.append((failed, slow))
+                total = len(self._outcomes)
+                if total >= self.min_calls:
+                    failures = sum(1 for f, _ in self._outcomes if f)
+                    slows = sum(1 for _, s in self._outcomes if s)
+                    if failures / total >= self.failure_rate or slows / total >= self.slow_rate:
+                        self._transition(OPEN)
+            changed = before != self.state
+        if changed:
+            self._publish()
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """Run fn under the breaker, recording its outcome."""
+        self.acquire()
+        started = time.monotonic()
+        try:
+            result = fn()
+        except Exception:
+            self.record(True, time.monotonic() - started)
+            raise
+        self.record(False, time.monotonic() - started)
+        return result
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+_global_listeners: List[Callable[[CircuitBreaker], None]] = []
+
+
+def get_breaker(base_url: str, model: str) -> CircuitBreaker:
+    name = f"{base_url}|{model}"
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker.from_env(name)
+            for listener in _global_listeners:
+                breaker.add_listener(listener)
+            _breakers[name] = breaker
+    return breaker
+
+
+def add_state_listener(listener: Callable[[CircuitBreaker], None]) -> None:
+    """Subscribe to state changes of every current and future breaker."""
+    with _breakers_lock:
+        _global_listeners.append(listener)
+        existing = list(_breakers.values())
+    for breaker in existing:
+        breaker.add_listener(listener)
+        listener(breaker)
+
+
+def breaker_states() -> Dict[str, str]:
+    with _breakers_lock:
+        return {name: breaker.state for name, breaker in _breakers.items()}
+
+
+class BreakerCallback(BaseCallbackHandler):
+    """LangChain callback that guards and records chat model calls."""
+
+    raise_error = True  # let CircuitOpenError propagate out of on_chat_model_start
+
+    def __init__(self, breaker: CircuitBreaker):
+        self.breaker = breaker
+        self._started: Dict[UUID, float] = {}
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self.breaker.acquire()
+        self._started[run_id] = time.monotonic()
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        started = self._started.pop(run_id, None)
+        if started is not None:
+            self.breaker.record(False, time.monotonic() - started)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        started = self._started.pop(run_id, None)
+        if started is None:
+            return
+        # GeneratorExit means the caller closed a stream that was producing tokens
+        # (early termination), StreamAborted that a hedge lost; the backend was healthy
+        self.breaker.record(not isinstance(error, (GeneratorExit, StreamAborted)), time.monotonic() - started)
+
+
+def breaker_callbacks(base_url: str, model: str) -> Optional[List[BaseCallbackHandler]]:
+    if os.getenv("LLM_BREAKER_ENABLED", "true").lower() == "false":
+        return None
+    return [BreakerCallback(get_breaker(base_url, model))]
@@ -1,19 +1,29 @@
+import functools
 import os
 import pathlib
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from jinja2 import Template
 
-try:
-    from langchain_ollama import ChatOllama
-    from langchain_core.output_parsers import StrOutputParser
-except ImportError:
-    ChatOllama = None  # type: ignore
-    StrOutputParser = None  # type: ignore
+from chains.cache import TieredCache, content_hash
+from chains.circuit_breaker import CircuitOpenError, breaker_callbacks
+from chains.degradation import model_for
+from chains.generation_profiles import get_profile, stream_text
+from chains.hedging import hedged_invoke, hedging_enabled
+from chains.job_digest import apply_digest
+from chains.llm_backends import backend_name, batched_generate
+from chains.ollama_client import OllamaChat
+from chains.question_rules import attributes_to_dict
+from chains.resume_ingest import resume_text_for
+from chains.skill_extraction import extract_skills
+from chains.usage import llm_stats, record_cache_hit, record_llm_call
+
+# Last good response per prompt, served while the backend's circuit is open
+_last_good = TieredCache("llm_last_good", max_entries=int(os.getenv("LLM_LAST_GOOD_CACHE_SIZE", "256")))
 
 
 def to_dict(obj: Any) -> Dict[str, Any]:
-    return {
+    job = {
         "id": getattr(obj, "id", ""),
         "title": getattr(obj, "title", ""),
         "company": getattr(obj, "company", ""),
@@ -28,51 +38,183 @@ def to_dict(obj: Any) -> Dict[str, Any]:
         "benefits": list(getattr(obj, "benefits", [])),
         "requirements": list(getattr(obj, "requirements", [])),
     }
+    return apply_digest(job)
 
 
 def profile_to_dict(profile: Any) -> Dict[str, Any]:
+    resume_text = getattr(profile, "resume_text", "")
+    resume_id = getattr(profile, "resume_id", "")
+    if resume_id:
+        # An ingested document stands in for the flattened resume_text
+        ingested = resume_text_for(resume_id)
+        if ingested is None:
+            print(f"[AGENT] Unknown resume_id {resume_id}, using resume_text")
+        resume_text = ingested or resume_text
+    headline = getattr(profile, "headline", "")
+    summary = getattr(profile, "summary", "")
+    skills = list(getattr(profile, "skills", []))
+    if not skills:
+        # Clients rarely send skills; take them from the profile text
+        skills = extract_skills("\n".join([headline, summary, resume_text]),
+                                limit=int(os.getenv("SKILL_EXTRACTION_MAX_PROFILE_SKILLS", "20")))
     return {
         "name": getattr(profile, "name", ""),
         "email": getattr(profile, "email", ""),
-        "headline": getattr(profile, "headline", ""),
-        "summary": getattr(profile, "summary", ""),
-        "skills": list(getattr(profile, "skills", [])),
-        "resume_text": getattr(profile, "resume_text", ""),
+        "headline": headline,
+        "summary": summary,
+        "skills": skills,
+        "resume_text": resume_text,
+        "attributes": attributes_to_dict(getattr(profile, "attributes", None)),
     }
 
 
+# path -> (mtime_ns, text): a stat per load instead of a read, and an edited template still takes effect
+_templates: Dict[str, Tuple[int, str]] = {}
+
+
 def load_template(env_var: str, default_path: pathlib.Path, fallback_template: str) -> str:
     env_path = os.getenv(env_var)
     path = pathlib.Path(env_path) if env_path else default_path
-    if path.exists():
-        return path.read_text(encoding="utf-8")
-    return fallback_template
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        return fallback_template
+    cached = _templates.get(str(path))
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    text = path.read_text(encoding="utf-8")
+    _templates[str(path)] = (mtime, text)
+    return text
+
+
+@functools.lru_cache(maxsize=32)
+def compile_template(template_str: str) -> Template:
+    """Compiled template, once per template text (compiling costs milliseconds, rendering microseconds)."""
+    return Template(template_str)
 
 
 def render_template(template_str: str, **kwargs: Any) -> str:
-    template = Template(template_str)
-    return template.render(**kwargs)
+    return compile_template(template_str).render(**kwargs)
 
 
-def run_llm(prompt: str, temperature: float, model: Optional[str]) -> Optional[str]:
-    if not ChatOllama:
+def chat_ollama_class() -> Optional[Any]:
+    """ChatOllama, imported on first use (LLM_BACKEND=native never needs it), or None if missing."""
+    try:
+        from langchain_ollama import ChatOllama
+    except ImportError:
+        return None
+    return ChatOllama
+
+
+def stage_temperature(default: float) -> float:
+    """LLM_TEMPERATURE, when set, overrides every stage's sampling temperature."""
+    override = os.getenv("LLM_TEMPERATURE")
+    return float(override) if override else default
+
+
+def generate(
+    prompt: str,
+    model_name: str,
+    base_url: str,
+    make_llm: Callable[..., Any],
+    task: Optional[str] = None,
+    units: int = 1,
+    context: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Run one prompt under the task's generation profile, hedging when enabled
+
+    Args:
+        prompt: Prompt text
+        model_name: Model name
+        base_url: Primary backend
+        make_llm: make_llm(base_url, transport=None, **options) -> chat model; hedged
+            attempts pass their own transport
+        task: Generation profile name ("resume", "cover_letter", "answers")
+        units: Size of the task input the budget scales with (e.g. number of questions)
+        context: Values for the completion detector (e.g. the candidate's name)
+
+    Returns:
+        Generated text
+    """
+    profile = get_profile(task)
+    options = profile.options(units) if profile else {}
+
+    def new_detector() -> Optional[Any]:
+        return profile.new_detector(**(context or {})) if profile else None
+
+    stats: Dict[str, Any] = {}
+    if hedging_enabled():
+        text, tokens, stopped_early, truncated = hedged_invoke(
+            prompt, model_name, lambda url, transport: make_llm(url, transport=transport, **options),
+            new_detector, stats)
+    elif profile:
+        text, tokens, stopped_early, truncated = stream_text(
+            make_llm(base_url, **options).stream(prompt), new_detector(), stats=stats)
+    else:
+        response = make_llm(base_url).invoke(prompt)
+        record_llm_call(model_name, dict(llm_stats(response.response_metadata), prompt_chars=len(prompt)))
+        return str(response.content)
+
+    usage = llm_stats(stats)
+    usage["prompt_chars"] = len(prompt)
+    if not usage["eval_tokens"]:  # stopped early: no final counters, use the streamed count
+        usage["eval_tokens"] = tokens
+    record_llm_call(model_name, usage)
+    if profile:
+        profile.observe(tokens, options["num_predict"], units, stopped_early, truncated)
+    return text
+
+
+def run_llm(
+    prompt: str,
+    temperature: float,
+    model: Optional[str],
+    task: Optional[str] = None,
+    units: int = 1,
+    context: Optional[Dict[str, Any]] = None,
+) -> Optional[str]:
+    backend = backend_name()
+    chat_ollama = chat_ollama_class() if backend == "ollama" else None
+    if backend == "ollama" and chat_ollama is None:
         return None
+    model = model_for(task, model)
+    temperature = stage_temperature(temperature)
 
     ollama_base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
     model_name = model or os.getenv("OLLAMA_MODEL", "llama3.2")
 
-    print(f"[AGENT] Initializing Ollama: model={model_name}, base_url={ollama_base_url}")
-    llm = ChatOllama(
-        model=model_name,
-        base_url=ollama_base_url,
-        temperature=temperature,
-    )
-
-    print(f"[AGENT] Calling Ollama LLM (prompt length: {len(prompt)} chars)...")
-    if StrOutputParser:
-        parser = StrOutputParser()
-        response = llm.invoke(prompt)
-        return parser.invoke(response)
-
-    response = llm.invoke(prompt)
-    return str(response.content)
+    def make_llm(base_url: str, transport: Optional[Any] = None, **options: Any) -> Any:
+        if backend == "native":
+            return OllamaChat(model=model_name, base_url=base_url, temperature=temperature,
+                              transport=transport, **options)
+        client_kwargs: Dict[str, Any] = {"timeout": float(os.getenv("OLLAMA_TIMEOUT_SECONDS", "120"))}
+        if transport is not None:
+            client_kwargs["transport"] = transport
+        return chat_ollama(
+            model=model_name,
+            base_url=base_url,
+            temperature=temperature,
+            callbacks=breaker_callbacks(base_url, model_name),
+            client_kwargs=client_kwargs,
+            **options,
+        )
+
+    cache_key = content_hash(ollama_base_url, model_name, temperature, prompt)
+    print(f"[AGENT] Calling Ollama LLM: model={model_name}, base_url={ollama_base_url} "
+          f"(prompt length: {len(prompt)} chars)...")
+    try:
+        if backend == "openai":
+            result = batched_generate(prompt, temperature, model, task, units, context)
+        else:
+            result = generate(prompt, model_name, ollama_base_url, make_llm, task, units, context)
+    except CircuitOpenError:
+        cached = _last_good.get(cache_key)
+        if cached is None:
+            raise
+        print("[AGENT] Circuit open, serving last good response for this prompt")
+        record_cache_hit("last_good")
+        return cached
+
+    _last_good.set(cache_key, result)
+    return result
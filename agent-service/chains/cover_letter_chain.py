@@ -1,7 +1,12 @@
 import pathlib
 from typing import Any
 
+from chains.circuit_breaker import CircuitOpenError
 from chains.common import load_template, profile_to_dict, render_template, run_llm, to_dict
+from chains.degradation import active
+from chains.fallbacks import fallback_cover_letter, mark_degraded
+
+DEFAULT_COVER_LETTER_TEMPLATE_PATH = pathlib.Path(__file__).parent.parent / "templates" / "cover_letter_prompt.jinja2"
 
 DEFAULT_COVER_LETTER_TEMPLATE = """
 Write a concise, professional cover letter tailored to the job.
@@ -12,7 +17,8 @@ Job:
 - Location: {{ job.location }}
 - Type: {{ job.type }}
 - Experience: {{ job.experience }}
-- Description: {{ job.description }}
+- Description: {{ job.description }}{% if job.requirements %}
+- Requirements: {{ job.requirements | join("; ") }}{% endif %}
 
 Candidate:
 - Name: {{ profile.name }}
@@ -30,8 +36,8 @@ Constraints:
 
 
 def load_cover_letter_template() -> str:
-    default_path = pathlib.Path(__file__).parent.parent / "templates" / "cover_letter_prompt.jinja2"
-    return load_template("COVER_LETTER_TEMPLATE_PATH", default_path, DEFAULT_COVER_LETTER_TEMPLATE)
+    return load_template("COVER_LETTER_TEMPLATE_PATH", DEFAULT_COVER_LETTER_TEMPLATE_PATH,
+                         DEFAULT_COVER_LETTER_TEMPLATE)
 
 
 def run_cover_letter_chain(
@@ -42,16 +48,27 @@ def run_cover_letter_chain(
 ) -> str:
     job = to_dict(job_obj)
     profile = profile_to_dict(profile_obj)
+    if active("template_cover_letter"):
+        print("[AGENT] Under load, returning template-only cover letter.")
+        mark_degraded("cover_letter")
+        return fallback_cover_letter(job, profile)
     resume_text = profile.get("resume_text", "")
     template = template_str or load_cover_letter_template()
     prompt = render_template(template, job=job, profile=profile, resume_text=resume_text)
 
     try:
-        result = run_llm(prompt, temperature=0.3, model=model)
+        result = run_llm(prompt, temperature=0.3, model=model, task="cover_letter",
+                         context={"name": profile.get("name", "")})
         if result is not None:
             return result
+    except CircuitOpenError as exc:
+        print(f"[AGENT] {exc}. Returning template-only fallback.")
+        mark_degraded("cover_letter")
+        return fallback_cover_letter(job, profile)
     except Exception as exc:
         print(f"[AGENT] Ollama error: {exc}. Returning mock response.")
+        mark_degraded("cover_letter")
         return f"[mock-cover-letter]\n{prompt}\n\n(Ollama unavailable)"
 
+    mark_degraded("cover_letter")
     return f"[mock-cover-letter]\n{prompt}"
@@ -2,12 +2,16 @@
 Cover letter generation tool for agentic application processing
 """
 import json
+import pathlib
 from typing import Dict, Any
 from langchain_core.tools import tool
-from jinja2 import Template
 
+from chains.common import load_template, render_template
+from chains.degradation import active
+from chains.fallbacks import fallback_cover_letter, mark_degraded
 from chains.llm_config import get_llm_chain
 
+DEFAULT_TEMPLATE_PATH = pathlib.Path(__file__).parent.parent / "templates" / "cover_letter_tool_prompt.jinja2"
 
 DEFAULT_TEMPLATE = """
 You are an expert cover letter writer helping a candidate apply for a job.
@@ -17,7 +21,8 @@ Job Information:
 - Company: {{ job.company }}
 - Location: {{ job.location }}
 - Type: {{ job.type }}
-- Description: {{ job.description }}
+- Description: {{ job.description }}{% if job.requirements %}
+- Requirements: {{ job.requirements | join("; ") }}{% endif %}
 
 Candidate Profile:
 - Name: {{ profile.name }}
@@ -43,6 +48,10 @@ Return ONLY the cover letter, no preamble or explanation.
 """.strip()
 
 
+def load_cover_letter_tool_template() -> str:
+    return load_template("COVER_LETTER_TOOL_TEMPLATE_PATH", DEFAULT_TEMPLATE_PATH, DEFAULT_TEMPLATE)
+
+
 @tool
 def generate_cover_letter(job_info: str, profile_info: str, tailored_resume: str = "") -> str:
     """
@@ -65,18 +74,23 @@ def generate_cover_letter(job_info: str, profile_info: str, tailored_resume: str
         job = json.loads(job_info)
         profile = json.loads(profile_info)
 
+        if active("template_cover_letter"):
+            print("[COVER_LETTER_TOOL] Under load, returning template-only cover letter")
+            mark_degraded("cover_letter")
+            return fallback_cover_letter(job, profile)
+
         print(f"[COVER_LETTER_TOOL] Generating cover letter for: {job.get('title', 'Unknown')} at {job.get('company', 'Unknown')}")
 
         # Render prompt template
-        template = Template(DEFAULT_TEMPLATE)
-        prompt = template.render(job=job, profile=profile)
+        prompt = render_template(load_cover_letter_tool_template(), job=job, profile=profile)
 
         # Add context from tailored resume if provided
         if tailored_resume:
             prompt += f"\n\nKey points from tailored resume:\n{tailored_resume[:500]}"
 
         # Get LLM chain and invoke
-        llm_chain = get_llm_chain(temperature=0.3)  # Slightly creative for writing
+        llm_chain = get_llm_chain(temperature=0.3, task="cover_letter",  # Slightly creative for writing
+                                  context={"name": profile.get("name", "")})
 
         print(f"[COVER_LETTER_TOOL] Invoking LLM (prompt length: {len(prompt)} chars)...")
         result = llm_chain.invoke(prompt)
@@ -87,10 +101,12 @@ def generate_cover_letter(job_info: str, profile_info: str, tailored_resume: str
     except json.JSONDecodeError as e:
         error_msg = f"Invalid JSON input: {e}"
         print(f"[COVER_LETTER_TOOL] Error: {error_msg}")
+        mark_degraded("cover_letter")
         return f"Error: {error_msg}. Please provide valid JSON strings."
     except Exception as e:
         error_msg = f"Failed to generate cover letter: {str(e)}"
         print(f"[COVER_LETTER_TOOL] Error: {error_msg}")
+        mark_degraded("cover_letter")
         return f"Error: {error_msg}"
 
 
@@ -0,0 +1,73 @@
+"""
+Load-adaptive quality degradation steps
+
+Under a backlog it is better for every request to get a slightly cheaper
+result than for every request to time out. The load governor
+(load_governor.py) picks a level per request; level N enables the first N
+of the configured steps, cheapest quality loss first:
+- pipeline: the fixed sequential pipeline instead of the ReAct agent (no planner turns)
+- small_model: LOAD_SMALL_MODEL for the resume and answers stages
+- short_budget: generation budgets scaled by LOAD_BUDGET_SCALE
+- template_cover_letter: the template-only cover letter instead of a generation
+
+The server applies the level for the duration of a request with applied();
+the chains check active(step) where each step takes effect.
+"""
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+STEPS = ("pipeline", "small_model", "short_budget", "template_cover_letter")
+SMALL_MODEL_TASKS = ("resume", "answers")
+
+_level: ContextVar[int] = ContextVar("degradation_level", default=0)
+
+
+def configured_steps() -> List[str]:
+    """Steps in the order the governor enables them (LOAD_DEGRADATION_STEPS)."""
+    spec = os.getenv("LOAD_DEGRADATION_STEPS", ",".join(STEPS))
+    steps = [step.strip() for step in spec.split(",") if step.strip()]
+    unknown = [step for step in steps if step not in STEPS]
+    if unknown:
+        raise ValueError(f"Unknown degradation steps: {', '.join(unknown)} (expected {', '.join(STEPS)})")
+    return steps
+
+
+def level_name(level: int) -> str:
+    """Name of the last step a level enables, or "normal" for level 0."""
+    return configured_steps()[level - 1] if level > 0 else "normal"
+
+
+@contextmanager
+def applied(level: int) -> Iterator[None]:
+    """Run the block at a degradation level."""
+    token = _level.set(level)
+    try:
+        yield
+    finally:
+        _level.reset(token)
+
+
+def current_level() -> int:
+    return _level.get()
+
+
+def active(step: str) -> bool:
+    """Whether the current request's level enables `step`."""
+    level = _level.get()
+    return level > 0 and step in configured_steps()[:level]
+
+
+def model_for(task: Optional[str], model: Optional[str]) -> Optional[str]:
+    """The smaller model for tasks it applies to while small_model is active; else `model`."""
+    if model is None and task in SMALL_MODEL_TASKS and active("small_model"):
+        return os.getenv("LOAD_SMALL_MODEL", "llama3.2:1b")
+    return model
+
+
+def budget_scale() -> float:
+    """Factor applied to generation budgets (1.0 unless short_budget is active)."""
+    if active("short_budget"):
+        return float(os.getenv("LOAD_BUDGET_SCALE", "0.5"))
+    return 1.0
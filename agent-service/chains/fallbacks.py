@@ -0,0 +1,86 @@
+"""
+Template-only fallbacks used while the LLM backend is unavailable
+
+These render in microseconds from the job digest and the profile, so a
+request that hits an open circuit breaker still gets a usable (if generic)
+resume summary and cover letter instead of waiting on a dead backend.
+
+Any stage that returns fallback or mock output calls mark_degraded(), so
+callers that persist results (stage checkpoints, near-duplicate reuse) can
+tell real generations from stand-ins.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from chains.common import render_template
+
+FALLBACK_RESUME_TEMPLATE = """
+{{ profile.name }}{% if profile.headline %} - {{ profile.headline }}{% endif %}
+
+{% if profile.summary %}{{ profile.summary }}
+{% endif %}
+Relevant to {{ job.title }} at {{ job.company }}:
+{% for skill in skills %}- {{ skill }}
+{% endfor %}
+""".strip()
+
+FALLBACK_COVER_LETTER_TEMPLATE = """
+Dear {{ job.company }} Hiring Team,
+
+I am writing to apply for the {{ job.title }} position{% if job.location %} in {{ job.location }}{% endif %}.{% if profile.headline %} As a {{ profile.headline }}, I{% else %} I{% endif %} bring experience that matches what you are looking for{% if skills %}, including {{ skills[:3] | join(", ") }}{% endif %}.
+
+{% if profile.summary %}{{ profile.summary }}
+
+{% endif %}I would welcome the chance to discuss how I can contribute to {{ job.company }}.
+
+Sincerely,
+{{ profile.name }}
+""".strip()
+
+# Mutable set shared with child contexts, so tools run in executor threads report back
+_degraded: ContextVar[Optional[Set[str]]] = ContextVar("degraded_stages", default=None)
+
+
+def mark_degraded(stage: str) -> None:
+    """Record that `stage` produced fallback output in the current collection scope."""
+    stages = _degraded.get()
+    if stages is not None:
+        stages.add(stage)
+
+
+@contextmanager
+def collect_degraded() -> Iterator[Set[str]]:
+    """Collect the stages marked degraded while the block runs; an enclosing scope sees them too."""
+    parent = _degraded.get()
+    stages: Set[str] = set()
+    token = _degraded.set(stages)
+    try:
+        yield stages
+    finally:
+        _degraded.reset(token)
+        if parent is not None:
+            parent.update(stages)
+
+
+def matched_skills(job: Dict[str, Any], profile: Dict[str, Any], limit: int = 5) -> List[str]:
+    """Profile skills mentioned by the job first, then the rest, up to limit."""
+    job_text = " ".join(
+        [job.get("title", ""), job.get("description", "")]
+        + list(job.get("requirements", []))
+        + list(job.get("keywords", []))
+    ).lower()
+    skills = [s for s in profile.get("skills", []) if s]
+    matched = [s for s in skills if s.lower() in job_text]
+    rest = [s for s in skills if s not in matched]
+    return (matched + rest)[:limit]
+
+
+def fallback_resume(job: Dict[str, Any], profile: Dict[str, Any]) -> str:
+    return render_template(FALLBACK_RESUME_TEMPLATE, job=job, profile=profile,
+                           skills=matched_skills(job, profile))
+
+
+def fallback_cover_letter(job: Dict[str, Any], profile: Dict[str, Any]) -> str:
+    return render_template(FALLBACK_COVER_LETTER_TEMPLATE, job=job, profile=profile,
+                           skills=matched_skills(job, profile))
@@ -0,0 +1,281 @@
+"""
+Per-task generation budgets, stop sequences and early termination
+
+Small models keep generating after the useful part of the answer: a cover
+letter continues past "Sincerely, <name>", the QA chain adds commentary after
+its JSON array. Every token of that is CPU/GPU time we throw away.
+
+Each task has a generation profile:
+- `num_predict` learned from the output lengths observed for that task
+  (a high percentile times a headroom factor, clamped to [min, max]);
+  tasks whose output scales with the input (answers per question) learn a
+  per-unit length
+- Stop sequences passed to Ollama
+- An incremental completion detector run on the streamed output; once the
+  output is complete the stream is closed, which aborts the generation
+
+Streamed chunks are counted as tokens (Ollama streams one token per chunk).
+"""
+import os
+import re
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from chains import metrics
+from chains.degradation import budget_scale
+
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 384, 512, 768, 1024, 1536, 2048, 4096)
+
+# Small models like to append remarks about what they just wrote
+TRAILING_COMMENTARY = ["\nNote:", "\n(Note:", "\nI hope this"]
+
+SIGN_OFF = re.compile(
+    r"^\s*(sincerely|best regards|kind regards|warm regards|regards|best|respectfully|thank you)\s*(?:,(.*))?$",
+    re.IGNORECASE,
+)
+
+
+def looks_like_name(text: str) -> bool:
+    """Whether a line could be a signature: a few capitalized words, not a sentence."""
+    words = text.split()
+    return (0 < len(words) <= 4 and not re.search(r"[!?;:]", text)
+            and all(word[0].isupper() for word in words)
+            and not (text.endswith(".") and len(words[-1]) > 2))  # "J." is an initial, "forward." is not
+
+
+class JsonArrayDetector:
+    """Reports completion once a top-level JSON array has been closed."""
+
+    def __init__(self, **_: Any):
+        self.overflow = 0  # characters of the last chunk past the end of the output
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text: str) -> bool:
+        for index, char in enumerate(text):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                continue
+            if char == '"' and self.started:
+                self.in_string = True
+            elif char in "[{":
+                self.started = self.started or char == "["
+                if self.started:
+                    self.depth += 1
+            elif char in "]}" and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    self.overflow = len(text) - index - 1
+                    return True
+        return False
+
+
+class SignOffDetector:
+    """Reports completion once a letter sign-off and the signature are emitted.
+
+    Handles both "Sincerely,\\n<name>" and "Sincerely, <name>" on one line. Without
+    a known name, the signature is text that looks like a name: on the sign-off's
+    line, or the first non-empty line after it. A body line such as "Thank you, I
+    look forward to..." is not a sign-off.
+    """
+
+    def __init__(self, name: str = "", **_: Any):
+        self.overflow = 0  # characters of the last chunk past the end of the output
+        self.name = name.strip().lower()
+        self.buffer = ""
+        self.signed_off = False
+
+    def feed(self, text: str) -> bool:
+        self.buffer += text
+        while "\n" in self.buffer:
+            line, self.buffer = self.buffer.split("\n", 1)
+            if self._signature_complete(line):
+                # Keep the signature's newline, drop whatever followed it
+                self.overflow = min(len(text), len(self.buffer))
+                return True
+        # The signature is usually the last line, so check it before its newline arrives
+        return bool(self.name and self.name in self.buffer.lower()
+                    and (self.signed_off or SIGN_OFF.match(self.buffer)))
+
+    def _signature_complete(self, line: str) -> bool:
+        if not self.signed_off:
+            match = SIGN_OFF.match(line)
+            if not match:
+                return False
+            rest = (match.group(2) or "").strip()
+            if rest and not self.name and not looks_like_name(rest):
+                return False
+            self.signed_off = True
+            return bool(rest) and (not self.name or self.name in rest.lower())
+        stripped = line.strip()
+        if not stripped:
+            return False
+        if self.name:
+            return self.name in stripped.lower()
+        if not looks_like_name(stripped):
+            # The "sign-off" was part of the body; this line may be a sign-off itself
+            self.signed_off = False
+            return self._signature_complete(line)
+        return True
+
+
+class GenerationProfile:
+    """Generation limits for one task, adapted from observed output lengths.
+
+    Args:
+        task: Task name used in metrics
+        default_tokens: num_predict (per unit) before enough samples exist
+        min_tokens: Lower bound on the learned budget (per unit)
+        max_tokens: Upper bound on the learned budget (per unit)
+        base_tokens: Fixed budget added on top of the per-unit budget
+        stop: Stop sequences passed to the backend
+        detector: Factory for an incremental completion detector, or None
+    """
+
+    def __init__(
+        self,
+        task: str,
+        default_tokens: int,
+        min_tokens: int,
+        max_tokens: int,
+        base_tokens: int = 0,
+        stop: Optional[List[str]] = None,
+        detector: Optional[Callable[..., Any]] = None,
+    ):
+        self.task = task
+        self.default_tokens = default_tokens
+        self.min_tokens = min_tokens
+        self.max_tokens = max_tokens
+        self.base_tokens = base_tokens
+        self.stop = stop or []
+        self.detector = detector
+        self.headroom = float(os.getenv("GENERATION_HEADROOM", "1.5"))
+        self.percentile = float(os.getenv("GENERATION_PERCENTILE", "95"))
+        self.min_samples = int(os.getenv("GENERATION_MIN_SAMPLES", "20"))
+        self._samples: Deque[float] = deque(maxlen=200)  # tokens per unit
+        self._lock = threading.Lock()
+
+    def num_predict(self, units: int = 1) -> int:
+        with self._lock:
+            samples = sorted(self._samples)
+        per_unit = self.default_tokens
+        if len(samples) >= self.min_samples:
+            index = min(len(samples) - 1, int(len(samples) * self.percentile / 100.0))
+            per_unit = int(samples[index] * self.headroom)
+        per_unit = max(self.min_tokens, min(self.max_tokens, per_unit))
+        return self.base_tokens + per_unit * max(1, units)
+
+    def expected_tokens(self, units: int = 1) -> int:
+        """Typical output length: the median observed length, or the default budget without its headroom."""
+        with self._lock:
+            samples = sorted(self._samples)
+        per_unit = self.default_tokens / self.headroom
+        if len(samples) >= self.min_samples:
+            per_unit = samples[len(samples) // 2]
+        return int(self.base_tokens + per_unit * max(1, units))
+
+    def options(self, units: int = 1) -> Dict[str, Any]:
+        """Keyword arguments for ChatOllama (budget shortened under load, see degradation)."""
+        budget = max(1, int(self.num_predict(units) * budget_scale()))
+        metrics.set_gauge("llm_num_predict", budget, task=self.task)
+        return {"num_predict": budget, "stop": self.stop or None}
+
+    def reset(self) -> None:
+        """Forget observed lengths; the budget goes back to default_tokens."""
+        with self._lock:
+            self._samples.clear()
+
+    def new_detector(self, **context: Any) -> Optional[Any]:
+        return self.detector(**context) if self.detector else None
+
+    def observe(self, tokens: int, budget: int, units: int = 1,
+                stopped_early: bool = False, truncated: bool = False) -> None:
+        """Record one generation's length and the tokens early termination saved."""
+        metrics.observe("llm_output_tokens", tokens, buckets=TOKEN_BUCKETS, task=self.task)
+        if stopped_early:
+            metrics.inc("llm_early_stops_total", task=self.task)
+            # Upper bound: the model could have run on until the budget
+            metrics.inc("llm_tokens_saved_total", max(0, budget - tokens), task=self.task)
+        if truncated:
+            metrics.inc("llm_truncated_total", task=self.task)
+            # Hitting the cap says nothing about the real length; push the budget up
+            tokens = budget * 2
+        per_unit = max(0.0, tokens - self.base_tokens) / max(1, units)
+        with self._lock:
+            self._samples.append(per_unit)
+
+
+PROFILES: Dict[str, GenerationProfile] = {
+    "resume": GenerationProfile(
+        "resume", default_tokens=512, min_tokens=160, max_tokens=1024,
+        stop=TRAILING_COMMENTARY,
+    ),
+    "cover_letter": GenerationProfile(
+        "cover_letter", default_tokens=700, min_tokens=250, max_tokens=1200,
+        stop=TRAILING_COMMENTARY, detector=SignOffDetector,
+    ),
+    "answers": GenerationProfile(
+        "answers", default_tokens=120, min_tokens=48, max_tokens=400, base_tokens=32,
+        stop=TRAILING_COMMENTARY + ["\nExplanation:"], detector=JsonArrayDetector,
+    ),
+}
+
+
+def get_profile(task: Optional[str]) -> Optional[GenerationProfile]:
+    if not task or os.getenv("GENERATION_PROFILES_ENABLED", "true").lower() == "false":
+        return None
+    return PROFILES.get(task)
+
+
+def stream_text(stream: Any, detector: Optional[Any] = None,
+                on_chunk: Optional[Callable[[], bool]] = None,
+                stats: Optional[Dict[str, Any]] = None) -> Tuple[str, int, bool, bool]:
+    """
+    Consume a chat model stream, stopping early once the detector reports completion
+
+    Args:
+        stream: Iterator returned by chat_model.stream()
+        detector: Completion detector (feed(text) -> bool), or None
+        on_chunk: Called before each chunk is consumed; returning False abandons the stream
+        stats: Filled with the final chunk's response metadata (token counts and
+            durations); left empty when the stream is stopped early
+
+    Returns:
+        (text, tokens generated, stopped early, truncated at num_predict)
+    """
+    parts = []
+    tokens = 0
+    stopped_early = False
+    truncated = False
+    try:
+        for chunk in stream:
+            if on_chunk is not None and not on_chunk():
+                break
+            text = str(chunk.content)
+            if text:
+                tokens += 1
+                parts.append(text)
+            usage = getattr(chunk, "usage_metadata", None)
+            if usage and usage.get("output_tokens"):
+                tokens = usage["output_tokens"]
+            metadata = getattr(chunk, "response_metadata", None) or {}
+            if metadata.get("done_reason") == "length":
+                truncated = True
+            if stats is not None and "eval_count" in metadata:
+                stats.update(metadata)
+            if detector is not None and text and detector.feed(text):
+                stopped_early = True
+                if detector.overflow:
+                    parts[-1] = text[:len(text) - detector.overflow]
+                break
+    finally:
+        stream.close()  # aborts the generation on the backend when we stop early
+    return "".join(parts), tokens, stopped_early, truncated
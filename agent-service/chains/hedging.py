@@ -0,0 +1,231 @@
+"""
+Hedged LLM requests
+
+A single Ollama generation occasionally stalls (model swap, a noisy
+neighbour on the GPU) and that one call then dominates the p99 of the whole
+request. With hedging enabled, a call that has not produced its first token
+within a percentile-based delay is duplicated to another healthy backend;
+whichever attempt completes first wins and the other is cancelled. Each
+attempt runs over its own AbortableTransport, so the loser's connection is cut
+from the controlling thread, even when it stalled before its first token.
+Ollama sees the disconnect and aborts the generation.
+
+Hedges are capped by a budget so that at most LLM_HEDGE_BUDGET_PERCENT of
+calls are duplicated, which keeps a slow-but-healthy fleet from doubling its
+own load.
+"""
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from chains import metrics
+from chains.circuit_breaker import get_breaker
+from chains.generation_profiles import stream_text
+from chains.ollama_client import AbortableTransport
+
+
+def hedging_enabled() -> bool:
+    return os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true" and len(backend_urls()) > 1
+
+
+def backend_urls() -> List[str]:
+    """Primary backend followed by the extra backends hedges may go to."""
+    primary = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+    extra = [url.strip() for url in os.getenv("OLLAMA_HEDGE_URLS", "").split(",") if url.strip()]
+    return [primary] + [url for url in extra if url != primary]
+
+
+class FirstTokenTracker:
+    """Rolling time-to-first-token samples per model, used to pick the hedge delay.
+
+    Args:
+        percentile: Percentile of recent first-token latencies to wait before hedging
+        window: Samples kept per model
+        min_samples: Samples required before the percentile is trusted
+        default_delay: Delay used until enough samples exist
+        min_delay: Lower bound on the delay
+    """
+
+    def __init__(self, percentile: float = 95.0, window: int = 200, min_samples: int = 20,
+                 default_delay: float = 5.0, min_delay: float = 0.25):
+        self.percentile = percentile
+        self.window = window
+        self.min_samples = min_samples
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(model, deque(maxlen=self.window)).append(seconds)
+
+    def delay(self, model: str) -> float:
+        with self._lock:
+            samples = sorted(self._samples.get(model, ()))
+        if len(samples) < self.min_samples:
+            return self.default_delay
+        index = min(len(samples) - 1, int(len(samples) * self.percentile / 100.0))
+        return max(self.min_delay, samples[index])
+
+
+class HedgeBudget:
+    """Token bucket that earns `percent`/100 of a hedge per call.
+
+    Args:
+        percent: Maximum share of calls that may be hedged
+        burst: Hedges that may be banked for a burst of slow calls
+    """
+
+    def __init__(self, percent: float = 10.0, burst: float = 5.0):
+        self.ratio = percent / 100.0
+        self.burst = burst
+        self.tokens = burst
+        self._lock = threading.Lock()
+
+    def earn(self) -> None:
+        with self._lock:
+            self.tokens = min(self.burst, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return True
+            return False
+
+
+_tracker = FirstTokenTracker(
+    percentile=float(os.getenv("LLM_HEDGE_PERCENTILE", "95")),
+    min_samples=int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20")),
+    default_delay=float(os.getenv("LLM_HEDGE_DEFAULT_DELAY_SECONDS", "5")),
+    min_delay=float(os.getenv("LLM_HEDGE_MIN_DELAY_SECONDS", "0.25")),
+)
+_budget = HedgeBudget(
+    percent=float(os.getenv("LLM_HEDGE_BUDGET_PERCENT", "10")),
+    burst=float(os.getenv("LLM_HEDGE_BUDGET_BURST", "5")),
+)
+
+
+class _Attempt(threading.Thread):
+    """One streamed generation against one backend."""
+
+    def __init__(self, base_url: str, make_llm: Callable[[str, AbortableTransport], Any], prompt: str,
+                 detector: Optional[Any], results: "queue.Queue[_Attempt]"):
+        super().__init__(name=f"llm-attempt-{base_url}", daemon=True)
+        self.base_url = base_url
+        self.transport = AbortableTransport()
+        self.llm = make_llm(base_url, self.transport)
+        self.prompt = prompt
+        self.detector = detector
+        self.results = results
+        self.first_token = threading.Event()
+        self.cancelled = threading.Event()
+        self.started_at = time.monotonic()
+        self.first_token_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.output: Tuple[str, int, bool, bool] = ("", 0, False, False)
+        self.stats: Dict[str, Any] = {}
+        self.error: Optional[BaseException] = None
+
+    def _on_chunk(self) -> bool:
+        if self.first_token_at is None:
+            self.first_token_at = time.monotonic()
+            self.first_token.set()
+        return not self.cancelled.is_set()
+
+    def cancel(self) -> None:
+        """Stop the attempt from another thread, cutting its connection."""
+        self.cancelled.set()
+        self.transport.abort()
+
+    def run(self) -> None:
+        try:
+            self.output = stream_text(self.llm.stream(self.prompt), self.detector, self._on_chunk, self.stats)
+        except Exception as exc:
+            self.error = exc
+        finally:
+            self.transport.close()
+            self.finished_at = time.monotonic()
+            self.first_token.set()
+            if not self.cancelled.is_set():
+                self.results.put(self)
+
+
+def hedged_invoke(
+    prompt: str,
+    model: str,
+    make_llm: Callable[[str, AbortableTransport], Any],
+    new_detector: Callable[[], Optional[Any]] = lambda: None,
+    stats: Optional[Dict[str, Any]] = None,
+) -> Tuple[str, int, bool, bool]:
+    """
+    Generate with the primary backend, hedging to another backend on a slow first token
+
+    Args:
+        prompt: Prompt text
+        model: Model name, used to key first-token latency statistics
+        make_llm: Builds a chat model for a backend base URL that sends its requests over
+            the given transport
+        new_detector: Builds a completion detector for each attempt (see generation_profiles)
+        stats: Filled with the winning attempt's response metadata (see stream_text)
+
+    Returns:
+        Output of the first attempt to complete successfully, as returned by stream_text
+    """
+    urls = backend_urls()
+    # Fail over to a healthy backend when the primary's breaker is open
+    urls = [url for url in urls if get_breaker(url, model).available()] or urls
+    results: "queue.Queue[_Attempt]" = queue.Queue()
+    _budget.earn()
+    metrics.inc("llm_hedge_calls_total")
+
+    primary = _Attempt(urls[0], make_llm, prompt, new_detector(), results)
+    primary.start()
+    attempts = [primary]
+
+    delay = _tracker.delay(model)
+    if not primary.first_token.wait(timeout=delay):
+        alternates = [url for url in urls[1:] if get_breaker(url, model).available()]
+        if not alternates:
+            metrics.inc("llm_hedges_skipped_total", reason="no_backend")
+        elif not _budget.try_spend():
+            metrics.inc("llm_hedges_skipped_total", reason="budget")
+        else:
+            print(f"[HEDGE] No first token from {urls[0]} after {delay:.2f}s, hedging to {alternates[0]}", flush=True)
+            hedge = _Attempt(alternates[0], make_llm, prompt, new_detector(), results)
+            hedge.start()
+            attempts.append(hedge)
+
+    winner = None
+    for _ in attempts:
+        attempt = results.get()
+        if attempt.first_token_at is not None:
+            _tracker.record(model, attempt.first_token_at - attempt.started_at)
+        if attempt.error is None:
+            winner = attempt
+            break
+    for attempt in attempts:
+        if attempt is not winner:
+            attempt.cancel()
+
+    if winner is None:
+        raise primary.error
+    if stats is not None:
+        stats.update(winner.stats)
+
+    if len(attempts) > 1:
+        hedge_won = winner is not primary
+        metrics.inc("llm_hedges_total", outcome="won" if hedge_won else "lost")
+        if hedge_won:
+            # The primary would have needed at least its first token (or now, if it
+            # never produced one) plus a generation as long as the winner's
+            generation = winner.finished_at - (winner.first_token_at or winner.started_at)
+            primary_first = primary.first_token_at or winner.finished_at
+            recovered = max(0.0, primary_first + generation - winner.finished_at)
+            metrics.observe("llm_hedge_recovered_seconds", recovered)
+            metrics.inc("llm_hedge_recovered_seconds_total", recovered)
+    return winner.output
@@ -0,0 +1,199 @@
+"""
+Near-duplicate job detection
+
+The same posting often shows up under several ids (reposts, one copy per
+location, external copies). This module keeps MinHash signatures of word
+shingles over the digested job text in an in-memory LSH index, and remembers
+the artifacts generated for each (profile, job). When a new request's job is
+a near-duplicate of one already processed for the same profile, the prior
+resume, cover letter and answers are reused with the job title, company and
+location swapped in, instead of being generated from scratch.
+"""
+import os
+import re
+import threading
+import zlib
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from chains.cache import TieredCache, content_hash
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+PRIME = (1 << 31) - 1
+
+_rng = np.random.default_rng(20240611)
+_PERM_A = _rng.integers(1, PRIME, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, PRIME, size=NUM_PERM, dtype=np.uint64)
+
+WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+
+def dedup_enabled() -> bool:
+    return os.getenv("JOB_DEDUP_ENABLED", "true").lower() != "false"
+
+
+def dedup_threshold() -> float:
+    return float(os.getenv("JOB_DEDUP_THRESHOLD", "0.8"))
+
+
+def job_text(job: Dict[str, Any]) -> str:
+    """Normalized text used for shingling (expects a digested job dict)."""
+    return "\n".join([job.get("title", ""), job.get("description", "")] + list(job.get("requirements", [])))
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    words = WORD_RE.findall(text.lower())
+    if len(words) < size:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+    return {
+        zlib.crc32(" ".join(words[i:i + size]).encode("utf-8"))
+        for i in range(len(words) - size + 1)
+    }
+
+
+def minhash(shingle_set: Set[int]) -> np.ndarray:
+    """MinHash signature of a shingle set using universal hashing mod a Mersenne prime."""
+    if not shingle_set:
+        return np.full(NUM_PERM, PRIME, dtype=np.uint64)
+    values = np.fromiter(shingle_set, dtype=np.uint64, count=len(shingle_set)) & np.uint64(PRIME)
+    hashed = (np.outer(_PERM_A, values) + _PERM_B[:, None]) % np.uint64(PRIME)
+    return hashed.min(axis=1)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity between two signatures."""
+    return float(np.mean(a == b))
+
+
+class MinHashIndex:
+    """Bounded LSH index of job signatures (banding: BANDS x ROWS)."""
+
+    def __init__(self, max_entries: int = 50000):
+        self.max_entries = max_entries
+        self._signatures: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._buckets: Dict[Tuple[int, bytes], Set[str]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _bands(signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        return [(band, signature[band * ROWS:(band + 1) * ROWS].tobytes()) for band in range(BANDS)]
+
+    def add(self, key: str, signature: np.ndarray) -> None:
+        with self._lock:
+            if key in self._signatures:
+                self._remove(key)
+            self._signatures[key] = signature
+            for bucket in self._bands(signature):
+                self._buckets[bucket].add(key)
+            while len(self._signatures) > self.max_entries:
+                self._remove(next(iter(self._signatures)))
+
+    def _remove(self, key: str) -> None:
+        signature = self._signatures.pop(key)
+        for bucket in self._bands(signature):
+            members = self._buckets.get(bucket)
+            if members:
+                members.discard(key)
+                if not members:
+                    del self._buckets[bucket]
+
+    def query(self, signature: np.ndarray, threshold: float) -> List[Tuple[str, float]]:
+        """Indexed keys whose estimated similarity is at least threshold, best first."""
+        with self._lock:
+            candidates = set()
+            for bucket in self._bands(signature):
+                candidates |= self._buckets.get(bucket, set())
+            scored = [(key, similarity(signature, self._signatures[key])) for key in candidates]
+        return sorted((item for item in scored if item[1] >= threshold), key=lambda item: -item[1])
+
+
+_index = MinHashIndex(max_entries=int(os.getenv("JOB_DEDUP_INDEX_SIZE", "50000")))
+_artifacts = TieredCache("dedup_artifacts", max_entries=int(os.getenv("JOB_DEDUP_ARTIFACTS_SIZE", "5000")), persistent=False)
+
+
+def job_key(job: Dict[str, Any]) -> str:
+    return f"{job.get('id', '')}:{content_hash(job_text(job))[:16]}"
+
+
+def profile_key(profile: Dict[str, Any]) -> str:
+    return content_hash(profile)[:16]
+
+
+def _swap(text: str, old: str, new: str) -> str:
+    if old and new and old != new:
+        return re.sub(rf"\b{re.escape(old)}\b", lambda _: new, text)
+    return text
+
+
+def adapt_artifacts(artifacts: Dict[str, Any], job: Dict[str, Any]) -> Dict[str, Any]:
+    """Lightly adapt artifacts generated for a source job to a duplicate job."""
+    source = artifacts["job"]
+    old_location, new_location = source.get("location", ""), job.get("location", "")
+
+    def adapt(text: str) -> str:
+        text = _swap(text, source.get("company", ""), job.get("company", ""))
+        text = _swap(text, source.get("title", ""), job.get("title", ""))
+        text = _swap(text, old_location, new_location)
+        # Letters often name only the city of "City, State"
+        return _swap(text, old_location.split(",")[0].strip(), new_location.split(",")[0].strip())
+
+    return {
+        "refined_resume": adapt(artifacts.get("refined_resume", "")),
+        "cover_letter": adapt(artifacts.get("cover_letter", "")),
+        "answers": [
+            {"question": a["question"], "answer": adapt(a["answer"])}
+            for a in artifacts.get("answers", [])
+        ],
+    }
+
+
+def find_prior_application(job: Dict[str, Any], profile: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Look up artifacts generated for a near-duplicate of this job and profile
+
+    Args:
+        job: Digested job dict (see to_dict)
+        profile: Profile dict (see profile_to_dict)
+
+    Returns:
+        Adapted artifacts plus "source_job_id" and "similarity", or None
+    """
+    if not dedup_enabled():
+        return None
+
+    signature = minhash(shingles(job_text(job)))
+    owner = profile_key(profile)
+    for key, score in _index.query(signature, dedup_threshold()):
+        artifacts = _artifacts.get(f"{owner}:{key}")
+        if artifacts is None:
+            continue
+        print(
+            f"[JOB_DEDUP] Job {job.get('id')} is a near-duplicate of {artifacts['job'].get('id')} "
+            f"(similarity {score:.2f}); reusing artifacts"
+        )
+        adapted = adapt_artifacts(artifacts, job)
+        adapted["source_job_id"] = artifacts["job"].get("id", "")
+        adapted["similarity"] = score
+        return adapted
+    return None
+
+
+def remember_application(job: Dict[str, Any], profile: Dict[str, Any], result: Dict[str, Any]) -> None:
+    """Index a processed job and store its artifacts for this profile."""
+    if not dedup_enabled():
+        return
+
+    key = job_key(job)
+    _index.add(key, minhash(shingles(job_text(job))))
+    _artifacts.set(f"{profile_key(profile)}:{key}", {
+        "job": {"id": job.get("id", ""), "title": job.get("title", ""), "company": job.get("company", ""),
+                "location": job.get("location", "")},
+        "refined_resume": result.get("refined_resume", ""),
+        "cover_letter": result.get("cover_letter", ""),
+        "answers": list(result.get("answers", [])),
+    })
@@ -0,0 +1,208 @@
+"""
+Job description digest stage
+
+Job descriptions arrive as raw posting text, frequently with HTML markup,
+EEO statements and benefits lists that add prompt tokens without helping the
+model. The digest strips that noise once per job, extracts requirements, keywords
+and taxonomy skills (see skill_extraction), and caps the summary length.
+Digests are cached by job id plus a hash of the description and the skill
+taxonomy, so every applicant to the same job shares one pass. A job without
+a requirements section gets its skills as requirements.
+"""
+import html
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, List
+
+from chains.cache import TieredCache, content_hash
+from chains.skill_extraction import extract_skills, taxonomy_version
+
+DIGEST_VERSION = "3"
+
+TAG_RE = re.compile(r"<[^>]+>")
+BLOCK_TAG_RE = re.compile(r"(?i)<\s*(br|/p|/div|/li|/h[1-6]|/tr)\s*/?>")
+LIST_ITEM_RE = re.compile(r"(?i)<\s*li[^>]*>")
+SCRIPT_RE = re.compile(r"(?is)<\s*(script|style)[^>]*>.*?<\s*/\s*\1\s*>")
+BULLET_RE = re.compile(r"^\s*(?:[-*•▪●]|\d+[.)])\s+")
+WHITESPACE_RE = re.compile(r"[ \t ]+")
+SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+WORD_RE = re.compile(r"[a-z][a-z0-9+#./-]*[a-z0-9+#]|[a-z]")
+
+BOILERPLATE_PATTERNS = [
+    re.compile(p, re.IGNORECASE)
+    for p in (
+        r"equal (employment )?opportunity",
+        r"without regard to (race|color|religion|sex|age)",
+        r"affirmative action",
+        r"reasonable accommodation",
+        r"e-?verify",
+        r"protected (veteran|class|characteristic)",
+        r"sexual orientation|gender identity|national origin",
+        r"we (do not|don't) accept unsolicited",
+        r"recruit(ment|ing) agenc(y|ies)",
+        r"privacy (notice|policy)",
+    )
+]
+
+BENEFITS_HEADINGS = re.compile(
+    r"^(benefits|perks|what we offer|why (join|work)|our benefits|compensation and benefits)\b",
+    re.IGNORECASE,
+)
+REQUIREMENT_HEADINGS = re.compile(
+    r"^(requirements|qualifications|what you('|’)ll (need|bring)|what we('|’)re looking for|"
+    r"must have|nice to have|bonus points|skills|you have|about you|who you are|"
+    r"minimum qualifications|preferred qualifications)\b",
+    re.IGNORECASE,
+)
+OTHER_HEADINGS = re.compile(
+    r"^(about (us|the (team|role|company))|responsibilities|what you('|’)ll do|the role|"
+    r"how to apply|location|salary)\b",
+    re.IGNORECASE,
+)
+
+STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can
+could do does for from has have having he her his how i if in into is it its
+just may more most must no not of on or our out over own per same she should so
+some such than that the their them then there these they this those through to
+too under up very was we were what when where which while who will with within
+would you your yours ability able across etc experience work working team role
+strong including new using use well based year years plus preferred required
+""".split())
+
+_digest_cache = TieredCache("job_digests", max_entries=int(os.getenv("JOB_DIGEST_CACHE_SIZE", "1024")))
+
+
+def digest_enabled() -> bool:
+    return os.getenv("JOB_DIGEST_ENABLED", "true").lower() != "false"
+
+
+def strip_markup(text: str) -> str:
+    """Convert HTML-ish posting text into plain lines."""
+    text = SCRIPT_RE.sub(" ", text)
+    text = LIST_ITEM_RE.sub("\n- ", text)
+    text = BLOCK_TAG_RE.sub("\n", text)
+    text = TAG_RE.sub(" ", text)
+    text = html.unescape(text)
+    lines = [WHITESPACE_RE.sub(" ", line).strip() for line in text.splitlines()]
+    return "\n".join(line for line in lines if line)
+
+
+def _is_heading(line: str) -> bool:
+    stripped = line.rstrip(":").strip()
+    if line.endswith(":"):
+        return len(stripped) < 60
+    return len(stripped.split()) <= 6 and not stripped.endswith((".", "!", "?"))
+
+
+def _ends_dropped(line: str) -> bool:
+    """Any heading-like line ends a benefits section, known heading or not."""
+    if BULLET_RE.match(line) or not _is_heading(line):
+        return False
+    return line.endswith(":") or line[:1].isupper()
+
+
+def _is_boilerplate(line: str) -> bool:
+    return any(pattern.search(line) for pattern in BOILERPLATE_PATTERNS)
+
+
+def split_sections(text: str) -> Dict[str, List[str]]:
+    """Bucket lines into body, requirements and dropped (benefits/boilerplate)."""
+    sections: Dict[str, List[str]] = {"body": [], "requirements": [], "dropped": []}
+    current = "body"
+
+    for line in text.splitlines():
+        heading_text = line.rstrip(":").strip()
+        if _is_heading(line) and not BULLET_RE.match(line):
+            if BENEFITS_HEADINGS.match(heading_text):
+                current = "dropped"
+                continue
+            if REQUIREMENT_HEADINGS.match(heading_text):
+                current = "requirements"
+                continue
+            if OTHER_HEADINGS.match(heading_text):
+                current = "body"
+                continue
+        if current == "dropped" and _ends_dropped(line):
+            current = "body"
+
+        if _is_boilerplate(line):
+            sections["dropped"].append(line)
+            continue
+
+        sections[current].append(line)
+
+    return sections
+
+
+def extract_keywords(text: str, limit: int = 15) -> List[str]:
+    """Most frequent non-stopword terms, in order of first appearance on ties."""
+    words = [w.strip("./-") for w in WORD_RE.findall(text.lower())]
+    counts = Counter(w for w in words if len(w) > 1 and w not in STOPWORDS)
+    return [word for word, _ in counts.most_common(limit)]
+
+
+def summarize(lines: List[str], max_chars: int) -> str:
+    """Join prose lines and cut at the last sentence boundary under max_chars."""
+    prose = " ".join(BULLET_RE.sub("", line) for line in lines)
+    if len(prose) <= max_chars:
+        return prose
+
+    summary = ""
+    for sentence in SENTENCE_RE.split(prose):
+        if len(summary) + len(sentence) + 1 > max_chars:
+            break
+        summary = f"{summary} {sentence}".strip()
+    return summary or prose[:max_chars].rstrip() + "..."
+
+
+def build_digest(description: str) -> Dict[str, Any]:
+    max_chars = int(os.getenv("JOB_DIGEST_MAX_CHARS", "1200"))
+    max_requirements = int(os.getenv("JOB_DIGEST_MAX_REQUIREMENTS", "8"))
+    max_skills = int(os.getenv("JOB_DIGEST_MAX_SKILLS", "12"))
+
+    plain = strip_markup(description or "")
+    sections = split_sections(plain)
+    requirements = [BULLET_RE.sub("", line) for line in sections["requirements"]][:max_requirements]
+
+    return {
+        "summary": summarize(sections["body"], max_chars),
+        "requirements": requirements,
+        "keywords": extract_keywords("\n".join(sections["body"] + sections["requirements"])),
+        "skills": extract_skills("\n".join(sections["body"] + sections["requirements"]), limit=max_skills),
+        "original_chars": len(description or ""),
+    }
+
+
+def digest_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the cached digest for a job dict, building it on first use."""
+    description = job.get("description", "") or ""
+    key = f"{job.get('id', '')}:{content_hash(DIGEST_VERSION, taxonomy_version(), description)}"
+
+    cached = _digest_cache.get(key)
+    if cached is not None:
+        return cached
+
+    digest = build_digest(description)
+    _digest_cache.set(key, digest)
+    print(
+        f"[JOB_DIGEST] Digested job {job.get('id') or '<no id>'}: "
+        f"{digest['original_chars']} -> {len(digest['summary'])} chars, "
+        f"{len(digest['requirements'])} requirements, {len(digest['skills'])} skills"
+    )
+    return digest
+
+
+def apply_digest(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace the raw description of a job dict with its digest."""
+    if not digest_enabled() or not job.get("description"):
+        return job
+
+    digest = digest_job(job)
+    job["description"] = digest["summary"]
+    if not job.get("requirements"):
+        job["requirements"] = list(digest["requirements"] or digest["skills"])
+    job["keywords"] = list(digest["keywords"])
+    job["skills"] = list(digest["skills"])
+    return job
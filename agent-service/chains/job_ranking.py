@@ -0,0 +1,233 @@
+"""
+Local profile-to-job match scoring
+
+Scores hundreds to thousands of jobs against one profile without any LLM
+call, so the backend can order the swipe deck and skip low-fit jobs before
+spending generation capacity.
+
+Each job is featurized once into hashed unigram/bigram term counts and the
+set of taxonomy skills it mentions (cached by job id plus content hash).
+Scoring a batch then concatenates those sparse vectors and computes, fully
+vectorized with NumPy:
+- TF-IDF cosine similarity between the profile text and each job
+- Skill coverage: fraction of profile skills found in the job text, either
+  literally or as the same taxonomy skill under another alias ("k8s" vs
+  "Kubernetes")
+- Location and employment type matches against the request preferences
+"""
+import os
+import re
+import zlib
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from chains.cache import TieredCache
+from chains.job_digest import STOPWORDS, strip_markup
+from chains.skill_extraction import canonical_skills, get_matcher, skill_extraction_enabled
+
+HASH_BITS = 20
+HASH_MASK = (1 << HASH_BITS) - 1
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+WEIGHTS = {
+    "text": 0.5,
+    "skill": 0.3,
+    "location": 0.1,
+    "type": 0.1,
+}
+
+_feature_cache = TieredCache(
+    "job_rank_features",
+    max_entries=int(os.getenv("JOB_RANK_CACHE_SIZE", "20000")),
+    persistent=False,
+)
+
+
+def _field(obj: Any, name: str, default: Any = "") -> Any:
+    if isinstance(obj, dict):
+        return obj.get(name, default)
+    return getattr(obj, name, default)
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def _hash(term: str) -> int:
+    return zlib.crc32(term.encode("utf-8")) & HASH_MASK
+
+
+def featurize(text: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Hashed unigram + bigram counts as parallel (ids, counts) arrays."""
+    tokens = tokenize(text)
+    terms = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    if not terms:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+    hashed = np.fromiter((_hash(t) for t in terms), dtype=np.int64, count=len(terms))
+    ids, counts = np.unique(hashed, return_counts=True)
+    return ids, counts.astype(np.float32)
+
+
+def job_features(job: Any) -> Tuple[np.ndarray, np.ndarray, FrozenSet[str]]:
+    """(term ids, term counts, canonical skills) for a job, cached."""
+    title = _field(job, "title")
+    description = _field(job, "description")
+    requirements = list(_field(job, "requirements", []) or [])
+    # crc32 keeps the per-job key cost negligible; the cache is process-local
+    digest = zlib.crc32("\x00".join([title, description] + requirements).encode("utf-8"))
+    key = f"{_field(job, 'id')}:{digest}"
+
+    cached = _feature_cache.get(key)
+    if cached is not None:
+        return cached
+
+    # Title is repeated so it carries more weight than any single body line
+    text = "\n".join([title, title, strip_markup(description or "")] + requirements)
+    skills = frozenset(name for _, _, name in get_matcher().find(text)) if skill_extraction_enabled() else frozenset()
+    features = featurize(text) + (skills,)
+    _feature_cache.set(key, features)
+    return features
+
+
+def profile_text(profile: Dict[str, Any]) -> str:
+    return "\n".join([
+        profile.get("headline", ""),
+        profile.get("summary", ""),
+        " ".join(profile.get("skills", [])),
+        profile.get("resume_text", ""),
+    ])
+
+
+def _matches_any(value: str, preferences: Sequence[str]) -> Optional[float]:
+    """1.0/0.0 match of a job attribute against preferences, None when unconstrained."""
+    wanted = [p.strip().lower() for p in preferences if p and p.strip()]
+    if not wanted:
+        return None
+    value = (value or "").lower()
+    return 1.0 if any(p in value or value in p for p in wanted if value) else 0.0
+
+
+def _attribute_scores(jobs: Sequence[Any], name: str, preferences: Sequence[str]) -> List[Optional[float]]:
+    # Decks repeat a handful of locations/types, so match each distinct value once
+    memo: Dict[str, Optional[float]] = {}
+    scores = []
+    for job in jobs:
+        value = _field(job, name)
+        if value not in memo:
+            memo[value] = _matches_any(value, preferences)
+        scores.append(memo[value])
+    return scores
+
+
+def rank_jobs(
+    profile: Dict[str, Any],
+    jobs: Sequence[Any],
+    preferred_locations: Sequence[str] = (),
+    preferred_types: Sequence[str] = (),
+    top_k: int = 0,
+    min_score: float = 0.0,
+) -> List[Dict[str, Any]]:
+    """
+    Rank jobs for a profile by local match score
+
+    Args:
+        profile: Profile dict (see profile_to_dict)
+        jobs: Job messages or dicts with id, title, description, location, type
+        preferred_locations: Location substrings the candidate accepts ("remote" included)
+        preferred_types: Accepted employment types (e.g. "Full-time")
+        top_k: Return at most this many jobs (0 = all)
+        min_score: Drop jobs scoring below this threshold
+
+    Returns:
+        List of score dicts sorted by descending score
+    """
+    n_jobs = len(jobs)
+    if n_jobs == 0:
+        return []
+
+    features = [job_features(job) for job in jobs]
+    lengths = np.fromiter((len(ids) for ids, _, _ in features), dtype=np.int64, count=n_jobs)
+    doc_idx = np.repeat(np.arange(n_jobs), lengths)
+    term_ids = np.concatenate([ids for ids, _, _ in features]) if lengths.sum() else np.empty(0, dtype=np.int64)
+    counts = np.concatenate([c for _, c, _ in features]) if lengths.sum() else np.empty(0, dtype=np.float32)
+
+    # Corpus statistics over this batch of jobs
+    df = np.bincount(term_ids, minlength=HASH_MASK + 1).astype(np.float32)
+    idf = np.log((1.0 + n_jobs) / (1.0 + df)) + 1.0
+
+    doc_weights = (1.0 + np.log(counts)) * idf[term_ids] if len(term_ids) else counts
+    doc_norms = np.sqrt(np.bincount(doc_idx, weights=doc_weights ** 2, minlength=n_jobs))
+
+    query_ids, query_counts = featurize(profile_text(profile))
+    query_vector = np.zeros(HASH_MASK + 1, dtype=np.float32)
+    query_vector[query_ids] = (1.0 + np.log(query_counts)) * idf[query_ids]
+    query_norm = float(np.sqrt(np.sum(query_vector[query_ids] ** 2)))
+
+    dots = np.bincount(doc_idx, weights=doc_weights * query_vector[term_ids], minlength=n_jobs)
+    denominator = doc_norms * query_norm
+    text_scores = np.divide(dots, denominator, out=np.zeros(n_jobs), where=denominator > 0)
+
+    # Skill coverage: a skill matches when all of its hashed terms occur in the job
+    skills = [s for s in profile.get("skills", []) if s and s.strip()]
+    skill_scores = None
+    matched_skills: List[List[str]] = [[] for _ in range(n_jobs)]
+    if skills:
+        skill_terms = []
+        for skill in skills:
+            tokens = tokenize(skill)
+            grams = [f"{a} {b}" for a, b in zip(tokens, tokens[1:])] or tokens
+            skill_terms.append([_hash(g) for g in grams])
+
+        unique_terms = sorted({h for terms in skill_terms for h in terms})
+        lookup = np.full(HASH_MASK + 1, -1, dtype=np.int64)
+        lookup[unique_terms] = np.arange(len(unique_terms))
+        columns = lookup[term_ids]
+        present = np.zeros((n_jobs, max(len(unique_terms), 1)), dtype=bool)
+        hit = columns >= 0
+        present[doc_idx[hit], columns[hit]] = True
+
+        skill_hits = np.zeros((n_jobs, len(skills)), dtype=bool)
+        for s, terms in enumerate(skill_terms):
+            if terms:
+                skill_hits[:, s] = present[:, lookup[terms]].all(axis=1)
+        for s, canonical in enumerate(canonical_skills(skills)):
+            if canonical:
+                skill_hits[:, s] |= np.fromiter((canonical in f[2] for f in features), dtype=bool, count=n_jobs)
+        skill_scores = skill_hits.mean(axis=1)
+        for j, s in zip(*np.nonzero(skill_hits)):
+            matched_skills[j].append(skills[s])
+
+    location_scores = _attribute_scores(jobs, "location", preferred_locations)
+    type_scores = _attribute_scores(jobs, "type", preferred_types)
+
+    components = {"text": text_scores}
+    if skill_scores is not None:
+        components["skill"] = skill_scores
+    if preferred_locations and any(s is not None for s in location_scores):
+        components["location"] = np.array([s or 0.0 for s in location_scores])
+    if preferred_types and any(s is not None for s in type_scores):
+        components["type"] = np.array([s or 0.0 for s in type_scores])
+
+    total_weight = sum(WEIGHTS[name] for name in components)
+    scores = sum(WEIGHTS[name] * values for name, values in components.items()) / total_weight
+
+    order = np.argsort(-scores, kind="stable")
+    if min_score > 0:
+        order = order[scores[order] >= min_score]
+    if top_k > 0:
+        order = order[:top_k]
+
+    return [
+        {
+            "job_id": _field(jobs[i], "id"),
+            "score": float(scores[i]),
+            "text_score": float(text_scores[i]),
+            "skill_score": float(skill_scores[i]) if skill_scores is not None else 0.0,
+            "location_score": float(location_scores[i] or 0.0),
+            "type_score": float(type_scores[i] or 0.0),
+            "matched_skills": matched_skills[i],
+        }
+        for i in order
+    ]
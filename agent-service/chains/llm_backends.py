@@ -0,0 +1,215 @@
+"""
+LLM backend selection and micro-batching for OpenAI-compatible servers
+
+Ollama runs our concurrent prompts for a model largely one at a time.
+OpenAI-compatible local servers (llama.cpp server, vLLM) batch the prompts
+they receive together, and /v1/completions accepts a list of prompts in one
+request. With LLM_BACKEND=openai, chain generations (resume, cover letter,
+answers) go through a MicroBatcher instead:
+- Concurrent prompts with the same model and sampling settings are queued
+- A batch is sent once LLM_BATCH_MAX_SIZE prompts are waiting, or
+  LLM_BATCH_WINDOW_MS after the first one arrived
+- Each caller gets its own completion back
+
+The agent's planner model still talks to Ollama (it needs tool calling).
+"""
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from chains import metrics
+from chains.circuit_breaker import get_breaker
+from chains.generation_profiles import get_profile
+from chains.usage import record_llm_call
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+CHARS_PER_TOKEN = 4  # the batch response only reports total usage
+
+BatchKey = Tuple[str, float, int, Tuple[str, ...]]  # (model, temperature, max_tokens, stop)
+
+
+def backend_name() -> str:
+    return os.getenv("LLM_BACKEND", "ollama").lower()
+
+
+def openai_base_url() -> str:
+    return os.getenv("OPENAI_BASE_URL", "http://localhost:8000/v1").rstrip("/")
+
+
+class OpenAICompletionsBackend:
+    """Client for the /completions endpoint of an OpenAI-compatible server.
+
+    Args:
+        base_url: API root, e.g. http://localhost:8000/v1
+        api_key: Bearer token, if the server needs one
+        timeout: Seconds allowed for one batch
+    """
+
+    def __init__(self, base_url: str, api_key: Optional[str] = None, timeout: float = 120.0):
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.base_url = base_url
+        self.client = httpx.Client(base_url=base_url, headers=headers, timeout=timeout)
+
+    def complete_batch(self, key: BatchKey, prompts: List[str]) -> List[Tuple[str, str]]:
+        """(text, finish_reason) per prompt, in prompt order."""
+        model, temperature, max_tokens, stop = key
+        body: Dict[str, Any] = {
+            "model": model,
+            "prompt": prompts,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+        if stop:
+            body["stop"] = list(stop)
+        response = self.client.post("/completions", json=body)
+        response.raise_for_status()
+        choices = sorted(response.json()["choices"], key=lambda choice: choice.get("index", 0))
+        if len(choices) != len(prompts):
+            raise ValueError(f"Backend returned {len(choices)} choices for {len(prompts)} prompts")
+        return [(choice.get("text", ""), choice.get("finish_reason") or "") for choice in choices]
+
+
+class _Pending:
+    def __init__(self, prompt: str):
+        self.prompt = prompt
+        self.future: Future = Future()
+        self.queued_at = time.monotonic()
+
+
+class MicroBatcher:
+    """
+    Collects concurrent prompts per batch key and submits them together
+
+    Args:
+        backend: Object with complete_batch(key, prompts)
+        window: Seconds to wait for more prompts after the first one arrives
+        max_batch: Prompts per request; a full batch is sent immediately
+        max_concurrent: Batches in flight at once
+        use_breaker: Run each batch under the (base_url, model) circuit breaker
+    """
+
+    def __init__(self, backend: Any, window: float = 0.01, max_batch: int = 16, max_concurrent: int = 2,
+                 use_breaker: bool = True):
+        self.backend = backend
+        self.window = window
+        self.max_batch = max(1, max_batch)
+        self.use_breaker = use_breaker
+        self._queues: Dict[BatchKey, List[_Pending]] = {}
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_concurrent), thread_name_prefix="llm-batch")
+        self._thread = threading.Thread(target=self._run, name="llm-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, key: BatchKey, prompt: str) -> Future:
+        """Queue a prompt; the future resolves to (text, finish_reason)."""
+        pending = _Pending(prompt)
+        with self._cond:
+            self._queues.setdefault(key, []).append(pending)
+            self._cond.notify()
+        return pending.future
+
+    def _next_batch(self) -> Tuple[BatchKey, List[_Pending]]:
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                wait = None
+                for key, queue in self._queues.items():
+                    due = queue[0].queued_at + self.window
+                    if len(queue) >= self.max_batch or due <= now:
+                        batch, self._queues[key] = queue[:self.max_batch], queue[self.max_batch:]
+                        if not self._queues[key]:
+                            del self._queues[key]
+                        return key, batch
+                    wait = due - now if wait is None else min(wait, due - now)
+                self._cond.wait(wait)
+
+    def _run(self) -> None:
+        while True:
+            key, batch = self._next_batch()
+            self._executor.submit(self._dispatch, key, batch)
+
+    def _dispatch(self, key: BatchKey, batch: List[_Pending]) -> None:
+        started = time.monotonic()
+        metrics.observe("llm_batch_size", len(batch), buckets=BATCH_SIZE_BUCKETS, model=key[0])
+        metrics.observe("llm_batch_wait_seconds", started - batch[0].queued_at, model=key[0])
+        prompts = [pending.prompt for pending in batch]
+        try:
+            if self.use_breaker:
+                breaker = get_breaker(self.backend.base_url, key[0])
+                results = breaker.call(lambda: self.backend.complete_batch(key, prompts))
+            else:
+                results = self.backend.complete_batch(key, prompts)
+        except Exception as exc:  # noqa: BLE001 - every caller in the batch gets the error
+            for pending in batch:
+                pending.future.set_exception(exc)
+            return
+        for pending, result in zip(batch, results):
+            pending.future.set_result(result)
+        print(f"[LLM_BATCH] {len(batch)} prompts for {key[0]} in {time.monotonic() - started:.2f}s", flush=True)
+
+
+_batchers: Dict[str, MicroBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_batcher(base_url: Optional[str] = None) -> MicroBatcher:
+    base_url = base_url or openai_base_url()
+    with _batchers_lock:
+        batcher = _batchers.get(base_url)
+        if batcher is None:
+            backend = OpenAICompletionsBackend(
+                base_url,
+                api_key=os.getenv("OPENAI_API_KEY") or None,
+                timeout=float(os.getenv("OPENAI_TIMEOUT_SECONDS", "120")),
+            )
+            batcher = MicroBatcher(
+                backend,
+                window=float(os.getenv("LLM_BATCH_WINDOW_MS", "10")) / 1000.0,
+                max_batch=int(os.getenv("LLM_BATCH_MAX_SIZE", "16")),
+                max_concurrent=int(os.getenv("LLM_BATCH_MAX_CONCURRENT", "2")),
+                use_breaker=os.getenv("LLM_BREAKER_ENABLED", "true").lower() != "false",
+            )
+            _batchers[base_url] = batcher
+    return batcher
+
+
+def batched_generate(
+    prompt: str,
+    temperature: float,
+    model: Optional[str] = None,
+    task: Optional[str] = None,
+    units: int = 1,
+    context: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Generate through the micro-batcher under the task's generation profile
+
+    The output is not streamed, so the completion detector trims the text
+    after the fact instead of stopping the generation early.
+
+    Raises:
+        CircuitOpenError: The backend's breaker is open
+    """
+    model_name = model or os.getenv("OPENAI_MODEL") or os.getenv("OLLAMA_MODEL", "llama3.2:3b")
+    profile = get_profile(task)
+    options = profile.options(units) if profile else {}
+    max_tokens = options.get("num_predict") or int(os.getenv("OPENAI_MAX_TOKENS", "512"))
+    key: BatchKey = (model_name, round(float(temperature), 3), max_tokens, tuple(options.get("stop") or ()))
+
+    batcher = get_batcher()
+    future = batcher.submit(key, prompt)
+    text, finish_reason = future.result(timeout=float(os.getenv("OPENAI_TIMEOUT_SECONDS", "120")) + 10)
+
+    detector = profile.new_detector(**(context or {})) if profile else None
+    if detector is not None and detector.feed(text) and detector.overflow:
+        text = text[:len(text) - detector.overflow]
+    if profile:
+        profile.observe(len(text) // CHARS_PER_TOKEN, max_tokens, units, truncated=finish_reason == "length")
+    record_llm_call(model_name, {"prompt_tokens": len(prompt) // CHARS_PER_TOKEN,
+                                 "eval_tokens": len(text) // CHARS_PER_TOKEN,
+                                 "prompt_chars": len(prompt)})
+    return text
@@ -4,38 +4,100 @@ LLM configuration and initialization for agent tools
 import os
 from langchain_ollama import ChatOllama
 from langchain_core.output_parsers import StrOutputParser
+from langchain_core.runnables import RunnableLambda
 
+from chains.circuit_breaker import breaker_callbacks, get_breaker
+from chains.common import generate, stage_temperature
+from chains.degradation import model_for
+from chains.generation_profiles import get_profile
+from chains.hedging import hedging_enabled
+from chains.llm_backends import backend_name, batched_generate
+from chains.ollama_client import OllamaChat
+from chains.usage import UsageCallback
 
-def get_llm(temperature: float = 0.3, model: str = None):
+
+def get_llm(temperature: float = 0.3, model: str = None, base_url: str = None, transport=None, **options):
     """
     Get configured LLM instance
 
     Args:
         temperature: Temperature for generation (0-1)
         model: Optional model override
+        base_url: Optional backend override (defaults to OLLAMA_BASE_URL)
+        transport: Optional httpx transport for the client (hedged attempts pass their own)
+        **options: Extra ChatOllama generation options (num_predict, stop)
 
     Returns:
-        Configured ChatOllama instance
+        Configured ChatOllama instance guarded by the backend's circuit breaker
     """
-    ollama_base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+    ollama_base_url = base_url or os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
     model_name = model or os.getenv("OLLAMA_MODEL", "llama3.2:3b")
 
     print(f"[LLM] Initializing: model={model_name}, temperature={temperature}")
+    client_kwargs = {"timeout": float(os.getenv("OLLAMA_TIMEOUT_SECONDS", "120"))}
+    if transport is not None:
+        client_kwargs["transport"] = transport
 
     return ChatOllama(
         model=model_name,
         base_url=ollama_base_url,
         temperature=temperature,
+        callbacks=breaker_callbacks(ollama_base_url, model_name),
+        client_kwargs=client_kwargs,
+        **options,
     )
 
 
-def get_llm_chain(temperature: float = 0.3, model: str = None):
+def get_llm_chain(temperature: float = 0.3, model: str = None, task: str = None,
+                  units: int = 1, context: dict = None):
     """
     Get LLM with output parser chain
 
+    Args:
+        temperature: Temperature for generation (0-1)
+        model: Optional model override
+        task: Generation profile name (see generation_profiles)
+        units: Size of the task input the token budget scales with
+        context: Values for the task's completion detector
+
     Returns:
-        LLM | StrOutputParser chain
+        LLM | StrOutputParser chain, or an equivalent runnable that applies the
+        task's generation profile and hedging (or micro-batching with LLM_BACKEND=openai,
+        or the native client with LLM_BACKEND=native)
     """
+    model = model_for(task, model)
+    temperature = stage_temperature(temperature)
+    if backend_name() == "openai":
+        return RunnableLambda(lambda prompt: batched_generate(str(prompt), temperature, model, task, units, context))
+
+    if backend_name() == "native" or hedging_enabled() or get_profile(task):
+        model_name = model or os.getenv("OLLAMA_MODEL", "llama3.2:3b")
+        base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+
+        def make_llm(url, transport=None, **options):
+            if backend_name() == "native":
+                return OllamaChat(model=model_name, base_url=url, temperature=temperature,
+                                  transport=transport, **options)
+            return get_llm(temperature=temperature, model=model_name, base_url=url, transport=transport, **options)
+
+        return RunnableLambda(lambda prompt: generate(str(prompt), model_name, base_url, make_llm,
+                                                      task, units, context))
+
     llm = get_llm(temperature=temperature, model=model)
+    llm.callbacks = list(llm.callbacks or []) + [UsageCallback(llm.model)]
     parser = StrOutputParser()
     return llm | parser
+
+
+def llm_available(model: str = None) -> bool:
+    """
+    Whether the configured backend's circuit breaker currently lets calls through
+
+    Returns:
+        False while the breaker is open and still cooling down
+    """
+    if os.getenv("LLM_BREAKER_ENABLED", "true").lower() == "false":
+        return True
+    ollama_base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+    model_name = model or os.getenv("OLLAMA_MODEL", "llama3.2:3b")
+    return get_breaker(ollama_base_url, model_name).available()
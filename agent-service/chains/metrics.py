@@ -0,0 +1,159 @@
+"""
+In-process metrics registry
+
+Counters, gauges and fixed-bucket histograms keyed by name plus labels.
+Every process periodically writes its snapshot to a shared directory, so in
+multi-process mode any worker can report totals across all live workers by
+merging the snapshot files (fixed bucket boundaries make histograms additive).
+"""
+import json
+import os
+import pathlib
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from chains.cache import cache_dir
+
+# Seconds; covers sub-millisecond local work through multi-minute agent runs
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+
+_lock = threading.Lock()
+_counters: Dict[str, float] = {}
+_gauges: Dict[str, float] = {}
+_histograms: Dict[str, Dict[str, Any]] = {}
+
+
+def _key(name: str, labels: Dict[str, Any]) -> str:
+    if not labels:
+        return name
+    rendered = ",".join(f'{k}="{labels[k]}"' for k in sorted(labels))
+    return f"{name}{{{rendered}}}"
+
+
+def inc(name: str, value: float = 1.0, **labels: Any) -> None:
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0.0) + value
+
+
+def set_gauge(name: str, value: float, **labels: Any) -> None:
+    with _lock:
+        _gauges[_key(name, labels)] = float(value)
+
+
+def observe(name: str, value: float, buckets: Tuple[float, ...] = LATENCY_BUCKETS, **labels: Any) -> None:
+    key = _key(name, labels)
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = {"buckets": list(buckets), "counts": [0] * (len(buckets) + 1), "count": 0, "sum": 0.0}
+            _histograms[key] = hist
+        index = next((i for i, bound in enumerate(buckets) if value <= bound), len(buckets))
+        hist["counts"][index] += 1
+        hist["count"] += 1
+        hist["sum"] += value
+
+
+def quantile(hist: Dict[str, Any], q: float) -> float:
+    """Upper bucket bound containing the q-quantile (0 when empty)."""
+    if not hist["count"]:
+        return 0.0
+    target = q * hist["count"]
+    seen = 0
+    for bound, count in zip(hist["buckets"] + [float("inf")], hist["counts"]):
+        seen += count
+        if seen >= target:
+            return bound
+    return float("inf")
+
+
+def snapshot() -> Dict[str, Any]:
+    with _lock:
+        return {
+            "pid": os.getpid(),
+            "timestamp": time.time(),
+            "counters": dict(_counters),
+            "gauges": dict(_gauges),
+            "histograms": {k: {**v, "counts": list(v["counts"])} for k, v in _histograms.items()},
+        }
+
+
+def merge(snapshots: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sum counters and histograms across snapshots; gauges are summed too (per-process values)."""
+    merged: Dict[str, Any] = {"workers": [], "counters": {}, "gauges": {}, "histograms": {}}
+    for snap in snapshots:
+        merged["workers"].append(snap["pid"])
+        for key, value in snap["counters"].items():
+            merged["counters"][key] = merged["counters"].get(key, 0.0) + value
+        for key, value in snap["gauges"].items():
+            merged["gauges"][key] = merged["gauges"].get(key, 0.0) + value
+        for key, hist in snap["histograms"].items():
+            target = merged["histograms"].get(key)
+            if target is None or target["buckets"] != hist["buckets"]:
+                merged["histograms"][key] = {**hist, "counts": list(hist["counts"])}
+                continue
+            target["counts"] = [a + b for a, b in zip(target["counts"], hist["counts"])]
+            target["count"] += hist["count"]
+            target["sum"] += hist["sum"]
+    for hist in merged["histograms"].values():
+        hist["p50"] = quantile(hist, 0.5)
+        hist["p99"] = quantile(hist, 0.99)
+    return merged
+
+
+def metrics_dir() -> pathlib.Path:
+    env_dir = os.getenv("AGENT_METRICS_DIR")
+    return pathlib.Path(env_dir) if env_dir else cache_dir() / "metrics"
+
+
+def write_snapshot(directory: Optional[pathlib.Path] = None) -> None:
+    directory = directory or metrics_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"worker-{os.getpid()}.json"
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(snapshot()), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def aggregate(directory: Optional[pathlib.Path] = None) -> Dict[str, Any]:
+    """Merge this process's live snapshot with the latest snapshot of every other live process."""
+    directory = directory or metrics_dir()
+    snapshots = [snapshot()]
+    for path in sorted(directory.glob("worker-*.json")) if directory.exists() else []:
+        try:
+            snap = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if snap.get("pid") == os.getpid():
+            continue
+        if not pid_alive(snap.get("pid")):
+            path.unlink(missing_ok=True)
+            continue
+        snapshots.append(snap)
+    return merge(snapshots)
+
+
+def start_exporter(interval: float = 2.0) -> threading.Thread:
+    """Write this process's snapshot every interval seconds from a daemon thread."""
+    def loop():
+        while True:
+            try:
+                write_snapshot()
+            except OSError as exc:
+                print(f"[METRICS] Snapshot write failed: {exc}", flush=True)
+            time.sleep(interval)
+
+    thread = threading.Thread(target=loop, name="metrics-exporter", daemon=True)
+    thread.start()
+    return thread
+
+
+def pid_alive(pid: Any) -> bool:
+    try:
+        os.kill(int(pid), 0)
+    except (TypeError, ValueError, ProcessLookupError):
+        return False
+    except PermissionError:
+        return True
+    return True
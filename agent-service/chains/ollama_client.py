@@ -0,0 +1,293 @@
+"""
+Native Ollama client for chain generations
+
+The sequential chains only need "send a prompt, get text". ChatOllama plus
+StrOutputParser adds a callback manager, message conversion and several
+objects to every call. Importing langchain_ollama also pulls in the ollama
+package and LangChain's tracers, which takes most of a second. With
+LLM_BACKEND=native, run_llm and get_llm_chain call Ollama's /api/chat
+directly instead:
+- One pooled httpx client per base URL (sync, and async per event loop), so
+  calls reuse keep-alive connections
+- Streaming over NDJSON. Closing the stream closes the response, which
+  aborts the generation on the Ollama side (early stopping)
+- AbortableTransport, which lets another thread cut a call's connection,
+  even before the first byte arrives (lost hedges)
+- Chunks shaped like ChatOllama's (content, and response_metadata on the
+  final chunk), so generation profiles, hedging and usage work unchanged
+- The backend's circuit breaker is called directly instead of through
+  callbacks
+
+The agent's planner still uses ChatOllama, because it needs tool calling.
+"""
+import asyncio
+import json
+import os
+import socket
+import threading
+import time
+import weakref
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+import httpcore
+import httpx
+
+from chains.circuit_breaker import CircuitBreaker, StreamAborted, get_breaker
+
+
+class OllamaError(Exception):
+    """Ollama reported an error in the response body."""
+
+
+class Chunk:
+    """A piece of model output, with the attributes stream_text reads from LangChain chunks."""
+
+    __slots__ = ("content", "response_metadata")
+
+    def __init__(self, content: str, response_metadata: Optional[Dict[str, Any]] = None):
+        self.content = content
+        self.response_metadata = response_metadata or {}
+
+
+def _limits() -> httpx.Limits:
+    size = int(os.getenv("OLLAMA_POOL_SIZE", "16"))
+    return httpx.Limits(max_connections=size, max_keepalive_connections=size)
+
+
+_clients: Dict[str, httpx.Client] = {}
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary())
+_clients_lock = threading.Lock()
+
+
+def sync_client(base_url: str) -> httpx.Client:
+    """Shared connection pool for a backend."""
+    with _clients_lock:
+        client = _clients.get(base_url)
+        if client is None:
+            client = httpx.Client(base_url=base_url, limits=_limits())
+            _clients[base_url] = client
+    return client
+
+
+def async_client(base_url: str) -> httpx.AsyncClient:
+    """Shared connection pool for a backend on the running event loop (pools cannot cross loops)."""
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(base_url)
+        if client is None:
+            client = httpx.AsyncClient(base_url=base_url, limits=_limits())
+            clients[base_url] = client
+    return client
+
+
+class _AbortableStream(httpcore.NetworkStream):
+    """Network stream that fails with StreamAborted once its transport is aborted."""
+
+    def __init__(self, stream: httpcore.NetworkStream, transport: "AbortableTransport"):
+        self.stream = stream
+        self.transport = transport
+
+    def read(self, max_bytes: int, timeout: Optional[float] = None) -> bytes:
+        try:
+            data = self.stream.read(max_bytes, timeout)
+        except Exception:
+            if self.transport.aborted.is_set():
+                raise StreamAborted("connection cut by abort()") from None
+            raise
+        if self.transport.aborted.is_set():
+            raise StreamAborted("connection cut by abort()")
+        return data
+
+    def write(self, buffer: bytes, timeout: Optional[float] = None) -> None:
+        self.stream.write(buffer, timeout)
+
+    def close(self) -> None:
+        self.stream.close()
+
+    def start_tls(self, ssl_context: Any, server_hostname: Optional[str] = None,
+                  timeout: Optional[float] = None) -> httpcore.NetworkStream:
+        return self.transport.track(self.stream.start_tls(ssl_context, server_hostname, timeout))
+
+    def get_extra_info(self, info: str) -> Any:
+        return self.stream.get_extra_info(info)
+
+
+class _AbortableBackend(httpcore.NetworkBackend):
+    def __init__(self, backend: httpcore.NetworkBackend, transport: "AbortableTransport"):
+        self.backend = backend
+        self.transport = transport
+
+    def connect_tcp(self, host: str, port: int, timeout: Optional[float] = None,
+                    local_address: Optional[str] = None, socket_options: Any = None) -> httpcore.NetworkStream:
+        if self.transport.aborted.is_set():
+            raise StreamAborted("transport aborted before connecting")
+        return self.transport.track(self.backend.connect_tcp(host, port, timeout, local_address, socket_options))
+
+    def connect_unix_socket(self, path: str, timeout: Optional[float] = None,
+                            socket_options: Any = None) -> httpcore.NetworkStream:
+        return self.transport.track(self.backend.connect_unix_socket(path, timeout, socket_options))
+
+    def sleep(self, seconds: float) -> None:
+        self.backend.sleep(seconds)
+
+
+class AbortableTransport(httpx.HTTPTransport):
+    """HTTP transport whose connections another thread can cut with abort().
+
+    Closing a client does not wake a thread blocked reading its response, so a
+    stalled call would hold its request until the timeout. abort() shuts the
+    sockets down instead: the reading thread fails at once with StreamAborted,
+    and Ollama sees the disconnect and stops generating.
+    """
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.aborted = threading.Event()
+        self._streams: List[httpcore.NetworkStream] = []
+        self._lock = threading.Lock()
+        self._pool._network_backend = _AbortableBackend(self._pool._network_backend, self)
+
+    def track(self, stream: httpcore.NetworkStream) -> httpcore.NetworkStream:
+        with self._lock:
+            self._streams.append(stream)
+        if self.aborted.is_set():  # aborted while connecting
+            self._shutdown(stream)
+        return _AbortableStream(stream, self)
+
+    def abort(self) -> None:
+        self.aborted.set()
+        with self._lock:
+            streams = list(self._streams)
+        for stream in streams:
+            self._shutdown(stream)
+
+    @staticmethod
+    def _shutdown(stream: httpcore.NetworkStream) -> None:
+        sock = stream.get_extra_info("socket")
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass  # already closed
+
+
+def _parse_line(line: str) -> Chunk:
+    data = json.loads(line)
+    if "error" in data:
+        raise OllamaError(data["error"])
+    content = (data.pop("message", None) or {}).get("content", "")
+    return Chunk(content, data if data.get("done") else None)
+
+
+class OllamaChat:
+    """
+    Chat model for one backend, model and set of sampling options
+
+    Implements the part of the ChatOllama interface the chains use:
+    invoke() and stream(), and ainvoke() and astream() for async callers.
+
+    Args:
+        model: Model name
+        base_url: Ollama root URL
+        temperature: Sampling temperature
+        timeout: Seconds allowed per request (default OLLAMA_TIMEOUT_SECONDS)
+        transport: Transport for a client of this model's own (e.g. an AbortableTransport
+            for a hedged attempt); by default calls share the backend's pool
+        **options: Other Ollama options, e.g. num_predict and stop; None values are left out
+    """
+
+    def __init__(self, model: str, base_url: str, temperature: float = 0.3,
+                 timeout: Optional[float] = None, transport: Optional[httpx.BaseTransport] = None,
+                 **options: Any):
+        self.model = model
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout if timeout is not None else float(os.getenv("OLLAMA_TIMEOUT_SECONDS", "120"))
+        self.options = {"temperature": temperature,
+                        **{name: value for name, value in options.items() if value is not None}}
+        self.client = httpx.Client(base_url=self.base_url, transport=transport) if transport else None
+        self.breaker: Optional[CircuitBreaker] = None
+        if os.getenv("LLM_BREAKER_ENABLED", "true").lower() != "false":
+            self.breaker = get_breaker(base_url, model)
+
+    def _body(self, prompt: str, stream: bool) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "messages": [{"role": "user", "content": str(prompt)}],
+            "stream": stream,
+            "options": self.options,
+        }
+
+    def _acquire(self) -> float:
+        if self.breaker is not None:
+            self.breaker.acquire()
+        return time.monotonic()
+
+    def _record(self, failed: bool, started: float) -> None:
+        if self.breaker is not None:
+            self.breaker.record(failed, time.monotonic() - started)
+
+    def invoke(self, prompt: str) -> Chunk:
+        """Whole reply; response_metadata carries Ollama's token counts and durations."""
+        started = self._acquire()
+        try:
+            response = (self.client or sync_client(self.base_url)).post(
+                "/api/chat", json=self._body(prompt, False), timeout=self.timeout)
+            response.raise_for_status()
+            chunk = _parse_line(response.text)
+        except Exception:
+            self._record(True, started)
+            raise
+        self._record(False, started)
+        return chunk
+
+    def stream(self, prompt: str) -> Iterator[Chunk]:
+        """Stream the reply chunk by chunk; closing the iterator aborts the generation."""
+        started = self._acquire()
+        failed = True
+        try:
+            with (self.client or sync_client(self.base_url)).stream(
+                    "POST", "/api/chat", json=self._body(prompt, True), timeout=self.timeout) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if line:
+                        yield _parse_line(line)
+            failed = False
+        except (GeneratorExit, StreamAborted):
+            # The caller stopped reading (early termination, or a hedge that lost);
+            # the backend was healthy
+            failed = False
+            raise
+        finally:
+            self._record(failed, started)
+
+    async def ainvoke(self, prompt: str) -> Chunk:
+        started = self._acquire()
+        try:
+            response = await async_client(self.base_url).post(
+                "/api/chat", json=self._body(prompt, False), timeout=self.timeout)
+            response.raise_for_status()
+            chunk = _parse_line(response.text)
+        except Exception:
+            self._record(True, started)
+            raise
+        self._record(False, started)
+        return chunk
+
+    async def astream(self, prompt: str) -> AsyncIterator[Chunk]:
+        started = self._acquire()
+        failed = True
+        try:
+            async with async_client(self.base_url).stream(
+                    "POST", "/api/chat", json=self._body(prompt, True), timeout=self.timeout) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if line:
+                        yield _parse_line(line)
+            failed = False
+        except GeneratorExit:
+            failed = False
+            raise
+        finally:
+            self._record(failed, started)
@@ -1,8 +1,12 @@
 from typing import Any, Dict, List, Optional
 
+from chains.common import profile_to_dict, to_dict
 from chains.resume_chain import run_resume_chain
 from chains.cover_letter_chain import run_cover_letter_chain
+from chains.fallbacks import collect_degraded
 from chains.question_answering_chain import run_question_answering_chain
+from chains.stage_checkpoints import StageCheckpoints, checkpoints_enabled
+from chains.usage import record_cache_hit, stage as usage_stage
 
 
 def run_orchestrator_chain(
@@ -10,6 +14,7 @@ def run_orchestrator_chain(
     profile_obj: Any,
     questions: Optional[List[Dict[str, Any]]] = None,
     model: str = None,
+    checkpoints: Optional[StageCheckpoints] = None,
 ) -> Dict[str, Any]:
     """
     Orchestrates full application process:
@@ -17,11 +22,15 @@ def run_orchestrator_chain(
     2. Generates cover letter
     3. Answers questions if present
 
+    Each completed stage is checkpointed; stages already checkpointed for the
+    same request are reused instead of regenerated.
+
     Args:
         job_obj: Job object with title, company, description, etc.
         profile_obj: Profile object with name, email, resume_text, etc.
         questions: Optional list of question dicts with 'question', 'type', and 'options'
         model: Optional model name override
+        checkpoints: Optional checkpoint store (created from the request when omitted)
 
     Returns:
         {
@@ -29,7 +38,8 @@ def run_orchestrator_chain(
             "cover_letter": str,
             "answers": [{"question": "...", "answer": "..."}],
             "success": bool,
-            "message": str
+            "message": str,
+            "reused_stages": [str]
         }
     """
     results = {
@@ -37,25 +47,40 @@ def run_orchestrator_chain(
         "refined_resume": "",
         "cover_letter": "",
         "answers": [],
-        "message": ""
+        "message": "",
+        "reused_stages": []
     }
 
+    if checkpoints is None and checkpoints_enabled():
+        checkpoints = StageCheckpoints(to_dict(job_obj), profile_to_dict(profile_obj), questions, model)
+
+    def run_stage(stage, generate):
+        cached = checkpoints.get(stage) if checkpoints else None
+        if cached is not None:
+            record_cache_hit("checkpoint", stage=stage)
+            return cached
+        with collect_degraded() as degraded, usage_stage(stage):
+            output = generate()
+        if checkpoints and stage not in degraded:
+            checkpoints.put(stage, output)
+        return output
+
     try:
         # Step 1: Refine resume (always)
         print("[ORCHESTRATOR] Step 1/3: Refining resume...")
-        refined_resume = run_resume_chain(job_obj, profile_obj, model=model)
-        results["refined_resume"] = refined_resume
+        results["refined_resume"] = run_stage(
+            "resume", lambda: run_resume_chain(job_obj, profile_obj, model=model))
 
         # Step 2: Generate cover letter (always)
         print("[ORCHESTRATOR] Step 2/3: Generating cover letter...")
-        cover_letter = run_cover_letter_chain(job_obj, profile_obj, model=model)
-        results["cover_letter"] = cover_letter
+        results["cover_letter"] = run_stage(
+            "cover_letter", lambda: run_cover_letter_chain(job_obj, profile_obj, model=model))
 
         # Step 3: Answer questions (conditional)
         if questions and len(questions) > 0:
             print(f"[ORCHESTRATOR] Step 3/3: Answering {len(questions)} questions...")
-            answers = run_question_answering_chain(job_obj, profile_obj, questions, model=model)
-            results["answers"] = answers
+            results["answers"] = run_stage(
+                "answers", lambda: run_question_answering_chain(job_obj, profile_obj, questions, model=model))
         else:
             print("[ORCHESTRATOR] Step 3/3: Skipped (no questions)")
 
@@ -66,4 +91,7 @@ def run_orchestrator_chain(
         print(f"[ORCHESTRATOR] Error: {exc}")
         results["message"] = f"Orchestration failed: {str(exc)}"
 
+    if checkpoints:
+        results["reused_stages"] = list(checkpoints.reused)
+
     return results
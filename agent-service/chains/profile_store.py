@@ -0,0 +1,105 @@
+"""
+Server-side profile store with content-hash versions
+
+Apply, AnswerQuestions and AutoApply requests used to carry the whole
+Profile on every call, resume text included. PutProfile stores a profile
+once, under an id the client chooses (e.g. the user id). Requests then send
+profile_ref instead.
+
+Each distinct profile content is a version, named by its hash and stored
+unchanged under "<profile_id>@<version>". Putting the same content again
+stores nothing new. A ref is either pinned ("user-1@3f2a...") or a bare id,
+which resolves to the latest version. The latest-version pointer is read
+past the in-memory tier, so every worker process sees the newest put.
+
+Profiles belong to the tenant that put them. Every entry is keyed by the
+tenant as well as the ref, so a ref (pinned or bare) only resolves for the
+tenant that stored it; any other tenant gets the same miss as for an
+unknown ref.
+
+Data derived from a profile (resolved resume text, extracted skills) is
+cached against the pinned ref. It is computed once per version, and an edit
+to a profile invalidates that profile's entries and nothing else.
+"""
+import os
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from chains import metrics
+from chains.cache import TieredCache, content_hash
+
+VERSION_SEPARATOR = "@"
+
+# Stored profiles do not expire by default; the row cap (AGENT_CACHE_MAX_ROWS) still bounds the file
+_versions = TieredCache("profile_versions", max_entries=int(os.getenv("PROFILE_STORE_SIZE", "1024")),
+                        ttl_seconds=float(os.getenv("PROFILE_STORE_TTL_SECONDS", "0")))
+_latest = TieredCache("profile_latest", max_entries=int(os.getenv("PROFILE_STORE_SIZE", "1024")),
+                      ttl_seconds=float(os.getenv("PROFILE_STORE_TTL_SECONDS", "0")))
+_derived = TieredCache("profile_derived", max_entries=int(os.getenv("PROFILE_DERIVED_CACHE_SIZE", "1024")),
+                       persistent=False)
+
+
+def profile_version(profile: Dict[str, Any]) -> str:
+    return content_hash(profile)[:16]
+
+
+def split_ref(ref: str) -> Tuple[str, str]:
+    """(profile_id, version); the version is "" for a bare id."""
+    profile_id, _, version = ref.partition(VERSION_SEPARATOR)
+    return profile_id, version
+
+
+def _scoped(tenant: str, name: str) -> str:
+    """Cache key of a ref or profile id within a tenant (unambiguous for any tenant string)."""
+    return content_hash(tenant, name)
+
+
+def put_profile(tenant: str, profile_id: str, profile: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Store a profile version and make it the latest one for the tenant's profile_id
+
+    Args:
+        tenant: Tenant the profile belongs to ("" for the default tenant)
+        profile_id: Client-chosen id, without "@"
+        profile: Profile fields (JSON-serializable)
+
+    Returns:
+        {"profile_ref", "version", "changed"}; changed is False when this content
+        already was the latest version
+
+    Raises:
+        ValueError: Empty profile_id, or one containing "@"
+    """
+    if not profile_id or VERSION_SEPARATOR in profile_id:
+        raise ValueError(f"profile_id must be non-empty and must not contain '{VERSION_SEPARATOR}'")
+    version = profile_version(profile)
+    ref = f"{profile_id}{VERSION_SEPARATOR}{version}"
+    if _versions.get(_scoped(tenant, ref)) is None:
+        _versions.set(_scoped(tenant, ref), profile)  # before the pointer moves, so the latest version always resolves
+    changed = _latest.get(_scoped(tenant, profile_id), fresh=True) != version
+    if changed:
+        _latest.set(_scoped(tenant, profile_id), version)
+    metrics.inc("profile_store_puts_total", result="changed" if changed else "unchanged")
+    return {"profile_ref": ref, "version": version, "changed": changed}
+
+
+def get_profile(tenant: str, ref: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """(pinned ref, profile fields), or None if the tenant has no such profile or version (or it was evicted)."""
+    profile_id, version = split_ref(ref)
+    if not version:
+        version = _latest.get(_scoped(tenant, profile_id), fresh=True) or ""
+    pinned = f"{profile_id}{VERSION_SEPARATOR}{version}"
+    profile = _versions.get(_scoped(tenant, pinned)) if profile_id and version else None
+    metrics.inc("profile_store_lookups_total", result="hit" if profile is not None else "miss")
+    if profile is None:
+        return None
+    return pinned, profile
+
+
+def derived(pinned_ref: str, name: str, build: Callable[[], Any], *key: Any) -> Any:
+    """Value computed once per profile version and extra key parts (e.g. the skill taxonomy)."""
+    cache_key = content_hash(pinned_ref, name, *key)
+    value = _derived.get(cache_key)
+    if value is None:
+        value = build()
+        _derived.set(cache_key, value)
+    return value
@@ -3,6 +3,12 @@ import pathlib
 from typing import Any, Dict, List
 
 from chains.common import load_template, profile_to_dict, render_template, run_llm, to_dict
+from chains.fallbacks import mark_degraded
+from chains.question_rules import merge_answers, resolve_questions
+
+DEFAULT_QUESTION_ANSWERING_TEMPLATE_PATH = (
+    pathlib.Path(__file__).parent.parent / "templates" / "question_answering_prompt.jinja2"
+)
 
 DEFAULT_QUESTION_ANSWERING_TEMPLATE = """
 You are helping a job candidate answer application questions.
@@ -12,7 +18,8 @@ Job:
 - Company: {{ job.company }}
 - Location: {{ job.location }}
 - Type: {{ job.type }}
-- Description: {{ job.description }}
+- Description: {{ job.description }}{% if job.requirements %}
+- Requirements: {{ job.requirements | join("; ") }}{% endif %}
 
 Candidate:
 - Name: {{ profile.name }}
@@ -39,8 +46,8 @@ Do not include any other text or explanation, just the JSON array.
 
 
 def load_question_answering_template() -> str:
-    default_path = pathlib.Path(__file__).parent.parent / "templates" / "question_answering_prompt.jinja2"
-    return load_template("QUESTION_ANSWERING_TEMPLATE_PATH", default_path, DEFAULT_QUESTION_ANSWERING_TEMPLATE)
+    return load_template("QUESTION_ANSWERING_TEMPLATE_PATH", DEFAULT_QUESTION_ANSWERING_TEMPLATE_PATH,
+                         DEFAULT_QUESTION_ANSWERING_TEMPLATE)
 
 
 def run_question_answering_chain(
@@ -64,12 +71,19 @@ def run_question_answering_chain(
     """
     job = to_dict(job_obj)
     profile = profile_to_dict(profile_obj)
+
+    # Boolean/choice questions the profile attributes decide never reach the LLM
+    resolved, unresolved = resolve_questions(questions, profile)
+    if not unresolved:
+        return merge_answers(questions, resolved, unresolved, [])
+    pending = [questions[i] for i in unresolved]
+
     resume_text = profile.get("resume_text", "")
     template = template_str or load_question_answering_template()
-    prompt = render_template(template, job=job, profile=profile, resume_text=resume_text, questions=questions)
+    prompt = render_template(template, job=job, profile=profile, resume_text=resume_text, questions=pending)
 
     try:
-        result = run_llm(prompt, temperature=0.2, model=model)
+        result = run_llm(prompt, temperature=0.2, model=model, task="answers", units=len(pending))
         if result:
             # Try to parse JSON response
             # Strip markdown code blocks if present
@@ -86,17 +100,18 @@ def run_question_answering_chain(
 
             # Validate and ensure all questions are answered
             if isinstance(answers, list) and len(answers) > 0:
-                return answers
+                return merge_answers(questions, resolved, unresolved, answers)
     except Exception as exc:
         print(f"[AGENT] Error generating answers: {exc}. Returning mock response.")
 
     # Fallback: return generic answers
-    return [
+    mark_degraded("answers")
+    return merge_answers(questions, resolved, unresolved, [
         {
             "question": q.get("question", ""),
             "answer": f"Yes, I am interested in this {job.get('title', 'position')} role at {job.get('company', 'your company')}."
             if q.get("type") == "boolean"
             else f"I am well-suited for this role based on my experience and skills."
         }
-        for q in questions
-    ]
+        for q in pending
+    ])
@@ -2,12 +2,16 @@
 Question answering tool for agentic application processing
 """
 import json
+import pathlib
 from typing import Dict, Any, List
 from langchain_core.tools import tool
-from jinja2 import Template
 
+from chains.common import load_template, render_template
+from chains.fallbacks import mark_degraded
+from chains.question_rules import merge_answers, resolve_questions
 from chains.llm_config import get_llm_chain
 
+DEFAULT_TEMPLATE_PATH = pathlib.Path(__file__).parent.parent / "templates" / "question_answering_tool_prompt.jinja2"
 
 DEFAULT_TEMPLATE = """
 You are helping a candidate answer job application questions.
@@ -15,7 +19,8 @@ You are helping a candidate answer job application questions.
 Job Information:
 - Title: {{ job.title }}
 - Company: {{ job.company }}
-- Description: {{ job.description }}
+- Description: {{ job.description }}{% if job.requirements %}
+- Requirements: {{ job.requirements | join("; ") }}{% endif %}
 
 Candidate Profile:
 - Name: {{ profile.name }}
@@ -46,6 +51,10 @@ No markdown code blocks, no preamble - just the raw JSON array.
 """.strip()
 
 
+def load_question_answering_tool_template() -> str:
+    return load_template("QUESTION_ANSWERING_TOOL_TEMPLATE_PATH", DEFAULT_TEMPLATE_PATH, DEFAULT_TEMPLATE)
+
+
 @tool
 def answer_application_questions(job_info: str, profile_info: str, questions: str) -> str:
     """
@@ -75,12 +84,19 @@ def answer_application_questions(job_info: str, profile_info: str, questions: st
 
         print(f"[QUESTIONS_TOOL] Answering {len(questions_list)} questions for: {job.get('title', 'Unknown')}")
 
+        # Boolean/choice questions the profile attributes decide never reach the LLM
+        resolved, unresolved = resolve_questions(questions_list, profile)
+        if not unresolved:
+            return json.dumps(merge_answers(questions_list, resolved, unresolved, []))
+        pending = [questions_list[i] for i in unresolved]
+
         # Render prompt template
-        template = Template(DEFAULT_TEMPLATE)
-        prompt = template.render(job=job, profile=profile, questions=questions_list)
+        prompt = render_template(load_question_answering_tool_template(), job=job, profile=profile,
+                                 questions=pending)
 
         # Get LLM chain and invoke
-        llm_chain = get_llm_chain(temperature=0.2)  # Low temp for consistent answers
+        llm_chain = get_llm_chain(temperature=0.2, task="answers",  # Low temp for consistent answers
+                                  units=len(pending))
 
         print(f"[QUESTIONS_TOOL] Invoking LLM (prompt length: {len(prompt)} chars)...")
         result = llm_chain.invoke(prompt)
@@ -102,11 +118,11 @@ def answer_application_questions(job_info: str, profile_info: str, questions: st
                 raise ValueError("Response is not a list")
 
             # Ensure all questions are answered
-            if len(answers) != len(questions_list):
-                print(f"[QUESTIONS_TOOL] Warning: Expected {len(questions_list)} answers, got {len(answers)}")
+            if len(answers) != len(pending):
+                print(f"[QUESTIONS_TOOL] Warning: Expected {len(pending)} answers, got {len(answers)}")
 
             print(f"[QUESTIONS_TOOL] Generated {len(answers)} answers")
-            return json.dumps(answers)
+            return json.dumps(merge_answers(questions_list, resolved, unresolved, answers))
 
         except (json.JSONDecodeError, ValueError) as e:
             print(f"[QUESTIONS_TOOL] Failed to parse LLM response as JSON: {e}")
@@ -120,18 +136,21 @@ def answer_application_questions(job_info: str, profile_info: str, questions: st
                     if q.get("type") == "boolean"
                     else f"I am well-suited for this role based on my experience and skills."
                 }
-                for q in questions_list
+                for q in pending
             ]
             print("[QUESTIONS_TOOL] Using fallback answers")
-            return json.dumps(fallback_answers)
+            mark_degraded("answers")
+            return json.dumps(merge_answers(questions_list, resolved, unresolved, fallback_answers))
 
     except json.JSONDecodeError as e:
         error_msg = f"Invalid JSON input: {e}"
         print(f"[QUESTIONS_TOOL] Error: {error_msg}")
+        mark_degraded("answers")
         return json.dumps([])
     except Exception as e:
         error_msg = f"Failed to answer questions: {str(e)}"
         print(f"[QUESTIONS_TOOL] Error: {error_msg}")
+        mark_degraded("answers")
         return json.dumps([])
 
 
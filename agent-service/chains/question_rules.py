@@ -0,0 +1,250 @@
+"""
+Deterministic answers for boolean and choice application questions
+
+Questions such as "Are you authorized to work in the US?" or a veteran
+status dropdown have one correct answer, already stored on the profile
+(Profile.attributes, from the backend's user.additionalInfo). Generating
+them with the LLM costs a full generation and can produce the wrong answer.
+
+resolve_questions() matches each question's text against attribute
+patterns and answers it from the attribute:
+- Boolean questions (and yes/no phrased text questions) get "Yes"/"No"
+- Choice questions get the option that matches the attribute value; a
+  decline value ("Prefer not to say") picks the decline option
+Each rule matches the way its attribute is asked ("require sponsorship",
+"are you a protected veteran") or the bare field label ("Veteran status").
+A question that only mentions a keyword, matches rules for more than one
+attribute, or whose attribute is unknown, is left for the LLM.
+"Without sponsorship" questions ask the opposite of needs_visa and are
+answered that way; any other negated yes/no question is left for the LLM,
+since its polarity cannot be read from the attribute alone.
+
+    >>> attributes = {"needs_visa": True, "gender": "Male"}
+    >>> resolve_question({"question": "Are you legally authorized to work in the US without visa sponsorship?",
+    ...                   "type": "boolean"}, attributes)
+    ('needs_visa', 'No')
+    >>> resolve_question({"question": "Will you be able to work without requiring visa sponsorship now or in the future?",
+    ...                   "type": "text"}, {"needs_visa": False})
+    ('needs_visa', 'Yes')
+    >>> resolve_question({"question": "Will you not require sponsorship?", "type": "boolean"}, attributes) is None
+    True
+    >>> resolve_question({"question": "Gender", "type": "select", "options": ["Female", "Non-binary"]}, attributes) is None
+    True
+    >>> resolve_question({"question": "Gender", "type": "select", "options": ["Female", "Male"]}, attributes)
+    ('gender', 'Male')
+    >>> resolve_question({"question": "Are you open to working on our Visa payments team?", "type": "boolean"},
+    ...                  attributes) is None
+    True
+    >>> resolve_question({"question": "Do you have Python experience and a visa-related background?",
+    ...                   "type": "boolean"}, attributes) is None
+    True
+    >>> resolve_question({"question": "Do you have relatives in the armed forces?", "type": "boolean"},
+    ...                  {"veteran": "I am not a protected veteran"}) is None
+    True
+    >>> resolve_question({"question": "Are you authorized to work in the US, and will you require sponsorship?",
+    ...                   "type": "boolean"}, {"needs_visa": True, "work_authorization_in_country": True}) is None
+    True
+"""
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from chains import metrics
+from chains.usage import record_cache_hit
+
+BOOL_ATTRIBUTES = ("work_authorization_in_country", "needs_visa", "willing_to_relocate")
+TEXT_ATTRIBUTES = ("ethnicity", "veteran", "disability", "gender")
+
+
+def _label(names: str) -> str:
+    """A question that is only the field label, e.g. "Veteran status:" or "Race/Ethnicity *"."""
+    return rf"^\s*(?:{names})\s*[:?*]*\s*$"
+
+
+# (attribute, question pattern). Patterns follow how the attribute is asked, never a bare
+# keyword ("our Visa payments team", "relatives in the armed forces"); a question matching
+# no rule, or rules for more than one attribute, is left for the LLM.
+RULES: List[Tuple[str, re.Pattern]] = [
+    ("needs_visa", re.compile(
+        r"\b(requir|need)\w*\b[^.?]*\b(sponsor\w*|visa|h-?1b)\b|\bwithout\b[^.?]*?\b(sponsor\w*|visa|h-?1b)\b|"
+        + _label(r"(visa )?sponsorship( required| needed)?"),
+        re.IGNORECASE)),
+    ("work_authorization_in_country", re.compile(
+        r"(authori[sz]ed|eligible|permitted|entitled|legally able) to work|right to work|"
+        + _label(r"work authori[sz]ation( status)?"),
+        re.IGNORECASE)),
+    ("willing_to_relocate", re.compile(
+        r"\b(willing|open|able|prepared|plan\w*|consider\w*)\s+(to\s+)?relocat|\byou\s+relocate\b|"
+        + _label(r"(willing to )?relocat(e|ion)"),
+        re.IGNORECASE)),
+    ("veteran", re.compile(
+        r"\bare you (a |an )?(protected |u\.?s\.? |military )?veteran\b|\byour veteran status\b|"
+        r"\bhave you (ever )?served in the\b[^.?]*\b(military|armed forces)\b|"
+        + _label(r"(protected )?veteran status"),
+        re.IGNORECASE)),
+    ("disability", re.compile(
+        r"\bdo you have (a |any )?disabilit|\bhave you ever had a disabilit|\bare you disabled\b|"
+        r"\byour disability status\b|" + _label(r"disability( status)?|(voluntary )?self-identification of disability"),
+        re.IGNORECASE)),
+    ("gender", re.compile(
+        r"\b(what is|select|choose|indicate|specify) your (gender|sex)\b|\bidentify\b[^.?]*\bgender\b|"
+        r"\bgender\b[^.?]*\bidentify\b|" + _label(r"(gender|sex)( identity)?"),
+        re.IGNORECASE)),
+    ("ethnicity", re.compile(
+        r"\b(what is|select|choose|indicate|specify|identify) your (race|ethnicity|ethnic)\b|"
+        r"\bare you hispanic\b|" + _label(r"race|ethnicity|race ?(/|&|and|or) ?ethnicity|ethnicity ?(/|&|and|or) ?race"),
+        re.IGNORECASE)),
+]
+
+YES_NO_QUESTION = re.compile(
+    r"^\s*(are|do|does|will|would|have|has|can|could|is)\s+you\b", re.IGNORECASE)
+DECLINE = re.compile(
+    r"prefer not|decline|(do not|don't|not) wish|not (to )?(say|answer|disclose|specify)|rather not", re.IGNORECASE)
+NEGATED_QUESTION = re.compile(r"\b(not|never|no longer|without)\b|n't\b", re.IGNORECASE)
+WITHOUT_SPONSORSHIP = re.compile(r"\bwithout\b[^.?]*?(sponsor\w*|\bvisa\b|\bh-?1b\b)", re.IGNORECASE)
+NEGATIVE = re.compile(r"^\s*(no\b|not\b|none\b|i am not\b|i'm not\b|i do not\b|i don't\b)", re.IGNORECASE)
+YES_OPTION = re.compile(r"^\s*yes\b", re.IGNORECASE)
+NO_OPTION = re.compile(r"^\s*no\b", re.IGNORECASE)
+
+
+def rules_enabled() -> bool:
+    return os.getenv("QA_RULES_ENABLED", "true").lower() != "false"
+
+
+def attributes_to_dict(attributes: Any) -> Dict[str, Any]:
+    """Known attributes only, from an ApplicantAttributes message or a dict."""
+    if not attributes:
+        return {}
+    if isinstance(attributes, dict):
+        return {k: v for k, v in attributes.items()
+                if k in BOOL_ATTRIBUTES + TEXT_ATTRIBUTES and v is not None and v != ""}
+    known: Dict[str, Any] = {}
+    for name in BOOL_ATTRIBUTES:
+        if attributes.HasField(name):
+            known[name] = getattr(attributes, name)
+    for name in TEXT_ATTRIBUTES:
+        value = getattr(attributes, name, "")
+        if value:
+            known[name] = value
+    return known
+
+
+def _polarity(value: Any) -> Optional[bool]:
+    """True/False for a yes/no reading of the value; None when it declines to answer."""
+    if isinstance(value, bool):
+        return value
+    text = str(value)
+    if DECLINE.search(text):
+        return None
+    return not NEGATIVE.search(text)
+
+
+def _mentions(text: str, phrase: str) -> bool:
+    """Whether phrase occurs in text as whole words ("male" is not in "female")."""
+    return bool(phrase) and re.search(rf"(?<!\w){re.escape(phrase)}(?!\w)", text) is not None
+
+
+def _pick_option(value: Any, options: List[str], negated: bool = False) -> Optional[str]:
+    text = str(value).strip().lower()
+    if not isinstance(value, bool):
+        if DECLINE.search(text):
+            return next((o for o in options if DECLINE.search(o)), None)
+        for option in options:
+            if option.strip().lower() == text:
+                return option
+        contained = [o for o in options if _mentions(text, o.strip().lower()) or _mentions(o.strip().lower(), text)]
+        if len(contained) == 1:
+            return contained[0]
+    polarity = _polarity(value)
+    if polarity is None or negated:
+        return None
+    pattern = YES_OPTION if polarity else NO_OPTION
+    matches = [o for o in options if pattern.search(o)]
+    return matches[0] if len(matches) == 1 else None
+
+
+def resolve_question(question: Dict[str, Any], attributes: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    """(attribute, answer) for a question the attributes decide, else None."""
+    text = question.get("question", "")
+    qtype = question.get("type") or "text"
+    options = [o for o in question.get("options") or [] if o]
+    if qtype == "text" and not YES_NO_QUESTION.search(text):
+        return None
+    matched = {attribute for attribute, pattern in RULES if pattern.search(text)}
+    without = WITHOUT_SPONSORSHIP.search(text) if "needs_visa" in matched else None
+    if without:
+        # "Authorized to work without sponsorship?" is one question, answered from both attributes
+        matched.discard("work_authorization_in_country")
+    if len(matched) != 1:
+        return None
+    attribute = matched.pop()
+    if attribute not in attributes:
+        return None
+    value = attributes[attribute]
+    negated = NEGATED_QUESTION.search(text) is not None
+    if without:
+        # Yes only when no visa is needed
+        value = not value and attributes.get("work_authorization_in_country") is not False
+        negated = NEGATED_QUESTION.search(text[:without.start()] + text[without.end():]) is not None
+    if options:
+        answer = _pick_option(value, options, negated)
+    else:
+        polarity = None if negated else _polarity(value)
+        answer = None if polarity is None else ("Yes" if polarity else "No")
+    return (attribute, answer) if answer else None
+
+
+def resolve_questions(
+    questions: List[Dict[str, Any]],
+    profile: Dict[str, Any],
+) -> Tuple[Dict[int, Dict[str, str]], List[int]]:
+    """
+    Answer what the profile attributes decide
+
+    Args:
+        questions: Question dicts with 'question', 'type' and 'options'
+        profile: Profile dict (see common.profile_to_dict)
+
+    Returns:
+        (answers by question index, indexes of questions left for the LLM)
+    """
+    attributes = profile.get("attributes") or {}
+    if not rules_enabled() or not attributes:
+        return {}, list(range(len(questions)))
+    resolved: Dict[int, Dict[str, str]] = {}
+    unresolved: List[int] = []
+    for index, question in enumerate(questions):
+        match = resolve_question(question, attributes)
+        if match is None:
+            unresolved.append(index)
+            continue
+        attribute, answer = match
+        resolved[index] = {"question": question.get("question", ""), "answer": answer}
+        metrics.inc("qa_rule_answers_total", attribute=attribute)
+    metrics.inc("qa_llm_questions_total", len(unresolved))
+    if resolved:
+        record_cache_hit("rules")
+        print(f"[QA_RULES] Answered {len(resolved)}/{len(questions)} questions from profile attributes", flush=True)
+    return resolved, unresolved
+
+
+def merge_answers(
+    questions: List[Dict[str, Any]],
+    resolved: Dict[int, Dict[str, str]],
+    unresolved: List[int],
+    generated: List[Dict[str, str]],
+) -> List[Dict[str, str]]:
+    """Rule and LLM answers in the original question order.
+
+    Generated answers are matched to their question by text, then by position.
+    """
+    by_text = {a.get("question", "").strip(): a for a in generated if isinstance(a, dict)}
+    answers: Dict[int, Dict[str, str]] = dict(resolved)
+    for position, index in enumerate(unresolved):
+        text = questions[index].get("question", "")
+        answer = by_text.get(text.strip())
+        if answer is None and position < len(generated) and isinstance(generated[position], dict):
+            answer = generated[position]
+        if answer is not None:
+            answers[index] = {"question": text, "answer": answer.get("answer", "")}
+    return [answers[i] for i in sorted(answers)]
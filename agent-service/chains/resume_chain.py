@@ -1,7 +1,11 @@
 import pathlib
 from typing import Any
 
+from chains.circuit_breaker import CircuitOpenError
 from chains.common import load_template, profile_to_dict, render_template, run_llm, to_dict
+from chains.fallbacks import fallback_resume, mark_degraded
+
+DEFAULT_TEMPLATE_PATH = pathlib.Path(__file__).parent.parent / "templates" / "resume_prompt.jinja2"
 
 DEFAULT_TEMPLATE = """
 You are an assistant refining a candidate's resume for a specific role.
@@ -12,7 +16,8 @@ Job:
 - Location: {{ job.location }}
 - Type: {{ job.type }}
 - Experience: {{ job.experience }}
-- Description: {{ job.description }}
+- Description: {{ job.description }}{% if job.requirements %}
+- Requirements: {{ job.requirements | join("; ") }}{% endif %}
 
 Candidate:
 - Name: {{ profile.name }}
@@ -29,8 +34,7 @@ Keep it plain text.
 
 
 def load_resume_template() -> str:
-    default_path = pathlib.Path(__file__).parent.parent / "templates" / "resume_prompt.jinja2"
-    return load_template("PROMPT_TEMPLATE_PATH", default_path, DEFAULT_TEMPLATE)
+    return load_template("PROMPT_TEMPLATE_PATH", DEFAULT_TEMPLATE_PATH, DEFAULT_TEMPLATE)
 
 
 def run_resume_chain(
@@ -45,11 +49,17 @@ def run_resume_chain(
     prompt = render_template(template, job=job, profile=profile)
 
     try:
-        result = run_llm(prompt, temperature=0, model=model)
+        result = run_llm(prompt, temperature=0, model=model, task="resume")
         if result is not None:
             return result
+    except CircuitOpenError as exc:
+        print(f"[AGENT] {exc}. Returning template-only fallback.")
+        mark_degraded("resume")
+        return fallback_resume(job, profile)
     except Exception as exc:
         print(f"[AGENT] Ollama error: {exc}. Returning mock response.")
+        mark_degraded("resume")
         return f"[mock-refined]\n{prompt}\n\n(Ollama unavailable)"
 
+    mark_degraded("resume")
     return f"[mock-refined]\n{prompt}"
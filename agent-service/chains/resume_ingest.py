@@ -0,0 +1,189 @@
+"""
+Resume document ingestion with a content-hash parse cache
+
+IngestResume streams a resume file (PDF, DOCX or plain text) in chunks.
+The chunks are hashed as they arrive and spooled to a temporary file, which
+stays in memory only while it is small. Text is extracted page by page, and
+the result (text, sections, page count) is cached under the content hash. A
+re-upload of the same file, or the same file sent by another worker, is
+never parsed again.
+
+The returned resume id ("res-<hash>") can be sent as Profile.resume_id in
+place of resume_text.
+"""
+import hashlib
+import io
+import os
+import re
+import tempfile
+import time
+import zipfile
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional
+from xml.etree import ElementTree
+
+from chains import metrics
+from chains.cache import TieredCache
+
+try:
+    from pypdf import PdfReader
+except ImportError:
+    PdfReader = None  # type: ignore
+
+RESUME_ID_PREFIX = "res-"
+PARSER_VERSION = "1"  # bump to re-parse cached documents after parser changes
+
+SECTION_HEADINGS = re.compile(
+    r"^(summary|professional summary|profile|objective|about me|experience|work experience|"
+    r"professional experience|employment history|education|skills|technical skills|core competencies|"
+    r"projects|certifications|certificates|awards|publications|languages|interests|volunteering|"
+    r"volunteer experience|references)\s*:?$",
+    re.IGNORECASE,
+)
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+_documents = TieredCache("resume_documents", max_entries=int(os.getenv("RESUME_CACHE_SIZE", "256")))
+
+
+class ResumeFormatError(ValueError):
+    """The document could not be read as a resume."""
+
+
+def resume_id_for(digest: str) -> str:
+    return f"{RESUME_ID_PREFIX}{digest[:32]}"
+
+
+def detect_format(filename: str, content_type: str, head: bytes) -> str:
+    """"pdf", "docx" or "text" from the magic bytes, then the name and content type."""
+    if head.startswith(b"%PDF"):
+        return "pdf"
+    if head.startswith(b"PK\x03\x04"):
+        return "docx"
+    name = filename.lower()
+    if name.endswith(".pdf") or content_type == "application/pdf":
+        return "pdf"
+    if name.endswith(".docx") or "wordprocessingml" in content_type:
+        return "docx"
+    if name.endswith(".doc") or content_type == "application/msword":
+        raise ResumeFormatError("Legacy .doc files are not supported; upload PDF or DOCX")
+    return "text"
+
+
+def pdf_pages(source: IO[bytes]) -> Iterator[str]:
+    if PdfReader is None:
+        raise ResumeFormatError("PDF support requires the pypdf package")
+    try:
+        reader = PdfReader(source)
+        for page in reader.pages:
+            yield page.extract_text() or ""
+    except ResumeFormatError:
+        raise
+    except Exception as exc:  # noqa: BLE001 - pypdf raises many error types for corrupt files
+        raise ResumeFormatError(f"Could not read PDF: {exc}") from exc
+
+
+def docx_pages(source: IO[bytes]) -> Iterator[str]:
+    """The whole document as one page; DOCX has no fixed pagination."""
+    try:
+        with zipfile.ZipFile(source) as archive, archive.open("word/document.xml") as document:
+            paragraphs = []
+            for _, element in ElementTree.iterparse(document):
+                if element.tag == f"{WORD_NAMESPACE}p":
+                    paragraphs.append("".join(node.text or "" for node in element.iter(f"{WORD_NAMESPACE}t")))
+                    element.clear()
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as exc:
+        raise ResumeFormatError(f"Could not read DOCX: {exc}") from exc
+    yield "\n".join(paragraphs)
+
+
+def text_pages(source: IO[bytes]) -> Iterator[str]:
+    yield io.TextIOWrapper(source, encoding="utf-8", errors="replace").read()
+
+
+def split_sections(lines: Iterable[str]) -> List[Dict[str, str]]:
+    """Sections keyed by recognised headings; text before the first one is the "header"."""
+    sections: List[Dict[str, Any]] = [{"title": "header", "lines": []}]
+    for line in lines:
+        stripped = line.strip()
+        if stripped and len(stripped) <= 40 and SECTION_HEADINGS.match(stripped):
+            sections.append({"title": stripped.rstrip(":").strip().lower(), "lines": []})
+        elif stripped:
+            sections[-1]["lines"].append(stripped)
+    return [{"title": s["title"], "text": "\n".join(s["lines"])} for s in sections if s["lines"]]
+
+
+def ingest_resume(
+    chunks: Iterable[bytes],
+    filename: str = "",
+    content_type: str = "",
+    max_bytes: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Hash, spool and parse a streamed resume, reusing the cached parse when possible
+
+    Args:
+        chunks: Document bytes in order
+        filename: Original file name (format detection fallback)
+        content_type: MIME type, if known
+        max_bytes: Size limit (default RESUME_MAX_BYTES)
+
+    Returns:
+        {"resume_id", "text", "sections", "pages", "size_bytes", "cached"}
+
+    Raises:
+        ResumeFormatError: Empty, oversized, or unreadable document
+    """
+    max_bytes = max_bytes or int(os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+    spool_limit = int(os.getenv("RESUME_SPOOL_BYTES", str(1024 * 1024)))
+    digest = hashlib.sha256()
+    size = 0
+    with tempfile.SpooledTemporaryFile(max_size=spool_limit) as spool:
+        for chunk in chunks:
+            size += len(chunk)
+            if size > max_bytes:
+                raise ResumeFormatError(f"Document exceeds {max_bytes} bytes")
+            digest.update(chunk)
+            spool.write(chunk)
+        if size == 0:
+            raise ResumeFormatError("Empty document")
+
+        digest.update(PARSER_VERSION.encode("utf-8"))
+        resume_id = resume_id_for(digest.hexdigest())
+        cached = _documents.get(resume_id)
+        if cached is not None:
+            metrics.inc("resume_ingest_total", result="cached")
+            return {**cached, "resume_id": resume_id, "cached": True}
+
+        started = time.perf_counter()
+        spool.seek(0)
+        fmt = detect_format(filename, content_type, spool.read(8))
+        spool.seek(0)
+        reader = {"pdf": pdf_pages, "docx": docx_pages, "text": text_pages}[fmt]
+        lines: List[str] = []
+        pages = 0
+        for page_text in reader(spool):
+            pages += 1
+            lines.extend(page_text.splitlines())
+
+    text = "\n".join(line.rstrip() for line in lines).strip()
+    if not text:
+        raise ResumeFormatError("No text found in document (scanned PDFs are not supported)")
+    document = {
+        "text": text,
+        "sections": split_sections(lines),
+        "pages": pages,
+        "size_bytes": size,
+        "format": fmt,
+    }
+    _documents.set(resume_id, document)
+    metrics.inc("resume_ingest_total", result="parsed")
+    metrics.observe("resume_parse_seconds", time.perf_counter() - started, format=fmt)
+    print(f"[RESUME_INGEST] Parsed {fmt} ({size} bytes, {pages} pages) as {resume_id}", flush=True)
+    return {**document, "resume_id": resume_id, "cached": False}
+
+
+def resume_text_for(resume_id: str) -> Optional[str]:
+    """Text of an ingested resume, or None if the id is unknown (or evicted)."""
+    if not resume_id.startswith(RESUME_ID_PREFIX):
+        return None
+    document = _documents.get(resume_id)
+    return document["text"] if document else None
@@ -2,12 +2,15 @@
 Resume tailoring tool for agentic application processing
 """
 import json
+import pathlib
 from typing import Dict, Any
 from langchain_core.tools import tool
-from jinja2 import Template
 
+from chains.common import load_template, render_template
+from chains.fallbacks import mark_degraded
 from chains.llm_config import get_llm_chain
 
+DEFAULT_TEMPLATE_PATH = pathlib.Path(__file__).parent.parent / "templates" / "resume_tool_prompt.jinja2"
 
 DEFAULT_TEMPLATE = """
 You are an expert resume writer helping a candidate tailor their resume for a specific job.
@@ -17,7 +20,8 @@ Job Information:
 - Company: {{ job.company }}
 - Location: {{ job.location }}
 - Type: {{ job.type }}
-- Description: {{ job.description }}
+- Description: {{ job.description }}{% if job.requirements %}
+- Requirements: {{ job.requirements | join("; ") }}{% endif %}
 
 Candidate Profile:
 - Name: {{ profile.name }}
@@ -44,6 +48,10 @@ Format as:
 """.strip()
 
 
+def load_resume_tool_template() -> str:
+    return load_template("RESUME_TOOL_TEMPLATE_PATH", DEFAULT_TEMPLATE_PATH, DEFAULT_TEMPLATE)
+
+
 @tool
 def tailor_resume(job_info: str, profile_info: str) -> str:
     """
@@ -68,11 +76,10 @@ def tailor_resume(job_info: str, profile_info: str) -> str:
         print(f"[RESUME_TOOL] Tailoring resume for: {job.get('title', 'Unknown')} at {job.get('company', 'Unknown')}")
 
         # Render prompt template
-        template = Template(DEFAULT_TEMPLATE)
-        prompt = template.render(job=job, profile=profile)
+        prompt = render_template(load_resume_tool_template(), job=job, profile=profile)
 
         # Get LLM chain and invoke
-        llm_chain = get_llm_chain(temperature=0.1)  # Low temp for factual resume
+        llm_chain = get_llm_chain(temperature=0.1, task="resume")  # Low temp for factual resume
 
         print(f"[RESUME_TOOL] Invoking LLM (prompt length: {len(prompt)} chars)...")
         result = llm_chain.invoke(prompt)
@@ -83,10 +90,12 @@ def tailor_resume(job_info: str, profile_info: str) -> str:
     except json.JSONDecodeError as e:
         error_msg = f"Invalid JSON input: {e}"
         print(f"[RESUME_TOOL] Error: {error_msg}")
+        mark_degraded("resume")
         return f"Error: {error_msg}. Please provide valid JSON strings."
     except Exception as e:
         error_msg = f"Failed to tailor resume: {str(e)}"
         print(f"[RESUME_TOOL] Error: {error_msg}")
+        mark_degraded("resume")
         return f"Error: {error_msg}"
 
 
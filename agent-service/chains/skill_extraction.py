@@ -0,0 +1,218 @@
+"""
+Skill extraction with a compiled multi-pattern matcher
+
+The backend sends no skills with a profile, and most job postings have no
+requirements section the digest can find. Without those, the LLM has to work
+out the skills from raw text on every call, and ranking has nothing to
+compare. This module finds the skills locally instead.
+
+The skill taxonomy (data/skill_taxonomy.json, or SKILL_TAXONOMY_PATH) maps
+canonical skill names to aliases, grouped by category. An entry is either a
+list of aliases or {"aliases": [...], "match_name": false}; the second form
+is for names that are also ordinary words ("Go", "Excel"), which then match
+only through their aliases.
+
+Every name and alias is tokenized and compiled into one Aho-Corasick
+automaton over word tokens. Text is lowercased and tokenized with a single
+regex, then scanned once. Each token costs a dict lookup or two, whatever
+the taxonomy's size. Matching whole tokens gives word boundaries for free
+("java" does not match inside "javascript"). Overlapping matches resolve to
+the leftmost longest one ("react native" is React Native, not React).
+Aliases map to the canonical name, so "k8s" and "Kubernetes" both count as
+Kubernetes.
+"""
+import json
+import os
+import pathlib
+import re
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from chains.cache import TieredCache, content_hash
+
+DEFAULT_TAXONOMY_PATH = pathlib.Path(__file__).parent.parent / "data" / "skill_taxonomy.json"
+
+# Word tokens keep dots, + and # ("node.js", ".net", "c++", "c#") but never end in a
+# dot ("python." at the end of a sentence); slashes and hyphens split ("ci/cd", "event-driven").
+# A plain character class is twice as fast as spelling out where dots may go.
+TOKEN_RE = re.compile(r"[a-z0-9.+#]*[a-z0-9+#]")
+
+Match = Tuple[int, int, str]  # (first token, token count, canonical name)
+
+_extracted = TieredCache("extracted_skills", max_entries=int(os.getenv("SKILL_CACHE_SIZE", "2048")),
+                         persistent=False)
+
+
+def skill_extraction_enabled() -> bool:
+    return os.getenv("SKILL_EXTRACTION_ENABLED", "true").lower() != "false"
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton whose alphabet is word tokens
+
+    Args:
+        patterns: Canonical skill name per alias
+        categories: Category per canonical name
+        version: Identifies the taxonomy, for cache keys
+    """
+
+    def __init__(self, patterns: Dict[str, str], categories: Optional[Dict[str, str]] = None,
+                 version: str = ""):
+        self.categories = categories or {}
+        self.version = version
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[Tuple[str, int], ...]] = [()]
+        self._aliases: Dict[Tuple[str, ...], str] = {}
+        for alias, canonical in patterns.items():
+            tokens = tuple(tokenize(alias))
+            if tokens:
+                self._aliases[tokens] = canonical
+                self._insert(tokens, canonical)
+        self._link()
+
+    @classmethod
+    def from_taxonomy(cls, taxonomy: Dict[str, Any], version: str = "") -> "SkillMatcher":
+        patterns: Dict[str, str] = {}
+        categories: Dict[str, str] = {}
+        for category, entries in taxonomy.get("categories", {}).items():
+            for name, entry in entries.items():
+                if isinstance(entry, dict):
+                    aliases, match_name = list(entry.get("aliases", [])), entry.get("match_name", True)
+                else:
+                    aliases, match_name = list(entry), True
+                categories[name] = category
+                for alias in ([name] if match_name else []) + aliases:
+                    patterns.setdefault(alias, name)
+        return cls(patterns, categories, version)
+
+    def _insert(self, tokens: Tuple[str, ...], canonical: str) -> None:
+        state = 0
+        for token in tokens:
+            following = self._goto[state].get(token)
+            if following is None:
+                following = len(self._goto)
+                self._goto[state][token] = following
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = following
+        self._out[state] = self._out[state] + ((canonical, len(tokens)),)
+
+    def _link(self) -> None:
+        """Failure links, breadth first; each state also reports its fallback's matches."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, following in self._goto[state].items():
+                queue.append(following)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[following] = self._goto[fallback].get(token, 0)
+                self._out[following] = self._out[following] + self._out[self._fail[following]]
+
+    def find(self, text: str) -> List[Match]:
+        """Non-overlapping matches, leftmost longest first, in text order."""
+        goto, fail, out = self._goto, self._fail, self._out
+        root = goto[0]
+        found: List[Match] = []
+        state = 0
+        for index, token in enumerate(tokenize(text)):
+            if state == 0:
+                state = root.get(token, 0)
+            else:
+                while state and token not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(token, 0)
+            for canonical, length in out[state]:
+                found.append((index - length + 1, length, canonical))
+        found.sort(key=lambda match: (match[0], -match[1]))
+        kept: List[Match] = []
+        end = 0
+        for match in found:
+            if match[0] >= end:
+                kept.append(match)
+                end = match[0] + match[1]
+        return kept
+
+    def extract(self, text: str, limit: int = 0) -> List[str]:
+        """Canonical skills in the text, most mentioned first, then in order of first mention."""
+        counts: Dict[str, int] = {}
+        for _, _, canonical in self.find(text):
+            counts[canonical] = counts.get(canonical, 0) + 1
+        skills = sorted(counts, key=lambda name: -counts[name])  # stable: ties keep first-mention order
+        return skills[:limit] if limit > 0 else skills
+
+    def canonical(self, name: str) -> Optional[str]:
+        """Canonical name for a whole skill string ("k8s" -> "Kubernetes"), or None if unknown."""
+        return self._aliases.get(tuple(tokenize(name)))
+
+    def patterns(self) -> Dict[str, str]:
+        """Canonical name per alias, with aliases as the matcher tokenized them."""
+        return {" ".join(tokens): canonical for tokens, canonical in self._aliases.items()}
+
+    def __len__(self) -> int:
+        return len(self._aliases)
+
+
+def taxonomy_path() -> pathlib.Path:
+    env_path = os.getenv("SKILL_TAXONOMY_PATH")
+    return pathlib.Path(env_path) if env_path else DEFAULT_TAXONOMY_PATH
+
+
+def load_matcher(path: pathlib.Path) -> SkillMatcher:
+    """Compile the taxonomy at path; an unreadable taxonomy gives a matcher that finds nothing."""
+    try:
+        raw = path.read_text(encoding="utf-8")
+        taxonomy = json.loads(raw)
+    except (OSError, ValueError) as exc:
+        print(f"[SKILLS] Cannot load skill taxonomy {path}: {exc}", flush=True)
+        return SkillMatcher({})
+    matcher = SkillMatcher.from_taxonomy(taxonomy, version=content_hash(raw)[:16])
+    print(f"[SKILLS] Compiled {len(matcher)} skill patterns from {path}", flush=True)
+    return matcher
+
+
+_matchers: Dict[str, SkillMatcher] = {}
+_matchers_lock = threading.Lock()
+
+
+def get_matcher() -> SkillMatcher:
+    path = taxonomy_path()
+    with _matchers_lock:
+        matcher = _matchers.get(str(path))
+        if matcher is None:
+            matcher = load_matcher(path)
+            _matchers[str(path)] = matcher
+    return matcher
+
+
+def taxonomy_version() -> str:
+    return get_matcher().version
+
+
+def extract_skills(text: str, limit: int = 0) -> List[str]:
+    """Canonical skills mentioned in text (cached by content), most mentioned first."""
+    if not text or not skill_extraction_enabled():
+        return []
+    matcher = get_matcher()
+    key = content_hash(matcher.version, limit, text)
+    cached = _extracted.get(key)
+    if cached is not None:
+        return list(cached)
+    skills = matcher.extract(text, limit)
+    _extracted.set(key, skills)
+    return list(skills)
+
+
+def canonical_skills(names: Iterable[str]) -> List[Optional[str]]:
+    """Canonical name per skill string, None where the taxonomy does not know it."""
+    matcher = get_matcher()
+    return [matcher.canonical(name) for name in names]
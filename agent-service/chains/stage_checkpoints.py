@@ -0,0 +1,92 @@
+"""
+Stage-level checkpoints for application processing
+
+Each completed stage (resume, cover letter, answers) is stored under a key
+built from the job, the profile, the questions and the prompt templates
+behind that stage (the pipeline chain's and the agent tool's). When the backend retries a request, or a request is
+resumed after a failure, only stages that are missing (or whose template
+changed since they were stored) are generated again.
+
+Only real generations are checkpointed; stages that returned fallback or
+mock output (see chains.fallbacks.mark_degraded) are always redone.
+"""
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from chains.cache import TieredCache, content_hash
+from chains.cover_letter_chain import load_cover_letter_template
+from chains.cover_letter_tool import load_cover_letter_tool_template
+from chains.question_answering_chain import load_question_answering_template
+from chains.question_answering_tool import load_question_answering_tool_template
+from chains.resume_chain import load_resume_template
+from chains.resume_tool import load_resume_tool_template
+
+CHECKPOINT_VERSION = "1"
+STAGES = ("resume", "cover_letter", "answers")
+
+_store = TieredCache("stage_checkpoints", max_entries=int(os.getenv("STAGE_CHECKPOINT_CACHE_SIZE", "512")),
+                     ttl_seconds=float(os.getenv("STAGE_CHECKPOINT_TTL_SECONDS", "86400")))
+
+
+def checkpoints_enabled() -> bool:
+    return os.getenv("STAGE_CHECKPOINTS_ENABLED", "true").lower() != "false"
+
+
+def stage_versions() -> Dict[str, str]:
+    """Template fingerprint per stage; editing a stage's chain or tool template invalidates it."""
+    return {
+        "resume": content_hash(load_resume_template(), load_resume_tool_template()),
+        "cover_letter": content_hash(load_cover_letter_template(), load_cover_letter_tool_template()),
+        "answers": content_hash(load_question_answering_template(), load_question_answering_tool_template()),
+    }
+
+
+class StageCheckpoints:
+    """Checkpoint store scoped to one application request.
+
+    Args:
+        job: Job dict (see common.to_dict)
+        profile: Profile dict (see common.profile_to_dict)
+        questions: Question dicts, or None
+        model: Model override used for the request
+    """
+
+    def __init__(
+        self,
+        job: Dict[str, Any],
+        profile: Dict[str, Any],
+        questions: Optional[List[Dict[str, Any]]] = None,
+        model: Optional[str] = None,
+    ):
+        self.request_key = content_hash(
+            CHECKPOINT_VERSION,
+            job.get("id", ""),
+            content_hash(job),
+            content_hash(profile),
+            content_hash(questions or []),
+            model or os.getenv("OLLAMA_MODEL", ""),
+        )
+        self.versions = stage_versions()
+        self.ttl = float(os.getenv("STAGE_CHECKPOINT_TTL_SECONDS", "86400"))
+        self.reused: List[str] = []
+
+    def _key(self, stage: str) -> str:
+        return content_hash(self.request_key, stage, self.versions[stage])
+
+    def get(self, stage: str) -> Optional[Any]:
+        """Stored output for the stage, recording it as reused."""
+        entry = _store.get(self._key(stage))
+        if entry is None or time.time() - entry["saved_at"] > self.ttl:
+            return None
+        if stage not in self.reused:
+            self.reused.append(stage)
+        print(f"[CHECKPOINT] Reusing {stage} for request {self.request_key[:12]}", flush=True)
+        return entry["output"]
+
+    def has(self, stage: str) -> bool:
+        entry = _store.get(self._key(stage))
+        return entry is not None and time.time() - entry["saved_at"] <= self.ttl
+
+    def put(self, stage: str, output: Any) -> None:
+        _store.set(self._key(stage), {"output": output, "saved_at": time.time()})
@@ -0,0 +1,214 @@
+"""
+Per-request timing and token usage
+
+Each LLM-bound RPC runs inside collect_usage(). While it runs:
+- stage(name) times a pipeline stage (resume, cover_letter, answers) and
+  makes it the stage that later records are charged to; the agent's planner
+  turns are timed by UsageCallback as the "planner" stage
+- record_llm_call() adds one model call with Ollama's counters: prompt and
+  eval tokens, prompt-eval and eval durations, and the prompt's length
+- record_cache_hit() notes output that was served without generating
+  (stage checkpoints, last-good responses, near-duplicate jobs, rules)
+- record_queue_wait() adds time spent waiting for a scheduler slot
+
+The server turns the collected UsageRecorder into the response's Usage block,
+so a client can see where the time of one request went without the metrics
+endpoint. Listeners added with add_usage_listener() get every finished
+request's summary (the latency estimator learns from them).
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from chains import metrics
+
+DEFAULT_STAGE = "other"
+NANOSECONDS = 1e9
+
+
+def usage_enabled() -> bool:
+    return os.getenv("AGENT_RESPONSE_USAGE", "true").lower() != "false"
+
+
+def _new_stage() -> Dict[str, Any]:
+    return {
+        "wall_seconds": 0.0,
+        "llm_calls": 0,
+        "prompt_tokens": 0,
+        "eval_tokens": 0,
+        "prompt_eval_seconds": 0.0,
+        "eval_seconds": 0.0,
+        "cache_hits": [],
+        "prompt_chars": 0,
+    }
+
+
+class UsageRecorder:
+    """Usage of one request, by stage. Thread-safe: agent tools run in executor threads."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queue_wait_seconds = 0.0
+        self.models: Dict[str, None] = {}  # insertion-ordered set
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _stage(self, name: str) -> Dict[str, Any]:
+        return self.stages.setdefault(name, _new_stage())
+
+    def add_wall(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._stage(stage)["wall_seconds"] += seconds
+
+    def add_llm_call(self, stage: str, model: str, stats: Dict[str, Any]) -> None:
+        with self._lock:
+            entry = self._stage(stage)
+            entry["llm_calls"] += 1
+            for key in ("prompt_tokens", "eval_tokens", "prompt_eval_seconds", "eval_seconds", "prompt_chars"):
+                entry[key] += stats.get(key) or 0
+            if model:
+                self.models[model] = None
+
+    def add_cache_hit(self, stage: str, kind: str) -> None:
+        with self._lock:
+            hits = self._stage(stage)["cache_hits"]
+            if kind not in hits:
+                hits.append(kind)
+
+    def add_queue_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.queue_wait_seconds += seconds
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals plus per-stage entries, in the order stages were first seen."""
+        with self._lock:
+            stages = [{"stage": name, **dict(entry, cache_hits=list(entry["cache_hits"]))}
+                      for name, entry in self.stages.items()]
+            return {
+                "total_seconds": time.perf_counter() - self.started,
+                "queue_wait_seconds": self.queue_wait_seconds,
+                "model": ",".join(self.models),
+                "llm_calls": sum(s["llm_calls"] for s in stages),
+                "prompt_tokens": sum(s["prompt_tokens"] for s in stages),
+                "eval_tokens": sum(s["eval_tokens"] for s in stages),
+                "stages": stages,
+            }
+
+
+_recorder: ContextVar[Optional[UsageRecorder]] = ContextVar("usage_recorder", default=None)
+_current_stage: ContextVar[str] = ContextVar("usage_stage", default=DEFAULT_STAGE)
+_listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+
+def add_usage_listener(listener: Callable[[Dict[str, Any]], None]) -> None:
+    """Call listener(summary) whenever a collect_usage() block finishes."""
+    _listeners.append(listener)
+
+
+@contextmanager
+def collect_usage() -> Iterator[UsageRecorder]:
+    """Collect the usage recorded while the block runs."""
+    recorder = UsageRecorder()
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _recorder.reset(token)
+        if _listeners:
+            summary = recorder.summary()
+            for listener in _listeners:
+                try:
+                    listener(summary)
+                except Exception as exc:
+                    print(f"[USAGE] Usage listener failed: {exc}", flush=True)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Charge the block's wall time, and everything recorded inside it, to `name`."""
+    token = _current_stage.set(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _current_stage.reset(token)
+        recorder = _recorder.get()
+        if recorder is not None:
+            recorder.add_wall(name, time.perf_counter() - started)
+
+
+def llm_stats(metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Token counts and durations (seconds) from Ollama's final response metadata."""
+    metadata = metadata or {}
+    return {
+        "prompt_tokens": int(metadata.get("prompt_eval_count") or 0),
+        "eval_tokens": int(metadata.get("eval_count") or 0),
+        "prompt_eval_seconds": (metadata.get("prompt_eval_duration") or 0) / NANOSECONDS,
+        "eval_seconds": (metadata.get("eval_duration") or 0) / NANOSECONDS,
+    }
+
+
+def record_llm_call(model: str, stats: Optional[Dict[str, Any]] = None, stage: Optional[str] = None) -> None:
+    """Record one model call in the current stage (stats as returned by llm_stats)."""
+    stats = stats or {}
+    if stats.get("prompt_tokens"):
+        metrics.inc("llm_prompt_tokens_total", stats["prompt_tokens"], model=model)
+    if stats.get("eval_tokens"):
+        metrics.inc("llm_eval_tokens_total", stats["eval_tokens"], model=model)
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.add_llm_call(stage or _current_stage.get(), model, stats)
+
+
+def record_cache_hit(kind: str, stage: Optional[str] = None) -> None:
+    """Note that the stage's output (or part of it) was served from `kind` instead of generated."""
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.add_cache_hit(stage or _current_stage.get(), kind)
+
+
+def record_queue_wait(seconds: float) -> None:
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.add_queue_wait(seconds)
+
+
+class UsageCallback(BaseCallbackHandler):
+    """Records each chat model call made with this callback attached.
+
+    Args:
+        model: Model name reported in the usage block
+        stage: Stage to charge the calls and their wall time to (default: the
+            stage current at the call, which already times itself)
+    """
+
+    def __init__(self, model: str, stage: Optional[str] = None):
+        self.model = model
+        self.stage = stage
+        self._started: Dict[Any, float] = {}
+        self._prompt_chars: Dict[Any, int] = {}
+
+    def on_chat_model_start(self, serialized: Any, messages: Any, *, run_id: Any, **kwargs: Any) -> None:
+        self._started[run_id] = time.perf_counter()
+        self._prompt_chars[run_id] = sum(len(str(m.content)) for batch in messages for m in batch)
+
+    def on_llm_end(self, response: Any, *, run_id: Any = None, **kwargs: Any) -> None:
+        started = self._started.pop(run_id, None)
+        generation = response.generations[0][0] if response.generations and response.generations[0] else None
+        metadata = dict(getattr(generation, "generation_info", None) or {})
+        message = getattr(generation, "message", None)
+        metadata.update(getattr(message, "response_metadata", None) or {})
+        stats = dict(llm_stats(metadata), prompt_chars=self._prompt_chars.pop(run_id, 0))
+        record_llm_call(self.model, stats, stage=self.stage)
+        recorder = _recorder.get()
+        if self.stage and started is not None and recorder is not None:
+            recorder.add_wall(self.stage, time.perf_counter() - started)
+
+    def on_llm_error(self, error: BaseException, *, run_id: Any = None, **kwargs: Any) -> None:
+        self._started.pop(run_id, None)
+        self._prompt_chars.pop(run_id, None)
@@ -0,0 +1,331 @@
+"""
+Cost and latency estimates for a request, before it runs
+
+EstimateApplication answers "what would this cost?" without calling the LLM:
+prompt tokens, expected and maximum output tokens, LLM calls and wall-clock
+seconds, per stage and in total, plus the wait for a scheduler slot.
+
+- Plan: the stages the request's mode runs, as the server would run them at
+  the load governor's current level (queued tickets run at level 0).
+  Checkpointed stages (prewarmed or retried), questions the profile
+  attributes answer, and a template-only cover letter cost no LLM call. The agent runs as the pipeline when the
+  level or a checkpoint would make it do so; otherwise it adds planner turns
+  (one per tool, plus the final answer). While the LLM breaker is open every
+  stage is served by its fallback.
+- Prompt tokens: each stage's prompt is rendered from its template exactly as
+  the chain renders it, and divided by the characters per token observed
+  for that stage
+- Output tokens: the stage's generation profile, i.e. the token budgeter:
+  the median observed length, capped at the budget the level allows
+- Seconds: per stage, seconds = a * calls + b * prompt_tokens/1000 +
+  c * output_tokens/1000, fitted by exponentially weighted least squares
+  from the stage usage of every finished request (usage listener). A ridge
+  prior pulls the coefficients toward ESTIMATE_* default rates, so the
+  first few requests cannot swing the fit, and ESTIMATE_DECAY forgets old
+  samples as the backend's speed changes.
+- Queue wait: when no slot is free, the requests queued ahead (all tenants)
+  divided by the slot count, times the recent mean time a request holds a
+  slot; a pipeline ticket also waits for the job queue's backlog to drain
+
+Coefficients are solved when a sample arrives, so an estimate is template
+renders and a few multiplications, well under a millisecond. Each worker
+process fits its own model. Near-duplicate job reuse is not predicted, so
+for those jobs the estimate is an upper bound.
+"""
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from chains.common import render_template
+from chains.cover_letter_chain import load_cover_letter_template
+from chains.degradation import active, applied as degradation_applied, budget_scale, level_name
+from chains.generation_profiles import get_profile
+from chains.llm_config import llm_available
+from chains.question_answering_chain import load_question_answering_template
+from chains.question_rules import resolve_questions
+from chains.resume_chain import load_resume_template
+from chains.stage_checkpoints import StageCheckpoints, checkpoints_enabled
+from load_governor import get_governor, governor_enabled
+from scheduler import get_scheduler
+
+PLANNER = "planner"
+CHAIN_STAGES = ("resume", "cover_letter", "answers")
+MODES = {
+    "agent": CHAIN_STAGES,  # AutoApply
+    "pipeline": CHAIN_STAGES,  # SubmitAutoApply
+    "apply": ("resume",),
+    "cover_letter": ("cover_letter",),
+    "answers": ("answers",),
+}
+
+
+def _env_float(name: str, default: str) -> float:
+    return float(os.getenv(name, default))
+
+
+class StageModel:
+    """Latency and token rates of one stage, learned from finished requests.
+
+    Args:
+        prior: Default (seconds per call, seconds per 1k prompt tokens, seconds per 1k output tokens)
+        prior_weight: How many samples the prior counts as
+        decay: Weight each sample keeps when a new one arrives
+        chars_per_token: Default prompt characters per token
+        output_tokens_per_call: Default output tokens per call (stages without a generation profile)
+    """
+
+    def __init__(self, prior: Tuple[float, float, float], prior_weight: float, decay: float,
+                 chars_per_token: float, output_tokens_per_call: float):
+        self.decay = decay
+        self.prior_weight = prior_weight
+        self.samples = 0
+        self._prior = np.asarray(prior, dtype=float)
+        self._weight = 0.0  # decayed sample count
+        self._xtx = np.zeros((3, 3))
+        self._xty = np.zeros(3)
+        self.coefficients = tuple(float(c) for c in prior)
+        # Decayed sums for the ratios, seeded with the prior as prior_weight one-call samples
+        self._chars = chars_per_token * 1000 * prior_weight
+        self._char_tokens = 1000.0 * prior_weight
+        self._calls = float(prior_weight)
+        self._output_tokens = output_tokens_per_call * prior_weight
+        self._lock = threading.Lock()
+
+    def observe(self, calls: int, prompt_tokens: int, output_tokens: int, seconds: float,
+                prompt_chars: int = 0) -> None:
+        x = np.array([calls, prompt_tokens / 1000.0, output_tokens / 1000.0])
+        with self._lock:
+            self._weight = self.decay * self._weight + 1
+            self._xtx = self.decay * self._xtx + np.outer(x, x)
+            self._xty = self.decay * self._xty + x * seconds
+            # Prior as prior_weight pseudo-samples shaped like the real ones, so the fit is a weighted
+            # blend of the prior and least squares; the small ridge keeps unseen directions at the prior
+            precision = (self._xtx / self._weight + 1e-3 * np.eye(3)) * self.prior_weight
+            solved = np.linalg.solve(precision + self._xtx, precision @ self._prior + self._xty)
+            self.coefficients = tuple(max(0.0, float(c)) for c in solved)
+            if prompt_chars and prompt_tokens:
+                self._chars = self.decay * self._chars + prompt_chars
+                self._char_tokens = self.decay * self._char_tokens + prompt_tokens
+            self._calls = self.decay * self._calls + calls
+            self._output_tokens = self.decay * self._output_tokens + output_tokens
+            self.samples += 1
+
+    def seconds(self, calls: int, prompt_tokens: int, output_tokens: int) -> float:
+        per_call, per_prompt, per_output = self.coefficients
+        return calls * per_call + prompt_tokens / 1000.0 * per_prompt + output_tokens / 1000.0 * per_output
+
+    def chars_per_token(self) -> float:
+        return self._chars / self._char_tokens
+
+    def output_tokens_per_call(self) -> float:
+        return self._output_tokens / self._calls
+
+
+class Estimator:
+    """Per-stage models plus the recent time a request holds a scheduler slot."""
+
+    def __init__(self, prior: Tuple[float, float, float], prior_weight: float, decay: float,
+                 chars_per_token: float, planner_output_tokens: float, planner_chars: int):
+        self.decay = decay
+        self.planner_chars = planner_chars
+        self.models = {stage: StageModel(prior, prior_weight, decay, chars_per_token, planner_output_tokens)
+                       for stage in CHAIN_STAGES + (PLANNER,)}
+        self._service_sum = 0.0
+        self._service_weight = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "Estimator":
+        return cls(
+            prior=(
+                _env_float("ESTIMATE_SECONDS_PER_CALL", "0.3"),
+                1000.0 / _env_float("ESTIMATE_PROMPT_TOKENS_PER_SECOND", "400"),
+                1000.0 / _env_float("ESTIMATE_OUTPUT_TOKENS_PER_SECOND", "20"),
+            ),
+            prior_weight=_env_float("ESTIMATE_PRIOR_WEIGHT", "5"),
+            decay=_env_float("ESTIMATE_DECAY", "0.98"),
+            chars_per_token=_env_float("ESTIMATE_CHARS_PER_TOKEN", "4"),
+            planner_output_tokens=_env_float("ESTIMATE_PLANNER_OUTPUT_TOKENS", "80"),
+            planner_chars=int(os.getenv("ESTIMATE_PLANNER_CHARS", "3000")),
+        )
+
+    @property
+    def samples(self) -> int:
+        return sum(model.samples for model in self.models.values())
+
+    def observe(self, summary: Dict[str, Any]) -> None:
+        """Learn from a finished request's usage summary (a usage listener)."""
+        generated = False
+        for entry in summary["stages"]:
+            model = self.models.get(entry["stage"])
+            if model is None or not entry["llm_calls"] or entry["wall_seconds"] <= 0:
+                continue
+            model.observe(entry["llm_calls"], entry["prompt_tokens"], entry["eval_tokens"],
+                          entry["wall_seconds"], entry.get("prompt_chars", 0))
+            generated = True
+        if generated:
+            with self._lock:
+                self._service_sum = self.decay * self._service_sum + (
+                    summary["total_seconds"] - summary["queue_wait_seconds"])
+                self._service_weight = self.decay * self._service_weight + 1
+
+    def service_seconds(self) -> Optional[float]:
+        """Recent mean time an LLM-bound request holds its slot, or None before the first one."""
+        with self._lock:
+            return self._service_sum / self._service_weight if self._service_weight else None
+
+    def stage(self, name: str, prompt_chars: int, units: int = 1, calls: int = 1) -> Dict[str, Any]:
+        """Estimate for one generating stage, under the degradation level currently applied."""
+        model = self.models[name]
+        prompt_tokens = int(prompt_chars / model.chars_per_token()) * calls
+        profile = get_profile(name)
+        if profile:
+            budget = max(1, int(profile.num_predict(units) * budget_scale()))
+            output_tokens = min(profile.expected_tokens(units), budget)
+        else:
+            budget = 0
+            output_tokens = int(model.output_tokens_per_call() * calls)
+        return {
+            "stage": name,
+            "llm_calls": calls,
+            "prompt_tokens": prompt_tokens,
+            "output_tokens": output_tokens,
+            "max_output_tokens": budget * calls,
+            "seconds": model.seconds(calls, prompt_tokens, output_tokens),
+            "served_from": "",
+        }
+
+    def queue_wait(self, queued: int, in_use: float, capacity: int, fallback_seconds: float) -> float:
+        if queued == 0 and in_use < capacity:
+            return 0.0
+        service = self.service_seconds()
+        return (queued + 1) / max(1, capacity) * (service if service is not None else fallback_seconds)
+
+
+def skipped_stage(name: str, served_from: str) -> Dict[str, Any]:
+    return {"stage": name, "llm_calls": 0, "prompt_tokens": 0, "output_tokens": 0,
+            "max_output_tokens": 0, "seconds": 0.0, "served_from": served_from}
+
+
+def stage_prompt_chars(stage: str, job: Dict[str, Any], profile: Dict[str, Any],
+                       pending: List[Dict[str, Any]]) -> int:
+    """Length of the prompt the stage's chain would send."""
+    resume_text = profile.get("resume_text", "")
+    if stage == "resume":
+        return len(render_template(load_resume_template(), job=job, profile=profile))
+    if stage == "cover_letter":
+        return len(render_template(load_cover_letter_template(), job=job, profile=profile, resume_text=resume_text))
+    return len(render_template(load_question_answering_template(), job=job, profile=profile,
+                               resume_text=resume_text, questions=pending))
+
+
+_estimator: Optional[Estimator] = None
+_estimator_lock = threading.Lock()
+
+
+def get_estimator() -> Estimator:
+    global _estimator
+    with _estimator_lock:
+        if _estimator is None:
+            _estimator = Estimator.from_env()
+        return _estimator
+
+
+def estimate_application(
+    job: Dict[str, Any],
+    profile: Dict[str, Any],
+    questions: List[Dict[str, Any]],
+    mode: str = "agent",
+    job_queue: Optional[Any] = None,
+) -> Dict[str, Any]:
+    """
+    Predict what a request would cost if it were sent now
+
+    Args:
+        job: Job dict (see common.to_dict)
+        profile: Profile dict (see common.profile_to_dict)
+        questions: Question dicts (empty for none)
+        mode: "agent" (AutoApply), "pipeline" (SubmitAutoApply), "apply",
+            "cover_letter" or "answers"
+        job_queue: The server's JobQueue; pipeline tickets also wait behind its backlog
+
+    Returns:
+        {"mode", "stages", "llm_calls", "prompt_tokens", "output_tokens",
+        "max_output_tokens", "generation_seconds", "queue_wait_seconds",
+        "latency_seconds", "queue_depth", "degradation_level", "degradation",
+        "fitted_samples"}; "mode" is the mode the request would actually run in
+
+    Raises:
+        ValueError: Unknown mode
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode!r} (expected {', '.join(MODES)})")
+    estimator = get_estimator()
+    # The current level, without evaluate(): an estimate must not move the governor.
+    # Queued tickets always run at full quality.
+    level = get_governor().level if governor_enabled() and mode != "pipeline" else 0
+    stages = [s for s in MODES[mode] if s != "answers" or questions]
+
+    checkpointed = set()
+    if mode == "agent" and checkpoints_enabled():
+        checkpoints = StageCheckpoints(job, profile, questions or None)
+        checkpointed = {s for s in stages if checkpoints.has(s)}
+
+    _, unresolved = resolve_questions(questions, profile) if questions else ({}, [])
+    pending = [questions[i] for i in unresolved]
+
+    planned = []
+    with degradation_applied(level):
+        if not llm_available():
+            effective = "degraded"
+        elif mode == "agent" and (active("pipeline") or checkpointed):
+            effective = "pipeline"
+        else:
+            effective = mode
+        for name in stages:
+            if effective == "degraded":
+                planned.append(skipped_stage(name, "fallback"))
+            elif name in checkpointed:
+                planned.append(skipped_stage(name, "checkpoint"))
+            elif name == "cover_letter" and active("template_cover_letter"):
+                planned.append(skipped_stage(name, "template"))
+            elif name == "answers" and not pending:
+                planned.append(skipped_stage(name, "rules"))
+            else:
+                units = len(pending) if name == "answers" else 1
+                planned.append(estimator.stage(name, stage_prompt_chars(name, job, profile, pending), units))
+        if effective == "agent":
+            task_chars = (estimator.planner_chars + len(json.dumps(job)) + len(json.dumps(profile))
+                          + len(json.dumps(questions)))
+            planned.append(estimator.stage(PLANNER, task_chars, calls=len(stages) + 1))
+
+    generation_seconds = sum(s["seconds"] for s in planned)
+    scheduler = get_scheduler()
+    queued = int(sum(tenant["queued"] for tenant in scheduler.stats().values()))
+    queue_wait = estimator.queue_wait(queued, scheduler.in_use, scheduler.capacity, generation_seconds)
+    if mode == "agent" and checkpointed == set(stages):
+        queue_wait = 0.0  # fully prewarmed: AutoApply skips the scheduler
+    if mode == "pipeline" and job_queue is not None:
+        tickets = job_queue.depth()
+        queued += tickets
+        service = estimator.service_seconds()
+        queue_wait += tickets / max(1, job_queue.workers) * (service if service is not None else generation_seconds)
+
+    return {
+        "mode": effective,
+        "stages": planned,
+        "llm_calls": sum(s["llm_calls"] for s in planned),
+        "prompt_tokens": sum(s["prompt_tokens"] for s in planned),
+        "output_tokens": sum(s["output_tokens"] for s in planned),
+        "max_output_tokens": sum(s["max_output_tokens"] for s in planned),
+        "generation_seconds": generation_seconds,
+        "queue_wait_seconds": queue_wait,
+        "latency_seconds": queue_wait + generation_seconds,
+        "queue_depth": queued,
+        "degradation_level": level,
+        "degradation": level_name(level),
+        "fitted_samples": estimator.samples,
+    }
@@ -0,0 +1,362 @@
+"""
+Durable asynchronous ticket queue for auto-apply requests
+
+Tickets are stored in a local SQLite file. A pool of worker threads claims
+queued tickets under a lease and hands them to a handler that runs the
+pipeline stage by stage, checkpointing each completed stage back into the
+ticket. Delivery is at-least-once: a ticket whose worker died (process
+restart, crash) is re-queued when its lease expires or when its owning
+process is found dead at startup, and resumes from its last completed stage.
+
+While a handler runs, a heartbeat renews its lease, so a slow stage is not
+claimed a second time. Every claim has its own owner token, and checkpoints
+and results are only written while the claim still holds the ticket. A worker
+that lost its ticket abandons it at the next checkpoint.
+"""
+import json
+import os
+import pathlib
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from chains import metrics
+from chains.cache import cache_dir
+from chains.metrics import pid_alive
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+TERMINAL_STATES = (COMPLETED, FAILED)
+
+# handler(ticket_id, payload, completed_stages, checkpoint) -> result dict
+Handler = Callable[[str, bytes, Dict[str, Any], Callable[[str, Any], None]], Dict[str, Any]]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tickets (
+    ticket_id TEXT PRIMARY KEY,
+    tenant TEXT NOT NULL DEFAULT '',
+    state TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    stages TEXT NOT NULL DEFAULT '{}',
+    stage TEXT NOT NULL DEFAULT '',
+    result TEXT,
+    message TEXT NOT NULL DEFAULT '',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    owner TEXT NOT NULL DEFAULT '',
+    lease_expires REAL NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tickets_state ON tickets (state, created_at);
+"""
+
+
+class LeaseLost(Exception):
+    """The ticket was re-claimed by another worker; this worker's work is discarded."""
+
+
+def default_queue_path() -> pathlib.Path:
+    env_path = os.getenv("JOB_QUEUE_PATH")
+    return pathlib.Path(env_path) if env_path else cache_dir() / "job_queue.sqlite3"
+
+
+class JobQueue:
+    """SQLite-backed ticket queue with a worker thread pool.
+
+    Args:
+        handler: Callable that processes one ticket (see Handler)
+        path: SQLite file location
+        workers: Number of worker threads
+        lease_seconds: How long a claim is valid without a heartbeat
+        max_attempts: Attempts before a ticket is marked failed
+    """
+
+    def __init__(
+        self,
+        handler: Handler,
+        path: Optional[pathlib.Path] = None,
+        workers: int = 2,
+        lease_seconds: float = 300.0,
+        max_attempts: int = 3,
+    ):
+        self.handler = handler
+        self.path = path or default_queue_path()
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._changed = threading.Condition()
+        self._stopping = threading.Event()
+        self._threads = []
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(tickets)")}
+            if "tenant" not in columns:
+                conn.execute("ALTER TABLE tickets ADD COLUMN tenant TEXT NOT NULL DEFAULT ''")
+            # Serves the per-tenant running count in _claim's ORDER BY (superseded (tenant, state))
+            conn.execute("DROP INDEX IF EXISTS tickets_tenant")
+            conn.execute("CREATE INDEX IF NOT EXISTS tickets_tenant_lease ON tickets (tenant, state, lease_expires)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _notify(self) -> None:
+        with self._changed:
+            self._changed.notify_all()
+
+    # -- Public API -------------------------------------------------------
+
+    def submit(self, payload: bytes, tenant: str = "") -> str:
+        ticket_id = f"tkt-{uuid.uuid4().hex}"
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO tickets (ticket_id, tenant, state, payload, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (ticket_id, tenant, QUEUED, payload, now, now),
+            )
+        self._notify()
+        return ticket_id
+
+    def get(self, ticket_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM tickets WHERE ticket_id = ?", (ticket_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            "ticket_id": row["ticket_id"],
+            "state": row["state"],
+            "stage": row["stage"],
+            "completed_stages": list(json.loads(row["stages"])),
+            "stages": json.loads(row["stages"]),
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "message": row["message"],
+            "attempts": row["attempts"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+
+    def watch(self, ticket_id: str, is_active: Callable[[], bool] = lambda: True,
+              poll_seconds: float = 1.0) -> Iterator[Dict[str, Any]]:
+        """Yield the ticket every time it changes, until it reaches a terminal state."""
+        last_seen = None
+        while is_active() and not self._stopping.is_set():
+            ticket = self.get(ticket_id)
+            if ticket is None:
+                return
+            if ticket["updated_at"] != last_seen:
+                last_seen = ticket["updated_at"]
+                yield ticket
+            if ticket["state"] in TERMINAL_STATES:
+                return
+            # Wake on local progress; poll covers progress made by other processes
+            with self._changed:
+                self._changed.wait(timeout=poll_seconds)
+
+    def depth(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM tickets WHERE state = ?", (QUEUED,)).fetchone()[0]
+
+    def start(self) -> None:
+        recovered = self._recover()
+        if recovered:
+            print(f"[JOB_QUEUE] Re-queued {recovered} unfinished tickets", flush=True)
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"job-queue-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        print(f"[JOB_QUEUE] Started {self.workers} workers on {self.path}", flush=True)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopping.set()
+        self._notify()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+
+    # -- Worker internals -------------------------------------------------
+
+    def _recover(self) -> int:
+        """Re-queue running tickets whose lease expired or whose owner process is gone.
+
+        A ticket that already used max_attempts is marked failed instead: its
+        worker died without raising (OOM, SIGKILL), and running it again would
+        likely kill the next worker too.
+        """
+        host = socket.gethostname()
+        now = time.time()
+        requeue, failed = [], []
+        with self._connect() as conn:
+            for row in conn.execute(
+                    "SELECT ticket_id, owner, lease_expires, attempts FROM tickets WHERE state = ?", (RUNNING,)):
+                owner_process = row["owner"].partition("/")[0]
+                owner_host, _, owner_pid = owner_process.rpartition(":")
+                # Same owner string means a previous incarnation that reused our pid (e.g. pid 1 in a container)
+                if (row["lease_expires"] < now or owner_process == self.owner
+                        or (owner_host == host and not pid_alive(owner_pid))):
+                    (failed if row["attempts"] >= self.max_attempts else requeue).append(
+                        (row["ticket_id"], row["attempts"]))
+            for ticket_id, _ in requeue:
+                conn.execute(
+                    "UPDATE tickets SET state = ?, owner = '', updated_at = ? WHERE ticket_id = ? AND state = ?",
+                    (QUEUED, now, ticket_id, RUNNING),
+                )
+            for ticket_id, attempts in failed:
+                conn.execute(
+                    "UPDATE tickets SET state = ?, owner = '', message = ?, updated_at = ? WHERE ticket_id = ? AND state = ?",
+                    (FAILED, f"Worker died after {attempts} attempts", now, ticket_id, RUNNING),
+                )
+        if failed:
+            metrics.inc("job_queue_tickets_total", len(failed), state=FAILED)
+            print(f"[JOB_QUEUE] Failed {len(failed)} tickets whose worker died on the last attempt", flush=True)
+        return len(requeue)
+
+    def _claim(self) -> Optional[Dict[str, Any]]:
+        """Claim the next ticket; the returned row's "owner" is this claim's token."""
+        now = time.time()
+        owner = f"{self.owner}/{uuid.uuid4().hex[:12]}"
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            # An expired lease on the last attempt means the worker died without raising; don't retry it
+            expired = conn.execute(
+                "UPDATE tickets SET state = ?, owner = '', message = 'Lease expired after ' || attempts || ' attempts', "
+                "updated_at = ? WHERE state = ? AND lease_expires < ? AND attempts >= ?",
+                (FAILED, now, RUNNING, now, self.max_attempts),
+            ).rowcount
+            # Prefer tenants with the fewest running tickets so one tenant's batch
+            # can't occupy every worker; FIFO within the same running count
+            row = conn.execute(
+                "SELECT t.* FROM tickets t WHERE t.state = ? OR (t.state = ? AND t.lease_expires < ?) "
+                "ORDER BY (SELECT COUNT(*) FROM tickets r WHERE r.tenant = t.tenant AND r.state = ? "
+                "AND r.lease_expires >= ?), t.created_at LIMIT 1",
+                (QUEUED, RUNNING, now, RUNNING, now),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE tickets SET state = ?, owner = ?, lease_expires = ?, attempts = attempts + 1, "
+                    "updated_at = ? WHERE ticket_id = ?",
+                    (RUNNING, owner, now + self.lease_seconds, now, row["ticket_id"]),
+                )
+            conn.execute("COMMIT")
+        if expired:
+            metrics.inc("job_queue_tickets_total", expired, state=FAILED)
+            print(f"[JOB_QUEUE] Failed {expired} tickets whose lease expired on the last attempt", flush=True)
+            self._notify()
+        return dict(row, owner=owner) if row is not None else None
+
+    def _renew(self, ticket_id: str, owner: str) -> bool:
+        """Extend the claim's lease; False once another claim holds the ticket."""
+        with self._connect() as conn:
+            return conn.execute(
+                "UPDATE tickets SET lease_expires = ? WHERE ticket_id = ? AND owner = ? AND state = ?",
+                (time.time() + self.lease_seconds, ticket_id, owner, RUNNING),
+            ).rowcount > 0
+
+    def _heartbeat(self, ticket_id: str, owner: str, done: threading.Event, lost: threading.Event) -> None:
+        while not done.wait(self.lease_seconds / 3):
+            try:
+                if not self._renew(ticket_id, owner):
+                    lost.set()
+                    print(f"[JOB_QUEUE] {ticket_id}: lease lost to another worker", flush=True)
+                    return
+            except sqlite3.Error as exc:
+                print(f"[JOB_QUEUE] {ticket_id}: lease renewal failed: {exc}", flush=True)
+
+    def _checkpoint(self, ticket_id: str, owner: str, stage: str, output: Any) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT stages FROM tickets WHERE ticket_id = ? AND owner = ? AND state = ?", (ticket_id, owner, RUNNING)
+            ).fetchone()
+            if row is not None:
+                stages = json.loads(row["stages"])
+                stages[stage] = output
+                conn.execute(
+                    "UPDATE tickets SET stages = ?, stage = ?, lease_expires = ?, updated_at = ? "
+                    "WHERE ticket_id = ? AND owner = ?",
+                    (json.dumps(stages), stage, now + self.lease_seconds, now, ticket_id, owner),
+                )
+            conn.execute("COMMIT")
+        if row is None:
+            raise LeaseLost(f"{ticket_id} is no longer held by {owner}")
+        self._notify()
+
+    def _finish(self, ticket_id: str, owner: str, state: str, message: str,
+                result: Optional[Dict[str, Any]] = None) -> bool:
+        """Record the outcome if the claim still holds the ticket."""
+        with self._connect() as conn:
+            updated = conn.execute(
+                "UPDATE tickets SET state = ?, message = ?, result = ?, owner = '', updated_at = ? "
+                "WHERE ticket_id = ? AND owner = ?",
+                (state, message, json.dumps(result) if result is not None else None, time.time(), ticket_id, owner),
+            ).rowcount > 0
+        self._notify()
+        return updated
+
+    def _worker_loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                row = self._claim()
+            except sqlite3.Error as exc:
+                print(f"[JOB_QUEUE] Claim failed: {exc}", flush=True)
+                row = None
+
+            if row is None:
+                with self._changed:
+                    self._changed.wait(timeout=1.0)
+                continue
+
+            ticket_id, owner = row["ticket_id"], row["owner"]
+            attempt = row["attempts"] + 1
+            print(f"[JOB_QUEUE] {ticket_id}: attempt {attempt} (stages done: {list(json.loads(row['stages']))})", flush=True)
+            self._notify()
+
+            done, lost = threading.Event(), threading.Event()
+            heartbeat = threading.Thread(target=self._heartbeat, args=(ticket_id, owner, done, lost),
+                                         name=f"job-queue-lease-{ticket_id[-8:]}", daemon=True)
+            heartbeat.start()
+
+            def checkpoint(stage: str, output: Any) -> None:
+                if lost.is_set():
+                    raise LeaseLost(f"{ticket_id} is no longer held by {owner}")
+                self._checkpoint(ticket_id, owner, stage, output)
+
+            try:
+                result = self.handler(ticket_id, row["payload"], json.loads(row["stages"]), checkpoint)
+                if self._finish(ticket_id, owner, COMPLETED, result.get("message", ""), result):
+                    metrics.inc("job_queue_tickets_total", state=COMPLETED)
+                    print(f"[JOB_QUEUE] {ticket_id}: completed", flush=True)
+                else:
+                    metrics.inc("job_queue_abandoned_total")
+                    print(f"[JOB_QUEUE] {ticket_id}: lease lost, result discarded", flush=True)
+            except LeaseLost as exc:
+                metrics.inc("job_queue_abandoned_total")
+                print(f"[JOB_QUEUE] {ticket_id}: abandoned: {exc}", flush=True)
+            except Exception as exc:
+                if attempt >= self.max_attempts:
+                    if self._finish(ticket_id, owner, FAILED, f"Failed after {attempt} attempts: {exc}"):
+                        metrics.inc("job_queue_tickets_total", state=FAILED)
+                    print(f"[JOB_QUEUE] {ticket_id}: failed permanently: {exc}", flush=True)
+                else:
+                    with self._connect() as conn:
+                        conn.execute(
+                            "UPDATE tickets SET state = ?, owner = '', message = ?, updated_at = ? "
+                            "WHERE ticket_id = ? AND owner = ?",
+                            (QUEUED, f"Attempt {attempt} failed: {exc}", time.time(), ticket_id, owner),
+                        )
+                    self._notify()
+                    metrics.inc("job_queue_retries_total")
+                    print(f"[JOB_QUEUE] {ticket_id}: attempt {attempt} failed, re-queued: {exc}", flush=True)
+            finally:
+                done.set()
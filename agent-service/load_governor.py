@@ -0,0 +1,150 @@
+"""
+Load governor: picks the degradation level from queue depth and latency
+
+Each LLM-bound request asks the governor for a level before it runs
+(chains/degradation.py describes the steps a level enables). The governor
+looks at two signals:
+- Queue depth: requests waiting for a scheduler slot, across tenants
+- Latency: the LOAD_LATENCY_PERCENTILE of LLM-bound requests that finished
+  in the last LOAD_LATENCY_WINDOW_SECONDS
+
+It steps up one level when either signal is above its high threshold, at
+most once per LOAD_DWELL_SECONDS. It steps down one level for every
+LOAD_DWELL_SECONDS that both signals have stayed at or below their low
+thresholds; time without any request counts as quiet. The gap between the
+thresholds and the dwell time keep the level from flapping as degraded
+requests get faster.
+"""
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Optional, Tuple
+
+from chains import metrics
+from chains.degradation import configured_steps, level_name
+from scheduler import get_scheduler
+
+
+def governor_enabled() -> bool:
+    return os.getenv("LOAD_GOVERNOR_ENABLED", "true").lower() != "false"
+
+
+def scheduler_queue_depth() -> int:
+    return int(sum(tenant["queued"] for tenant in get_scheduler().stats().values()))
+
+
+class LoadGovernor:
+    """Degradation level with hysteresis.
+
+    Args:
+        max_level: Highest level (the number of configured steps)
+        queue_high: Queue depth at which to step up
+        queue_low: Queue depth at or below which stepping down is allowed
+        latency_high: Recent latency (seconds) at which to step up
+        latency_low: Recent latency at or below which stepping down is allowed
+        dwell: Minimum seconds between steps up; calm seconds needed per step down
+        window: Seconds of finished requests the latency signal covers
+        percentile: Latency percentile compared with the thresholds
+        queue_depth: Returns the current queue depth
+    """
+
+    def __init__(
+        self,
+        max_level: int,
+        queue_high: int = 8,
+        queue_low: int = 2,
+        latency_high: float = 60.0,
+        latency_low: float = 30.0,
+        dwell: float = 15.0,
+        window: float = 60.0,
+        percentile: float = 90.0,
+        queue_depth: Callable[[], int] = scheduler_queue_depth,
+    ):
+        self.max_level = max_level
+        self.queue_high = queue_high
+        self.queue_low = queue_low
+        self.latency_high = latency_high
+        self.latency_low = latency_low
+        self.dwell = dwell
+        self.window = window
+        self.percentile = percentile
+        self.queue_depth = queue_depth
+        self.level = 0
+        self.changed_at = time.monotonic()
+        self.evaluated_at = self.changed_at
+        self.calm_since: Optional[float] = None
+        self._latencies: Deque[Tuple[float, float]] = deque(maxlen=500)  # (finished_at, seconds)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "LoadGovernor":
+        return cls(
+            max_level=len(configured_steps()),
+            queue_high=int(os.getenv("LOAD_QUEUE_HIGH", "8")),
+            queue_low=int(os.getenv("LOAD_QUEUE_LOW", "2")),
+            latency_high=float(os.getenv("LOAD_LATENCY_HIGH_SECONDS", "60")),
+            latency_low=float(os.getenv("LOAD_LATENCY_LOW_SECONDS", "30")),
+            dwell=float(os.getenv("LOAD_DWELL_SECONDS", "15")),
+            window=float(os.getenv("LOAD_LATENCY_WINDOW_SECONDS", "60")),
+            percentile=float(os.getenv("LOAD_LATENCY_PERCENTILE", "90")),
+        )
+
+    def observe_latency(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append((time.monotonic(), seconds))
+
+    def recent_latency(self, now: Optional[float] = None) -> float:
+        """Latency percentile over the window; 0 when nothing finished in it."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            while self._latencies and now - self._latencies[0][0] > self.window:
+                self._latencies.popleft()
+            samples = sorted(seconds for _, seconds in self._latencies)
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(len(samples) * self.percentile / 100.0))]
+
+    def evaluate(self) -> int:
+        """Update the level from the current signals and return it."""
+        now = time.monotonic()
+        depth = self.queue_depth()
+        latency = self.recent_latency(now)
+        with self._lock:
+            level = self.level
+            if depth <= self.queue_low and latency <= self.latency_low:
+                if self.calm_since is None:
+                    # Nothing was asked of us since the last evaluation: count that gap as calm
+                    self.calm_since = self.evaluated_at
+            else:
+                self.calm_since = None
+            self.evaluated_at = now
+
+            if depth >= self.queue_high or latency >= self.latency_high:
+                if level < self.max_level and now - self.changed_at >= self.dwell:
+                    level += 1
+            elif self.calm_since is not None and level > 0:
+                calm = now - max(self.calm_since, self.changed_at)
+                level = max(0, level - int(calm // self.dwell))
+
+            if level != self.level:
+                direction = "up" if level > self.level else "down"
+                print(f"[LOAD_GOVERNOR] Level {self.level} -> {level} ({level_name(level)}): "
+                      f"queue depth {depth}, p{self.percentile:g} latency {latency:.1f}s", flush=True)
+                metrics.inc("load_level_changes_total", direction=direction)
+                self.level = level
+                self.changed_at = now
+            metrics.set_gauge("load_degradation_level", self.level)
+            return self.level
+
+
+_governor: Optional[LoadGovernor] = None
+_governor_lock = threading.Lock()
+
+
+def get_governor() -> LoadGovernor:
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = LoadGovernor.from_env()
+        return _governor
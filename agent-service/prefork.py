@@ -0,0 +1,100 @@
+"""
+Pre-fork multi-process serving mode
+
+One agent_server process is limited by the GIL for template rendering, JSON
+and protobuf conversion and LangGraph bookkeeping. In this mode a parent
+process imports and warms everything once, then forks N worker processes
+that each run their own gRPC server on the same port (SO_REUSEPORT lets the
+kernel balance connections between them). Imported modules are shared
+copy-on-write, so each extra worker costs far less memory than an extra
+container. The parent only supervises: it restarts workers that exit and
+forwards shutdown signals.
+
+gRPC must not create channels or servers before forking, so the parent never
+touches the network; everything network-related starts inside the workers.
+"""
+import gc
+import os
+import signal
+import sys
+import time
+from typing import Callable, Dict
+
+
+def serve_prefork(serve: Callable[[], None], workers: int) -> None:
+    """
+    Fork and supervise worker processes
+
+    Args:
+        serve: Blocking function that runs one worker's gRPC server
+        workers: Number of worker processes to keep running
+    """
+    children: Dict[int, int] = {}  # pid -> worker slot
+    started_at: Dict[int, float] = {}  # slot -> last spawn time
+    failures: Dict[int, int] = {}  # slot -> consecutive fast exits
+    stopping = False
+
+    def spawn(slot: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            os.environ["AGENT_WORKER_ID"] = str(slot)
+            exit_code = 0
+            try:
+                serve()
+            except BaseException as exc:  # noqa: BLE001 - report and let the supervisor restart us
+                print(f"[PREFORK] Worker {slot} crashed: {exc}", flush=True)
+                exit_code = 1
+            finally:
+                sys.stdout.flush()
+                os._exit(exit_code)
+
+        children[pid] = slot
+        started_at[slot] = time.monotonic()
+        print(f"[PREFORK] Started worker {slot} (pid {pid})", flush=True)
+
+    def shutdown(signum, frame):
+        nonlocal stopping
+        stopping = True
+        print(f"[PREFORK] Received signal {signum}, stopping {len(children)} workers", flush=True)
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    # Move everything imported so far out of the collector's view so GC passes
+    # in the workers don't touch (and un-share) the parent's pages
+    gc.collect()
+    gc.freeze()
+
+    for slot in range(workers):
+        spawn(slot)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+
+        slot = children.pop(pid, None)
+        if slot is None or stopping:
+            continue
+
+        code = os.waitstatus_to_exitcode(status)
+        uptime = time.monotonic() - started_at[slot]
+        failures[slot] = failures.get(slot, 0) + 1 if uptime < 10 else 0
+        backoff = min(30.0, 0.5 * (2 ** failures[slot])) if failures[slot] else 0
+        print(f"[PREFORK] Worker {slot} (pid {pid}) exited with {code} after {uptime:.1f}s; "
+              f"restarting in {backoff:.1f}s", flush=True)
+        time.sleep(backoff)
+        if not stopping:
+            spawn(slot)
+
+    print("[PREFORK] All workers stopped", flush=True)
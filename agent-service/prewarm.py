@@ -0,0 +1,262 @@
+"""
+Speculative pre-generation for the jobs a user is about to see
+
+The swipe deck is predictable: the frontend knows the next few jobs before
+the user swipes on them. PrewarmApplications queues those jobs here, and a
+background worker generates their resume, cover letter and answers ahead of
+time. Each stage is written as an ordinary stage checkpoint, under the same
+key AutoApply computes for the same job, profile and questions, so a later
+right-swipe finds every stage checkpointed and returns without generating.
+
+Speculative work must never slow real requests down:
+- Each stage runs only in an idle scheduler slot (nobody waiting, and
+  PREWARM_RESERVED_SLOTS left free), one stage per slot
+- Nothing runs while the load governor is above level 0
+- Each user may start at most PREWARM_BUDGET_PER_USER speculative jobs per
+  PREWARM_BUDGET_WINDOW_SECONDS, and have PREWARM_MAX_PENDING_PER_USER queued
+- CancelPrewarm drops jobs the user swiped left on; a job already generating
+  stops before its next stage
+"""
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from chains import metrics
+from chains.common import profile_to_dict, to_dict
+from chains.cover_letter_chain import run_cover_letter_chain
+from chains.fallbacks import collect_degraded
+from chains.question_answering_chain import run_question_answering_chain
+from chains.resume_chain import run_resume_chain
+from chains.stage_checkpoints import StageCheckpoints
+from load_governor import get_governor, governor_enabled
+from scheduler import get_scheduler
+
+
+def prewarm_enabled() -> bool:
+    return os.getenv("PREWARM_ENABLED", "true").lower() != "false"
+
+
+class PrewarmTask:
+    """One job to pre-generate for one user."""
+
+    def __init__(self, user: str, job: Any, profile: Any, questions: List[Dict[str, Any]]):
+        self.user = user
+        self.job = job
+        self.profile = profile
+        self.questions = questions
+        self.job_id = job.id
+        self.cancelled = threading.Event()
+
+    def checkpoints(self) -> StageCheckpoints:
+        # Same key as AutoApply: questions are None there when the request has none
+        return StageCheckpoints(to_dict(self.job), profile_to_dict(self.profile), self.questions or None)
+
+    def stages(self) -> List[Tuple[str, Callable[[], Any]]]:
+        stages = [
+            ("resume", lambda: run_resume_chain(self.job, self.profile)),
+            ("cover_letter", lambda: run_cover_letter_chain(self.job, self.profile)),
+        ]
+        if self.questions:
+            stages.append(("answers", lambda: run_question_answering_chain(self.job, self.profile, self.questions)))
+        return stages
+
+
+class Prewarmer:
+    """
+    Per-user queues of speculative jobs, served round robin by worker threads
+
+    Args:
+        budget: Speculative jobs a user may start per budget window
+        budget_window: Seconds the budget covers
+        max_pending: Queued jobs allowed per user
+        workers: Worker threads (each runs one stage at a time)
+        reserve: Scheduler slots speculative work must leave free
+        poll_interval: Seconds between checks for idle capacity
+    """
+
+    def __init__(self, budget: int = 20, budget_window: float = 3600.0, max_pending: int = 10,
+                 workers: int = 1, reserve: float = 1, poll_interval: float = 0.5):
+        self.budget = budget
+        self.budget_window = budget_window
+        self.max_pending = max_pending
+        self.workers = workers
+        self.reserve = reserve
+        self.poll_interval = poll_interval
+        self._queues: "OrderedDict[str, Deque[PrewarmTask]]" = OrderedDict()
+        self._running: Dict[Tuple[str, str], PrewarmTask] = {}
+        self._spent: Dict[str, Deque[float]] = {}
+        self._cond = threading.Condition()
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    @classmethod
+    def from_env(cls) -> "Prewarmer":
+        return cls(
+            budget=int(os.getenv("PREWARM_BUDGET_PER_USER", "20")),
+            budget_window=float(os.getenv("PREWARM_BUDGET_WINDOW_SECONDS", "3600")),
+            max_pending=int(os.getenv("PREWARM_MAX_PENDING_PER_USER", "10")),
+            workers=int(os.getenv("PREWARM_WORKERS", "1")),
+            reserve=float(os.getenv("PREWARM_RESERVED_SLOTS", "1")),
+        )
+
+    def start(self) -> None:
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"prewarm-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        self._stopping.set()
+        with self._cond:
+            self._cond.notify_all()
+
+    def budget_remaining(self, user: str) -> int:
+        """Speculative jobs the user may still queue in the current window. Caller holds the lock."""
+        spent = self._spent.setdefault(user, deque())
+        now = time.monotonic()
+        while spent and now - spent[0] > self.budget_window:
+            spent.popleft()
+        return max(0, self.budget - len(spent))
+
+    def submit(
+        self,
+        user: str,
+        profile: Any,
+        jobs: List[Tuple[Any, List[Dict[str, Any]]]],
+    ) -> Dict[str, Any]:
+        """
+        Queue jobs for pre-generation, in deck order
+
+        Args:
+            user: User the budget is charged to
+            profile: Profile message
+            jobs: (Job message, question dicts) per upcoming job
+
+        Returns:
+            {"accepted": [job_id], "cached": [job_id], "skipped": [job_id], "budget_remaining": int}
+        """
+        accepted, cached, skipped = [], [], []
+        with self._cond:
+            queue = self._queues.setdefault(user, deque())
+            known = {task.job_id for task in queue} | {job_id for u, job_id in self._running if u == user}
+            for job, questions in jobs:
+                task = PrewarmTask(user, job, profile, questions)
+                if task.job_id in known:
+                    accepted.append(task.job_id)
+                    continue
+                checkpoints = task.checkpoints()
+                if all(checkpoints.has(stage) for stage, _ in task.stages()):
+                    cached.append(task.job_id)
+                    metrics.inc("prewarm_jobs_total", result="cached")
+                    continue
+                if len(queue) >= self.max_pending or self.budget_remaining(user) <= 0:
+                    skipped.append(task.job_id)
+                    metrics.inc("prewarm_jobs_total", result="over_budget")
+                    continue
+                self._spent[user].append(time.monotonic())
+                queue.append(task)
+                known.add(task.job_id)
+                accepted.append(task.job_id)
+                metrics.inc("prewarm_jobs_total", result="accepted")
+            if not queue:
+                del self._queues[user]
+            remaining = self.budget_remaining(user)
+            self._update_gauge()
+            self._cond.notify_all()
+        return {"accepted": accepted, "cached": cached, "skipped": skipped, "budget_remaining": remaining}
+
+    def cancel(self, user: str, job_ids: Optional[List[str]] = None) -> int:
+        """Drop the user's queued jobs (all when job_ids is empty); budget for unstarted jobs is refunded."""
+        wanted = set(job_ids or [])
+        cancelled = 0
+        with self._cond:
+            queue = self._queues.get(user)
+            if queue:
+                keep: Deque[PrewarmTask] = deque()
+                for task in queue:
+                    if not wanted or task.job_id in wanted:
+                        task.cancelled.set()
+                        cancelled += 1
+                        if self._spent.get(user):
+                            self._spent[user].pop()
+                    else:
+                        keep.append(task)
+                if keep:
+                    self._queues[user] = keep
+                else:
+                    del self._queues[user]
+            for (task_user, job_id), task in self._running.items():
+                if task_user == user and (not wanted or job_id in wanted):
+                    task.cancelled.set()
+                    cancelled += 1
+            self._update_gauge()
+        if cancelled:
+            metrics.inc("prewarm_jobs_total", cancelled, result="cancelled")
+        return cancelled
+
+    def _update_gauge(self) -> None:
+        metrics.set_gauge("prewarm_pending", sum(len(q) for q in self._queues.values()))
+
+    def _next(self) -> Optional[PrewarmTask]:
+        """Head of the next user's queue, round robin across users."""
+        with self._cond:
+            while not self._queues and not self._stopping.is_set():
+                self._cond.wait(timeout=1.0)
+            if self._stopping.is_set():
+                return None
+            user, queue = next(iter(self._queues.items()))
+            task = queue.popleft()
+            if queue:
+                self._queues.move_to_end(user)
+            else:
+                del self._queues[user]
+            self._running[(task.user, task.job_id)] = task
+            self._update_gauge()
+            return task
+
+    def _generate_when_idle(self, task: PrewarmTask, generate: Callable[[], Any]) -> Tuple[bool, Any, Set[str]]:
+        """Run generate() once an idle slot is free; (ran, output, degraded stages)."""
+        scheduler = get_scheduler()
+        while not task.cancelled.is_set() and not self._stopping.is_set():
+            if not governor_enabled() or get_governor().level == 0:
+                with scheduler.idle_slot(self.reserve) as granted:
+                    if granted:
+                        with collect_degraded() as degraded:
+                            return True, generate(), degraded
+            time.sleep(self.poll_interval)
+        return False, None, set()
+
+    def _run(self, task: PrewarmTask) -> str:
+        checkpoints = task.checkpoints()
+        for stage, generate in task.stages():
+            if checkpoints.has(stage):
+                continue
+            started = time.perf_counter()
+            ran, output, degraded = self._generate_when_idle(task, generate)
+            if not ran:
+                return "cancelled"
+            if stage in degraded:
+                # The backend is failing; fallback output must not be served later
+                return "failed"
+            checkpoints.put(stage, output)
+            metrics.observe("prewarm_stage_seconds", time.perf_counter() - started, stage=stage)
+        return "completed"
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            task = self._next()
+            if task is None:
+                return
+            try:
+                result = self._run(task)
+            except Exception as exc:  # noqa: BLE001 - one bad job must not stop the worker
+                print(f"[PREWARM] {task.user}/{task.job_id} failed: {exc}", flush=True)
+                result = "failed"
+            finally:
+                with self._cond:
+                    self._running.pop((task.user, task.job_id), None)
+            if result != "cancelled":
+                metrics.inc("prewarm_jobs_total", result=result)
+            print(f"[PREWARM] {task.user}/{task.job_id}: {result}", flush=True)
@@ -0,0 +1,213 @@
+"""
+On-demand CPU and memory profiling for a running agent_server
+
+- SamplingProfiler walks every thread's stack (sys._current_frames) at a
+  fixed interval. Overhead is proportional to the sampling rate, not to how
+  much Python code runs, so it is safe to switch on in production for a few
+  seconds. Samples render as collapsed stacks (flamegraph.pl / speedscope
+  input) or as a pstats file synthesized from the samples.
+- HeapTracker wraps tracemalloc snapshots and diffs.
+- RequestProfileStore keeps the profiles of individual requests (captured
+  when the client sends the x-profile metadata header) on disk, so any worker
+  in pre-fork mode can return them.
+"""
+import json
+import marshal
+import os
+import pathlib
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from chains.cache import cache_dir
+
+FrameKey = Tuple[str, int, str]  # (filename, first line, function)
+Stack = Tuple[str, Tuple[FrameKey, ...]]  # (thread name, frames root -> leaf)
+
+FORMATS = ("collapsed", "pstats")
+HEAP_GROUP_BY = ("lineno", "filename", "traceback")  # tracemalloc statistics keys
+
+
+class SamplingProfiler:
+    """Samples the Python stacks of all threads every `interval` seconds.
+
+    Args:
+        interval: Seconds between samples
+        max_depth: Frames kept per stack (outermost frames are dropped)
+        focus: Thread ident labelled "request:<name>" in the output, e.g. the
+            thread handling a profiled RPC
+    """
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 128, focus: Optional[int] = None):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.focus = focus
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self.started_at = 0.0
+        self.stopped_at = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SamplingProfiler":
+        self.started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.stopped_at = time.monotonic()
+        return self
+
+    @property
+    def duration(self) -> float:
+        return (self.stopped_at or time.monotonic()) - self.started_at
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            if self.focus in names:
+                names[self.focus] = f"request:{names[self.focus]}"
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                frames: List[FrameKey] = []
+                while frame is not None and len(frames) < self.max_depth:
+                    code = frame.f_code
+                    frames.append((code.co_filename, code.co_firstlineno, code.co_name))
+                    frame = frame.f_back
+                frames.reverse()
+                self.samples[(names.get(ident, str(ident)), tuple(frames))] += 1
+            self.sample_count += 1
+
+
+def render_collapsed(samples: Counter) -> bytes:
+    """One line per distinct stack: "thread;file:function:line;... count"."""
+    lines = []
+    for (thread, frames), count in samples.most_common():
+        path = ";".join([thread] + [f"{os.path.basename(f)}:{name}:{line}" for f, line, name in frames])
+        lines.append(f"{path} {count}")
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def render_pstats(samples: Counter, interval: float) -> bytes:
+    """Marshalled stats dict loadable with pstats.Stats(path), built from the samples.
+
+    Call counts are sample counts; times are samples multiplied by the interval.
+    """
+    stats: Dict[FrameKey, list] = {}
+    for (_, frames), count in samples.items():
+        seconds = count * interval
+        seen = set()
+        for depth, key in enumerate(frames):
+            entry = stats.setdefault(key, [0, 0, 0.0, 0.0, {}])
+            if key not in seen:  # recursion: count inclusive time once per stack
+                seen.add(key)
+                entry[0] += count
+                entry[1] += count
+                entry[3] += seconds
+            if depth == len(frames) - 1:
+                entry[2] += seconds
+            if depth:
+                caller = frames[depth - 1]
+                cc, nc, tt, ct = entry[4].get(caller, (0, 0, 0.0, 0.0))
+                leaf_time = seconds if depth == len(frames) - 1 else 0.0
+                entry[4][caller] = (cc + count, nc + count, tt + leaf_time, ct + seconds)
+    return marshal.dumps({key: (cc, nc, tt, ct, callers) for key, (cc, nc, tt, ct, callers) in stats.items()})
+
+
+def render(samples: Counter, interval: float, fmt: str) -> bytes:
+    if fmt == "pstats":
+        return render_pstats(samples, interval)
+    return render_collapsed(samples)
+
+
+class HeapTracker:
+    """Numbered tracemalloc snapshots (the oldest are dropped past `keep`)."""
+
+    def __init__(self, keep: int = 5):
+        self.keep = keep
+        self._snapshots: "OrderedDict[int, tracemalloc.Snapshot]" = OrderedDict()
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def snapshot(self, frames: int = 1) -> Tuple[int, tracemalloc.Snapshot]:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(max(1, frames))
+        snap = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        with self._lock:
+            snapshot_id = self._next_id
+            self._next_id += 1
+            self._snapshots[snapshot_id] = snap
+            while len(self._snapshots) > self.keep:
+                self._snapshots.popitem(last=False)
+        return snapshot_id, snap
+
+    def get(self, snapshot_id: int) -> Optional[tracemalloc.Snapshot]:
+        with self._lock:
+            return self._snapshots.get(snapshot_id)
+
+    def stop(self) -> int:
+        """Stop tracing and drop all snapshots; returns how many were dropped."""
+        with self._lock:
+            dropped = len(self._snapshots)
+            self._snapshots.clear()
+        tracemalloc.stop()
+        return dropped
+
+
+def profile_dir() -> pathlib.Path:
+    env_dir = os.getenv("AGENT_PROFILE_DIR")
+    return pathlib.Path(env_dir) if env_dir else cache_dir() / "profiles"
+
+
+class RequestProfileStore:
+    """Per-request profiles as JSON files, pruned to the newest `keep`."""
+
+    def __init__(self, directory: Optional[pathlib.Path] = None, keep: int = 50):
+        self.directory = directory or profile_dir()
+        self.keep = keep
+
+    def save(self, method: str, profiler: SamplingProfiler) -> str:
+        profile_id = f"prof-{uuid.uuid4().hex[:16]}"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        record = {
+            "method": method,
+            "pid": os.getpid(),
+            "interval": profiler.interval,
+            "duration": profiler.duration,
+            "sample_count": profiler.sample_count,
+            "samples": [[thread, [list(f) for f in frames], count]
+                        for (thread, frames), count in profiler.samples.items()],
+        }
+        (self.directory / f"{profile_id}.json").write_text(json.dumps(record), encoding="utf-8")
+        self._prune()
+        return profile_id
+
+    def load(self, profile_id: str) -> Optional[Dict]:
+        if not profile_id.startswith("prof-") or "/" in profile_id:
+            return None
+        path = self.directory / f"{profile_id}.json"
+        if not path.exists():
+            return None
+        record = json.loads(path.read_text(encoding="utf-8"))
+        record["samples"] = Counter({
+            (thread, tuple(tuple(f) for f in frames)): count for thread, frames, count in record["samples"]
+        })
+        return record
+
+    def _prune(self) -> None:
+        files = sorted(self.directory.glob("prof-*.json"), key=lambda p: p.stat().st_mtime)
+        for path in files[:-self.keep]:
+            path.unlink(missing_ok=True)
@@ -0,0 +1,241 @@
+"""
+Per-tenant fair-share scheduling of LLM capacity
+
+Every LLM-bound request acquires a slot from the scheduler before running.
+Waiting requests are queued per tenant and dispatched with deficit round
+robin (DRR): each round a tenant earns `quantum * weight` credit and may
+start requests whose cost fits its credit, so one tenant's 200-job batch
+interleaves with everybody else's single applies instead of starving them.
+On top of DRR each tenant has a concurrency cap and an optional token-bucket
+rate limit. Queue depth and wait time are exported per tenant.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, Optional
+
+from chains import metrics
+
+DEFAULT_TENANT = "anonymous"
+
+
+class SchedulerFull(Exception):
+    """Raised when a tenant's wait queue is full."""
+
+
+def _parse_weights(spec: str) -> Dict[str, float]:
+    weights = {}
+    for item in spec.split(","):
+        if "=" in item:
+            tenant, weight = item.split("=", 1)
+            weights[tenant.strip()] = float(weight)
+    return weights
+
+
+class _Waiter:
+    __slots__ = ("cost", "granted", "enqueued_at")
+
+    def __init__(self, cost: float):
+        self.cost = cost
+        self.granted = False
+        self.enqueued_at = time.monotonic()
+
+
+class _Tenant:
+    def __init__(self, name: str, weight: float, rate: float, burst: float):
+        self.name = name
+        self.weight = weight
+        self.queue: Deque[_Waiter] = deque()
+        self.deficit = 0.0
+        self.running = 0
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.refilled_at = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        if self.rate > 0:
+            self.tokens = min(self.burst, self.tokens + (now - self.refilled_at) * self.rate)
+        self.refilled_at = now
+
+    def has_token(self, cost: float) -> bool:
+        return self.rate <= 0 or self.tokens >= min(cost, self.burst)
+
+
+class FairScheduler:
+    """Weighted DRR scheduler with per-tenant caps and token buckets.
+
+    Args:
+        capacity: Requests allowed to run concurrently across all tenants
+        quantum: Credit a weight-1 tenant earns per round
+        tenant_max_concurrency: Running requests allowed per tenant (0 = up to capacity)
+        tenant_rate: Token refill rate per tenant in cost units/second (0 = unlimited)
+        tenant_burst: Token bucket size per tenant
+        tenant_max_queue: Waiting requests allowed per tenant before rejecting
+        weights: Per-tenant weight overrides (default weight 1)
+    """
+
+    def __init__(
+        self,
+        capacity: float = 2,
+        quantum: float = 1.0,
+        tenant_max_concurrency: int = 0,
+        tenant_rate: float = 0.0,
+        tenant_burst: float = 5.0,
+        tenant_max_queue: int = 100,
+        weights: Optional[Dict[str, float]] = None,
+    ):
+        self.capacity = capacity
+        self.quantum = quantum
+        self.tenant_max_concurrency = tenant_max_concurrency if tenant_max_concurrency > 0 else capacity
+        self.tenant_rate = tenant_rate
+        self.tenant_burst = tenant_burst
+        self.tenant_max_queue = tenant_max_queue
+        self.weights = weights or {}
+        self.in_use = 0.0
+        self._tenants: "OrderedDict[str, _Tenant]" = OrderedDict()
+        self._cond = threading.Condition()
+
+    @classmethod
+    def from_env(cls) -> "FairScheduler":
+        return cls(
+            capacity=float(os.getenv("SCHEDULER_CAPACITY", "2")),
+            quantum=float(os.getenv("SCHEDULER_QUANTUM", "1")),
+            tenant_max_concurrency=int(os.getenv("SCHEDULER_TENANT_MAX_CONCURRENCY", "0")),
+            tenant_rate=float(os.getenv("SCHEDULER_TENANT_RATE", "0")),
+            tenant_burst=float(os.getenv("SCHEDULER_TENANT_BURST", "5")),
+            tenant_max_queue=int(os.getenv("SCHEDULER_TENANT_MAX_QUEUE", "100")),
+            weights=_parse_weights(os.getenv("SCHEDULER_TENANT_WEIGHTS", "")),
+        )
+
+    def _tenant(self, name: str) -> _Tenant:
+        tenant = self._tenants.get(name)
+        if tenant is None:
+            tenant = _Tenant(name, self.weights.get(name, 1.0), self.tenant_rate, self.tenant_burst)
+            self._tenants[name] = tenant
+        return tenant
+
+    def _dispatch(self) -> None:
+        """Grant slots in DRR order while capacity remains. Caller holds the lock."""
+        now = time.monotonic()
+        progressed = True
+        while progressed and self.in_use < self.capacity:
+            progressed = False
+            for tenant in list(self._tenants.values()):
+                if not tenant.queue:
+                    tenant.deficit = 0.0
+                    if tenant.running == 0:
+                        del self._tenants[tenant.name]
+                    continue
+
+                tenant.refill(now)
+                head = tenant.queue[0]
+                if tenant.running >= self.tenant_max_concurrency or not tenant.has_token(head.cost):
+                    continue
+
+                # Cap banked credit so a tenant blocked on capacity can't build up a burst
+                share = self.quantum * tenant.weight
+                tenant.deficit = min(tenant.deficit + share, share + head.cost)
+                while (tenant.queue and tenant.deficit >= tenant.queue[0].cost
+                       and tenant.running < self.tenant_max_concurrency
+                       and self.in_use < self.capacity
+                       and tenant.has_token(tenant.queue[0].cost)):
+                    waiter = tenant.queue.popleft()
+                    tenant.deficit -= waiter.cost
+                    if tenant.rate > 0:
+                        tenant.tokens -= min(waiter.cost, tenant.burst)
+                    tenant.running += 1
+                    self.in_use += 1
+                    waiter.granted = True
+                    progressed = True
+                    metrics.observe("scheduler_wait_seconds", now - waiter.enqueued_at, tenant=tenant.name)
+                metrics.set_gauge("scheduler_queue_depth", len(tenant.queue), tenant=tenant.name)
+                # Rotate so the next dispatch starts with the following tenant
+                self._tenants.move_to_end(tenant.name)
+
+                if self.in_use >= self.capacity:
+                    break
+        self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, tenant: str = DEFAULT_TENANT, cost: float = 1.0) -> Iterator[None]:
+        """Block until the tenant is granted a slot, release it on exit.
+
+        Every granted request occupies one of `capacity` slots; `cost` (roughly
+        the number of LLM calls the request makes) is what DRR credit and the
+        token bucket are charged.
+        """
+        tenant = tenant or DEFAULT_TENANT
+        with self._cond:
+            state = self._tenant(tenant)
+            if len(state.queue) >= self.tenant_max_queue:
+                metrics.inc("scheduler_rejected_total", tenant=tenant)
+                raise SchedulerFull(f"Tenant {tenant} already has {len(state.queue)} queued requests")
+
+            waiter = _Waiter(cost)
+            state.queue.append(waiter)
+            metrics.set_gauge("scheduler_queue_depth", len(state.queue), tenant=tenant)
+            self._dispatch()
+            while not waiter.granted:
+                # Timed wait so token buckets that refill over time get re-dispatched
+                self._cond.wait(timeout=0.1)
+                if not waiter.granted:
+                    self._dispatch()
+
+        try:
+            yield
+        finally:
+            with self._cond:
+                state = self._tenant(tenant)
+                state.running -= 1
+                self.in_use -= 1
+                self._dispatch()
+
+    @contextmanager
+    def idle_slot(self, reserve: float = 0) -> Iterator[bool]:
+        """Take a slot only if no request is waiting and `reserve` slots stay free.
+
+        Never waits: yields False when there is no idle capacity. Used for
+        speculative work that must not delay real requests.
+        """
+        with self._cond:
+            granted = (self.in_use + 1 + reserve <= self.capacity
+                       and not any(tenant.queue for tenant in self._tenants.values()))
+            if granted:
+                self.in_use += 1
+        if not granted:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            with self._cond:
+                self.in_use -= 1
+                self._dispatch()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._cond:
+            now = time.monotonic()
+            return {
+                name: {
+                    "queued": len(t.queue),
+                    "running": t.running,
+                    "oldest_wait_seconds": now - t.queue[0].enqueued_at if t.queue else 0.0,
+                    "weight": t.weight,
+                }
+                for name, t in self._tenants.items()
+            }
+
+
+_scheduler: Optional[FairScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> FairScheduler:
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = FairScheduler.from_env()
+        return _scheduler
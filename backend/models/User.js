@@ -20,6 +20,9 @@ const userSchema = new Schema({
     resume: {
       type: String  // URL or file path to uploaded resume
     },
+    resumeId: {
+      type: String  // agent-service IngestResume id for the uploaded resume
+    },
     workHistory: [{
       company: {
         type: Schema.Types.ObjectId,
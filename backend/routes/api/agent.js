@@ -2,10 +2,31 @@ const express = require('express');
 const router = express.Router();
 const mongoose = require('mongoose');
 const { requireUser } = require('../../config/passport');
-const { generateCoverLetter, answerQuestions, autoApply } = require('../../services/agentClient');
+const {
+  generateCoverLetter, answerQuestions, autoApply, prewarmApplications, cancelPrewarm, estimateApplication,
+  withProfileRef,
+} = require('../../services/agentClient');
 
 const Job = mongoose.model('Job');
 
+// Structured answers the agent uses for boolean/choice questions without the LLM.
+// Unset fields are left out so the agent treats them as unknown.
+const buildApplicantAttributes = (user) => {
+  const info = user.additionalInfo || {};
+  const attributes = {
+    work_authorization_in_country: info.workAuthorizationInCountry,
+    needs_visa: info.needsVisa,
+    willing_to_relocate: info.willingToRelocate,
+    ethnicity: info.ethnicity,
+    veteran: info.veteran,
+    disability: info.disability,
+    gender: info.gender,
+  };
+  return Object.fromEntries(
+    Object.entries(attributes).filter(([, value]) => value !== undefined && value !== null && value !== '')
+  );
+};
+
 const buildResumeText = (user) => {
   const lines = [
     `Name: ${user.username}`,
@@ -41,6 +62,38 @@ const formatSalary = (salary) => {
   return `${salary.min}-${salary.max} ${currency} ${period}`.trim();
 };
 
+// Job, profile and questions exactly as auto-apply sends them: prewarmed stages are
+// only reused when all three match. Every route sends the same profile, stored once
+// in the agent with PutProfile and referenced by the user id.
+const buildAutoApplyJob = (job) => ({
+  id: job._id.toString(),
+  title: job.title,
+  company: job.company?.name || '',
+  location: job.location,
+  salary: formatSalary(job.salary),
+  type: job.jobType || '',
+  experience: '',
+  description: job.description,
+  easy_apply: true,
+});
+
+const buildAutoApplyProfile = (user) => ({
+  name: user.username,
+  email: user.email,
+  headline: '',
+  summary: '',
+  skills: [],
+  resume_text: buildResumeText(user),
+  resume_id: user.resumeId || '',
+  attributes: buildApplicantAttributes(user),
+});
+
+const buildAutoApplyQuestions = (job) => (job.questions || []).map(q => ({
+  question: q,
+  type: 'text',
+  options: []
+}));
+
 router.post('/cover-letter', requireUser, async (req, res, next) => {
   try {
     const { jobId } = req.body;
@@ -57,7 +110,6 @@ router.post('/cover-letter', requireUser, async (req, res, next) => {
       return next(error);
     }
 
-    const resumeText = buildResumeText(req.user);
     const requestPayload = {
       job: {
         id: job._id.toString(),
@@ -70,17 +122,11 @@ router.post('/cover-letter', requireUser, async (req, res, next) => {
         description: job.description,
         easy_apply: Array.isArray(job.questions) && job.questions.length > 0,
       },
-      profile: {
-        name: req.user.username,
-        email: req.user.email,
-        headline: '',
-        summary: '',
-        skills: [],
-        resume_text: resumeText,
-      },
+      profile: buildAutoApplyProfile(req.user),
+      tenant_id: req.user._id.toString(),
     };
 
-    const response = await generateCoverLetter(requestPayload);
+    const response = await withProfileRef(generateCoverLetter, req.user._id.toString(), requestPayload);
     return res.json({
       coverLetter: response.cover_letter || '',
       message: response.message || 'Cover letter generated',
@@ -107,8 +153,6 @@ router.post('/answer-questions', requireUser, async (req, res, next) => {
       return next(error);
     }
 
-    const resumeText = buildResumeText(req.user);
-
     // Format for gRPC (same pattern as cover letter endpoint)
     const requestPayload = {
       job: {
@@ -122,14 +166,8 @@ router.post('/answer-questions', requireUser, async (req, res, next) => {
         description: job.description,
         easy_apply: true,
       },
-      profile: {
-        name: req.user.username,
-        email: req.user.email,
-        headline: '',
-        summary: '',
-        skills: [],
-        resume_text: resumeText,
-      },
+      profile: buildAutoApplyProfile(req.user),
+      tenant_id: req.user._id.toString(),
       questions: questions.map(q => ({
         question: q.question || q,
         type: q.type || 'text',
@@ -137,7 +175,7 @@ router.post('/answer-questions', requireUser, async (req, res, next) => {
       }))
     };
 
-    const response = await answerQuestions(requestPayload);
+    const response = await withProfileRef(answerQuestions, req.user._id.toString(), requestPayload);
 
     return res.json({
       success: response.success,
@@ -196,39 +234,16 @@ router.post('/auto-apply/:jobId', requireUser, async (req, res, next) => {
       });
     }
 
-    // Build resume text from user profile
-    const resumeText = buildResumeText(req.user);
-
     // Build request payload
     const requestPayload = {
-      job: {
-        id: job._id.toString(),
-        title: job.title,
-        company: job.company?.name || '',
-        location: job.location,
-        salary: formatSalary(job.salary),
-        type: job.jobType || '',
-        experience: '',
-        description: job.description,
-        easy_apply: true,
-      },
-      profile: {
-        name: req.user.username,
-        email: req.user.email,
-        headline: '',
-        summary: '',
-        skills: [],
-        resume_text: resumeText,
-      },
-      questions: (job.questions || []).map(q => ({
-        question: q,
-        type: 'text',
-        options: []
-      }))
+      job: buildAutoApplyJob(job),
+      profile: buildAutoApplyProfile(req.user),
+      tenant_id: req.user._id.toString(),
+      questions: buildAutoApplyQuestions(job),
     };
 
     // Call orchestrator agent
-    const agentResponse = await autoApply(requestPayload);
+    const agentResponse = await withProfileRef(autoApply, req.user._id.toString(), requestPayload);
 
     if (!agentResponse.success) {
       const error = new Error('Agent failed to process application');
@@ -294,4 +309,91 @@ router.post('/auto-apply/:jobId', requireUser, async (req, res, next) => {
   }
 });
 
+// What auto-applying to a job would cost right now (LLM calls, tokens, seconds), without
+// generating anything. mode: agent (default), pipeline, apply, cover_letter, answers.
+router.get('/auto-apply/:jobId/estimate', requireUser, async (req, res, next) => {
+  try {
+    const job = await Job.findById(req.params.jobId).populate('company', 'name');
+    if (!job) {
+      const error = new Error('Job not found');
+      error.statusCode = 404;
+      return next(error);
+    }
+
+    const response = await withProfileRef(estimateApplication, req.user._id.toString(), {
+      job: buildAutoApplyJob(job),
+      profile: buildAutoApplyProfile(req.user),
+      questions: buildAutoApplyQuestions(job),
+      mode: req.query.mode || 'agent',
+      tenant_id: req.user._id.toString(),
+    });
+    if (!response.success) {
+      return res.status(400).json({ success: false, message: response.message });
+    }
+
+    return res.json({
+      success: true,
+      mode: response.mode,
+      llmCalls: response.llm_calls,
+      promptTokens: Number(response.prompt_tokens),
+      outputTokens: Number(response.output_tokens),
+      maxOutputTokens: Number(response.max_output_tokens),
+      queueWaitSeconds: response.queue_wait_seconds,
+      latencySeconds: response.latency_seconds,
+      queueDepth: response.queue_depth,
+      degradation: response.degradation,
+      stages: response.stages.map(stage => ({
+        stage: stage.stage,
+        llmCalls: stage.llm_calls,
+        promptTokens: Number(stage.prompt_tokens),
+        outputTokens: Number(stage.output_tokens),
+        seconds: stage.seconds,
+        servedFrom: stage.served_from,
+      })),
+    });
+  } catch (err) {
+    return next(err);
+  }
+});
+
+// Speculatively generate applications for the next jobs in the user's swipe deck,
+// so a right-swipe on one of them is answered from cache.
+router.post('/prewarm', requireUser, async (req, res, next) => {
+  try {
+    const jobIds = Array.isArray(req.body.jobIds) ? req.body.jobIds.slice(0, 10) : [];
+    const jobs = await Job.find({ _id: { $in: jobIds } }).populate('company', 'name');
+    // Keep deck order; Job.find returns documents in storage order
+    const byId = new Map(jobs.map(job => [job._id.toString(), job]));
+    const deck = jobIds.map(id => byId.get(String(id))).filter(Boolean);
+
+    const response = await withProfileRef(prewarmApplications, req.user._id.toString(), {
+      profile: buildAutoApplyProfile(req.user),
+      tenant_id: req.user._id.toString(),
+      jobs: deck.map(job => ({ job: buildAutoApplyJob(job), questions: buildAutoApplyQuestions(job) })),
+    });
+
+    return res.json({
+      success: response.success,
+      message: response.message,
+      accepted: response.accepted_job_ids,
+      cached: response.cached_job_ids,
+      skipped: response.skipped_job_ids,
+      budgetRemaining: response.budget_remaining,
+    });
+  } catch (err) {
+    return next(err);
+  }
+});
+
+// Drop prewarming for jobs the user swiped left on (all pending jobs when jobIds is empty).
+router.post('/prewarm/cancel', requireUser, async (req, res, next) => {
+  try {
+    const jobIds = Array.isArray(req.body.jobIds) ? req.body.jobIds.map(String) : [];
+    const response = await cancelPrewarm(req.user._id.toString(), jobIds);
+    return res.json({ success: true, cancelled: response.cancelled });
+  } catch (err) {
+    return next(err);
+  }
+});
+
 module.exports = router;
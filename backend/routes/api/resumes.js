@@ -5,6 +5,7 @@ const User = mongoose.model('User');
 const multer = require('multer');
 const path = require('path');
 const { requireUser } = require('../../config/passport');
+const { ingestResume } = require('../../services/agentClient');
 
 // Configure multer for resume uploads
 const storage = multer.diskStorage({
@@ -49,10 +50,19 @@ router.post('/upload', requireUser, upload.single('resume'), async (req, res, ne
 
     // Store the file path in the user's resume field
     const resumePath = `/uploads/${req.file.filename}`;
-    
+
+    // Parse once in the agent service; applies then send resume_id instead of rebuilt text
+    let resumeId = null;
+    try {
+      const ingested = await ingestResume(req.file.path, req.file.mimetype);
+      resumeId = ingested.success ? ingested.resume_id : null;
+    } catch (err) {
+      console.error('Resume ingestion failed:', err.message);
+    }
+
     const user = await User.findByIdAndUpdate(
       req.user._id,
-      { resume: resumePath },
+      { resume: resumePath, resumeId },
       { new: true }
     ).select('-hashedPassword');
 
@@ -87,6 +97,7 @@ router.delete('/delete', requireUser, async (req, res, next) => {
 
     // Remove resume reference from user
     user.resume = null;
+    user.resumeId = null;
     await user.save();
 
     return res.json({ message: 'Resume deleted successfully' });
@@ -1,9 +1,13 @@
+const crypto = require('crypto');
+const fs = require('fs');
 const path = require('path');
 const grpc = require('@grpc/grpc-js');
 const protoLoader = require('@grpc/proto-loader');
 
 const PROTO_PATH = path.join(__dirname, '..', '..', 'agent-service', 'apply_service.proto');
 const AGENT_GRPC_URL = process.env.AGENT_GRPC_URL || 'localhost:50051';
+const AGENT_PROFILE_REFS = process.env.AGENT_PROFILE_REFS !== 'false';
+const PROFILE_REF_CACHE_SIZE = 10000;
 
 const packageDefinition = protoLoader.loadSync(PROTO_PATH, {
   keepCase: true,
@@ -50,8 +54,166 @@ const autoApply = (request) =>
     });
   });
 
+const rankJobs = (request) =>
+  new Promise((resolve, reject) => {
+    client.RankJobs(request, (err, response) => {
+      if (err) {
+        return reject(err);
+      }
+      return resolve(response);
+    });
+  });
+
+const submitAutoApply = (request) =>
+  new Promise((resolve, reject) => {
+    client.SubmitAutoApply(request, (err, response) => {
+      if (err) {
+        return reject(err);
+      }
+      return resolve(response);
+    });
+  });
+
+const getApplicationStatus = (ticketId) =>
+  new Promise((resolve, reject) => {
+    client.GetApplicationStatus({ ticket_id: ticketId }, (err, response) => {
+      if (err) {
+        return reject(err);
+      }
+      return resolve(response);
+    });
+  });
+
+// Streams a resume file to the agent in chunks; resolves to { resume_id, text, sections, ... }.
+const ingestResume = (filePath, contentType = '') =>
+  new Promise((resolve, reject) => {
+    const call = client.IngestResume((err, response) => {
+      if (err) {
+        return reject(err);
+      }
+      return resolve(response);
+    });
+    let first = true;
+    fs.createReadStream(filePath, { highWaterMark: 64 * 1024 })
+      .on('data', (data) => {
+        call.write(first ? { filename: path.basename(filePath), content_type: contentType, data } : { data });
+        first = false;
+      })
+      .on('end', () => call.end())
+      .on('error', (err) => {
+        call.cancel();
+        reject(err);
+      });
+  });
+
+const prewarmApplications = (request) =>
+  new Promise((resolve, reject) => {
+    client.PrewarmApplications(request, (err, response) => {
+      if (err) {
+        return reject(err);
+      }
+      return resolve(response);
+    });
+  });
+
+const cancelPrewarm = (tenantId, jobIds = []) =>
+  new Promise((resolve, reject) => {
+    client.CancelPrewarm({ tenant_id: tenantId, job_ids: jobIds }, (err, response) => {
+      if (err) {
+        return reject(err);
+      }
+      return resolve(response);
+    });
+  });
+
+// Profiles belong to the tenant that stores them; only that tenant can resolve their refs.
+const putProfile = (profileId, profile, tenantId = '') =>
+  new Promise((resolve, reject) => {
+    client.PutProfile({ profile_id: profileId, profile, tenant_id: tenantId }, (err, response) => {
+      if (err) {
+        return reject(err);
+      }
+      return resolve(response);
+    });
+  });
+
+const getProfile = (profileRef, tenantId = '') =>
+  new Promise((resolve, reject) => {
+    client.GetProfile({ profile_ref: profileRef, tenant_id: tenantId }, (err, response) => {
+      if (err) {
+        return reject(err);
+      }
+      return resolve(response);
+    });
+  });
+
+// Predicted tokens, LLM calls and latency of a request; the agent never calls the LLM for it.
+const estimateApplication = (request) =>
+  new Promise((resolve, reject) => {
+    client.EstimateApplication(request, (err, response) => {
+      if (err) {
+        return reject(err);
+      }
+      return resolve(response);
+    });
+  });
+
+// "<tenantId>/<profileId>" -> { hash, ref } of the last profile stored with PutProfile
+const profileRefs = new Map();
+
+const storeProfile = async (tenantId, profileId, profile, hash) => {
+  const stored = await putProfile(profileId, profile, tenantId);
+  if (!stored.success) {
+    throw new Error(stored.message);
+  }
+  const key = `${tenantId}/${profileId}`;
+  profileRefs.delete(key);
+  if (profileRefs.size >= PROFILE_REF_CACHE_SIZE) {
+    profileRefs.delete(profileRefs.keys().next().value);
+  }
+  profileRefs.set(key, { hash, ref: stored.profile_ref });
+  return stored.profile_ref;
+};
+
+// Calls `method` with request.profile replaced by a profile_ref. The profile is sent
+// with PutProfile only when it changed since the last call, or when the agent no longer
+// has it (NOT_FOUND, e.g. after its store was cleared). The profile is stored for
+// request.tenant_id, the only tenant that can then resolve the ref.
+const withProfileRef = async (method, profileId, request) => {
+  if (!AGENT_PROFILE_REFS) {
+    return method(request);
+  }
+  const { profile, ...rest } = request;
+  const tenantId = rest.tenant_id || '';
+  const hash = crypto.createHash('sha256').update(JSON.stringify(profile)).digest('hex');
+  const known = profileRefs.get(`${tenantId}/${profileId}`);
+  const ref = known && known.hash === hash ? known.ref : await storeProfile(tenantId, profileId, profile, hash);
+  try {
+    return await method({ ...rest, profile_ref: ref });
+  } catch (err) {
+    if (err.code !== grpc.status.NOT_FOUND) {
+      throw err;
+    }
+    return method({ ...rest, profile_ref: await storeProfile(tenantId, profileId, profile, hash) });
+  }
+};
+
+// Returns a readable stream emitting ApplicationStatus updates until the ticket finishes.
+const watchApplication = (ticketId) => client.WatchApplication({ ticket_id: ticketId });
+
 module.exports = {
   generateCoverLetter,
   answerQuestions,
   autoApply,
+  rankJobs,
+  submitAutoApply,
+  getApplicationStatus,
+  watchApplication,
+  ingestResume,
+  prewarmApplications,
+  cancelPrewarm,
+  putProfile,
+  getProfile,
+  estimateApplication,
+  withProfileRef,
 };
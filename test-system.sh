@@ -86,9 +86,39 @@ else
     warning "MongoDB not detected on port 27017 (might be using Atlas)"
 fi
 
-# Test 6: End-to-End Integration Test (optional)
+# Test 6: Profile refs are usable by their tenant only
+echo "Test 6: Profile Registry"
+cat > /tmp/test-profile-refs.py << 'EOF'
+import grpc
+import apply_service_pb2 as pb
+import apply_service_pb2_grpc as pb_grpc
+
+stub = pb_grpc.ApplyServiceStub(grpc.insecure_channel("localhost:50051"))
+ref = stub.PutProfile(pb.PutProfileRequest(
+    profile_id="system-test", profile=pb.Profile(name="System Test", skills=["python"]),
+    tenant_id="system-test")).profile_ref
+job = pb.Job(id="system-test-job", title="Python Developer", description="Python")
+ranked = stub.RankJobs(pb.RankJobsRequest(profile_ref=ref, jobs=[job], tenant_id="system-test"))
+assert ranked.success and len(ranked.scores) == 1, ranked
+try:
+    stub.RankJobs(pb.RankJobsRequest(profile_ref=ref, jobs=[job], tenant_id="someone-else"))
+    raise SystemExit("another tenant resolved the profile_ref")
+except grpc.RpcError as exc:
+    assert exc.code() == grpc.StatusCode.NOT_FOUND, exc.code()
+print("OK")
+EOF
+if docker exec -i agent-service python - < /tmp/test-profile-refs.py > /dev/null 2>&1; then
+    success "RankJobs resolves a profile_ref for its tenant only"
+else
+    error "Profile registry check failed"
+    rm -f /tmp/test-profile-refs.py
+    exit 1
+fi
+rm -f /tmp/test-profile-refs.py
+
+# Test 7: End-to-End Integration Test (optional)
 echo ""
-echo "Test 6: End-to-End Integration (optional)"
+echo "Test 7: End-to-End Integration (optional)"
 read -p "Run full integration test? (takes ~20 seconds) [y/N] " -n 1 -r
 echo ""
 if [[ $REPLY =~ ^[Yy]$ ]]; then